@@ -8,7 +8,6 @@ from pathlib import Path
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from pewpew import resources  # noqa: F401
-from pewpew.mainwindow import MainWindow
 
 logger = logging.getLogger()
 
@@ -22,6 +21,11 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument(
         "--open", "-i", type=Path, nargs="+", help="Open file(s) on startup."
     )
+    parser.add_argument(
+        "--watch",
+        type=Path,
+        help="Watch a directory, importing new data as it is written.",
+    )
     parser.add_argument(
         "--nohook", action="store_true", help="Don't install the execption hook."
     )
@@ -34,13 +38,22 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         for path in args.open:
             if not path.exists:
                 raise parser.error(f"[--open, -i]: File '{path}' not found.")
+    if args.watch is not None and not args.watch.is_dir():
+        raise parser.error(f"[--watch]: Directory '{args.watch}' not found.")
 
     return args
 
 
 def main() -> int:
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from pewpew import batch
+
+        return min(batch.main(sys.argv[2:]), 1)
+
     args = parse_args(sys.argv)
 
+    from pewpew.mainwindow import MainWindow
+
     app = QtWidgets.QApplication(args.qtargs)
     app.setApplicationName("pewpew")
     app.setOrganizationName("pewpew")
@@ -55,10 +68,13 @@ def main() -> int:
     logger.info(f"Using Pewlib {version('pewlib')}.")
 
     window.show()
+    window.startAutosave()
 
     # Arguments
     if args.open is not None:
         window.tabview.openDocument(args.open)
+    if args.watch is not None:
+        window.watchDirectory(args.watch)
 
     # Keep event loop active with timer
     timer = QtCore.QTimer()
@@ -70,4 +86,4 @@ def main() -> int:
 
 if __name__ == "__main__":
     multiprocessing.freeze_support()
-    main()
+    sys.exit(main())
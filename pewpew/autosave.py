@@ -0,0 +1,390 @@
+"""Background autosaves for recovery after a crash.
+
+Lasers are periodically written to a session directory as uncompressed pew²
+'.npz' snapshots, with each element stored separately, alongside a manifest of
+their tabs and layout. Snapshots are written in a worker thread without
+copying the laser data. Instead each
+:class:`pewpew.graphics.imageitems.LaserImageItem` carries a revision that is
+incremented whenever it is modified, a snapshot is only used if the revision
+is unchanged once the snapshot is written. Unchanged lasers are not rewritten.
+
+The session directory is removed when the application exits normally, the
+sessions of processes that did not exit are offered for recovery on startup.
+"""
+
+import copy
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from importlib.metadata import version
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+from pewlib.calibration import Calibration
+from pewlib.config import Config
+from PySide6 import QtCore
+
+from pewpew.graphics.imageitems import LaserImageItem
+from pewpew.lib import lazynpz
+from pewpew.lib.project import ProjectFile
+from pewpew.widgets.laser import LaserTabView, LaserTabWidget
+
+logger = logging.getLogger(__name__)
+
+
+def _write_atomic(path: Path, write) -> None:
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            write(fp)
+        os.replace(tmp, path)
+    except Exception:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def write_snapshot(
+    path: Path,
+    data: np.ndarray,
+    calibration: dict[str, Calibration],
+    config: Config,
+    info: dict[str, str],
+    cancelled: Callable[[], bool] | None = None,
+) -> None:
+    """Atomically writes an uncompressed pew² '.npz'.
+
+    If 'cancelled' returns True the partial file is removed and an
+    InterruptedError raised.
+
+    See :func:`pewlib.io.npz.save` and :func:`pewpew.lib.lazynpz.save_elements`.
+    """
+    from pewlib.io.npz import pack_calibration, pack_info
+
+    header = {
+        "version": version("pewlib"),
+        "class": str(config._class),
+        "time": str(time.time()),
+    }
+    _write_atomic(
+        path,
+        lambda fp: lazynpz.save_elements(
+            fp,
+            header=pack_info(header),
+            data=data,
+            calibration=pack_calibration(calibration),
+            info=pack_info(info),
+            config=config.to_array(),
+            cancelled=cancelled,
+        ),
+    )
+
+
+class SnapshotThread(QtCore.QThread):
+    """Writes laser snapshots.
+
+    The laser data is read in this thread, lazy lasers are read without being
+    loaded. Writes are abandoned once interruption is requested.
+
+    Args:
+        jobs: list of (key, revision, path, laser, calibration, config, info)
+
+    Signals:
+        snapshotSaved: str, int, key and revision of a written snapshot
+    """
+
+    snapshotSaved = QtCore.Signal(str, int)
+
+    def __init__(self, jobs: list[tuple], parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.jobs = jobs
+
+    def run(self) -> None:
+        for key, revision, path, laser, *parameters in self.jobs:
+            if self.isInterruptionRequested():
+                break
+            try:
+                if isinstance(laser, lazynpz.LazyNpzLaser) and not laser.isLoaded():
+                    data = laser.readData()
+                else:
+                    data = laser.data
+                write_snapshot(
+                    path, data, *parameters, cancelled=self.isInterruptionRequested
+                )
+            except InterruptedError:
+                break
+            except Exception as e:
+                logger.warning(f"Autosave of {path.name} failed: {e}")
+            else:
+                self.snapshotSaved.emit(key, revision)
+
+
+class AutosaveService(QtCore.QObject):
+    """Periodically snapshots the lasers of a view.
+
+    Each instance writes to a new session in 'directory', which is locked
+    while the service is active.
+
+    Args:
+        view: view to snapshot
+        directory: directory to store sessions
+        interval: time between snapshots, in ms
+
+    Signals:
+        snapshotFinished: emitted after the session manifest is written
+    """
+
+    manifest_name = "session.json"
+
+    snapshotFinished = QtCore.Signal()
+
+    def __init__(
+        self,
+        view: LaserTabView,
+        directory: Path | str,
+        interval: int = 300000,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.view = view
+        self.directory = Path(directory)
+        self.session = self.directory.joinpath(f"{os.getpid()}-{time.time_ns()}")
+        self.lock = QtCore.QLockFile(str(self.session) + ".lock")
+        self.lock.setStaleLockTime(0)  # only stale if the process exits
+
+        self.keys: dict[LaserImageItem, str] = {}
+        self.items: dict[str, LaserImageItem] = {}
+        # Revision and file name of valid snapshots
+        self.saved: dict[str, tuple[int, str]] = {}
+        self.records: list[dict] = []
+        # Locks of recovered sessions, removed once snapshotted
+        self.recovered: dict[Path, QtCore.QLockFile] = {}
+
+        self.thread: SnapshotThread | None = None
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.snapshot)
+
+    def isActive(self) -> bool:
+        return self.timer.isActive()
+
+    def start(self) -> None:
+        self.session.mkdir(parents=True, exist_ok=True)
+        if not self.lock.tryLock(0):  # pragma: no cover
+            raise RuntimeError(f"Unable to lock autosave session {self.session}.")
+        self.timer.start()
+
+    def stop(self, remove: bool = True) -> None:
+        """Stop autosaving, removing the session if 'remove'.
+
+        Any snapshot being written is abandoned, waiting only for the current
+        chunk to be written.
+        """
+        self.timer.stop()
+        if self.thread is not None:
+            self.thread.requestInterruption()
+            self.thread.wait()
+        if remove:
+            shutil.rmtree(self.session, ignore_errors=True)
+            self.removeRecovered()
+        self.lock.unlock()
+
+    def recoverableSessions(self) -> list[Path]:
+        """Sessions of processes that did not exit cleanly.
+
+        The sessions are locked until removed by `removeRecovered`, so that
+        they are not offered to other instances.
+        """
+        sessions = []
+        if not self.directory.exists():
+            return sessions
+        for session in sorted(self.directory.iterdir()):
+            if not session.is_dir() or session == self.session:
+                continue
+            lock = QtCore.QLockFile(str(session) + ".lock")
+            lock.setStaleLockTime(0)
+            if not lock.tryLock(0):  # in use
+                continue
+            if session.joinpath(self.manifest_name).exists():
+                self.recovered[session] = lock
+                sessions.append(session)
+            else:  # nothing to recover
+                shutil.rmtree(session, ignore_errors=True)
+                lock.unlock()
+        return sessions
+
+    def removeRecovered(self) -> None:
+        for session, lock in self.recovered.items():
+            shutil.rmtree(session, ignore_errors=True)
+            lock.unlock()
+        self.recovered.clear()
+
+    def restoreSession(self, session: Path) -> list[LaserTabWidget]:
+        """Add the lasers of 'session' to new tabs in the view.
+
+        Lasers are loaded lazily from the snapshots, or their unmodified source
+        documents and projects. The session is removed once they have been
+        snapshotted to the current session.
+        """
+        manifest = json.loads(session.joinpath(self.manifest_name).read_text())
+        widgets: dict[int, LaserTabWidget] = {}
+        for record in manifest["lasers"]:
+            try:
+                if "source" not in record:
+                    laser = lazynpz.load(session.joinpath(record["file"]))
+                elif record.get("source_key") is not None:
+                    laser = ProjectFile(record["source"]).readLaser(
+                        record["source_key"]
+                    )
+                else:
+                    laser = lazynpz.load(record["source"])
+            except Exception as e:
+                name = record.get("file", record.get("source"))
+                logger.warning(f"Unable to recover {name}: {e}")
+                continue
+            if record.get("file_path") is not None:
+                laser.info["File Path"] = record["file_path"]
+
+            if record["tab"] not in widgets:
+                widget = LaserTabWidget(self.view.options, self.view)
+                self.view.addTab(record["tab_name"], widget)
+                widgets[record["tab"]] = widget
+            widgets[record["tab"]].addItemFromState(laser, record)
+
+        for widget in widgets.values():
+            widget.setWindowModified(True)
+        logger.info(f"Recovered {len(manifest['lasers'])} images from {session.name}.")
+        return list(widgets.values())
+
+    def lazySource(self, widget: LaserTabWidget, item: LaserImageItem) -> dict | None:
+        """The source of an unmodified lazy laser, to be recorded in place of a
+        snapshot. None if the laser requires a snapshot.
+        """
+        laser = item.laser
+        if (
+            not isinstance(laser, lazynpz.LazyNpzLaser)
+            or item.revision != 0
+            or laser.isSourceModified()
+        ):
+            return None
+        if laser.members is None:  # a pewlib document
+            return {"source": str(laser.path), "source_key": None}
+        if (
+            widget.project is not None
+            and widget.project.path == laser.path
+            and item in widget.project_keys
+        ):
+            return {"source": str(laser.path), "source_key": widget.project_keys[item]}
+        return None
+
+    def snapshot(self) -> None:
+        """Start writing snapshots of modified lasers.
+
+        Unmodified lazy lasers are not written, their source is recorded.
+        If the previous snapshot has not finished this call is skipped.
+        """
+        if self.thread is not None:
+            return
+
+        keys: dict[LaserImageItem, str] = {}
+        records: list[dict] = []
+        jobs: list[tuple] = []
+        for i, widget in enumerate(self.view.widgets()):
+            if not isinstance(widget, LaserTabWidget):
+                continue
+            for item in widget.graphics.scene().items(QtCore.Qt.AscendingOrder):
+                if not isinstance(item, LaserImageItem):
+                    continue
+                key = self.keys.get(item, uuid.uuid4().hex)
+                keys[item] = key
+                record = {
+                    "key": key,
+                    "tab": i,
+                    "tab_name": widget.name,
+                    "file_path": item.laser.info.get("File Path"),
+                    **widget.itemState(item),
+                }
+                records.append(record)
+
+                source = self.lazySource(widget, item)
+                if source is not None:
+                    record.update(source)
+                    continue
+                if self.saved.get(key, (None,))[0] == item.revision:
+                    continue
+                # Data is not copied, the snapshot is discarded if it is modified
+                jobs.append(
+                    (
+                        key,
+                        item.revision,
+                        self.session.joinpath(f"{key}-{item.revision}.npz"),
+                        item.laser,
+                        copy.deepcopy(item.laser.calibration),
+                        copy.copy(item.laser.config),
+                        dict(item.laser.info),
+                    )
+                )
+        self.keys = keys
+        self.items = {key: item for item, key in keys.items()}
+        self.records = records
+
+        if len(jobs) == 0:
+            self.writeManifest()
+            return
+
+        self.thread = SnapshotThread(jobs, parent=self)
+        self.thread.snapshotSaved.connect(self.snapshotSaved)
+        self.thread.finished.connect(self.snapshotThreadFinished)
+        self.thread.start()
+
+    def snapshotSaved(self, key: str, revision: int) -> None:
+        # Snapshots of items modified while writing are not valid
+        item = self.items.get(key)
+        if item is not None and item.revision == revision:
+            self.saved[key] = (revision, f"{key}-{revision}.npz")
+
+    def snapshotThreadFinished(self) -> None:
+        if self.thread is not None:
+            self.thread.deleteLater()
+            self.thread = None
+        self.writeManifest()
+
+    def writeManifest(self) -> None:
+        """Writes the manifest of valid snapshots and removes stale files."""
+        valid = {
+            key: file for key, (_, file) in self.saved.items() if key in self.items
+        }
+        records = [
+            record if "source" in record else {**record, "file": valid[record["key"]]}
+            for record in self.records
+            if "source" in record or record["key"] in valid
+        ]
+        manifest = {
+            "pewpew": version("pewpew"),
+            "time": time.time(),
+            "lasers": records,
+        }
+        try:
+            _write_atomic(
+                self.session.joinpath(self.manifest_name),
+                lambda fp: fp.write(json.dumps(manifest).encode()),
+            )
+        except OSError as e:
+            logger.warning(f"Unable to write autosave manifest: {e}")
+            return
+
+        referenced = set(valid.values())
+        for path in self.session.glob("*.npz"):
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
+        self.saved = {key: self.saved[key] for key in valid}
+
+        # Recovered sessions are no longer needed once all lasers are saved
+        if len(self.recovered) > 0 and len(records) == len(self.records):
+            self.removeRecovered()
+        self.snapshotFinished.emit()
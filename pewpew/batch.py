@@ -0,0 +1,294 @@
+"""Headless batch import, processing and export of laser data.
+
+Run as ``pewpew batch``, see ``pewpew batch --help``.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from pewlib.config import Config
+from pewlib.laser import Laser
+
+from pewpew.lib import lazynpz
+from pewpew.lib.importcache import ImportCache
+from pewpew.lib.processing import apply_processing
+from pewpew.threads import import_path
+from pewpew.watch import is_importable
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ["npz", "csv", "png", "vti"]
+
+invalid_map = str.maketrans('<>:"/\\|?*', "_" * 9)
+
+
+def export_laser(
+    laser: Laser,
+    directory: Path,
+    formats: list[str],
+    elements: list[str] | None = None,
+    calibrate: bool = False,
+    colortable: str = "viridis",
+    scale: int = 1,
+    dpi: int = 96,
+) -> list[Path]:
+    """Export 'laser' to 'directory', as per the export dialog.
+
+    Args:
+        laser: laser to export
+        directory: output directory
+        formats: any of 'npz', 'csv', 'png', 'vti'
+        elements: elements to export as csv or png, default all
+        calibrate: calibrate exported csv, png and vti data
+        colortable: colortable of png images
+        scale: scale of png images
+        dpi: dpi of png images
+
+    Returns:
+        paths of exported files
+    """
+    from pewlib import io
+
+    name = laser.info["Name"].translate(invalid_map)
+    if elements is None:
+        elements = list(laser.elements)
+    elements = [e for e in elements if e in laser.elements]
+
+    paths = []
+    for format in formats:
+        if format == "npz":
+            path = directory.joinpath(name + ".npz")
+            lazynpz.save(path, laser)
+            paths.append(path)
+        elif format == "csv":
+            for element in elements:
+                path = directory.joinpath(
+                    f"{name}_{element.translate(invalid_map)}.csv"
+                )
+                io.textimage.save(path, laser.get(element, calibrate, flat=True))
+                paths.append(path)
+        elif format == "png":
+            from PySide6 import QtCore
+
+            from pewpew.graphics.export import generate_laser_image
+            from pewpew.graphics.options import GraphicsOptions
+
+            options = GraphicsOptions()
+            options.colortable = colortable
+            options.calibrate = calibrate
+            for element in elements:
+                path = directory.joinpath(
+                    f"{name}_{element.translate(invalid_map)}.png"
+                )
+                image = generate_laser_image(
+                    laser,
+                    element,
+                    options,
+                    size=QtCore.QSize(laser.shape[1] * scale, laser.shape[0] * scale),
+                    scale=scale,
+                    dpi=dpi,
+                )
+                image.setDotsPerMeterX(int(dpi * 39.37007874))
+                image.setDotsPerMeterY(int(dpi * 39.37007874))
+                image.save(str(path.absolute()))
+                paths.append(path)
+        elif format == "vti":
+            path = directory.joinpath(name + ".vti")
+            # Last axis (z) is negative for layer order
+            spacing = (
+                laser.config.get_pixel_width(),
+                laser.config.get_pixel_height(),
+                -laser.config.spotsize / 2.0,
+            )
+            io.vtk.save(path, laser.get(calibrate=calibrate), spacing)
+            paths.append(path)
+        else:
+            raise ValueError(f"Unable to export file as '{format}'.")
+    return paths
+
+
+def process_path(
+    path: Path,
+    directory: Path,
+    config: Config,
+    processing: str,
+    formats: list[str],
+    cache: ImportCache | None = None,
+    **export_kws,
+) -> list[Path]:
+    """Import, process and export a single path, see `export_laser`."""
+    laser = import_path(path, config, cache=cache)
+    if not isinstance(laser, Laser):  # pragma: no cover, SRR
+        raise ValueError(f"{path.name}: Unsupported laser type.")
+    apply_processing(laser, processing)
+    return export_laser(laser, directory, formats, **export_kws)
+
+
+def _init_worker() -> None:
+    # Images are drawn without a display
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6 import QtGui
+
+    if QtGui.QGuiApplication.instance() is None:
+        _init_worker.app = QtGui.QGuiApplication([])  # type: ignore
+
+
+def collect_paths(paths: list[Path]) -> list[Path]:
+    """Importable files and '.b' batches in 'paths'.
+
+    Other directories are searched for importable paths, as per
+    :class:`pewpew.watch.DirectoryWatcher`.
+    """
+    collected = []
+    for path in paths:
+        if path.is_dir() and path.suffix.lower() != ".b":
+            collected.extend(sorted(p for p in path.iterdir() if is_importable(p)))
+        elif is_importable(path):
+            collected.append(path)
+        else:
+            logger.warning(f"Skipping {path}, not an importable file.")
+    return collected
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="pewpew batch",
+        description="Import, process and export LA-ICP-MS data without the GUI.",
+    )
+    parser.add_argument(
+        "paths",
+        type=Path,
+        nargs="+",
+        help="Files or '.b' batches to import, directories are searched.",
+    )
+    parser.add_argument(
+        "--output", "-o", type=Path, required=True, help="Output directory."
+    )
+    parser.add_argument(
+        "--format",
+        "-f",
+        nargs="+",
+        choices=EXPORT_FORMATS,
+        default=["npz"],
+        help="Export format(s).",
+    )
+    processing = parser.add_mutually_exclusive_group()
+    processing.add_argument(
+        "--process",
+        "-p",
+        default="",
+        help="Processing string, e.g. 'Filter(*,Local Median,size=5,σ=3.0);'.",
+    )
+    processing.add_argument(
+        "--process-file", type=Path, help="File containing a processing string."
+    )
+    parser.add_argument(
+        "--elements", nargs="+", help="Elements to export as csv or png."
+    )
+    parser.add_argument(
+        "--calibrate", action="store_true", help="Calibrate exported data."
+    )
+    parser.add_argument(
+        "--colortable", default="viridis", help="Colortable of png images."
+    )
+    parser.add_argument("--scale", type=int, default=1, help="Scale of png images.")
+    parser.add_argument("--dpi", type=int, default=96, help="DPI of png images.")
+    parser.add_argument(
+        "--config",
+        nargs=3,
+        type=float,
+        metavar=("SPOTSIZE", "SPEED", "SCANTIME"),
+        help="Default config, if not read from the data.",
+    )
+    parser.add_argument(
+        "--processes",
+        "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes.",
+    )
+    parser.add_argument(
+        "--cache", type=Path, help="Directory to cache parsed vendor data."
+    )
+    args = parser.parse_args(argv)
+
+    if args.process_file is not None:
+        args.process = args.process_file.read_text().strip()
+    if args.processes < 1:
+        parser.error("[--processes, -j]: must be at least 1.")
+    for path in args.paths:
+        if not path.exists():
+            parser.error(f"'{path}' not found.")
+
+    return args
+
+
+def main(argv: list[str]) -> int:
+    """Run a batch, returning the number of failed paths."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    paths = collect_paths(args.paths)
+    if len(paths) == 0:
+        logger.error("No importable paths found.")
+        return 1
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    config = Config(*args.config) if args.config is not None else Config()
+    cache = ImportCache(args.cache) if args.cache is not None else None
+    export_kws = dict(
+        elements=args.elements,
+        calibrate=args.calibrate,
+        colortable=args.colortable,
+        scale=args.scale,
+        dpi=args.dpi,
+    )
+
+    errors: dict[Path, str] = {}
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=min(args.processes, len(paths)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    ) as pool:
+        futures = {
+            pool.submit(
+                process_path,
+                path,
+                args.output,
+                config,
+                args.process,
+                args.format,
+                cache=cache,
+                **export_kws,
+            ): path
+            for path in paths
+        }
+        for i, future in enumerate(as_completed(futures)):
+            path = futures[future]
+            try:
+                outputs = future.result()
+            except Exception as e:
+                errors[path] = f"{type(e).__name__}: {e}"
+                logger.error(f"[{i + 1}/{len(paths)}] {path.name} failed.")
+            else:
+                logger.info(
+                    f"[{i + 1}/{len(paths)}] {path.name} -> "
+                    f"{', '.join(p.name for p in outputs)}"
+                )
+
+    logger.info(
+        f"Processed {len(paths) - len(errors)} of {len(paths)} paths "
+        f"in {time.perf_counter() - t0:.1f} s."
+    )
+    if len(errors) > 0:
+        print(f"Failed ({len(errors)}):", file=sys.stderr)
+        for path, error in errors.items():
+            print(f"  {path}: {error}", file=sys.stderr)
+    return len(errors)
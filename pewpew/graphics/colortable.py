@@ -1,2597 +1,233 @@
-from typing import Dict, List
+"""Colortables as packed little-endian uint32 ARGB values.
+
+Generated by scripts/colormap_to_table.py, do not edit.
+"""
+
+import base64
 
 import numpy as np
 
-colortables: dict[str, np.ndarray] = {
-    "balance": [
-        4279704642,
-        4279770437,
-        4279836488,
-        4279902283,
-        4279968078,
-        4280034129,
-        4280099925,
-        4280165976,
-        4280231771,
-        4280297566,
-        4280363361,
-        4280429413,
-        4280495208,
-        4280495467,
-        4280561519,
-        4280627314,
-        4280693110,
-        4280693625,
-        4280759421,
-        4280759680,
-        4280825732,
-        4280825992,
-        4280826251,
-        4280892047,
-        4280892562,
-        4280892822,
-        4280893338,
-        4280828062,
-        4280828321,
-        4280763301,
-        4280763560,
-        4280698540,
-        4280567983,
-        4280502962,
-        4280372149,
-        4280176056,
-        4280045754,
-        4279784123,
-        4279588028,
-        4279391933,
-        4279196093,
-        4279065534,
-        4278934974,
-        4278869949,
-        4278805181,
-        4278871229,
-        4278937277,
-        4279003324,
-        4279134908,
-        4279266492,
-        4279463611,
-        4279595195,
-        4279792315,
-        4279989435,
-        4280120762,
-        4280317882,
-        4280515002,
-        4280646586,
-        4280843706,
-        4281040826,
-        4281172153,
-        4281369273,
-        4281566393,
-        4281697977,
-        4281894841,
-        4282091961,
-        4282223545,
-        4282420409,
-        4282551993,
-        4282749113,
-        4282945977,
-        4283143098,
-        4283274682,
-        4283471546,
-        4283668666,
-        4283865786,
-        4284062650,
-        4284194234,
-        4284391099,
-        4284588219,
-        4284785339,
-        4285047740,
-        4285244860,
-        4285441724,
-        4285638845,
-        4285835709,
-        4286032830,
-        4286295230,
-        4286492095,
-        4286689215,
-        4286886080,
-        4287083201,
-        4287345601,
-        4287542722,
-        4287739587,
-        4287936708,
-        4288133573,
-        4288330437,
-        4288527558,
-        4288724423,
-        4288921544,
-        4289118409,
-        4289315530,
-        4289512395,
-        4289709517,
-        4289906382,
-        4290103503,
-        4290300624,
-        4290497489,
-        4290694610,
-        4290891476,
-        4291088597,
-        4291285718,
-        4291482583,
-        4291614169,
-        4291811034,
-        4292008155,
-        4292205277,
-        4292402398,
-        4292599263,
-        4292730849,
-        4292927970,
-        4293125092,
-        4293321957,
-        4293453543,
-        4293650664,
-        4293847786,
-        4293979371,
-        4293979371,
-        4293913064,
-        4293847014,
-        4293780963,
-        4293714656,
-        4293648605,
-        4293582554,
-        4293516247,
-        4293450197,
-        4293383890,
-        4293383375,
-        4293317324,
-        4293251017,
-        4293184966,
-        4293118915,
-        4293118144,
-        4293052094,
-        4292986043,
-        4292919736,
-        4292853685,
-        4292853170,
-        4292786863,
-        4292720812,
-        4292720297,
-        4292653990,
-        4292587939,
-        4292521889,
-        4292521374,
-        4292455067,
-        4292389016,
-        4292388501,
-        4292322194,
-        4292256143,
-        4292255628,
-        4292189577,
-        4292123271,
-        4292122756,
-        4292056705,
-        4291990654,
-        4291989883,
-        4291923832,
-        4291857782,
-        4291857011,
-        4291790960,
-        4291724909,
-        4291658858,
-        4291658088,
-        4291592037,
-        4291525986,
-        4291525215,
-        4291459165,
-        4291393114,
-        4291326807,
-        4291326293,
-        4291260242,
-        4291193935,
-        4291127885,
-        4291127370,
-        4291061064,
-        4290995013,
-        4290928707,
-        4290862656,
-        4290796606,
-        4290795836,
-        4290729786,
-        4290663479,
-        4290597429,
-        4290531123,
-        4290465073,
-        4290398767,
-        4290332717,
-        4290266412,
-        4290200106,
-        4290134057,
-        4290067752,
-        4290001447,
-        4289935398,
-        4289803557,
-        4289737252,
-        4289671204,
-        4289539364,
-        4289473316,
-        4289341476,
-        4289209892,
-        4289143588,
-        4289012004,
-        4288880421,
-        4288748837,
-        4288617253,
-        4288485670,
-        4288354086,
-        4288222503,
-        4288025639,
-        4287894055,
-        4287762728,
-        4287565864,
-        4287434536,
-        4287237929,
-        4287106601,
-        4286909993,
-        4286713385,
-        4286582057,
-        4286385449,
-        4286189096,
-        4286058024,
-        4285861415,
-        4285664807,
-        4285533734,
-        4285337126,
-        4285140517,
-        4285009444,
-        4284812835,
-        4284616226,
-        4284485153,
-        4284288545,
-        4284091936,
-        4283960606,
-        4283763997,
-        4283632924,
-        4283436059,
-        4283239450,
-        4283108377,
-        4282911512,
-        4282780438,
-        4282583573,
-        4282452500,
-        4282255635,
-        4282124561,
-    ],
-    "cividis": [
-        4278198861,
-        4278199119,
-        4278199120,
-        4278199378,
-        4278199636,
-        4278199893,
-        4278199895,
-        4278200153,
-        4278200411,
-        4278200412,
-        4278200670,
-        4278200928,
-        4278200930,
-        4278201188,
-        4278201446,
-        4278201447,
-        4278201705,
-        4278201963,
-        4278202221,
-        4278202223,
-        4278202480,
-        4278202480,
-        4278202736,
-        4278202736,
-        4278465136,
-        4278727536,
-        4278924144,
-        4279121008,
-        4279317871,
-        4279514735,
-        4279645807,
-        4279777135,
-        4279908463,
-        4280039534,
-        4280105326,
-        4280236654,
-        4280367982,
-        4280433518,
-        4280564846,
-        4280630637,
-        4280761709,
-        4280827501,
-        4280958829,
-        4281024365,
-        4281090157,
-        4281221484,
-        4281287276,
-        4281352812,
-        4281418604,
-        4281484396,
-        4281615468,
-        4281681260,
-        4281747052,
-        4281812588,
-        4281878380,
-        4281944172,
-        4282009707,
-        4282075499,
-        4282206827,
-        4282272619,
-        4282338155,
-        4282403947,
-        4282469739,
-        4282535275,
-        4282601067,
-        4282666859,
-        4282732395,
-        4282798187,
-        4282863979,
-        4282929515,
-        4282995307,
-        4283061099,
-        4283126892,
-        4283192428,
-        4283258220,
-        4283324012,
-        4283324012,
-        4283389804,
-        4283455596,
-        4283521132,
-        4283586924,
-        4283652716,
-        4283718252,
-        4283784045,
-        4283849837,
-        4283915629,
-        4283981165,
-        4284046957,
-        4284047213,
-        4284112749,
-        4284178542,
-        4284244334,
-        4284309870,
-        4284375662,
-        4284441454,
-        4284507246,
-        4284572783,
-        4284573039,
-        4284638831,
-        4284704367,
-        4284770159,
-        4284835952,
-        4284901744,
-        4284967280,
-        4285033072,
-        4285033329,
-        4285098865,
-        4285164657,
-        4285230449,
-        4285295986,
-        4285361778,
-        4285427570,
-        4285427827,
-        4285493363,
-        4285559155,
-        4285624947,
-        4285690740,
-        4285756276,
-        4285822069,
-        4285822325,
-        4285887861,
-        4285953654,
-        4286019446,
-        4286085238,
-        4286150775,
-        4286151031,
-        4286216823,
-        4286282615,
-        4286348152,
-        4286413944,
-        4286479736,
-        4286545272,
-        4286611064,
-        4286676856,
-        4286742648,
-        4286808184,
-        4286873976,
-        4286939768,
-        4286940024,
-        4287005560,
-        4287071352,
-        4287137144,
-        4287202936,
-        4287268472,
-        4287334264,
-        4287400056,
-        4287465848,
-        4287531384,
-        4287597175,
-        4287662967,
-        4287728759,
-        4287794295,
-        4287860087,
-        4287925879,
-        4287991671,
-        4288057207,
-        4288122998,
-        4288188790,
-        4288254582,
-        4288320374,
-        4288385910,
-        4288451702,
-        4288517493,
-        4288583285,
-        4288648821,
-        4288714613,
-        4288780404,
-        4288846196,
-        4288911988,
-        4288977524,
-        4289043315,
-        4289109107,
-        4289174899,
-        4289240691,
-        4289306226,
-        4289372018,
-        4289437810,
-        4289503601,
-        4289569393,
-        4289634929,
-        4289700720,
-        4289766512,
-        4289832304,
-        4289898095,
-        4289963631,
-        4290029423,
-        4290095214,
-        4290161006,
-        4290226797,
-        4290292589,
-        4290358125,
-        4290423916,
-        4290489708,
-        4290555499,
-        4290621291,
-        4290687082,
-        4290752618,
-        4290883945,
-        4290949737,
-        4291015528,
-        4291081320,
-        4291147111,
-        4291212647,
-        4291278438,
-        4291344229,
-        4291410021,
-        4291475812,
-        4291541604,
-        4291607395,
-        4291673186,
-        4291738722,
-        4291804513,
-        4291870304,
-        4292001632,
-        4292067423,
-        4292133214,
-        4292199006,
-        4292264797,
-        4292330332,
-        4292396123,
-        4292461914,
-        4292527706,
-        4292593497,
-        4292659288,
-        4292790615,
-        4292856406,
-        4292922197,
-        4292987988,
-        4293053523,
-        4293119314,
-        4293185105,
-        4293250896,
-        4293316687,
-        4293448014,
-        4293513805,
-        4293579596,
-        4293645387,
-        4293711178,
-        4293776968,
-        4293842759,
-        4293908550,
-        4294039876,
-        4294105667,
-        4294171202,
-        4294236992,
-        4294302783,
-        4294368573,
-        4294499899,
-        4294565690,
-        4294631480,
-        4294697270,
-        4294828596,
-        4294828851,
-        4294829364,
-        4294829622,
-        4294829879,
-    ],
-    "cubehelix": [
-        4278190080,
-        4278255617,
-        4278386947,
-        4278518020,
-        4278583814,
-        4278714888,
-        4278780681,
-        4278846475,
-        4278977549,
-        4279043343,
-        4279109137,
-        4279240211,
-        4279306005,
-        4279371799,
-        4279437593,
-        4279503387,
-        4279503389,
-        4279569183,
-        4279635233,
-        4279635235,
-        4279701029,
-        4279767079,
-        4279767337,
-        4279833131,
-        4279833389,
-        4279833647,
-        4279899440,
-        4279899698,
-        4279900212,
-        4279900470,
-        4279900728,
-        4279901241,
-        4279901499,
-        4279902012,
-        4279902270,
-        4279902784,
-        4279903041,
-        4279903554,
-        4279838275,
-        4279838789,
-        4279839046,
-        4279774023,
-        4279774536,
-        4279774793,
-        4279709769,
-        4279710282,
-        4279710795,
-        4279645516,
-        4279646028,
-        4279646541,
-        4279646797,
-        4279581774,
-        4279582286,
-        4279582798,
-        4279583310,
-        4279583566,
-        4279584078,
-        4279519054,
-        4279519566,
-        4279519822,
-        4279520333,
-        4279586381,
-        4279586892,
-        4279587148,
-        4279587659,
-        4279653451,
-        4279653962,
-        4279654473,
-        4279720265,
-        4279720776,
-        4279786567,
-        4279852614,
-        4279918405,
-        4279984452,
-        4280050243,
-        4280116035,
-        4280182082,
-        4280247873,
-        4280313664,
-        4280379710,
-        4280511037,
-        4280576828,
-        4280708155,
-        4280773946,
-        4280905274,
-        4281036601,
-        4281167928,
-        4281299255,
-        4281430326,
-        4281561653,
-        4281692980,
-        4281824307,
-        4281955635,
-        4282152242,
-        4282283569,
-        4282480177,
-        4282611504,
-        4282808112,
-        4282939439,
-        4283136047,
-        4283332655,
-        4283529518,
-        4283660590,
-        4283857198,
-        4284053806,
-        4284250670,
-        4284447279,
-        4284643887,
-        4284840495,
-        4285037104,
-        4285233712,
-        4285430321,
-        4285626930,
-        4285889075,
-        4286085683,
-        4286282292,
-        4286478901,
-        4286675511,
-        4286872120,
-        4287068729,
-        4287265083,
-        4287461692,
-        4287658302,
-        4287854912,
-        4288051522,
-        4288248131,
-        4288379205,
-        4288575815,
-        4288772426,
-        4288903244,
-        4289099854,
-        4289296465,
-        4289427539,
-        4289624150,
-        4289755224,
-        4289951835,
-        4290082910,
-        4290213984,
-        4290345059,
-        4290476390,
-        4290607465,
-        4290738540,
-        4290869615,
-        4290935154,
-        4291066485,
-        4291197560,
-        4291263100,
-        4291328895,
-        4291459970,
-        4291525765,
-        4291591304,
-        4291657100,
-        4291722639,
-        4291788434,
-        4291853973,
-        4291919769,
-        4291920028,
-        4291985823,
-        4292051618,
-        4292051878,
-        4292052137,
-        4292117676,
-        4292117935,
-        4292118450,
-        4292118709,
-        4292118968,
-        4292119226,
-        4292119485,
-        4292120000,
-        4292054723,
-        4292054981,
-        4292055496,
-        4291990218,
-        4291990477,
-        4291990991,
-        4291925714,
-        4291860692,
-        4291861206,
-        4291795928,
-        4291796442,
-        4291731164,
-        4291666142,
-        4291666656,
-        4291601377,
-        4291536355,
-        4291471333,
-        4291471846,
-        4291406824,
-        4291341545,
-        4291342058,
-        4291277035,
-        4291212012,
-        4291212525,
-        4291147502,
-        4291147759,
-        4291082735,
-        4291083248,
-        4291018225,
-        4291018737,
-        4290953713,
-        4290953970,
-        4290954482,
-        4290889459,
-        4290889971,
-        4290890227,
-        4290890739,
-        4290891251,
-        4290891763,
-        4290892019,
-        4290892531,
-        4290893043,
-        4290958835,
-        4290959346,
-        4290959602,
-        4291025650,
-        4291025906,
-        4291091953,
-        4291092209,
-        4291158257,
-        4291224048,
-        4291289840,
-        4291290096,
-        4291356144,
-        4291421935,
-        4291487727,
-        4291619055,
-        4291685103,
-        4291750894,
-        4291882222,
-        4291948014,
-        4292013806,
-        4292145134,
-        4292210670,
-        4292341998,
-        4292473326,
-        4292539118,
-        4292670447,
-        4292801775,
-        4292867311,
-        4292998639,
-        4293129968,
-        4293261296,
-        4293392369,
-        4293458161,
-        4293589234,
-        4293720563,
-        4293851892,
-        4293982965,
-        4294114294,
-        4294245367,
-        4294376696,
-        4294442233,
-        4294573562,
-        4294704636,
-        4294835965,
-        4294967295,
-    ],
-    "curl": [
-        4279508291,
-        4279574340,
-        4279574853,
-        4279640902,
-        4279641415,
-        4279707464,
-        4279707978,
-        4279774027,
-        4279774540,
-        4279775053,
-        4279840846,
-        4279841359,
-        4279841872,
-        4279907922,
-        4279908435,
-        4279908948,
-        4279974997,
-        4279975254,
-        4279975767,
-        4279976281,
-        4279976794,
-        4279977307,
-        4280043100,
-        4280043613,
-        4280044126,
-        4280044640,
-        4280045153,
-        4279980130,
-        4279980387,
-        4279980900,
-        4279981413,
-        4279981926,
-        4279916903,
-        4279917417,
-        4279917930,
-        4279852651,
-        4279853164,
-        4279788141,
-        4279723118,
-        4279723631,
-        4279658608,
-        4279593585,
-        4279594098,
-        4279528818,
-        4279463795,
-        4279464308,
-        4279399285,
-        4279334262,
-        4279334775,
-        4279269751,
-        4279270264,
-        4279270777,
-        4279336569,
-        4279337082,
-        4279403131,
-        4279469179,
-        4279600764,
-        4279732348,
-        4279863677,
-        4280060797,
-        4280257918,
-        4280455038,
-        4280651902,
-        4280849023,
-        4281111679,
-        4281308543,
-        4281571200,
-        4281833856,
-        4282096257,
-        4282358913,
-        4282621313,
-        4282883970,
-        4283146371,
-        4283409027,
-        4283671428,
-        4283934085,
-        4284196485,
-        4284458886,
-        4284721543,
-        4284983944,
-        4285180809,
-        4285443466,
-        4285705867,
-        4285968525,
-        4286165390,
-        4286427791,
-        4286624913,
-        4286887314,
-        4287149716,
-        4287346837,
-        4287543703,
-        4287806105,
-        4288003226,
-        4288265628,
-        4288462750,
-        4288659616,
-        4288856482,
-        4289119140,
-        4289316006,
-        4289513128,
-        4289709994,
-        4289907116,
-        4290103983,
-        4290301105,
-        4290497971,
-        4290695094,
-        4290891960,
-        4291089083,
-        4291285949,
-        4291483072,
-        4291679938,
-        4291877061,
-        4292074183,
-        4292271050,
-        4292468173,
-        4292665295,
-        4292796626,
-        4292993749,
-        4293190872,
-        4293387739,
-        4293584861,
-        4293716448,
-        4293913571,
-        4294110694,
-        4294307561,
-        4294439148,
-        4294636271,
-        4294833394,
-        4294833908,
-        4294767601,
-        4294701549,
-        4294569706,
-        4294503655,
-        4294437347,
-        4294371296,
-        4294304989,
-        4294238937,
-        4294172630,
-        4294106579,
-        4294040271,
-        4293974220,
-        4293907913,
-        4293841861,
-        4293841346,
-        4293775039,
-        4293708988,
-        4293642680,
-        4293576629,
-        4293575858,
-        4293509807,
-        4293443500,
-        4293442985,
-        4293376678,
-        4293310627,
-        4293244320,
-        4293243805,
-        4293177498,
-        4293176983,
-        4293110676,
-        4293044626,
-        4293043855,
-        4292977804,
-        4292911498,
-        4292910983,
-        4292844677,
-        4292778626,
-        4292777856,
-        4292711806,
-        4292645500,
-        4292644985,
-        4292578679,
-        4292512630,
-        4292446324,
-        4292445810,
-        4292379504,
-        4292313455,
-        4292247149,
-        4292181100,
-        4292114795,
-        4292048745,
-        4291982440,
-        4291916391,
-        4291850086,
-        4291784037,
-        4291717989,
-        4291586148,
-        4291520099,
-        4291454051,
-        4291322210,
-        4291256162,
-        4291190113,
-        4291058529,
-        4290992481,
-        4290860640,
-        4290794592,
-        4290663008,
-        4290531424,
-        4290465376,
-        4290333792,
-        4290202207,
-        4290136159,
-        4290004575,
-        4289872991,
-        4289741407,
-        4289609823,
-        4289543775,
-        4289412192,
-        4289280608,
-        4289149280,
-        4289017696,
-        4288886112,
-        4288754528,
-        4288623200,
-        4288491616,
-        4288360032,
-        4288163168,
-        4288031584,
-        4287900000,
-        4287768672,
-        4287637088,
-        4287440224,
-        4287308640,
-        4287177312,
-        4286980447,
-        4286848863,
-        4286717535,
-        4286520671,
-        4286389342,
-        4286192478,
-        4286061149,
-        4285864285,
-        4285732956,
-        4285536092,
-        4285405019,
-        4285208154,
-        4285077081,
-        4284880216,
-        4284683607,
-        4284552277,
-        4284355668,
-        4284158803,
-        4284027729,
-        4283831120,
-        4283634254,
-        4283503180,
-        4283306570,
-        4283175241,
-        4282978631,
-        4282782021,
-        4282650691,
-        4282454081,
-        4282322751,
-        4282126140,
-        4281994810,
-        4281798200,
-        4281666870,
-    ],
-    "grey": [
-        4278190080,
-        4278255873,
-        4278321666,
-        4278387459,
-        4278453252,
-        4278519045,
-        4278584838,
-        4278650631,
-        4278716424,
-        4278782217,
-        4278848010,
-        4278913803,
-        4278979596,
-        4279045389,
-        4279111182,
-        4279176975,
-        4279242768,
-        4279308561,
-        4279374354,
-        4279440147,
-        4279505940,
-        4279571733,
-        4279637526,
-        4279703319,
-        4279769112,
-        4279834905,
-        4279900698,
-        4279966491,
-        4280032284,
-        4280098077,
-        4280163870,
-        4280229663,
-        4280295456,
-        4280295456,
-        4280427042,
-        4280492835,
-        4280558628,
-        4280558628,
-        4280690214,
-        4280756007,
-        4280821800,
-        4280821800,
-        4280953386,
-        4281019179,
-        4281084972,
-        4281084972,
-        4281216558,
-        4281282351,
-        4281348144,
-        4281348144,
-        4281479730,
-        4281545523,
-        4281611316,
-        4281611316,
-        4281742902,
-        4281808695,
-        4281874488,
-        4281874488,
-        4282006074,
-        4282071867,
-        4282137660,
-        4282137660,
-        4282269246,
-        4282335039,
-        4282400832,
-        4282466625,
-        4282466625,
-        4282598211,
-        4282664004,
-        4282729797,
-        4282795590,
-        4282861383,
-        4282927176,
-        4282992969,
-        4282992969,
-        4283124555,
-        4283190348,
-        4283256141,
-        4283321934,
-        4283387727,
-        4283453520,
-        4283519313,
-        4283519313,
-        4283650899,
-        4283716692,
-        4283782485,
-        4283848278,
-        4283914071,
-        4283979864,
-        4284045657,
-        4284045657,
-        4284177243,
-        4284243036,
-        4284308829,
-        4284374622,
-        4284440415,
-        4284506208,
-        4284572001,
-        4284572001,
-        4284703587,
-        4284769380,
-        4284835173,
-        4284900966,
-        4284966759,
-        4285032552,
-        4285098345,
-        4285098345,
-        4285229931,
-        4285295724,
-        4285361517,
-        4285427310,
-        4285493103,
-        4285558896,
-        4285624689,
-        4285624689,
-        4285756275,
-        4285822068,
-        4285887861,
-        4285953654,
-        4286019447,
-        4286085240,
-        4286151033,
-        4286151033,
-        4286282619,
-        4286348412,
-        4286414205,
-        4286479998,
-        4286545791,
-        4286611584,
-        4286677377,
-        4286743170,
-        4286808963,
-        4286808963,
-        4286940549,
-        4287006342,
-        4287072135,
-        4287137928,
-        4287203721,
-        4287269514,
-        4287335307,
-        4287401100,
-        4287466893,
-        4287532686,
-        4287598479,
-        4287664272,
-        4287730065,
-        4287795858,
-        4287861651,
-        4287861651,
-        4287993237,
-        4288059030,
-        4288124823,
-        4288190616,
-        4288256409,
-        4288322202,
-        4288387995,
-        4288453788,
-        4288519581,
-        4288585374,
-        4288651167,
-        4288716960,
-        4288782753,
-        4288848546,
-        4288914339,
-        4288914339,
-        4289045925,
-        4289111718,
-        4289177511,
-        4289243304,
-        4289309097,
-        4289374890,
-        4289440683,
-        4289506476,
-        4289572269,
-        4289638062,
-        4289703855,
-        4289769648,
-        4289835441,
-        4289901234,
-        4289967027,
-        4289967027,
-        4290098613,
-        4290164406,
-        4290230199,
-        4290295992,
-        4290361785,
-        4290427578,
-        4290493371,
-        4290559164,
-        4290624957,
-        4290690750,
-        4290756543,
-        4290822336,
-        4290888129,
-        4290953922,
-        4291019715,
-        4291019715,
-        4291151301,
-        4291217094,
-        4291282887,
-        4291348680,
-        4291414473,
-        4291480266,
-        4291546059,
-        4291611852,
-        4291677645,
-        4291743438,
-        4291809231,
-        4291875024,
-        4291940817,
-        4292006610,
-        4292072403,
-        4292072403,
-        4292203989,
-        4292269782,
-        4292335575,
-        4292401368,
-        4292467161,
-        4292532954,
-        4292598747,
-        4292664540,
-        4292730333,
-        4292796126,
-        4292861919,
-        4292927712,
-        4292993505,
-        4293059298,
-        4293125091,
-        4293125091,
-        4293256677,
-        4293322470,
-        4293388263,
-        4293454056,
-        4293519849,
-        4293585642,
-        4293651435,
-        4293717228,
-        4293783021,
-        4293848814,
-        4293914607,
-        4293980400,
-        4294046193,
-        4294111986,
-        4294177779,
-        4294177779,
-        4294309365,
-        4294375158,
-        4294440951,
-        4294506744,
-        4294572537,
-        4294638330,
-        4294704123,
-        4294769916,
-        4294835709,
-        4294901502,
-        4294967295,
-    ],
-    "inferno": [
-        4278190083,
-        4278190084,
-        4278190086,
-        4278255623,
-        4278255881,
-        4278255883,
-        4278321422,
-        4278321680,
-        4278387218,
-        4278453012,
-        4278453014,
-        4278518808,
-        4278584347,
-        4278650141,
-        4278715935,
-        4278781473,
-        4278847267,
-        4278912806,
-        4279044136,
-        4279109674,
-        4279175469,
-        4279241007,
-        4279372338,
-        4279437876,
-        4279503670,
-        4279634745,
-        4279700283,
-        4279831358,
-        4279896896,
-        4280028227,
-        4280093765,
-        4280224839,
-        4280290378,
-        4280421196,
-        4280552270,
-        4280683344,
-        4280748882,
-        4280879956,
-        4281010774,
-        4281141848,
-        4281207386,
-        4281338460,
-        4281469277,
-        4281600351,
-        4281665888,
-        4281796961,
-        4281928034,
-        4282059108,
-        4282124645,
-        4282255718,
-        4282386790,
-        4282452327,
-        4282583656,
-        4282714729,
-        4282780265,
-        4282911594,
-        4283042666,
-        4283108459,
-        4283239531,
-        4283370860,
-        4283436396,
-        4283567724,
-        4283633261,
-        4283764589,
-        4283895661,
-        4283961453,
-        4284092781,
-        4284158318,
-        4284289646,
-        4284420718,
-        4284486510,
-        4284617838,
-        4284683374,
-        4284814702,
-        4284880238,
-        4285011566,
-        4285142894,
-        4285208430,
-        4285339758,
-        4285405294,
-        4285536622,
-        4285667693,
-        4285733485,
-        4285864813,
-        4285930349,
-        4286061677,
-        4286192749,
-        4286258540,
-        4286389612,
-        4286455404,
-        4286586731,
-        4286652267,
-        4286783595,
-        4286914666,
-        4286980458,
-        4287111530,
-        4287177321,
-        4287308393,
-        4287439721,
-        4287505512,
-        4287636584,
-        4287702375,
-        4287833447,
-        4287964774,
-        4288030310,
-        4288161637,
-        4288227428,
-        4288358500,
-        4288424291,
-        4288555363,
-        4288686690,
-        4288752481,
-        4288883553,
-        4288949344,
-        4289080415,
-        4289146207,
-        4289277534,
-        4289408605,
-        4289474396,
-        4289605723,
-        4289671515,
-        4289802586,
-        4289868377,
-        4289999704,
-        4290065239,
-        4290196566,
-        4290262358,
-        4290393685,
-        4290459476,
-        4290590547,
-        4290656338,
-        4290722129,
-        4290853456,
-        4290919247,
-        4291050574,
-        4291116365,
-        4291247692,
-        4291313227,
-        4291379018,
-        4291510345,
-        4291576136,
-        4291641927,
-        4291773510,
-        4291839300,
-        4291905091,
-        4291970882,
-        4292102209,
-        4292168000,
-        4292233791,
-        4292299582,
-        4292431165,
-        4292496955,
-        4292562746,
-        4292628537,
-        4292694584,
-        4292760375,
-        4292826166,
-        4292892212,
-        4293023539,
-        4293089330,
-        4293155377,
-        4293221168,
-        4293286958,
-        4293287469,
-        4293353260,
-        4293419307,
-        4293485098,
-        4293551144,
-        4293616935,
-        4293682982,
-        4293748773,
-        4293749283,
-        4293815330,
-        4293881121,
-        4293947167,
-        4293947422,
-        4294013469,
-        4294079516,
-        4294079770,
-        4294145817,
-        4294146328,
-        4294212118,
-        4294278165,
-        4294278676,
-        4294344722,
-        4294344977,
-        4294411024,
-        4294411534,
-        4294477581,
-        4294477836,
-        4294478347,
-        4294544393,
-        4294544904,
-        4294545416,
-        4294611207,
-        4294611718,
-        4294612230,
-        4294612742,
-        4294678790,
-        4294679302,
-        4294679814,
-        4294680071,
-        4294680583,
-        4294681096,
-        4294681610,
-        4294682123,
-        4294682637,
-        4294683150,
-        4294683664,
-        4294684178,
-        4294684692,
-        4294684950,
-        4294685464,
-        4294685978,
-        4294686492,
-        4294687006,
-        4294621985,
-        4294622499,
-        4294623013,
-        4294623528,
-        4294558506,
-        4294559020,
-        4294559535,
-        4294494513,
-        4294495028,
-        4294495543,
-        4294430522,
-        4294431036,
-        4294366015,
-        4294366530,
-        4294301509,
-        4294302024,
-        4294237003,
-        4294237263,
-        4294172242,
-        4294172758,
-        4294173273,
-        4294108253,
-        4294108768,
-        4294043748,
-        4294044008,
-        4294044524,
-        4294045040,
-        4294045300,
-        4294045817,
-        4294046333,
-        4294112129,
-        4294112389,
-        4294178441,
-        4294244237,
-        4294310033,
-        4294376085,
-        4294441881,
-        4294573213,
-        4294639008,
-        4294770340,
-    ],
-    "magma": [
-        4278190083,
-        4278190084,
-        4278190086,
-        4278255623,
-        4278255881,
-        4278255883,
-        4278321677,
-        4278321679,
-        4278387473,
-        4278453011,
-        4278453269,
-        4278518807,
-        4278584601,
-        4278650139,
-        4278715933,
-        4278781727,
-        4278847266,
-        4278913060,
-        4278978854,
-        4279044648,
-        4279110186,
-        4279175980,
-        4279241775,
-        4279307313,
-        4279373107,
-        4279504181,
-        4279569976,
-        4279635514,
-        4279701308,
-        4279766847,
-        4279898177,
-        4279963716,
-        4280029254,
-        4280160329,
-        4280226123,
-        4280291661,
-        4280422736,
-        4280488274,
-        4280619349,
-        4280684887,
-        4280815961,
-        4280947036,
-        4281012574,
-        4281143392,
-        4281274466,
-        4281340005,
-        4281471079,
-        4281602152,
-        4281667434,
-        4281798508,
-        4281929582,
-        4282060655,
-        4282126193,
-        4282257266,
-        4282388339,
-        4282519412,
-        4282584949,
-        4282716022,
-        4282847095,
-        4282912888,
-        4283043961,
-        4283109497,
-        4283240826,
-        4283371899,
-        4283437691,
-        4283568764,
-        4283634556,
-        4283765629,
-        4283896957,
-        4283962750,
-        4284093822,
-        4284159614,
-        4284290942,
-        4284356479,
-        4284487807,
-        4284553343,
-        4284684671,
-        4284816000,
-        4284881536,
-        4285012864,
-        4285078656,
-        4285209728,
-        4285275520,
-        4285406849,
-        4285472385,
-        4285603713,
-        4285734785,
-        4285800577,
-        4285931905,
-        4285997441,
-        4286128769,
-        4286194305,
-        4286325633,
-        4286456961,
-        4286522497,
-        4286653825,
-        4286719361,
-        4286850689,
-        4286916225,
-        4287047553,
-        4287178881,
-        4287244417,
-        4287375744,
-        4287441280,
-        4287572608,
-        4287703680,
-        4287769472,
-        4287900544,
-        4287966336,
-        4288097407,
-        4288228735,
-        4288294271,
-        4288425599,
-        4288556670,
-        4288622462,
-        4288753534,
-        4288884862,
-        4288950397,
-        4289081725,
-        4289147261,
-        4289278588,
-        4289409916,
-        4289475451,
-        4289606779,
-        4289737851,
-        4289803642,
-        4289934714,
-        4290066041,
-        4290131577,
-        4290262904,
-        4290328440,
-        4290459767,
-        4290591095,
-        4290656630,
-        4290787957,
-        4290919029,
-        4290984820,
-        4291116148,
-        4291181683,
-        4291313010,
-        4291444338,
-        4291509873,
-        4291641200,
-        4291706992,
-        4291838319,
-        4291904110,
-        4292035181,
-        4292100973,
-        4292232300,
-        4292298091,
-        4292429418,
-        4292495209,
-        4292626537,
-        4292692328,
-        4292758119,
-        4292889446,
-        4292955238,
-        4293021029,
-        4293152356,
-        4293218403,
-        4293284194,
-        4293349986,
-        4293416033,
-        4293547360,
-        4293613152,
-        4293679199,
-        4293744991,
-        4293811038,
-        4293811549,
-        4293877341,
-        4293943389,
-        4294009180,
-        4294075228,
-        4294141276,
-        4294141787,
-        4294207579,
-        4294273627,
-        4294274139,
-        4294340187,
-        4294340699,
-        4294406491,
-        4294407004,
-        4294473052,
-        4294473564,
-        4294539612,
-        4294540125,
-        4294540637,
-        4294606686,
-        4294606942,
-        4294607455,
-        4294673504,
-        4294674016,
-        4294674529,
-        4294675042,
-        4294741091,
-        4294741603,
-        4294742116,
-        4294742629,
-        4294742886,
-        4294808935,
-        4294809448,
-        4294809961,
-        4294810474,
-        4294810987,
-        4294811500,
-        4294812014,
-        4294812271,
-        4294812784,
-        4294878833,
-        4294879347,
-        4294879860,
-        4294880373,
-        4294880886,
-        4294881144,
-        4294881657,
-        4294882171,
-        4294882684,
-        4294883197,
-        4294883711,
-        4294884224,
-        4294884482,
-        4294884995,
-        4294885509,
-        4294886022,
-        4294886536,
-        4294887049,
-        4294887307,
-        4294887821,
-        4294888334,
-        4294823312,
-        4294823826,
-        4294824339,
-        4294824597,
-        4294825111,
-        4294825624,
-        4294826138,
-        4294826652,
-        4294827165,
-        4294827423,
-        4294827937,
-        4294828451,
-        4294763429,
-        4294763942,
-        4294764200,
-        4294764714,
-        4294765228,
-        4294765742,
-        4294766256,
-        4294766769,
-        4294767027,
-        4294767541,
-        4294768055,
-        4294703033,
-        4294703547,
-        4294703805,
-        4294704319,
-    ],
-    "plasma": [
-        4278978438,
-        4279240583,
-        4279436937,
-        4279568010,
-        4279764619,
-        4279961228,
-        4280092301,
-        4280223118,
-        4280354191,
-        4280485264,
-        4280616337,
-        4280747410,
-        4280878483,
-        4281009556,
-        4281140372,
-        4281271445,
-        4281402518,
-        4281533591,
-        4281599128,
-        4281730200,
-        4281861273,
-        4281992346,
-        4282057626,
-        4282188699,
-        4282319772,
-        4282385308,
-        4282516381,
-        4282647454,
-        4282712990,
-        4282843807,
-        4282974879,
-        4283040416,
-        4283171489,
-        4283302561,
-        4283368098,
-        4283498914,
-        4283564451,
-        4283695523,
-        4283826595,
-        4283892132,
-        4284023204,
-        4284088485,
-        4284219557,
-        4284350629,
-        4284416166,
-        4284547238,
-        4284612774,
-        4284743847,
-        4284809383,
-        4284940455,
-        4285005991,
-        4285137063,
-        4285268136,
-        4285333672,
-        4285464744,
-        4285530280,
-        4285661352,
-        4285726888,
-        4285857960,
-        4285923752,
-        4286054824,
-        4286120360,
-        4286251688,
-        4286317223,
-        4286448551,
-        4286514087,
-        4286645415,
-        4286710951,
-        4286842278,
-        4286908070,
-        4286973862,
-        4287104933,
-        4287170725,
-        4287302052,
-        4287367844,
-        4287499428,
-        4287565219,
-        4287631011,
-        4287762338,
-        4287828129,
-        4287959457,
-        4288025248,
-        4288091040,
-        4288222367,
-        4288288158,
-        4288354206,
-        4288485533,
-        4288551324,
-        4288617115,
-        4288682907,
-        4288814234,
-        4288880025,
-        4288945816,
-        4289011607,
-        4289143191,
-        4289208982,
-        4289274773,
-        4289340564,
-        4289471891,
-        4289537682,
-        4289603473,
-        4289669264,
-        4289735311,
-        4289801103,
-        4289866894,
-        4289998221,
-        4290064012,
-        4290129803,
-        4290195594,
-        4290261641,
-        4290327432,
-        4290393223,
-        4290459014,
-        4290524805,
-        4290590596,
-        4290656387,
-        4290722178,
-        4290788225,
-        4290854016,
-        4290919808,
-        4290985599,
-        4291051390,
-        4291117181,
-        4291182972,
-        4291248763,
-        4291314810,
-        4291380601,
-        4291446392,
-        4291512183,
-        4291577974,
-        4291643765,
-        4291709557,
-        4291775348,
-        4291841395,
-        4291907186,
-        4291907441,
-        4291973232,
-        4292039023,
-        4292104814,
-        4292170605,
-        4292236653,
-        4292302444,
-        4292302699,
-        4292368490,
-        4292434281,
-        4292500072,
-        4292565863,
-        4292631910,
-        4292632166,
-        4292697957,
-        4292763748,
-        4292829539,
-        4292829794,
-        4292895841,
-        4292961632,
-        4293027424,
-        4293093215,
-        4293093470,
-        4293159517,
-        4293225308,
-        4293225563,
-        4293291354,
-        4293357146,
-        4293423193,
-        4293423448,
-        4293489239,
-        4293555030,
-        4293555285,
-        4293621332,
-        4293687124,
-        4293687379,
-        4293753170,
-        4293753681,
-        4293819472,
-        4293885263,
-        4293885518,
-        4293951565,
-        4293951821,
-        4294017612,
-        4294083659,
-        4294083914,
-        4294149705,
-        4294149960,
-        4294216007,
-        4294216263,
-        4294282054,
-        4294282565,
-        4294348356,
-        4294348611,
-        4294349122,
-        4294414913,
-        4294415169,
-        4294481216,
-        4294481471,
-        4294481982,
-        4294547773,
-        4294548028,
-        4294614075,
-        4294614330,
-        4294614842,
-        4294615097,
-        4294681144,
-        4294681399,
-        4294681654,
-        4294747701,
-        4294747957,
-        4294748468,
-        4294748723,
-        4294749234,
-        4294749489,
-        4294815537,
-        4294815792,
-        4294816303,
-        4294816558,
-        4294817069,
-        4294817325,
-        4294817836,
-        4294818091,
-        4294818603,
-        4294818858,
-        4294819369,
-        4294819881,
-        4294820136,
-        4294820648,
-        4294820903,
-        4294821414,
-        4294756134,
-        4294756646,
-        4294757157,
-        4294757413,
-        4294757925,
-        4294692900,
-        4294693156,
-        4294693668,
-        4294628644,
-        4294628900,
-        4294629412,
-        4294564132,
-        4294564644,
-        4294499620,
-        4294500132,
-        4294434852,
-        4294435365,
-        4294370341,
-        4294370597,
-        4294305574,
-        4294306086,
-        4294240806,
-        4294175782,
-        4294176294,
-        4294111270,
-        4294111526,
-        4294046502,
-        4293981477,
-        4293981731,
-        4293916705,
-    ],
-    "turbo": [
-        4281340475,
-        4281406786,
-        4281473098,
-        4281604945,
-        4281671256,
-        4281737567,
-        4281803621,
-        4281869932,
-        4281936242,
-        4282002553,
-        4282068863,
-        4282135173,
-        4282135947,
-        4282202001,
-        4282268310,
-        4282334620,
-        4282400929,
-        4282401702,
-        4282467755,
-        4282468528,
-        4282534837,
-        4282601146,
-        4282601662,
-        4282602434,
-        4282668743,
-        4282669259,
-        4282735566,
-        4282736338,
-        4282736854,
-        4282737625,
-        4282803933,
-        4282804448,
-        4282805219,
-        4282805734,
-        4282806504,
-        4282807275,
-        4282807789,
-        4282808560,
-        4282809074,
-        4282809844,
-        4282810358,
-        4282811128,
-        4282746105,
-        4282746875,
-        4282747388,
-        4282682621,
-        4282617597,
-        4282552830,
-        4282487806,
-        4282423038,
-        4282358014,
-        4282293246,
-        4282162685,
-        4282097916,
-        4281967356,
-        4281902587,
-        4281772281,
-        4281641720,
-        4281576694,
-        4281446389,
-        4281315827,
-        4281185521,
-        4281054959,
-        4280990189,
-        4280859627,
-        4280729065,
-        4280664294,
-        4280533732,
-        4280403169,
-        4280338143,
-        4280207836,
-        4280142810,
-        4280077783,
-        4280012756,
-        4279947730,
-        4279882703,
-        4279817676,
-        4279818186,
-        4279753159,
-        4279753412,
-        4279753922,
-        4279754431,
-        4279820477,
-        4279820730,
-        4279886776,
-        4279952566,
-        4280018356,
-        4280149937,
-        4280215727,
-        4280347052,
-        4280478633,
-        4280609958,
-        4280806819,
-        4280938144,
-        4281135005,
-        4281331866,
-        4281528727,
-        4281725844,
-        4281922705,
-        4282119309,
-        4282381706,
-        4282578567,
-        4282840963,
-        4283103360,
-        4283300220,
-        4283562361,
-        4283824758,
-        4284087154,
-        4284349295,
-        4284611692,
-        4284873832,
-        4285136229,
-        4285398370,
-        4285660511,
-        4285857372,
-        4286119513,
-        4286381654,
-        4286643795,
-        4286905936,
-        4287102541,
-        4287364683,
-        4287561288,
-        4287823430,
-        4288020036,
-        4288216642,
-        4288412992,
-        4288609598,
-        4288805949,
-        4289002555,
-        4289133370,
-        4289329977,
-        4289526327,
-        4289657143,
-        4289853494,
-        4289984565,
-        4290180917,
-        4290377012,
-        4290507828,
-        4290704180,
-        4290834995,
-        4291031347,
-        4291161907,
-        4291358259,
-        4291489075,
-        4291685172,
-        4291815988,
-        4291946548,
-        4292142901,
-        4292273461,
-        4292404021,
-        4292534838,
-        4292730934,
-        4292861494,
-        4292992055,
-        4293122615,
-        4293253176,
-        4293383992,
-        4293449016,
-        4293579577,
-        4293710137,
-        4293775161,
-        4293905721,
-        4293970746,
-        4294101050,
-        4294166074,
-        4294231098,
-        4294361658,
-        4294426681,
-        4294491705,
-        4294556729,
-        4294556216,
-        4294620983,
-        4294686007,
-        4294685494,
-        4294750261,
-        4294749748,
-        4294814515,
-        4294814002,
-        4294813233,
-        4294812464,
-        4294877487,
-        4294876718,
-        4294875949,
-        4294875180,
-        4294808875,
-        4294808105,
-        4294807336,
-        4294806567,
-        4294740262,
-        4294739492,
-        4294673187,
-        4294672418,
-        4294606112,
-        4294605343,
-        4294539038,
-        4294472732,
-        4294406427,
-        4294405658,
-        4294339352,
-        4294273047,
-        4294206742,
-        4294140693,
-        4294074388,
-        4294008083,
-        4293876241,
-        4293810192,
-        4293743887,
-        4293677582,
-        4293545997,
-        4293479693,
-        4293413644,
-        4293282059,
-        4293215754,
-        4293084170,
-        4293018121,
-        4292886536,
-        4292754952,
-        4292688903,
-        4292557319,
-        4292425734,
-        4292294150,
-        4292228101,
-        4292096517,
-        4291964933,
-        4291833604,
-        4291702020,
-        4291504899,
-        4291373315,
-        4291241987,
-        4291110402,
-        4290978818,
-        4290781954,
-        4290650370,
-        4290453249,
-        4290321921,
-        4290124801,
-        4289993473,
-        4289796353,
-        4289599489,
-        4289467905,
-        4289271041,
-        4289074177,
-        4288877057,
-        4288680193,
-        4288483329,
-        4288286209,
-        4288089345,
-        4287892481,
-        4287695617,
-        4287498753,
-        4287301889,
-        4287039489,
-        4286842625,
-        4286645762,
-        4286383362,
-        4286186498,
-    ],
-    "viridis": [
-        4282646868,
-        4282647125,
-        4282647383,
-        4282713432,
-        4282713690,
-        4282714203,
-        4282779996,
-        4282780510,
-        4282780767,
-        4282781281,
-        4282847074,
-        4282847587,
-        4282847845,
-        4282848358,
-        4282848615,
-        4282848873,
-        4282849386,
-        4282915179,
-        4282915436,
-        4282915950,
-        4282916207,
-        4282916464,
-        4282916977,
-        4282917234,
-        4282917491,
-        4282917748,
-        4282852725,
-        4282852982,
-        4282853239,
-        4282853496,
-        4282854009,
-        4282854266,
-        4282854523,
-        4282789244,
-        4282789756,
-        4282790013,
-        4282790270,
-        4282724991,
-        4282725503,
-        4282725760,
-        4282726017,
-        4282660737,
-        4282661250,
-        4282595971,
-        4282596227,
-        4282596484,
-        4282531204,
-        4282531461,
-        4282531973,
-        4282466694,
-        4282466950,
-        4282401671,
-        4282401927,
-        4282336647,
-        4282337160,
-        4282271880,
-        4282272137,
-        4282206857,
-        4282207113,
-        4282207369,
-        4282142090,
-        4282142346,
-        4282077322,
-        4282077578,
-        4282012299,
-        4282012555,
-        4281947275,
-        4281947531,
-        4281882251,
-        4281882508,
-        4281817228,
-        4281817484,
-        4281752204,
-        4281752460,
-        4281687180,
-        4281687436,
-        4281622157,
-        4281622413,
-        4281557133,
-        4281557389,
-        4281492109,
-        4281492365,
-        4281427085,
-        4281427341,
-        4281427597,
-        4281362317,
-        4281362573,
-        4281297293,
-        4281297549,
-        4281232270,
-        4281232526,
-        4281232782,
-        4281167502,
-        4281167758,
-        4281102478,
-        4281102734,
-        4281102990,
-        4281037710,
-        4281037966,
-        4280972686,
-        4280972942,
-        4280973198,
-        4280907918,
-        4280908174,
-        4280842894,
-        4280842894,
-        4280843150,
-        4280777870,
-        4280778126,
-        4280778382,
-        4280713102,
-        4280713358,
-        4280713614,
-        4280648334,
-        4280648589,
-        4280583309,
-        4280583565,
-        4280583821,
-        4280518541,
-        4280518797,
-        4280519053,
-        4280453517,
-        4280453773,
-        4280454029,
-        4280388749,
-        4280389004,
-        4280389260,
-        4280323980,
-        4280324236,
-        4280324492,
-        4280259212,
-        4280259467,
-        4280259723,
-        4280259979,
-        4280260235,
-        4280194954,
-        4280195210,
-        4280195466,
-        4280195466,
-        4280195721,
-        4280195977,
-        4280196233,
-        4280196488,
-        4280196744,
-        4280197000,
-        4280197255,
-        4280263047,
-        4280263302,
-        4280263558,
-        4280329349,
-        4280329605,
-        4280395397,
-        4280395652,
-        4280461188,
-        4280526979,
-        4280527234,
-        4280593026,
-        4280658817,
-        4280724609,
-        4280790400,
-        4280856191,
-        4280921983,
-        4280987774,
-        4281053565,
-        4281119101,
-        4281250428,
-        4281316219,
-        4281382010,
-        4281513338,
-        4281579129,
-        4281710456,
-        4281776247,
-        4281907574,
-        4281973110,
-        4282104437,
-        4282235764,
-        4282301555,
-        4282432882,
-        4282564209,
-        4282695280,
-        4282761071,
-        4282892398,
-        4283023725,
-        4283155052,
-        4283286123,
-        4283417449,
-        4283548776,
-        4283680103,
-        4283811430,
-        4283942501,
-        4284073828,
-        4284205154,
-        4284402017,
-        4284533088,
-        4284664415,
-        4284795741,
-        4284992604,
-        4285123675,
-        4285255001,
-        4285386328,
-        4285582934,
-        4285714261,
-        4285845588,
-        4286042194,
-        4286173521,
-        4286370383,
-        4286501454,
-        4286698316,
-        4286829387,
-        4287026249,
-        4287157575,
-        4287354182,
-        4287485508,
-        4287682115,
-        4287813441,
-        4288010047,
-        4288141374,
-        4288337980,
-        4288534842,
-        4288665912,
-        4288862775,
-        4289059381,
-        4289190707,
-        4289387314,
-        4289584176,
-        4289715246,
-        4289912108,
-        4290108715,
-        4290239785,
-        4290436647,
-        4290633254,
-        4290764580,
-        4290961186,
-        4291157793,
-        4291289119,
-        4291485726,
-        4291682333,
-        4291813660,
-        4292010267,
-        4292141338,
-        4292338201,
-        4292534808,
-        4292665880,
-        4292862744,
-        4292993816,
-        4293190424,
-        4293387289,
-        4293518361,
-        4293714970,
-        4293846299,
-        4294042908,
-        4294173982,
-        4294370847,
-        4294501921,
-        4294632994,
-        4294829860,
-    ],
+_data = {
+    "balance": (
+        "QhwX/0UdGP9IHxn/SyAa/04hG/9RIxz/VSQd/1gmHv9bJx//Xigg/2EpIf9lKyL/aCwj/2stI/9v"
+        "LyT/cjAl/3YxJv95Myb/fTQn/4A1J/+ENyj/iDgo/4s5KP+POin/kjwp/5Y9Kf+aPyn/nkAo/6FB"
+        "KP+lQyf/qEQn/6xGJv+vSCT/skoj/7VLIf+4TR7/ulAc/7tSGP+8VBX/vVYS/71ZD/++Ww3/vl0L"
+        "/71fCv+9Ygn/vWQK/71mC/+8aAz/vGoO/7xsEP+7bhP/u3AV/7tyGP+7dBv/unUd/7p3IP+6eSP/"
+        "unsl/7p9KP+6fyv/uYAt/7mCMP+5hDP/uYY1/7mHOP+5iTv/uYs9/7mMQP+5jkL/uZBF/7mRSP+6"
+        "k0v/upVN/7qWUP+6mFP/uppW/7qbWf+6nVv/u55e/7ugYf+7omT/vKNo/7yla/+8pm7/vahx/72p"
+        "dP++q3f/vqx7/7+tfv+/r4H/wLCE/8Gyh//Bs4v/wrWO/8O2kf/EuJT/xbmX/8W6mv/GvJ3/x72g"
+        "/8i/o//JwKb/ysKp/8vDrP/Nxa//zsay/8/Itf/Qyrj/0cu7/9LNvv/UzsH/1dDE/9bSx//X08r/"
+        "2dXM/9rWz//b2NL/3drV/97c2P/f3dv/4d/d/+Lh4P/k4+P/5eTm/+fm6P/o6Ov/6uru/+vs8P/r"
+        "7PD/6Onv/+bn7v/j5e3/4OLs/93g6//a3ur/19vp/9XZ6P/S1uf/z9Tn/8zS5v/Jz+X/xs3k/8PL"
+        "4//AyOP/vsbi/7vE4f+4weD/tb/f/7K93/+vut7/rLjd/6m23f+ms9z/o7Hb/6Gv2v+erdr/m6rZ"
+        "/5io2P+Vptj/kqPX/4+h1v+Mn9b/iZ3V/4ea1P+EmNT/gZbT/36U0v97kdL/eI/R/3aN0P9zitD/"
+        "cIjP/22Gzv9qhM3/aIHN/2V/zP9ifcv/X3rL/114yv9adsn/V3PI/1VxyP9Sb8f/T2zG/01qxf9K"
+        "aMX/SGXE/0Vjw/9DYML/QF7B/z5cwP88WcD/Ole//zdUvv81Ur3/M0+8/zFNu/8vSrr/LUi5/yxF"
+        "uP8qQrf/KUC2/yg9tf8nOrT/Jjiz/yU1sf8kMrD/JDCv/yQtrf8kK6z/JCiq/yQmqP8kI6f/JCGl"
+        "/yUfo/8lHaH/JRuf/yYZnf8mF5v/JxWZ/ycUlv8nEpT/KBGS/ygQj/8oD43/KQ+K/ykOiP8pDoX/"
+        "KQ6C/ykNgP8pDX3/KA56/ygOeP8nDnX/Jw5y/yYOcP8mDm3/JQ5q/yQOaP8jDmX/Ig5i/yEOYP8h"
+        "Dl3/IA5a/x4NWP8dDVX/HA1T/xsMUP8aDE3/GQxL/xgLSP8WC0b/FQpD/xQKQf8TCT7/EQk8/w=="
+    ),
+    "cividis": (
+        "TSIA/08jAP9QIwD/UiQA/1QlAP9VJgD/VyYA/1knAP9bKAD/XCgA/14pAP9gKgD/YioA/2QrAP9m"
+        "LAD/ZywA/2ktAP9rLgD/bS8A/28vAP9wMAD/cDAA/3AxAP9wMQD/cDIE/3AzCP9wMwv/cDQO/281"
+        "Ef9vNhT/bzYW/283GP9vOBr/bjgc/245Hf9uOh//bjsh/247Iv9uPCT/bT0l/209J/9tPij/bT8q"
+        "/20/K/9tQCz/bEEu/2xCL/9sQjD/bEMx/2xEMv9sRDT/bEU1/2xGNv9sRjf/bEc4/2xIOf9rSDr/"
+        "a0k7/2tKPf9rSz7/a0s//2tMQP9rTUH/a01C/2tOQ/9rT0T/a09F/2tQRv9rUUf/a1FI/2tSSf9r"
+        "U0r/bFRL/2xUTP9sVU3/bFZO/2xWTv9sV0//bFhQ/2xYUf9sWVL/bFpT/2xaVP9tW1X/bVxW/21d"
+        "V/9tXVj/bV5Z/21fWf9tX1r/bmBb/25hXP9uYV3/bmJe/25jX/9uZGD/b2Rh/29lYf9vZmL/b2Zj"
+        "/29nZP9waGX/cGlm/3BpZ/9wamj/cWto/3Fraf9xbGr/cW1r/3JtbP9ybm3/cm9u/3Nwbv9zcG//"
+        "c3Fw/3Nycf90c3L/dHNz/3V0dP91dXT/dXV1/3Z2dv92d3f/dnh4/3d4ef93eXn/d3p6/3d7e/94"
+        "e3z/eHx9/3h9fv94fX//eH6A/3h/gf94gIL/eICD/3iBhP94goX/eIOF/3iDhv94hIf/eIWI/3iG"
+        "if94hor/eIeL/3iIjP94iY3/eImO/3eKj/93i5D/d4yR/3eMkv93jZP/d46U/3ePlf93j5b/dpCX"
+        "/3aRmP92kpn/dpOa/3aTm/92lJz/dZWd/3WWnv91lp//dZeg/3SYof90maL/dJqj/3SapP9zm6X/"
+        "c5ym/3Odp/9znqj/cp6p/3Kfqv9yoKv/caGs/3Girf9xoq7/cKOv/3CksP9wpbH/b6ay/2+ms/9v"
+        "p7T/bqi1/26ptv9tqrf/bau4/22ruf9srLr/bK27/2uuvP9rr73/arC+/2qwv/9pscH/abLC/2iz"
+        "w/9otMT/Z7XF/2e1xv9mtsf/ZbfI/2W4yf9kucr/ZLrL/2O7zP9ivM3/YrzO/2G9z/9gvtD/YL/S"
+        "/1/A0/9ewdT/XsLV/13D1v9cw9f/W8TY/1rF2f9axtr/Wcfb/1jI3P9Xyd7/Vsrf/1XL4P9UzOH/"
+        "U8zi/1LN4/9RzuT/UM/l/0/Q5v9O0ej/TdLp/0zT6v9L1Ov/StXs/0jW7f9H1+7/Rtjv/0TZ8f9D"
+        "2vL/Qtrz/0Db9P8/3PX/Pd32/zve+P863/n/OOD6/zbh+/804v3/M+P9/zTl/f825v3/N+f9/w=="
+    ),
+    "cubehelix": (
+        "AAAA/wEAAf8DAQP/BAEF/wYCBv8IAgj/CQMJ/wsECv8NBAz/DwUN/xEGDv8TBhD/FQcR/xcIEv8Z"
+        "CRP/GwoU/x0KFP8fCxX/IQ0W/yMNFv8lDhf/JxAY/ykRGP8rEhn/LRMZ/y8UGf8wFRr/MhYa/zQY"
+        "Gv82GRr/OBoa/zkcGv87HRr/PB8a/z4gGv9AIhr/QSMa/0IlGv9DJhn/RSgZ/0YpGf9HKxj/SC0Y"
+        "/0kuGP9JMBf/SjIX/0s0F/9MNRb/TDcW/005Fv9NOhb/TjwV/04+Ff9OQBX/TkIV/05DFf9ORRX/"
+        "TkcU/05JFP9OShT/TUwU/01OFf9MUBX/TFEV/0tTFf9LVBb/SlYW/0lYFv9JWRf/SFsX/0dcGP9G"
+        "Xhn/RV8a/0RhG/9DYhz/Q2Md/0JlHv9BZh//QGcg/z5pIf89aiP/PGsk/ztsJv86bSf/Om4p/zlv"
+        "K/84cC3/N3Ev/zZxMf81cjP/NHM1/zN0N/8zdTn/MnU8/zF2Pv8xdkH/MHdD/zB3Rv8veEj/L3hL"
+        "/y94Tv8ueVH/LnlT/y55Vv8ueVn/Lnpc/y96X/8vemL/L3pl/zB6aP8wemv/MXpu/zJ6cf8zenX/"
+        "M3p4/zR6e/81en7/N3qB/zh6hP85eof/O3mK/zx5jf8+eZD/QHmT/0J5lv9DeZn/RXmb/0d5nv9K"
+        "eaH/THij/054pv9ReKn/U3ir/1Z4rv9YeLD/W3iz/154tf9geLf/Y3i5/2Z5u/9peb3/bHm//295"
+        "wf9yecL/dXrE/3h6xv98esf/f3vI/4J7yv+FfMv/iHzM/4x9zf+Pfc7/kn7P/5V+0P+Zf9H/nIDR"
+        "/5+B0v+igtP/poPT/6mE0/+shNT/r4XU/7KH1P+1iNT/uInU/7qK1P+9i9T/wI3U/8OO0//Fj9P/"
+        "yJHT/8qS0v/Nk9L/z5XS/9KW0f/UmND/1prQ/9ibz//anc//3J7O/96gzf/gos3/4aPM/+Oly//l"
+        "p8r/5qnK/+iryf/prMj/6q7I/+uwx//sssb/7bTG/+62xf/vt8X/77nE//C7xP/xvcP/8b/D//HB"
+        "wv/ywsL/8sTC//PGwf/zyMH/88nB//PLwf/zzcH/88/B//PQwf/z0sH/89TB//PVwv/y18L/8tjC"
+        "//Law//y28P/8d3E//HexP/x4MX/8OHG//Dix//w48f/8OXI/+/myf/v58r/7+jM/+/qzf/u687/"
+        "7uzQ/+7t0f/u7tL/7u/U/+7v1f/u8Nf/7vHZ/+7y2v/v89z/7/Te/+/03//v9eH/8Pbj//D35f/x"
+        "9+f/8fjo//L46v/z+ez/9Pru//X68P/2+/L/9/v0//j89v/5/Pf/+v35//z9+//9/v3//////w=="
+    ),
+    "curl": (
+        "Qx0U/0QfFf9FIRX/RiMW/0clFv9IJxf/SikX/0srGP9MLRj/TS8Y/04wGf9PMhn/UDQZ/1I2Gv9T"
+        "OBr/VDoa/1U8G/9WPRv/Vz8b/1lBG/9aQxv/W0Ub/1xGHP9dSBz/Xkoc/2BMHP9hThz/YlAb/2NR"
+        "G/9kUxv/ZVUb/2ZXG/9nWRr/aVsa/2pdGv9rXhn/bGAZ/21iGP9uZBf/b2YX/3BoFv9xahX/cmwV"
+        "/3JtFP9zbxP/dHET/3VzEv92dRH/d3cR/3d5EP94exD/eX0Q/3l+Ef96gBH/e4IS/3uEE/98hhX/"
+        "fIgX/32JGf99ixz/fo0f/36PIv9+kCX/f5Io/3+ULP9/lS//gJcz/4CZN/+Bmjv/gZw//4GdQ/+C"
+        "n0f/g6BL/4OiT/+Eo1P/haVX/4WmW/+Gp1//h6lj/4iqZ/+Jq2r/iq1u/4uucv+NsHb/jrF5/4+y"
+        "ff+RtID/krWE/5S2iP+VuIv/l7mO/5m6kv+avJX/nL2Z/56/nP+gwJ//osGi/6TDpv+mxKn/qMas"
+        "/6rHr/+sybL/r8q1/7HMuP+zzbv/ts++/7jQwf+70sT/vdPH/8DVyv/C1s3/xdjQ/8fa0//K29b/"
+        "zd3Z/8/f3P/S4N7/1eLh/9jk5P/b5ef/3efq/+Dp7P/j6+//5u3y/+nu9f/s8Pf/7/L6//L0/f/0"
+        "9v3/8fP8/+3x+//q7vn/5+z4/+Pp9//g5/b/3eT1/9ni9P/W3/P/093y/8/a8f/M2PD/ydXv/8XT"
+        "7v/C0e7/v87t/7zM7P+4yev/tcfq/7LE6v+vwun/rL/o/6m96P+muuf/o7jm/6C15f+ds+X/mrDk"
+        "/5eu5P+Uq+P/kqni/4+m4v+MpOH/iqHg/4ef4P+FnN//gpre/4CX3v9+ld3/fJLc/3mQ3P93jdv/"
+        "dova/3SI2f9yhtn/cIPY/2+B1/9tftb/bHzV/2t51P9pd9P/aHTS/2dy0f9mb9D/ZW3P/2Vrzv9k"
+        "aMz/Y2bL/2Nkyv9iYcj/Yl/H/2Fdxv9hW8T/YVnD/2BWwf9gVMD/YFK+/2BQvP9gTrv/YEy5/19K"
+        "t/9fSLb/X0a0/19Esv9fQrD/X0Cu/18+rf9gPKv/YDqp/2A5p/9gN6X/YDWj/2Azof9gMp//YDCd"
+        "/2Aum/9gLZj/YCuW/2AplP9gKJL/YCaQ/2Aljf9gI4v/YCKJ/18hhv9fH4T/Xx6C/18df/9eHH3/"
+        "Xht6/10aeP9dGXX/XBhz/1wXcP9bF27/WhZr/1kWaf9YFWb/VxVj/1UUYf9UFF7/UxNb/1ETWf9Q"
+        "E1b/ThJT/0wSUf9KEk7/SRFM/0cRSf9FEUb/QxBE/0EQQf8/Dz//PA88/zoOOv84Djf/Ng01/w=="
+    ),
+    "grey": (
+        "AAAA/wEBAf8CAgL/AwMD/wQEBP8FBQX/BgYG/wcHB/8ICAj/CQkJ/woKCv8LCwv/DAwM/w0NDf8O"
+        "Dg7/Dw8P/xAQEP8RERH/EhIS/xMTE/8UFBT/FRUV/xYWFv8XFxf/GBgY/xkZGf8aGhr/Gxsb/xwc"
+        "HP8dHR3/Hh4e/x8fH/8gICD/ICAg/yIiIv8jIyP/JCQk/yQkJP8mJib/Jycn/ygoKP8oKCj/Kioq"
+        "/ysrK/8sLCz/LCws/y4uLv8vLy//MDAw/zAwMP8yMjL/MzMz/zQ0NP80NDT/NjY2/zc3N/84ODj/"
+        "ODg4/zo6Ov87Ozv/PDw8/zw8PP8+Pj7/Pz8//0BAQP9BQUH/QUFB/0NDQ/9ERET/RUVF/0ZGRv9H"
+        "R0f/SEhI/0lJSf9JSUn/S0tL/0xMTP9NTU3/Tk5O/09PT/9QUFD/UVFR/1FRUf9TU1P/VFRU/1VV"
+        "Vf9WVlb/V1dX/1hYWP9ZWVn/WVlZ/1tbW/9cXFz/XV1d/15eXv9fX1//YGBg/2FhYf9hYWH/Y2Nj"
+        "/2RkZP9lZWX/ZmZm/2dnZ/9oaGj/aWlp/2lpaf9ra2v/bGxs/21tbf9ubm7/b29v/3BwcP9xcXH/"
+        "cXFx/3Nzc/90dHT/dXV1/3Z2dv93d3f/eHh4/3l5ef95eXn/e3t7/3x8fP99fX3/fn5+/39/f/+A"
+        "gID/gYGB/4KCgv+Dg4P/g4OD/4WFhf+Ghob/h4eH/4iIiP+JiYn/ioqK/4uLi/+MjIz/jY2N/46O"
+        "jv+Pj4//kJCQ/5GRkf+SkpL/k5OT/5OTk/+VlZX/lpaW/5eXl/+YmJj/mZmZ/5qamv+bm5v/nJyc"
+        "/52dnf+enp7/n5+f/6CgoP+hoaH/oqKi/6Ojo/+jo6P/paWl/6ampv+np6f/qKio/6mpqf+qqqr/"
+        "q6ur/6ysrP+tra3/rq6u/6+vr/+wsLD/sbGx/7Kysv+zs7P/s7Oz/7W1tf+2trb/t7e3/7i4uP+5"
+        "ubn/urq6/7u7u/+8vLz/vb29/76+vv+/v7//wMDA/8HBwf/CwsL/w8PD/8PDw//FxcX/xsbG/8fH"
+        "x//IyMj/ycnJ/8rKyv/Ly8v/zMzM/83Nzf/Ozs7/z8/P/9DQ0P/R0dH/0tLS/9PT0//T09P/1dXV"
+        "/9bW1v/X19f/2NjY/9nZ2f/a2tr/29vb/9zc3P/d3d3/3t7e/9/f3//g4OD/4eHh/+Li4v/j4+P/"
+        "4+Pj/+Xl5f/m5ub/5+fn/+jo6P/p6en/6urq/+vr6//s7Oz/7e3t/+7u7v/v7+//8PDw//Hx8f/y"
+        "8vL/8/Pz//Pz8//19fX/9vb2//f39//4+Pj/+fn5//r6+v/7+/v//Pz8//39/f/+/v7//////w=="
+    ),
+    "inferno": (
+        "AwAA/wQAAP8GAAD/BwAB/wkBAf8LAQH/DgEC/xACAv8SAgP/FAME/xYDBP8YBAX/GwQG/x0FB/8f"
+        "Bgj/IQYJ/yMHCv8mBwv/KAgN/yoIDv8tCQ//LwkQ/zIKEv80ChP/NgsU/zkLFv87Cxf/PgsZ/0AL"
+        "Gv9DDBz/RQwd/0cMH/9KDCD/TAsi/04LJP9QCyb/Ugsn/1QLKf9WCiv/WAot/1oKLv9cCjD/XQky"
+        "/18JNP9gCTX/YQk3/2IJOf9kCTv/ZQk8/2YJPv9mCUD/ZwlB/2gKQ/9pCkX/aQpG/2oLSP9qC0r/"
+        "awxL/2sMTf9sDU//bA1Q/2wOUv9tDlP/bQ9V/20PV/9tEFj/bRFa/24RW/9uEl3/bhJf/24TYP9u"
+        "FGL/bhRj/24VZf9uFWb/bhZo/24Xav9uF2v/bhht/24Ybv9uGXD/bRly/20ac/9tG3X/bRt2/20c"
+        "eP9tHHr/bB17/2wdff9sHn7/ax+A/2sfgf9rIIP/aiCF/2ohhv9qIYj/aSKJ/2kii/9pI43/aCSO"
+        "/2gkkP9nJZH/ZyWT/2Ymlf9mJpb/ZSeY/2Qomf9kKJv/Yymc/2Mpnv9iKqD/YSuh/2Ero/9gLKT/"
+        "Xyym/18tp/9eLqn/XS6r/1wvrP9bMK7/WzGv/1oxsf9ZMrL/WDO0/1cztf9WNLf/VjW4/1U2uv9U"
+        "N7v/Uze9/1I4vv9ROb//UDrB/087wv9OPMT/TT3F/0w+x/9LPsj/Sj/J/0lAy/9IQcz/R0LN/0ZE"
+        "z/9ERdD/Q0bR/0JH0v9BSNT/QEnV/z9K1v8+S9f/PU3Z/ztO2v86T9v/OVDc/zhS3f83U97/NlTf"
+        "/zRW4P8zV+L/Mljj/zFa5P8wW+X/Llzm/y1e5v8sX+f/K2Ho/ypi6f8oZOr/J2Xr/yZn7P8laO3/"
+        "I2rt/yJs7v8hbe//H2/w/x5w8P8dcvH/HHTy/xp18v8Zd/P/GHnz/xZ69P8VfPX/FH71/xKA9v8R"
+        "gfb/EIP3/w6F9/8Nh/j/DIj4/wuK+P8JjPn/CI75/wiQ+f8Hkfr/BpP6/waV+v8Gl/r/Bpn7/wab"
+        "+/8Gnfv/B577/weg+/8Iovv/CqT7/wum+/8NqPv/Dqr7/xCs+/8Srvv/FLD7/xax+/8Ys/v/GrX7"
+        "/xy3+/8eufv/Ibv6/yO9+v8lv/r/KMH6/yrD+f8sxfn/L8f5/zHJ+P80y/j/N834/zrP9/880ff/"
+        "P9P2/0LV9v9F1/X/SNn1/0vb9P9P3PT/Ut7z/1bg8/9Z4vP/XeTy/2Dm8v9k6PH/aOnx/2zr8f9w"
+        "7fH/dO7x/3nw8f998vH/gfPy/4X08v+J9vP/jff0/5H49f+V+vb/mfv3/538+f+g/fr/pP78/w=="
+    ),
+    "magma": (
+        "AwAA/wQAAP8GAAD/BwAB/wkBAf8LAQH/DQIC/w8CAv8RAwP/EwME/xUEBP8XBAX/GQUG/xsFB/8d"
+        "Bgj/HwcJ/yIHCv8kCAv/JgkM/ygKDf8qCg7/LAsP/y8MEP8xDBH/Mw0S/zUNFP84DhX/Og4W/zwP"
+        "F/8/Dxj/QRAa/0QQG/9GEBz/SRAe/0sRH/9NESD/UBEi/1IRI/9VESX/VxEm/1kRKP9cESr/XhEr"
+        "/2AQLf9iEC//ZRAw/2cQMv9oEDT/ag81/2wPN/9uDzn/bw87/3EPPP9yDz7/cw9A/3QPQv91D0P/"
+        "dg9F/3cPR/94EEj/eRBK/3kQS/96EU3/exFP/3sSUP98ElL/fBNT/30TVf99FFf/fhVY/34VWv9+"
+        "Flv/fhdd/38XXv9/GGD/fxhh/38ZY/+AGmX/gBpm/4AbaP+AHGn/gBxr/4AdbP+BHm7/gR5v/4Ef"
+        "cf+BH3P/gSB0/4Ehdv+BIXf/gSJ5/4Eiev+BI3z/gSR+/4Ekf/+BJYH/gSWC/4EmhP+BJoX/gSeH"
+        "/4Eoif+BKIr/gCmM/4Apjf+AKo//gCqR/4Arkv+AK5T/gCyV/38sl/9/LZn/fy2a/38unP9+Lp7/"
+        "fi+f/34vof9+MKP/fTCk/30xpv99Maf/fDKp/3wzq/97M6z/ezSu/3s0sP96NbH/ejWz/3k2tf95"
+        "Nrb/eDe4/3g3uf93OLv/dzm9/3Y5vv91OsD/dTrC/3Q7w/90PMX/czzG/3I9yP9yPsr/cT7L/3A/"
+        "zf9wQM7/b0HQ/25C0f9tQtP/bUPU/2xE1v9rRdf/akbZ/2lH2v9pSNz/aEnd/2dK3v9mS+D/Zkzh"
+        "/2VN4v9kTuT/Y1Dl/2JR5v9iUuf/YVTo/2BV6v9gVuv/X1js/19Z7f9eW+7/XV3u/11e7/9dYPD/"
+        "XGHx/1xj8v9cZfP/W2fz/1to9P9bavX/W2z1/1tu9v9bcPb/W3H3/1xz9/9cdfj/XHf4/1x5+f9d"
+        "e/n/XX35/15/+v9egPr/X4L6/2CE+/9ghvv/YYj7/2KK+/9jjPz/Y478/2SQ/P9lkvz/ZpP8/2eV"
+        "/f9ol/3/aZn9/2qb/f9rnf3/bJ/9/26h/f9vov3/cKT9/3Gm/v9zqP7/dKr+/3Ws/v92rv7/eK/+"
+        "/3mx/v97s/7/fLX+/323/v9/uf7/gLv+/4K8/v+Dvv7/hcD+/4bC/v+IxP7/icb+/4vH/v+Nyf7/"
+        "jsv+/5DN/f+Sz/3/k9H9/5XS/f+X1P3/mNb9/5rY/f+c2v3/ndz9/5/d/f+h3/3/o+H9/6Xj/P+m"
+        "5fz/qOb8/6ro/P+s6vz/ruz8/7Du/P+x8Pz/s/H8/7Xz/P+39fz/uff7/7v5+/+9+vv/v/z7/w=="
+    ),
+    "plasma": (
+        "hgcM/4cHEP+JBhP/igYV/4sGGP+MBhv/jQYd/44FH/+PBSH/kAUj/5EFJf+SBSf/kwUp/5QFK/+U"
+        "BC3/lQQv/5YEMf+XBDP/mAQ0/5gENv+ZBDj/mgQ6/5oDO/+bAz3/nAM//5wDQP+dA0L/ngNE/54D"
+        "Rf+fAkf/nwJJ/6ACSv+hAkz/oQJO/6ICT/+iAVH/owFS/6MBVP+jAVb/pAFX/6QBWf+lAFr/pQBc"
+        "/6UAXv+mAF//pgBh/6YAYv+nAGT/pwBl/6cAZ/+nAGj/pwBq/6gAbP+oAG3/qABv/6gAcP+oAHL/"
+        "qABz/6gAdf+oAXb/qAF4/6gBef+oAnv/pwJ8/6cDfv+nA3//pwSB/6cEgv+mBYT/pgaF/6YHhv+l"
+        "B4j/pQiJ/6QJi/+kCoz/pAyO/6MNj/+jDpD/og+S/6EQk/+hEZX/oBKW/6ATl/+fFJn/nhWa/54X"
+        "m/+dGJ3/nBme/5san/+bG6D/mhyi/5kdo/+YHqT/lx+l/5chp/+WIqj/lSOp/5Qkqv+TJaz/kiat"
+        "/5Enrv+QKK//jyqw/48rsf+OLLL/jS20/4wutf+LL7b/ijC3/4kyuP+IM7n/hzS6/4Y1u/+FNrz/"
+        "hDe9/4M4vv+COb//gTvA/4A8wf+APcL/fz7D/34/xP99QMX/fEHG/3tCx/96RMj/eUXJ/3hGyv93"
+        "R8v/dkjM/3VJzf91Ss7/dEvP/3NN0P9yTtH/cU/R/3BQ0v9vUdP/blLU/21T1f9tVdb/bFbX/2tX"
+        "1/9qWNj/aVnZ/2ha2v9nW9v/Zl3c/2Ze3P9lX93/ZGDe/2Nh3/9iYt//YWTg/2Bl4f9gZuL/X2fj"
+        "/15o4/9dauT/XGvl/1ts5f9abeb/Wm7n/1lw6P9Ycej/V3Lp/1Zz6v9VdOr/VHbr/1R37P9TeOz/"
+        "Unnt/1F77f9QfO7/T33v/05+7/9NgPD/TYHw/0yC8f9LhPL/SoXy/0mG8/9Ih/P/R4n0/0eK9P9G"
+        "i/X/RY31/0SO9v9Dj/b/QpH2/0GS9/9Bk/f/QJX4/z+W+P8+mPj/PZn5/zya+f87nPr/Op36/zqf"
+        "+v85oPr/OKL7/zej+/82pPv/Nab8/zWn/P80qfz/M6r8/zKs/P8xrfz/Ma/9/zCw/f8vsv3/LrP9"
+        "/y21/f8ttv3/LLj9/yu5/f8ru/3/Krz9/ym+/f8pwP3/KMH9/yjD/f8nxP3/Jsb9/ybH/P8myfz/"
+        "Jcv8/yXM/P8lzvz/JND7/yTR+/8k0/v/JNX6/yTW+v8k2Pr/JNn5/yTb+f8k3fj/JN/4/yTg9/8l"
+        "4vf/JeT2/yXl9v8m5/X/Jun1/ybq9P8m7PP/Ju7z/ybw8v8m8fL/JvPx/yX18P8j9vD/Ifjv/w=="
+    ),
+    "turbo": (
+        "OxIw/0IVMf9KGDL/URs0/1geNf9fITb/ZSM3/2wmOP9yKTn/eSw6/38vO/+FMjz/izU8/5E3Pf+W"
+        "Oj7/nD0//6FAQP+mQ0D/q0VB/7BIQf+1S0L/uk5D/75QQ//CU0P/x1ZE/8tYRP/OW0X/0l5F/9Zg"
+        "Rf/ZY0X/3WZG/+BoRv/ja0b/5m1G/+hwRv/rc0b/7XVG//B4Rv/yekb/9H1G//Z/Rv/4gkb/+YRF"
+        "//uHRf/8iUX//YxE//2OQ//+kUL//pNB//6WQP/+mD///ps+//2dPP/8oDv//KI5//ulOP/5qDb/"
+        "+Ko0//asM//1rzH/87Ev//G0Lf/vtiv/7bkq/+u7KP/pvSb/5sAl/+TCI//hxCH/38Yg/9zJHv/a"
+        "yx3/180c/9TPG//S0Rr/z9MZ/8zVGP/K1xj/x9kX/8TaF//C3Bf/v94X/73gGP+64Rj/uOMZ/7bk"
+        "Gv+05Rv/secd/6/oHv+s6SD/qesi/6bsJP+j7Sf/oO4p/53vLP+a8C//l/Ey/5TzNf+R9Dj/jfQ7"
+        "/4r1P/+H9kL/g/dG/4D4Sv98+U3/eflR/3b6Vf9y+1n/b/td/2z8Yf9o/GX/Zf1p/2L9bf9f/XH/"
+        "XP50/1n+eP9W/nz/U/6A/1D+hP9N/of/S/6L/0j+jv9G/pL/RP6V/0L+mP9A/Zv/Pv2e/z38of87"
+        "/KT/Ovum/zn7qf83+qz/N/mu/zb4sf81+LP/Nfe2/zT1uf809Lv/NPO+/zPywP8z8cP/M+/F/zPu"
+        "yP8z7cr/NOvN/zTqz/806NH/NefU/zXl1v8149j/NuLa/zbg3f823t//N9zh/zfa4/842OX/ONfn"
+        "/zjV6P850+r/OdHs/znP7f85ze//Osvw/zrI8v86xvP/OsT0/zrC9v85wPf/Ob74/zm8+f84uvn/"
+        "N7f6/ze1+/82s/v/NbD8/zSu/P8zq/3/Mqn9/zGm/f8wo/3/L6H+/y6e/v8tm/7/LJj+/yuV/f8p"
+        "kv3/KI/9/yeM/f8mifz/JIb8/yOD+/8igPv/IH36/x96+v8ed/n/HHT4/xtx9/8abvf/GGv2/xdo"
+        "9f8WZfT/FWPz/xRg8v8TXfH/EVrv/xBY7v8PVe3/DlLs/w1Q6v8NTen/DEvo/wtJ5v8KRuX/CkTj"
+        "/wlC4v8IQOD/CD7e/wc83f8HOtv/BjjZ/wY21/8FNNb/BTLU/wUw0v8EL9D/BC3O/wMry/8DKcn/"
+        "AyjH/wImxf8CJMP/AiPA/wIhvv8BH7v/AR65/wEctv8BG7T/ARmx/wEYrv8BFqz/ARWp/wEUpv8B"
+        "EqP/ARGg/wEQnf8BDpr/AQ2X/wEMlP8BC5H/AQqO/wEJi/8BCIf/AQeE/wIGgf8CBX3/AgR6/w=="
+    ),
+    "viridis": (
+        "VAFE/1UCRP9XA0T/WAVF/1oGRf9bCEX/XAlG/14LRv9fDEb/YQ5G/2IPR/9jEUf/ZRJH/2YUR/9n"
+        "FUf/aRZH/2oYR/9rGUj/bBpI/24cSP9vHUj/cB5I/3EgSP9yIUj/cyJI/3QjSP91JUf/diZH/3cn"
+        "R/94KEf/eSpH/3orR/97LEf/fC1G/3wvRv99MEb/fjFG/38yRf9/NEX/gDVF/4E2Rf+BN0T/gjlE"
+        "/4M6Q/+DO0P/hDxD/4Q9Qv+FPkL/hUBC/4ZBQf+GQkH/h0NA/4dEQP+HRT//iEc//4hIPv+JST7/"
+        "iUo9/4lLPf+JTD3/ik08/4pOPP+KUDv/ilE7/4tSOv+LUzr/i1Q5/4tVOf+LVjj/jFc4/4xYN/+M"
+        "WTf/jFo2/4xbNv+MXDX/jF01/41eNP+NXzT/jWAz/41hM/+NYjL/jWMy/41kMf+NZTH/jWYx/41n"
+        "MP+NaDD/jWkv/41qL/+Oay7/jmwu/45tLv+Obi3/jm8t/45wLP+OcSz/jnIs/45zK/+OdCv/jnUq"
+        "/452Kv+Odyr/jngp/455Kf+Oeij/jnoo/457KP+OfCf/jn0n/45+J/+Ofyb/joAm/46BJv+OgiX/"
+        "jYMl/42EJP+NhST/jYYk/42HI/+NiCP/jYkj/42JIv+NiiL/jYsi/42MIf+MjSH/jI4h/4yPIP+M"
+        "kCD/jJEg/4ySH/+Lkx//i5Qf/4uVH/+Llh//ipce/4qYHv+KmR7/ipke/4maHv+Jmx7/iZwe/4id"
+        "Hv+Inh7/iJ8e/4egHv+HoR//hqIf/4ajH/+FpCD/haUg/4WmIf+EpyH/hKci/4OoI/+CqSP/gqok"
+        "/4GrJf+BrCb/gK0n/3+uKP9/ryn/frAq/32xK/99sSz/fLIu/3uzL/96tDD/erUy/3m2M/94tzX/"
+        "d7g2/3a5OP92uTn/dbo7/3S7Pf9zvD7/cr1A/3G+Qv9wvkT/b79F/27AR/9twUn/bMJL/2vCTf9p"
+        "w0//aMRR/2fFU/9mxlX/ZcZX/2THWf9iyFv/Ycle/2DJYP9fymL/Xctk/1zMZ/9bzGn/Wc1r/1jO"
+        "bf9WznD/Vc9y/1TQdP9S0Hf/UdF5/0/SfP9O0n7/TNOB/0vTg/9J1Ib/R9WI/0bVi/9E1o3/Q9aQ"
+        "/0HXkv8/15X/PtiX/zzYmv862Z3/ONmf/zfaov812qX/M9un/zLbqv8w3K3/Ltyv/yzdsv8r3bX/"
+        "Kd23/yfeuv8m3r3/JN+//yLfwv8h38X/H+DH/x7gyv8d4M3/HOHP/xvh0v8a4dT/GeLX/xji2v8Y"
+        "4tz/GOPf/xjj4f8Y4+T/GeTn/xnk6f8a5Oz/G+Xu/xzl8f8e5fP/H+b2/yHm+P8i5vr/JOf9/w=="
+    ),
 }
 
+_tables: dict[str, np.ndarray] = {}
+
 
 def list_tables() -> list[str]:
-    return list(colortables.keys())
+    return list(_data.keys())
 
 
 def get_table(name: str) -> np.ndarray:
-    return colortables[name]
+    """The colortable 'name' as a read-only uint32 array.
+
+    Tables are decoded on first use and cached.
+    """
+    if name not in _tables:
+        table = np.frombuffer(base64.b64decode(_data[name]), dtype="<u4")
+        table = table.astype(np.uint32, copy=False)
+        table.flags.writeable = False
+        _tables[name] = table
+    return _tables[name]
 
 
 def get_icon(name: str, w: int = 32, h: int = 32) -> "QtGui.QIcon":
@@ -2606,7 +242,7 @@ def get_icon(name: str, w: int = 32, h: int = 32) -> "QtGui.QIcon":
         QtGui.QImage.Format.Format_Indexed8,
     )
     img._array = x
-    img.setColorTable(colortables[name])
-    img.setColorCount(len(colortables[name]))
+    table = get_table(name)
+    img.setColorTable(table)
+    img.setColorCount(len(table))
     return QtGui.QIcon(QtGui.QPixmap.fromImage(img))
-
@@ -7,6 +7,7 @@ from pewpew.graphics.options import GraphicsOptions
 from pewpew.graphics.overlayitems import MetricScaleBarOverlay
 from pewpew.graphics.util import path_for_colorbar_labels
 from pewpew.lib.numpyqt import array_to_image
+from pewpew.lib.quantile import QuantileSketch
 
 
 def position_for_alignment(
@@ -144,18 +145,20 @@ def generate_laser_image(
     size: QtCore.QSize | None = None,
     scale: float = 1.0,
     dpi: int = 96,
+    sketch: QuantileSketch | None = None,
 ) -> QtGui.QImage:
+    """Draws an element with optional label, scalebar and colorbar.
+
+    A cached `sketch` of the element's data is used for percentile ranges, as
+    per `GraphicsOptions.get_color_range_as_float`.
+    """
     data = laser.get(element, calibrate=options.calibrate, flat=True)
     data = np.ascontiguousarray(data)
 
-    vmin, vmax = options.get_color_range_as_float(element, data)
+    vmin, vmax = options.get_color_range_as_float(element, data, sketch=sketch)
     table = colortable.get_table(options.colortable)
 
-    data = np.clip(data, vmin, vmax)
-    if vmin != vmax:  # Avoid div 0
-        data = (data - vmin) / (vmax - vmin)
-
-    image = array_to_image(data)
+    image = array_to_image(data, vrange=(vmin, vmax))
     image.setColorTable(table)
     image.setColorCount(len(table))
     if raw:
@@ -246,7 +249,14 @@ def generate_rgb_laser_image(
     size: QtCore.QSize | None = None,
     scale: float = 1.0,
     dpi: int = 96,
+    sketches: dict[str, QuantileSketch] | None = None,
 ) -> QtGui.QImage:
+    """Draws up to three elements as an RGB image.
+
+    Cached `sketches` of the uncalibrated data of each element are used for
+    the ranges if `GraphicsOptions.approximate_percentiles` is set.
+    """
+    sketches = sketches or {}
     data = np.zeros((*laser.shape[:2], 3))
 
     for i, (element, color, (pmin, pmax)) in enumerate(zip(elements, colors, ranges)):
@@ -258,7 +268,11 @@ def generate_rgb_laser_image(
 
         # Normalise to range
         x = laser.get(element=element, calibrate=False, flat=True)
-        vmin, vmax = np.nanpercentile(x, (pmin, pmax))
+        sketch = sketches.get(element)
+        if sketch is not None and options.approximate_percentiles:
+            vmin, vmax = sketch.percentile((pmin, pmax))
+        else:
+            vmin, vmax = np.nanpercentile(x, (pmin, pmax))
         x = np.clip(x, vmin, vmax)
         if vmin != vmax:
             x = (x - vmin) / (vmax - vmin)
@@ -1,10 +1,9 @@
 import copy
 from io import BytesIO
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import numpy as np
-from pewlib import io
 from pewlib.calibration import Calibration
 from pewlib.config import Config
 from pewlib.laser import Laser
@@ -13,8 +12,14 @@ from PySide6 import QtCore, QtGui, QtWidgets
 from pewpew.actions import qAction
 from pewpew.graphics import colortable
 from pewpew.graphics.items import ColorBarItem, EditableLabelItem, RGBLabelItem
-from pewpew.graphics.options import GraphicsOptions
+from pewpew.graphics.mask import SelectionMask
+from pewpew.graphics.options import GraphicsOptions, color_range_as_float
+from pewpew.graphics.tiles import ImageTilePyramid
+from pewpew.lib import lazynpz
+from pewpew.lib.cache import LRUCache
 from pewpew.lib.numpyqt import array_to_image, image_to_array
+from pewpew.lib.quantile import QuantileSketch
+from pewpew.threads import CoalescingQueue
 
 
 class SnapImageItem(QtWidgets.QGraphicsObject):
@@ -84,7 +89,10 @@ class SnapImageItem(QtWidgets.QGraphicsObject):
     def rawData(self) -> np.ndarray:
         raise NotImplementedError
 
-    def select(self, mask: np.ndarray, modes: list[str]) -> None:
+    def select(
+        self, mask: np.ndarray, modes: list[str], offset: tuple[int, int] = (0, 0)
+    ) -> None:
+        """Select pixels in 'mask', with the first value at (row, column) 'offset'."""
         self.selectionChanged.emit()
 
     def mapToData(self, pos: QtCore.QPointF) -> QtCore.QPoint:
@@ -238,10 +246,11 @@ class ScaledImageItem(SnapImageItem):
         cls,
         array: np.ndarray,
         rect: QtCore.QRectF,
-        colortable: list[int] | None = None,
+        colortable: list[int] | np.ndarray | None = None,
+        vrange: tuple[float, float] = (0.0, 1.0),
         parent: QtWidgets.QGraphicsItem | None = None,
     ) -> "ScaledImageItem":
-        image = array_to_image(array)
+        image = array_to_image(array, vrange=vrange)
         if colortable is not None:
             image.setColorTable(colortable)
             image.setColorCount(len(colortable))
@@ -361,6 +370,8 @@ class LaserImageItem(SnapImageItem):
     ):
         super().__init__(parent=parent)
         self.setAcceptHoverEvents(True)
+        # Required for the exposed rect when painting tiles
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption)
 
         self._last_hover_pos = QtCore.QPoint(-1, -1)
 
@@ -369,10 +380,26 @@ class LaserImageItem(SnapImageItem):
         self.current_element = current_element or self.laser.elements[0]
 
         self.image: QtGui.QImage | None = None
-        self.mask_image: QtGui.QImage | None = None
+        self.image_tiles: ImageTilePyramid | None = None
+        self.selection_mask = SelectionMask(self.laser.shape[:2])
 
         self.raw_data: np.ndarray = np.array([])
         self.vmin, self.vmax = 0.0, 0.0
+
+        # Rendered (raw_data, vmin, vmax, image, tiles), see cacheKey
+        self.image_cache = LRUCache(
+            self.options.image_cache_size,
+            sizeof=lambda x: x[0].nbytes + x[3].sizeInBytes() * 4 // 3,
+        )
+        self.quantile_sketches: dict[tuple[str, bool], QuantileSketch] = {}
+        self.modified.connect(self.clearCaches)
+
+        # Incremented on modification, to detect changes since a snapshot
+        self.revision = 0
+        self.modified.connect(self.incrementRevision)
+
+        self.render_queue = CoalescingQueue(parent=self)
+        self.render_queue.resultReady.connect(self.applyRender)
         # Name in top left corner
         self.element_label = EditableLabelItem(
             self,
@@ -397,9 +424,10 @@ class LaserImageItem(SnapImageItem):
 
     @property
     def mask(self) -> np.ndarray:
-        if self.mask_image is None:
+        """The selected pixels, all pixels if there is no selection."""
+        if self.selection_mask.isEmpty():
             return np.ones(self.laser.shape, dtype=bool)
-        return self.mask_image._array.astype(bool)
+        return self.selection_mask.toArray()
 
     def element(self) -> str:
         return self.current_element
@@ -435,12 +463,13 @@ class LaserImageItem(SnapImageItem):
         old_names = [x for x in self.laser.elements if x not in names]
         self.laser.remove(old_names)
         self.laser.rename(names)
+        # Clears the caches, keyed by name, before drawing
+        self.modified.emit()
         if self.current_element in names:
             self.setElement(names[self.current_element])
         else:
             self.setElement(self.laser.elements[0])
         self.elementsChanged.emit()
-        self.modified.emit()
 
     def name(self) -> str:
         return self.laser.info["Name"]
@@ -453,7 +482,9 @@ class LaserImageItem(SnapImageItem):
     # Virtual SnapImageItem methods
     def selectedAt(self, pos: QtCore.QPointF) -> bool:
         pos = self.mapToData(pos)
-        return self.mask[pos.y(), pos.x()]
+        if self.selection_mask.isEmpty():
+            return True
+        return self.selection_mask.contains(pos.y(), pos.x())
 
     def imageSize(self) -> QtCore.QSize:
         return QtCore.QSize(self.laser.shape[1], self.laser.shape[0])
@@ -461,57 +492,159 @@ class LaserImageItem(SnapImageItem):
     def rawData(self) -> np.ndarray:
         return self.raw_data
 
-    def redraw(self) -> None:
-        data = self.laser.get(
-            self.element(), calibrate=self.options.calibrate, flat=True
-        )
-        self.raw_data = np.ascontiguousarray(data)
-        self.vmin, self.vmax = self.options.get_color_range_as_float(
-            self.element(), self.raw_data
+    def cacheKey(self) -> tuple:
+        """Key of the current image in the image cache."""
+        return (
+            self.element(),
+            self.options.calibrate,
+            self.options.color_ranges.get(
+                self.element(), self.options.color_range_default
+            ),
+            self.options.approximate_percentiles,
         )
-        data = np.clip(self.raw_data, self.vmin, self.vmax)
-        if self.vmin != self.vmax:  # Avoid div 0
-            data = (data - self.vmin) / (self.vmax - self.vmin)
 
-        unit = self.laser.calibration[self.element()].unit
-        table = colortable.get_table(self.options.colortable)
+    def incrementRevision(self) -> None:
+        self.revision += 1
+
+    def clearCaches(self) -> None:
+        """Clear cached images and sketches, called when the item is modified.
+
+        Pending renders of the unmodified data are also cancelled.
+        """
+        self.render_queue.cancel()
+        self.image_cache.clear()
+        self.quantile_sketches.clear()
+
+    def quantileSketch(self, element: str, data: np.ndarray) -> QuantileSketch:
+        """Sketch of 'data', which must be the current data for 'element'.
+
+        Sketches are cached until the item is modified.
+        """
+        key = (element, self.options.calibrate)
+        if key not in self.quantile_sketches:
+            self.quantile_sketches[key] = QuantileSketch(data)
+        return self.quantile_sketches[key]
+
+    def colorTable(self) -> np.ndarray:
+        """The current colortable, with the NaN color at index 0."""
+        table = colortable.get_table(self.options.colortable).copy()
         table[0] = self.options.nan_color.rgba()
+        return table
 
-        self.image = array_to_image(data)
-        self.image.setColorTable(table)
-        self.image.setColorCount(len(table))
+    def cachedRender(self) -> tuple | None:
+        """The cached render of the current image, if any, see `renderFunction`."""
+        key = self.cacheKey()
+        entry = self.image_cache.get(key)
+        if entry is None:
+            return None
+        return key, entry, {}
 
-        # self.colortableChanged.emit(table, self.vmin, self.vmax, unit)
-        self.colorbar.updateTable(table, self.vmin, self.vmax, unit)
+    def renderFunction(self) -> Callable[[], tuple]:
+        """A function that renders the current image.
+
+        The function is thread safe and returns the cache key, the cache entry and
+        any newly created quantile sketches, to be passed to `applyRender`.
+        """
+        laser = self.laser
+        key = self.cacheKey()
+        element, calibrate, vrange, approximate = key
+        sketch = self.quantile_sketches.get((element, calibrate))
+
+        def render() -> tuple:
+            sketches = {}
+            raw_data = np.ascontiguousarray(
+                laser.get(element, calibrate=calibrate, flat=True)
+            )
+            # Sketch only required for percentile ranges
+            current = sketch if approximate else None
+            if (
+                approximate
+                and sketch is None
+                and any(isinstance(v, str) for v in vrange)
+            ):
+                current = QuantileSketch(raw_data)
+                sketches[(element, calibrate)] = current
+            vmin, vmax = color_range_as_float(vrange, raw_data, sketch=current)
+            image = array_to_image(raw_data, vrange=(vmin, vmax))
+            return key, (raw_data, vmin, vmax, image, ImageTilePyramid(image)), sketches
+
+        return render
+
+    def applyRender(self, result: tuple) -> None:
+        """Sets the image from the result of a `renderFunction`."""
+        key, entry, sketches = result
+        self.quantile_sketches.update(sketches)
+        self.image_cache.put(key, entry)
+
+        previous_tiles = self.image_tiles
+        self.raw_data, self.vmin, self.vmax, self.image, self.image_tiles = entry
+        # Release the converted tiles of the previous image
+        if previous_tiles is not None and previous_tiles is not self.image_tiles:
+            previous_tiles.clearTiles()
+
+        self.updateColorTable()
         # Update the colorbar position in case the image aspect has changed
         self.colorbar.setPos(self.boundingRect().bottomLeft())
         self.imageChanged.emit()
         self.update()
 
-    def select(self, mask: np.ndarray, modes: list[str]) -> None:
-        current_mask = self.mask
+    def redraw(self) -> None:
+        """Redraws the image from the laser data.
 
-        if "add" in modes:
-            mask = np.logical_or(current_mask, mask)
-        elif "subtract" in modes:
-            mask = np.logical_and(current_mask, ~mask)
-        elif "intersect" in modes:
-            mask = np.logical_and(current_mask, mask)
-        elif "difference" in modes:
-            mask = np.logical_xor(current_mask, mask)
+        Images are cached as colortable indicies and the colortable is applied
+        afterwards, see `updateColorTable`. Any pending `requestRedraw` is
+        cancelled.
+        """
+        self.render_queue.cancel()
+        result = self.cachedRender()
+        if result is None:
+            result = self.renderFunction()()
+        self.applyRender(result)
 
-        color = QtGui.QColor(255, 255, 255, a=128)
+    def requestRedraw(self) -> None:
+        """Redraws the image in a worker thread.
 
-        if np.any(mask):
-            self.mask_image = array_to_image(mask.astype(np.uint8))
-            self.mask_image.setColorTable([0, int(color.rgba())])
-            self.mask_image.setColorCount(2)
+        The current image is kept until the new one is ready and superseded
+        requests are cancelled. Cached images are applied immediately.
+        """
+        result = self.cachedRender()
+        if result is not None:
+            self.render_queue.cancel()
+            self.applyRender(result)
         else:
-            self.mask_image = None
+            self.render_queue.submit(self.renderFunction())
+
+    def updateColorTable(self) -> None:
+        """Applies the current colortable and NaN color without redrawing."""
+        if self.image_tiles is None:
+            return
+        table = self.colorTable()
+        self.image_tiles.setColorTable(table)
+
+        unit = self.laser.calibration[self.element()].unit
+        # self.colortableChanged.emit(table, self.vmin, self.vmax, unit)
+        self.colorbar.updateTable(table, self.vmin, self.vmax, unit)
+        self.update()
+
+    def select(
+        self, mask: np.ndarray, modes: list[str], offset: tuple[int, int] = (0, 0)
+    ) -> None:
+        """Select pixels in 'mask', with the first value at (row, column) 'offset'.
+
+        Only the bounding regions of the current selection and 'mask' are updated.
+        """
+        mode = next(
+            (m for m in ["add", "subtract", "intersect", "difference"] if m in modes),
+            None,
+        )
+        # No selection is equivalent to all pixels selected, see `mask`
+        if mode is not None and self.selection_mask.isEmpty():
+            self.selection_mask.fill()
+        self.selection_mask.combine(mask, mode, offset)
 
         self.update()
 
-        super().select(mask, modes)
+        super().select(mask, modes, offset)
 
     # GraphicsItem drawing
     def boundingRect(self) -> QtCore.QRectF:
@@ -532,11 +665,27 @@ class LaserImageItem(SnapImageItem):
 
         rect = self.boundingRect()
 
-        if self.image is not None:
-            painter.drawImage(rect, self.image)
+        if self.image_tiles is not None:
+            self.image_tiles.paint(
+                painter,
+                rect,
+                option.exposedRect,
+                option.levelOfDetailFromTransform(painter.worldTransform()),
+            )
 
-        if self.mask_image is not None:
-            painter.drawImage(rect, self.mask_image)
+        overlay = self.selection_mask.image()
+        if overlay is not None:
+            pixel = self.pixelSize()
+            overlay_rect = self.selection_mask.imageRect()
+            painter.drawImage(
+                QtCore.QRectF(
+                    rect.left() + overlay_rect.x() * pixel.width(),
+                    rect.top() + overlay_rect.y() * pixel.height(),
+                    overlay_rect.width() * pixel.width(),
+                    overlay_rect.height() * pixel.height(),
+                ),
+                overlay,
+            )
 
         if self.isSelected() and not isinstance(
             painter.device(), QtGui.QPixmap
@@ -568,6 +717,34 @@ class LaserImageItem(SnapImageItem):
             self.modified.emit()
             self.redraw()
 
+    def applyData(self, data: np.ndarray) -> None:
+        """Replace the laser data, e.g. as more lines are acquired.
+
+        Calibrations, config and info are kept. The selection is kept where it
+        fits the new shape.
+        """
+        elements_changed = data.dtype.names != self.laser.elements
+        if data.shape != self.laser.shape:
+            self.prepareGeometryChange()
+            mask = SelectionMask(data.shape[:2], self.selection_mask.color)
+            if not self.selection_mask.isEmpty():
+                y0, _, x0, _ = self.selection_mask.bounds()
+                mask.combine(self.selection_mask.region, None, (y0, x0))
+            self.selection_mask = mask
+
+        self.laser.data = data
+        for element in data.dtype.names:
+            if element not in self.laser.calibration:
+                self.laser.calibration[element] = Calibration()
+        if self.current_element not in data.dtype.names:
+            self.current_element = data.dtype.names[0]
+            self.element_label.setText(self.current_element)
+
+        self.modified.emit()
+        self.redraw()
+        if elements_changed:
+            self.elementsChanged.emit()
+
     def applyInformation(self, info: dict[str, str]) -> None:
         """Set laser information."""
         if self.laser.info != info:
@@ -575,6 +752,8 @@ class LaserImageItem(SnapImageItem):
             self.modified.emit()
 
     def copyToClipboard(self) -> None:
+        from pewlib.io.npz import pack_info
+
         clipboard = QtWidgets.QApplication.clipboard()
         clipboard.setImage(self.image)
         mime = QtCore.QMimeData()
@@ -588,7 +767,7 @@ class LaserImageItem(SnapImageItem):
             np.savez(fp, **{k: v.to_array() for k, v in self.laser.calibration.items()})
             mime.setData("application/x-pew2calibration", fp.getvalue())
         with BytesIO() as fp:
-            np.save(fp, io.npz.pack_info(self.laser.info, remove_keys=[]))
+            np.save(fp, pack_info(self.laser.info, remove_keys=[]))
             mime.setData("application/x-pew2info", fp.getvalue())
         clipboard.setMimeData(mime)
 
@@ -598,7 +777,7 @@ class LaserImageItem(SnapImageItem):
 
     def saveToFile(self, path: Path | str) -> None:
         path = Path(path)
-        io.npz.save(path, self.laser)
+        lazynpz.save(path, self.laser)
         self.laser.info["File Path"] = str(path.resolve())
 
     # ==== Actions ===
@@ -788,18 +967,15 @@ class LaserImageItem(SnapImageItem):
 
         If selection is not rectangular then it is filled with nan.
         """
-        if self.mask_image is None:
+        if self.selection_mask.isEmpty():
             return
-        mask = self.mask
-        ix, iy = np.nonzero(mask)
-        x0, x1, y0, y1 = np.min(ix), np.max(ix) + 1, np.min(iy), np.max(iy) + 1
+        y0, y1, x0, x1 = self.selection_mask.bounds()
+        mask = self.selection_mask.region
 
         data = self.laser.data
-        new_data = np.empty((x1 - x0, y1 - y0), dtype=data.dtype)
+        new_data = np.empty((y1 - y0, x1 - x0), dtype=data.dtype)
         for name in new_data.dtype.names:
-            new_data[name] = np.where(
-                mask[x0:x1, y0:y1], data[name][x0:x1, y0:y1], np.nan
-            )
+            new_data[name] = np.where(mask, data[name][y0:y1, x0:x1], np.nan)
 
         info = self.laser.info.copy()
         info["Name"] = info["Name"] + "_cropped"
@@ -834,12 +1010,17 @@ class LaserImageItem(SnapImageItem):
             else:
                 raise ValueError("rotate must be 'left', 'right'.")
             self.prepareGeometryChange()
+        # Selection no longer matches the data
+        self.selection_mask = SelectionMask(self.laser.shape[:2])
 
+        self.modified.emit()
         self.redraw()
 
     # === Events ===
     def contextMenuEvent(self, event: QtWidgets.QGraphicsSceneContextMenuEvent) -> None:
-        mask_context = self.mask_image is not None and self.selectedAt(event.pos())
+        mask_context = not self.selection_mask.isEmpty() and self.selectedAt(
+            event.pos()
+        )
 
         menu = QtWidgets.QMenu()
         menu.addAction(self.action_copy)
@@ -991,43 +1172,81 @@ class RGBLaserImageItem(LaserImageItem):
             alignment=QtCore.Qt.AlignTop | QtCore.Qt.AlignLeft,
         )
 
-    def redraw(self) -> None:
-        if len(self.current_elements) == 0:
-            self.raw_data == np.zeros((*self.laser.shape[:2], 3))
-        else:
-            self.raw_data = np.stack(
-                [
-                    self.laser.get(
-                        element.element, calibrate=self.options.calibrate, flat=True
-                    )
-                    for element in self.current_elements[:3]
-                ],
-                axis=2,
-            )
-        data = np.zeros((*self.laser.shape[:2], 3))
-        for i, element in enumerate(self.current_elements):
-            if element.element not in self.laser.elements:
-                continue
-            rgb = np.array(element.color.getRgbF()[:3])
-            if self.subtractive:
-                rgb = 1.0 - rgb
-
-            # Normalise to range
-            vmin, vmax = np.nanpercentile(self.raw_data[:, :, i], element.prange)
-            x = np.clip(self.raw_data[:, :, i], vmin, vmax)
-            if vmin != vmax:
-                x = (x - vmin) / (vmax - vmin)
-            # Convert to separate rgb channels
-            data += x[:, :, None] * rgb
-
-        if self.subtractive:
-            data = 1.0 - data
-
-        self.image = array_to_image(data)
+    def cachedRender(self) -> tuple | None:
+        return None
+
+    def renderFunction(self) -> Callable[[], tuple]:
+        """A function that renders the current RGB image.
+
+        The function is thread safe and returns the raw data, image and any newly
+        created quantile sketches, to be passed to `applyRender`.
+        """
+        laser, calibrate = self.laser, self.options.calibrate
+        approximate = self.options.approximate_percentiles
+        subtractive = self.subtractive
+        elements = [
+            (element.element, element.color.getRgbF()[:3], element.prange)
+            for element in self.current_elements
+        ]
+        existing = {
+            element: self.quantile_sketches.get((element, calibrate))
+            for element, _, _ in elements
+        }
+
+        def render() -> tuple:
+            sketches = {}
+            if len(elements) == 0:
+                raw_data = np.zeros((*laser.shape[:2], 3))
+            else:
+                raw_data = np.stack(
+                    [
+                        laser.get(element, calibrate=calibrate, flat=True)
+                        for element, _, _ in elements[:3]
+                    ],
+                    axis=2,
+                )
+            data = np.zeros((*laser.shape[:2], 3))
+            for i, (element, color, prange) in enumerate(elements):
+                if element not in laser.elements:
+                    continue
+                rgb = np.array(color)
+                if subtractive:
+                    rgb = 1.0 - rgb
+
+                # Normalise to range
+                x = raw_data[:, :, i]
+                if approximate:
+                    sketch = existing[element]
+                    if sketch is None:
+                        sketch = QuantileSketch(x)
+                        sketches[(element, calibrate)] = sketch
+                    vmin, vmax = sketch.percentile(prange)
+                else:
+                    vmin, vmax = np.nanpercentile(x, prange)
+                x = np.clip(x, vmin, vmax)
+                if vmin != vmax:
+                    x = (x - vmin) / (vmax - vmin)
+                # Convert to separate rgb channels
+                data += x[:, :, None] * rgb
+
+            if subtractive:
+                data = 1.0 - data
+
+            image = array_to_image(data)
+            return raw_data, image, ImageTilePyramid(image), sketches
+
+        return render
+
+    def applyRender(self, result: tuple) -> None:
+        self.raw_data, self.image, self.image_tiles, sketches = result
+        self.quantile_sketches.update(sketches)
 
         self.imageChanged.emit()
         self.update()
 
+    def updateColorTable(self) -> None:
+        pass
+
     def setElement(self, element: str, set_sibling_items: bool = False) -> None:
         if element not in self.laser.elements:
             raise ValueError(
@@ -1050,9 +1269,8 @@ class RGBLaserImageItem(LaserImageItem):
         self.elements_label.setTexts([rgb.element for rgb in elements])
         self.elements_label.colors = [rgb.color for rgb in elements]
         if len(self.current_elements) > 0:
-            self.setElement(self.current_elements[0].element)
-        else:
-            self.redraw()
+            self.current_element = self.current_elements[0].element
+        self.requestRedraw()
 
     @classmethod
     def fromLaserImageItem(
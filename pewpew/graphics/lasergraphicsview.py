@@ -54,6 +54,7 @@ class LaserGraphicsView(OverlayGraphicsView):
         self.addOverlayItem(self.scalebar)
         self.scalebar.setPos(0, 10)
 
+        self.options.colortableOptionsChanged.connect(self.updateColorTables)
         self.options.fontOptionsChanged.connect(self.scalebar.requestPaint)
         self.options.visiblityOptionsChanged.connect(self.updateOverlayVisibility)
         self.viewScaleChanged.connect(self.scalebar.requestPaint)
@@ -217,6 +218,10 @@ class LaserGraphicsView(OverlayGraphicsView):
                 self.scene().removeItem(item)
         self.setInteractionFlag("transform", False)
 
+    def updateColorTables(self) -> None:
+        for item in self.laserItems():
+            item.updateColorTable()
+
     def updateOverlayVisibility(self) -> None:
         self.scalebar.setVisible(self.options.scalebar)
         self.scalebar.requestPaint()
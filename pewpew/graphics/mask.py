@@ -0,0 +1,170 @@
+import numpy as np
+from PySide6 import QtCore, QtGui
+
+from pewpew.lib.numpyqt import array_to_image
+
+
+def _intersect(
+    a: tuple[int, int, int, int], b: tuple[int, int, int, int]
+) -> tuple[int, int, int, int]:
+    y0, x0 = max(a[0], b[0]), max(a[2], b[2])
+    return y0, max(min(a[1], b[1]), y0), x0, max(min(a[3], b[3]), x0)
+
+
+def _union(
+    a: tuple[int, int, int, int], b: tuple[int, int, int, int]
+) -> tuple[int, int, int, int]:
+    return min(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3])
+
+
+def _slices(
+    inner: tuple[int, int, int, int], outer: tuple[int, int, int, int]
+) -> tuple[slice, slice]:
+    """Slices of the 'inner' bounds in an array of the 'outer' bounds."""
+    return (
+        slice(inner[0] - outer[0], inner[1] - outer[0]),
+        slice(inner[2] - outer[2], inner[3] - outer[2]),
+    )
+
+
+class SelectionMask(object):
+    """Selected pixels of an image.
+
+    Only the region within the bounding box of the selection is stored. Boolean
+    operations only touch the bounding boxes of the current and new selections,
+    the full size mask and overlay image are created when first required.
+
+    Args:
+        shape: (rows, columns) of the image
+        color: color of selected pixels in the overlay image
+    """
+
+    def __init__(self, shape: tuple[int, int], color: QtGui.QColor | None = None):
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.color = color or QtGui.QColor(255, 255, 255, a=128)
+
+        self.offset = (0, 0)
+        self.region = np.zeros((0, 0), dtype=bool)
+
+        self._array: np.ndarray | None = None
+        self._image: QtGui.QImage | None = None
+
+    def isEmpty(self) -> bool:
+        return self.region.size == 0
+
+    def bounds(self) -> tuple[int, int, int, int]:
+        """The bounding box of the selection as (y0, y1, x0, x1)."""
+        y0, x0 = self.offset
+        return y0, y0 + self.region.shape[0], x0, x0 + self.region.shape[1]
+
+    def contains(self, row: int, column: int) -> bool:
+        y0, y1, x0, x1 = self.bounds()
+        if not (y0 <= row < y1 and x0 <= column < x1):
+            return False
+        return bool(self.region[row - y0, column - x0])
+
+    def toArray(self) -> np.ndarray:
+        """The selection as a read-only, full size bool array."""
+        if self._array is None:
+            y0, y1, x0, x1 = self.bounds()
+            array = np.zeros(self.shape, dtype=bool)
+            array[y0:y1, x0:x1] = self.region
+            array.flags.writeable = False
+            self._array = array
+        return self._array
+
+    def image(self) -> QtGui.QImage | None:
+        """Overlay image of the bounding box, see `imageRect`."""
+        if self.isEmpty():
+            return None
+        if self._image is None:
+            self._image = array_to_image(self.region.view(np.uint8))
+            self._image.setColorTable([0, int(self.color.rgba())])
+            self._image.setColorCount(2)
+        return self._image
+
+    def imageRect(self) -> QtCore.QRect:
+        """Position of the overlay image, in pixels."""
+        y0, y1, x0, x1 = self.bounds()
+        return QtCore.QRect(x0, y0, x1 - x0, y1 - y0)
+
+    def clear(self) -> None:
+        self.setRegion(np.zeros((0, 0), dtype=bool), (0, 0))
+
+    def fill(self) -> None:
+        self.setRegion(np.ones(self.shape, dtype=bool), (0, 0))
+
+    def setRegion(self, region: np.ndarray, offset: tuple[int, int]) -> None:
+        """Sets the selection to a copy of 'region', cropped to its bounding box."""
+        self._array = None
+        self._image = None
+
+        rows = np.flatnonzero(np.any(region, axis=1))
+        if rows.size == 0:
+            self.offset = (0, 0)
+            self.region = np.zeros((0, 0), dtype=bool)
+            return
+        cols = np.flatnonzero(np.any(region, axis=0))
+        y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+
+        self.offset = (int(offset[0] + y0), int(offset[1] + x0))
+        self.region = region[y0:y1, x0:x1].copy()
+
+    def combine(
+        self,
+        mask: np.ndarray,
+        mode: str | None = None,
+        offset: tuple[int, int] = (0, 0),
+    ) -> None:
+        """Combines the selection with 'mask'.
+
+        Args:
+            mask: bool array, may be smaller than the image
+            mode: one of 'add', 'subtract', 'intersect', 'difference' or None to
+                replace the selection
+            offset: (row, column) of the first value of 'mask'
+        """
+        mask = np.atleast_2d(np.asarray(mask, dtype=bool))
+        # Clip to the image
+        incoming = (
+            offset[0],
+            offset[0] + mask.shape[0],
+            offset[1],
+            offset[1] + mask.shape[1],
+        )
+        new = _intersect(incoming, (0, self.shape[0], 0, self.shape[1]))
+        mask = mask[_slices(new, incoming)]
+        current = self.bounds()
+
+        if mode is None:
+            self.setRegion(mask, (new[0], new[2]))
+        elif mode in ["add", "difference"]:
+            if self.isEmpty():
+                bounds = new
+            elif mask.size == 0:
+                bounds = current
+            else:
+                bounds = _union(current, new)
+            region = np.zeros((bounds[1] - bounds[0], bounds[3] - bounds[2]), bool)
+            region[_slices(current, bounds)] = self.region
+            view = region[_slices(new, bounds)]
+            if mode == "add":
+                np.logical_or(view, mask, out=view)
+            else:
+                np.logical_xor(view, mask, out=view)
+            self.setRegion(region, (bounds[0], bounds[2]))
+        elif mode == "subtract":
+            overlap = _intersect(current, new)
+            view = self.region[_slices(overlap, current)]
+            np.logical_and(view, ~mask[_slices(overlap, new)], out=view)
+            self.setRegion(self.region, self.offset)
+        elif mode == "intersect":
+            overlap = _intersect(current, new)
+            region = np.logical_and(
+                self.region[_slices(overlap, current)], mask[_slices(overlap, new)]
+            )
+            self.setRegion(region, (overlap[0], overlap[2]))
+        else:
+            raise ValueError(
+                "mode must be one of 'add', 'subtract', 'intersect', 'difference'."
+            )
@@ -2,6 +2,35 @@
 import numpy as np
 from PySide6 import QtCore, QtGui
 
+from pewpew.lib.quantile import QuantileSketch
+
+
+def color_range_as_float(
+    vrange: tuple[float | str, float | str],
+    data: np.ndarray,
+    sketch: QuantileSketch | None = None,
+) -> tuple[float, float]:
+    """Converts a colorrange of 'data' to float values.
+
+    Percentile ranges, e.g. "99%", are calculated using `sketch` if passed,
+    otherwise `np.nanpercentile`. Does not access any options, so may be used
+    from worker threads.
+    """
+    vmin, vmax = vrange
+    if data.dtype == bool:
+        return 0, 1
+
+    if sketch is not None:
+        percentile = sketch.percentile
+    else:
+        percentile = lambda q: np.nanpercentile(data, q)  # noqa: E731
+
+    if isinstance(vmin, str):
+        vmin = percentile(float(vmin.rstrip("%")))
+    if isinstance(vmax, str):
+        vmax = percentile(float(vmax.rstrip("%")))
+    return vmin, vmax  # type: ignore
+
 
 class GraphicsOptions(QtCore.QObject):
     """This object stores information used by pewpew to draw images.
@@ -14,6 +43,8 @@ class GraphicsOptions(QtCore.QObject):
         font: font to use
         font_color: color fo fonts
         units: unit of image
+        image_cache_size: memory budget of each image's render cache, in bytes
+        approximate_percentiles: use quantile sketches for percentile ranges
     """
 
     colortables = {
@@ -28,6 +59,7 @@ class GraphicsOptions(QtCore.QObject):
         "viridis": "Perceptually uniform colormap.",
     }
 
+    colortableOptionsChanged = QtCore.Signal()
     fontOptionsChanged = QtCore.Signal()
     imageOptionsChanged = QtCore.Signal()
     visiblityOptionsChanged = QtCore.Signal()
@@ -47,6 +79,9 @@ class GraphicsOptions(QtCore.QObject):
         self.calibrate = True
         self.units = "μm"
 
+        self.image_cache_size = 256 * 1024**2
+        self.approximate_percentiles = True
+
     @property
     def colortable(self) -> str:
         return QtCore.QSettings().value("Options/Colortable", "viridis")
@@ -66,6 +101,14 @@ class GraphicsOptions(QtCore.QObject):
     def nan_color(self, color: QtGui.QColor) -> None:
         return QtCore.QSettings().setValue("Options/NanColor", color)
 
+    def setColortable(self, colortable: str) -> None:
+        self.colortable = colortable
+        self.colortableOptionsChanged.emit()
+
+    def setNanColor(self, color: QtGui.QColor) -> None:
+        self.nan_color = color
+        self.colortableOptionsChanged.emit()
+
     def setFont(self, font: QtGui.QFont) -> None:
         self.font = font
         self.fontOptionsChanged.emit()
@@ -86,22 +129,59 @@ class GraphicsOptions(QtCore.QObject):
         self.smoothing = smooth
         self.imageOptionsChanged.emit()
 
+    def state(self) -> dict:
+        """The options as a JSON serialisable dict, see `restoreState`."""
+        return {
+            "color_ranges": {k: list(v) for k, v in self.color_ranges.items()},
+            "color_range_default": list(self.color_range_default),
+            "colortable": self.colortable,
+            "nan_color": self.nan_color.name(),
+            "scalebar": self.scalebar,
+            "highlight_focus": self.highlight_focus,
+            "smoothing": self.smoothing,
+            "font": self.font.toString(),
+            "font_color": self.font_color.name(),
+            "calibrate": self.calibrate,
+            "units": self.units,
+        }
+
+    def restoreState(self, state: dict) -> None:
+        """Restores options from `state`, missing keys are left unchanged."""
+        if "color_ranges" in state:
+            self.color_ranges = {k: tuple(v) for k, v in state["color_ranges"].items()}
+        if "color_range_default" in state:
+            self.color_range_default = tuple(state["color_range_default"])
+        if state.get("colortable") in GraphicsOptions.colortables:
+            self.colortable = state["colortable"]
+        if "nan_color" in state:
+            self.nan_color = QtGui.QColor(state["nan_color"])
+        for attr in ["scalebar", "highlight_focus", "smoothing", "calibrate", "units"]:
+            if attr in state:
+                setattr(self, attr, state[attr])
+        if "font" in state:
+            self.font.fromString(state["font"])
+        if "font_color" in state:
+            self.font_color = QtGui.QColor(state["font_color"])
+
+        self.colortableOptionsChanged.emit()
+        self.fontOptionsChanged.emit()
+        self.imageOptionsChanged.emit()
+        self.visiblityOptionsChanged.emit()
+
     def get_color_range_as_float(
-        self, name: str, data: np.ndarray
+        self, name: str, data: np.ndarray, sketch: QuantileSketch | None = None
     ) -> tuple[float, float]:
         """Get colorrange for 'name' or a default.
 
-        Converts percentile ranges to float values.
+        Converts percentile ranges to float values. If a `sketch` of 'data' is
+        passed and `approximate_percentiles` is set then it is used in place of
+        `np.nanpercentile`.
         """
-        vmin, vmax = self.color_ranges.get(name, self.color_range_default)
-        if data.dtype == bool:
-            return 0, 1
-
-        if isinstance(vmin, str):
-            vmin = np.nanpercentile(data, float(vmin.rstrip("%")))
-        if isinstance(vmax, str):
-            vmax = np.nanpercentile(data, float(vmax.rstrip("%")))
-        return vmin, vmax  # type: ignore
+        return color_range_as_float(
+            self.color_ranges.get(name, self.color_range_default),
+            data,
+            sketch=sketch if self.approximate_percentiles else None,
+        )
 
     def get_color_range_as_percentile(
         self, name: str, data: np.ndarray
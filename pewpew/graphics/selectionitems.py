@@ -4,8 +4,7 @@ import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from pewpew.graphics.imageitems import SnapImageItem
-from pewpew.graphics.util import polygonf_contains_points
-from pewpew.lib.numpyqt import polygonf_to_array
+from pewpew.graphics.util import polygonf_to_mask
 
 
 class SelectionItem(QtWidgets.QGraphicsObject):
@@ -127,37 +126,18 @@ class LassoImageSelectionItem(SnapImageSelectionItem):
             return
 
         modes = list(self.modifierModes(event.modifiers()))
-        pixel = self.item.pixelSize()
-        rect = self.item.boundingRect()
         size = self.item.imageSize()
 
         poly = self.mapToItem(self.item, self.poly)
-
-        array = polygonf_to_array(poly)
-        # Get start and end points of area
-        x1, x2 = np.amin(array[:, 0]), np.amax(array[:, 0])
-        y1, y2 = np.amin(array[:, 1]), np.amax(array[:, 1])
-        # Bound to image area
-        x1, y1 = max(x1, 0.0), max(y1, 0.0)
-        x2 = min(x2, rect.width() - pixel.width() / 2.0)
-        y2 = min(y2, rect.height() - pixel.height() / 2.0)
-        # Generate pixel centers
-        xs = np.arange(x1, x2, pixel.width()) + pixel.width() / 2.0
-        ys = np.arange(y1, y2, pixel.height()) + pixel.height() / 2.0
-        X, Y = np.meshgrid(xs, ys)
-        pixels = np.stack((X.flat, Y.flat), axis=1)
-
         # Get mask of selected area
-        mask = np.zeros((size.height(), size.width()), dtype=bool)
-        polymask = polygonf_contains_points(poly, pixels).reshape(ys.size, xs.size)
-        # Insert
-        ix, iy = int(x1 / pixel.width()), int(y1 / pixel.height())
-        mask[iy : iy + ys.size, ix : ix + xs.size] = polymask
+        mask, offset = polygonf_to_mask(
+            poly, (size.height(), size.width()), self.item.pixelSize()
+        )
 
         self.poly.clear()
         self.prepareGeometryChange()
 
-        self.item.select(mask, modes)
+        self.item.select(mask, modes, offset=offset)
         super().mouseReleaseEvent(event)
 
     def paint(
@@ -243,13 +223,13 @@ class RectImageSelectionItem(SnapImageSelectionItem):
         y1 = np.round(y1 / py).astype(int)
         y2 = np.round(y2 / py).astype(int)
 
-        mask = np.zeros((size.height(), size.width()), dtype=bool)
-        mask[y1:y2, x1:x2] = True
+        # Out of bounds regions are clipped by select
+        mask = np.ones((max(y2 - y1, 0), max(x2 - x1, 0)), dtype=bool)
 
         self._rect = QtCore.QRectF()
         self.prepareGeometryChange()
 
-        self.item.select(mask, modes)
+        self.item.select(mask, modes, offset=(y1, x1))
         super().mouseReleaseEvent(event)
 
     def paint(
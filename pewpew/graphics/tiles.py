@@ -0,0 +1,150 @@
+from collections import OrderedDict
+
+import numpy as np
+from PySide6 import QtCore, QtGui
+
+
+class ImageTilePyramid(object):
+    """Level-of-detail tiling of a QImage.
+
+    Level 0 is the full resolution image, each subsequent level is half the size of
+    the previous and is only created when first required. Tiles are converted to
+    a paintable format once and cached, so painting only touches the tiles that
+    intersect the exposed area, at a level matching the current zoom.
+
+    Args:
+        image: full resolution image
+        tile_size: width and height of tiles, in level pixels
+        max_tiles: maximum number of cached tiles
+    """
+
+    def __init__(self, image: QtGui.QImage, tile_size: int = 512, max_tiles: int = 256):
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+
+        self.levels: list[QtGui.QImage] = [image]
+        self.tiles: OrderedDict[tuple[int, int, int], QtGui.QImage] = OrderedDict()
+
+    @property
+    def image(self) -> QtGui.QImage:
+        return self.levels[0]
+
+    def maxLevel(self) -> int:
+        """The first level that fits within a single tile."""
+        size = max(self.image.width(), self.image.height(), 1)
+        return max(int(np.ceil(np.log2(size / self.tile_size))), 0)
+
+    def level(self, n: int) -> QtGui.QImage:
+        """Image at level 'n', downsampled by 2^n."""
+        while len(self.levels) <= n:
+            last = self.levels[-1]
+            self.levels.append(
+                last.scaled(
+                    (last.width() + 1) // 2,
+                    (last.height() + 1) // 2,
+                    QtCore.Qt.IgnoreAspectRatio,
+                    QtCore.Qt.FastTransformation,
+                )
+            )
+        return self.levels[n]
+
+    def levelForScale(self, scale: float) -> int:
+        """Level to use when each image pixel covers 'scale' device pixels."""
+        if scale <= 0.0:
+            return self.maxLevel()
+        n = int(np.floor(np.log2(1.0 / scale)))
+        return min(max(n, 0), self.maxLevel())
+
+    def tile(self, level: int, row: int, column: int) -> QtGui.QImage:
+        key = (level, row, column)
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+            return self.tiles[key]
+
+        image = self.level(level)
+        rect = QtCore.QRect(
+            column * self.tile_size,
+            row * self.tile_size,
+            self.tile_size,
+            self.tile_size,
+        ).intersected(image.rect())
+        tile = image.copy(rect).convertToFormat(
+            QtGui.QImage.Format_ARGB32_Premultiplied
+        )
+
+        self.tiles[key] = tile
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def clearTiles(self) -> None:
+        self.tiles.clear()
+
+    def setColorTable(self, table: list[int] | np.ndarray) -> None:
+        """Set the colortable of an indexed image.
+
+        Existing levels are updated in place and tiles are cleared if the table has
+        changed, no other conversion is performed.
+        """
+        if self.image.format() != QtGui.QImage.Format_Indexed8:
+            return
+        if np.array_equal(self.image.colorTable(), table):
+            return
+        for level in self.levels:
+            level.setColorTable(table)
+            level.setColorCount(len(table))
+        self.clearTiles()
+
+    def paint(
+        self,
+        painter: QtGui.QPainter,
+        target: QtCore.QRectF,
+        exposed: QtCore.QRectF | None = None,
+        level_of_detail: float = 1.0,
+    ) -> None:
+        """Draw the tiles that intersect 'exposed'.
+
+        Args:
+            painter: painter to use
+            target: area to draw the full image into
+            exposed: area that requires painting, defaults to 'target'
+            level_of_detail: device pixels per unit of 'target'
+        """
+        if self.image.isNull():
+            return
+
+        scale = level_of_detail * min(
+            target.width() / self.image.width(), target.height() / self.image.height()
+        )
+        n = self.levelForScale(scale)
+        image = self.level(n)
+
+        if exposed is None or exposed.isEmpty():
+            exposed = target
+        exposed = exposed.intersected(target)
+        if exposed.isEmpty():
+            return
+
+        # Size of a tile in target units
+        tw = self.tile_size * target.width() / image.width()
+        th = self.tile_size * target.height() / image.height()
+
+        ncolumns = (image.width() - 1) // self.tile_size + 1
+        nrows = (image.height() - 1) // self.tile_size + 1
+
+        c0 = max(int((exposed.left() - target.left()) / tw), 0)
+        c1 = min(int(np.ceil((exposed.right() - target.left()) / tw)), ncolumns)
+        r0 = max(int((exposed.top() - target.top()) / th), 0)
+        r1 = min(int(np.ceil((exposed.bottom() - target.top()) / th)), nrows)
+
+        sx, sy = tw / self.tile_size, th / self.tile_size
+        for row in range(r0, r1):
+            for column in range(c0, c1):
+                tile = self.tile(n, row, column)
+                rect = QtCore.QRectF(
+                    target.left() + column * tw,
+                    target.top() + row * th,
+                    tile.width() * sx,
+                    tile.height() * sy,
+                )
+                painter.drawImage(rect, tile)
@@ -1,5 +1,5 @@
 import numpy as np
-from PySide6 import QtGui
+from PySide6 import QtCore, QtGui
 
 import pewpew.lib.polyext
 from pewpew.lib.numpyqt import polygonf_to_array
@@ -14,6 +14,39 @@ def polygonf_contains_points(
     return result
 
 
+def polygonf_to_mask(
+    polygon: QtGui.QPolygonF,
+    shape: tuple[int, int],
+    pixel_size: QtCore.QSizeF = QtCore.QSizeF(1.0, 1.0),
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """Rasterise a polygon to the pixels with centers inside it.
+
+    Only the region of the image covered by the polygon is returned.
+
+    Args:
+        polygon: polygon in image coordinates
+        shape: (rows, columns) of the image
+        pixel_size: size of an image pixel
+
+    Returns:
+        bool mask of the region
+        (row, column) offset of the region
+    """
+    if polygon.isEmpty():
+        return np.zeros((0, 0), dtype=bool), (0, 0)
+    poly_array = polygonf_to_array(polygon) / [pixel_size.width(), pixel_size.height()]
+
+    x0, y0 = np.floor(np.amin(poly_array, axis=0)).astype(int)
+    x1, y1 = np.ceil(np.amax(poly_array, axis=0)).astype(int)
+    x0, y0 = max(x0, 0), max(y0, 0)
+    x1, y1 = max(min(x1, shape[1]), x0), max(min(y1, shape[0]), y0)
+
+    mask = pewpew.lib.polyext.polygonf_to_mask(
+        poly_array - [x0, y0], int(y1 - y0), int(x1 - x0)
+    )
+    return mask, (int(y0), int(x0))
+
+
 def closest_nice_value(
     values: float | np.ndarray,
     allowed: np.ndarray | None = None,
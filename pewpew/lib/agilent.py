@@ -0,0 +1,172 @@
+"""Concurrent import of Agilent '.b' batches.
+
+Each line of a batch is acquired to a separate '.d' datafile. The datafiles are
+read in a pool of threads and the lines stacked in acquisition order. As with
+`pewlib.io.agilent.load`, the binary data is read first, falling back to the
+'.csv' exports of each datafile.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import numpy.lib.recfunctions as rfn
+from pewlib.io import agilent
+
+logger = logging.getLogger(__name__)
+
+
+def read_datafile_csv(datafile: Path) -> np.ndarray | None:
+    """Reads the '.csv' export of 'datafile', None if it does not exist."""
+    csv = datafile.joinpath(datafile.with_suffix(".csv").name)
+    if not csv.exists():
+        logger.warning(f"Missing csv '{csv}', line skipped.")
+        return None
+    return np.genfromtxt(
+        agilent.csv_valid_lines(csv),
+        delimiter=b",",
+        names=True,
+        dtype=np.float64,
+        deletechars="",
+    )
+
+
+def read_datafiles(
+    datafiles: list[Path],
+    read: Callable[[Path], np.ndarray | None],
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> list[np.ndarray]:
+    """Read 'datafiles' concurrently.
+
+    Args:
+        datafiles: datafiles to read, in line order
+        read: function returning the line of a datafile, None to skip
+        max_workers: number of threads, defaults to that of `ThreadPoolExecutor`
+        progress: called with the number of lines read and the total
+        cancelled: polled after each line, raises InterruptedError if True
+
+    Returns:
+        lines in the order of 'datafiles'
+    """
+    lines: list[np.ndarray | None] = [None] * len(datafiles)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures: dict[Future, int] = {
+            pool.submit(read, datafile): i for i, datafile in enumerate(datafiles)
+        }
+        try:
+            for completed, future in enumerate(as_completed(futures), 1):
+                lines[futures[future]] = future.result()
+                if progress is not None:
+                    progress(completed, len(datafiles))
+                if cancelled is not None and cancelled():
+                    raise InterruptedError("Import cancelled.")
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return [line for line in lines if line is not None]
+
+
+def load(
+    path: str | Path,
+    collection_methods: list[str] | None = None,
+    use_acq_for_names: bool = True,
+    counts_per_second: bool = False,
+    drop_names: list[str] | None = None,
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> tuple[np.ndarray, dict[str, Any]]:
+    """Imports an Agilent '.b' batch, reading datafiles concurrently.
+
+    By default `drop_names` drops the 'Time' field of binary imports and the
+    'Time_[Sec]' field of csv imports.
+
+    Args:
+        path: path to batch
+        collection_methods: list of datafile collection methods,
+            default = ['batch_xml', 'batch_csv']
+        use_acq_for_names: read element names from 'AcqMethod.xml', only for csv
+        counts_per_second: return data in CPS, only for binary
+        drop_names: names to remove from final array
+        max_workers: number of threads used to read datafiles
+        progress: called with the number of lines read and the total
+        cancelled: polled after each line, raises InterruptedError if True
+
+    Returns:
+        structured array of data, dict of params
+
+    See Also:
+        :func:`pewlib.io.agilent.load`
+    """
+    if isinstance(path, str):  # pragma: no cover
+        path = Path(path)
+
+    if collection_methods is None:
+        collection_methods = ["batch_xml", "batch_csv"]
+
+    datafiles = agilent.collect_datafiles(path, collection_methods)
+    if len(datafiles) == 0:  # pragma: no cover
+        logger.info("Falling back to alphabetical order for datafile collection.")
+        datafiles = agilent.find_datafiles_alphabetical(path)
+        if len(datafiles) == 0:
+            raise FileNotFoundError(f"No data files found in {path.name}!")
+
+    kwargs = dict(max_workers=max_workers, progress=progress, cancelled=cancelled)
+    try:
+        masses = agilent.mass_info_datafile(datafiles[0])
+        lines = read_datafiles(
+            datafiles,
+            partial(agilent.binary_read_datafile, masses=masses),
+            **kwargs,
+        )
+        time_name = "Time"
+    except InterruptedError:
+        raise
+    except Exception as e:
+        logger.info("Unable to import as binary, reverting to CSV import.")
+        logger.exception(e)
+        masses = None
+        lines = read_datafiles(datafiles, read_datafile_csv, **kwargs)
+        time_name = "Time_[Sec]"
+
+    if len(lines) == 0:
+        raise ValueError(f"No data read from {path.name}!")
+
+    sizes = np.array([line.size for line in lines])
+    acq_ends = np.cumsum(sizes)
+    acq_starts = acq_ends - sizes
+
+    data = np.stack(lines, axis=0)
+    assert data.dtype.names is not None
+
+    if masses is None and use_acq_for_names:
+        acq_xml = path.joinpath(agilent.acq_method_xml_path)
+        if acq_xml.exists():
+            names = agilent.acq_method_xml_read_elements(acq_xml)
+            data = rfn.rename_fields(
+                data, {old: new for old, new in zip(data.dtype.names[1:], names)}
+            )
+        else:  # pragma: no cover
+            logger.warning("AcqMethod.xml not found, cannot read names.")
+
+    params: dict[str, Any] = {"acq_starts": acq_starts, "acq_ends": acq_ends}
+    if time_name in data.dtype.names:
+        params["times"] = data[time_name]
+        params["scantime"] = np.round(
+            np.mean(np.diff(data[time_name].flat[: sizes[0]])), 4
+        )
+    else:  # pragma: no cover
+        logger.warning(f"'{time_name}' field not found, unable to import scantime.")
+
+    if masses is not None and counts_per_second:
+        for mass in masses:
+            data[str(mass)] /= mass.acctime
+
+    data = rfn.drop_fields(data, drop_names if drop_names is not None else [time_name])
+    return data, params
@@ -0,0 +1,67 @@
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+def _sizeof(value: Any) -> int:
+    return getattr(value, "nbytes", sys.getsizeof(value))
+
+
+class LRUCache(object):
+    """A least-recently-used cache with a memory budget.
+
+    Once the total size of stored values exceeds `max_bytes` the least recently
+    used values are discarded. Values larger than the budget are not stored.
+
+    Args:
+        max_bytes: memory budget, in bytes
+        sizeof: function returning the size of a value, defaults to `nbytes`
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        sizeof: Callable[[Any], int] | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or _sizeof
+        self.nbytes = 0
+
+        self._values: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def keys(self) -> list[Hashable]:
+        return list(self._values.keys())
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._values:
+            return default
+        self._values.move_to_end(key)
+        return self._values[key][0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.pop(key)
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        self._values[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, size) = self._values.popitem(last=False)
+            self.nbytes -= size
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        if key not in self._values:
+            return default
+        value, size = self._values.pop(key)
+        self.nbytes -= size
+        return value
+
+    def clear(self) -> None:
+        self._values.clear()
+        self.nbytes = 0
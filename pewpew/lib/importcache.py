@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from importlib.metadata import version
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+
+def _json_default(x):
+    if hasattr(x, "tolist"):  # numpy arrays and scalars
+        return x.tolist()
+    raise TypeError(f"Object of type {type(x).__name__} is not JSON serializable")
+
+
+class ImportCache(object):
+    """A persistent cache of parsed vendor data.
+
+    Entries are keyed by the resolved path, modification time and size of each
+    file at the path (recursively for directories), the import options and
+    the version of pewlib. Each entry is stored as an uncompressed '.npz' of the
+    structured data with the import parameters and information as JSON.
+
+    Once the total size of entries exceeds `max_bytes` the least recently used
+    are removed. Entries are written atomically, the cache may be shared by
+    multiple processes.
+
+    Args:
+        directory: directory to store entries
+        max_bytes: size limit of the cache, in bytes
+    """
+
+    def __init__(self, directory: Path | str, max_bytes: int = 1 << 30):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(self, path: Path, options: dict | None = None) -> str:
+        """Hash of the state of the files at 'path' and the import 'options'.
+
+        The key should be created before parsing, so that changes made during
+        parsing are not hidden.
+        """
+        path = path.resolve()
+        files = sorted(path.rglob("*")) if path.is_dir() else [path]
+
+        hash = hashlib.sha256()
+        hash.update(f"{CACHE_FORMAT_VERSION};{version('pewlib')};".encode())
+        hash.update(json.dumps(options or {}, sort_keys=True).encode())
+        hash.update(str(path).encode())
+        for file in files:
+            stat = file.stat()
+            name = file.relative_to(path.parent)
+            hash.update(f";{name}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+        return hash.hexdigest()
+
+    def entryPath(self, key: str) -> Path:
+        return self.directory.joinpath(key + ".npz")
+
+    def get(self, key: str) -> tuple[np.ndarray, dict, dict[str, str]] | None:
+        """The cached (data, params, info) for 'key' or None, see `key`."""
+        entry = self.entryPath(key)
+        try:
+            with np.load(entry) as npz:
+                data = npz["data"]
+                meta = json.loads(str(npz["meta"]))
+            os.utime(entry)  # mark as used
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # corrupt entry
+            logger.warning(f"Unable to read import cache entry {entry.name}: {e}")
+            entry.unlink(missing_ok=True)
+            return None
+        return data, meta["params"], meta["info"]
+
+    def put(
+        self, key: str, data: np.ndarray, params: dict, info: dict[str, str]
+    ) -> None:
+        """Store the parsed data for 'key', see `key`."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta = json.dumps({"params": params, "info": info}, default=_json_default)
+
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                np.savez(fp, data=data, meta=np.array(meta))
+            os.replace(tmp, self.entryPath(key))
+        except Exception:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def clear(self) -> None:
+        for entry in self.directory.glob("*.npz"):
+            entry.unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until under `max_bytes`."""
+        entries = []
+        for entry in self.directory.glob("*.npz"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # removed by another process
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    @property
+    def nbytes(self) -> int:
+        return sum(entry.stat().st_size for entry in self.directory.glob("*.npz"))
@@ -0,0 +1,279 @@
+"""Parallel extraction of ion images from imzML datasets.
+
+The spectra are split into chunks that are processed in a pool of worker
+processes, each reading a memory-mapped '.ibd'. Only the spectra offsets and
+the extraction windows are sent to the workers, which return the summed
+intensities of each spectrum to be placed in the output image.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+from pewlib.io.imzml import ImzML
+
+from pewpew.lib.imzmlindex import read_arrays, spectra_array
+
+logger = logging.getLogger(__name__)
+
+# Binaries mapped by each worker process
+_binaries: dict[Path, np.ndarray] = {}
+
+
+def open_binary(path: Path) -> np.ndarray:
+    """Memory-maps the '.ibd' at 'path' as bytes."""
+    # A plain array view, slicing a memmap is slow
+    return np.asarray(np.memmap(path, dtype=np.uint8, mode="r"))
+
+
+def _worker_binary(path: Path) -> np.ndarray:
+    if path not in _binaries:
+        _binaries[path] = open_binary(path)
+    return _binaries[path]
+
+
+def mass_range(imzml: ImzML) -> tuple[float, float]:
+    """The lowest and highest m/z, reading only the ends of each m/z array.
+
+    See Also:
+        :meth:`pewlib.io.imzml.ImzML.mass_range`
+    """
+    spectra = spectra_array(imzml)
+    spectra = spectra[spectra["mz_length"] > 0]
+    if spectra.size == 0:
+        return np.inf, -np.inf
+    binary = open_binary(imzml.external_binary)
+    dtype = np.dtype(imzml.mz_params.dtype)
+    itemsize = dtype.itemsize
+    first = spectra["mz_offset"][:, None] + np.arange(itemsize)
+    last = first + spectra["mz_length"][:, None] - itemsize
+    return (
+        float(np.amin(binary[first].copy().view(dtype))),
+        float(np.amax(binary[last].copy().view(dtype))),
+    )
+
+
+def extract_chunk(
+    binary: Path | np.ndarray,
+    spectra: np.ndarray,
+    mz_dtype: np.dtype,
+    intensity_dtype: np.dtype,
+    windows: np.ndarray,
+) -> np.ndarray:
+    """Sums the intensities of 'spectra' within each window, including both edges.
+
+    Args:
+        binary: the mapped '.ibd', or a path mapped once per process
+        spectra: spectra to read, see `pewpew.lib.imzmlindex.spectra_dtype`
+        mz_dtype: dtype of the m/z arrays
+        intensity_dtype: dtype of the intensity arrays
+        windows: lower and upper m/z of each window, shape (N, 2)
+
+    Returns:
+        summed intensities, shape (spectra, N)
+    """
+    if isinstance(binary, Path):
+        binary = _worker_binary(binary)
+    data = np.empty(
+        (spectra.size, windows.shape[0]),
+        dtype=np.promote_types(intensity_dtype, np.float32),
+    )
+    for i, (mz_off, mz_len, int_off, int_len) in enumerate(
+        zip(
+            spectra["mz_offset"].tolist(),
+            spectra["mz_length"].tolist(),
+            spectra["intensity_offset"].tolist(),
+            spectra["intensity_length"].tolist(),
+        )
+    ):
+        mz = binary[mz_off : mz_off + mz_len].view(mz_dtype)
+        intensity = binary[int_off : int_off + int_len].view(intensity_dtype)
+        cumsum = np.zeros(intensity.size + 1, dtype=np.float64)
+        np.cumsum(intensity, out=cumsum[1:])
+        lower = np.searchsorted(mz, windows[:, 0], side="left")
+        upper = np.searchsorted(mz, windows[:, 1], side="right")
+        data[i] = cumsum[upper] - cumsum[lower]
+    return data
+
+
+def extract_masses(
+    imzml: ImzML,
+    target_masses: np.ndarray | float,
+    mass_width_ppm: float | None = None,
+    mass_width_mz: float | None = None,
+    chunk_size: int = 1024,
+    max_workers: int | None = None,
+    min_chunks: int = 4,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> np.ndarray:
+    """Extracts images of one or more m/z, in parallel.
+
+    Data within +/- 0.5 `mass_width_ppm` or `mass_width_mz` is summed, pixels
+    without a spectrum are NaN. Windows include both edges and empty windows are
+    0. This differs from :meth:`pewlib.io.imzml.ImzML.extract_masses`, which
+    excludes the upper edge and returns a neighbouring intensity for empty
+    windows. Small datasets, of fewer than `min_chunks` chunks, or those with
+    `max_workers` of 1 are processed without a pool.
+
+    Args:
+        imzml: dataset to extract from
+        target_masses: m/z to extract
+        mass_width_ppm: extraction width in ppm
+        mass_width_mz: extraction width in m/z (Da)
+        chunk_size: spectra processed by each task
+        max_workers: number of processes, defaults to that of `ProcessPoolExecutor`
+        min_chunks: minimum number of chunks to use a pool
+        progress: called with the number of spectra extracted and the total
+        cancelled: polled after each chunk, raises InterruptedError if True
+
+    Returns:
+        array of intensities, shape (Y, X, N)
+    """
+    target_masses = np.atleast_1d(target_masses)
+    if mass_width_ppm is not None and mass_width_mz is None:
+        widths = target_masses * mass_width_ppm / 1e6 / 2.0
+    elif mass_width_mz is not None and mass_width_ppm is None:
+        widths = np.full(target_masses.size, mass_width_mz / 2.0)
+    else:
+        raise ValueError("one of 'mass_width_ppm' or 'mass_width_mz' must be supplied.")
+    windows = np.stack((target_masses - widths, target_masses + widths), axis=1)
+
+    spectra = spectra_array(imzml)
+    mz_dtype = np.dtype(imzml.mz_params.dtype)
+    intensity_dtype = np.dtype(imzml.intensity_params.dtype)
+    path = imzml.external_binary.resolve()
+
+    sx, sy = imzml.image_size
+    data = np.full(
+        (sy, sx, target_masses.size),
+        np.nan,
+        dtype=np.promote_types(intensity_dtype, np.float32),
+    )
+
+    chunks = [
+        slice(start, min(start + chunk_size, spectra.size))
+        for start in range(0, spectra.size, chunk_size)
+    ]
+    done = 0
+
+    def chunk_completed(chunk: slice, result: np.ndarray) -> None:
+        nonlocal done
+        data[spectra["y"][chunk] - 1, spectra["x"][chunk] - 1] = result
+        done += chunk.stop - chunk.start
+        if progress is not None:
+            progress(done, spectra.size)
+        if cancelled is not None and cancelled():
+            raise InterruptedError("Extraction cancelled.")
+
+    if len(chunks) < min_chunks or max_workers == 1:
+        binary = open_binary(path)
+        for chunk in chunks:
+            result = extract_chunk(
+                binary, spectra[chunk], mz_dtype, intensity_dtype, windows
+            )
+            chunk_completed(chunk, result)
+        return data
+
+    # Spawn to avoid forking the Qt threads of this process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        futures: dict[Future, slice] = {
+            pool.submit(
+                extract_chunk,
+                path,
+                spectra[chunk],
+                mz_dtype,
+                intensity_dtype,
+                windows,
+            ): chunk
+            for chunk in chunks
+        }
+        try:
+            for future in as_completed(futures):
+                chunk_completed(futures[future], future.result())
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return data
+
+
+def tic_and_mean_spectrum(
+    imzml: ImzML,
+    bin_width: float = 0.01,
+    chunk_size: int = 1024,
+    partial: (
+        Callable[[np.ndarray, np.ndarray, np.ndarray, int, int], None] | None
+    ) = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The TIC image and binned mean spectrum, in a single pass of the binary.
+
+    The TIC is read from the imzML if available, otherwise the intensities of
+    each spectrum are summed. The mean spectrum only includes non-zero bins.
+
+    Args:
+        imzml: dataset to summarise
+        bin_width: width of mean spectrum bins, in m/z (Da)
+        chunk_size: spectra read at once
+        partial: called after each chunk with the TIC, bin m/z, mean intensity
+            of the spectra read so far and the number of spectra read and total,
+            the TIC is updated in place
+        cancelled: polled after each chunk, raises InterruptedError if True
+
+    Returns:
+        TIC image (Y, X), m/z of bins, mean intensity of bins
+    """
+    spectra = spectra_array(imzml)
+    mz_dtype = np.dtype(imzml.mz_params.dtype)
+    intensity_dtype = np.dtype(imzml.intensity_params.dtype)
+    sizes = spectra["intensity_length"] // intensity_dtype.itemsize
+
+    sx, sy = imzml.image_size
+    tic = np.full((sy, sx), np.nan, dtype=np.float64)
+
+    low, high = mass_range(imzml)
+    if spectra.size == 0 or low > high:
+        return tic, np.array([]), np.array([])
+    nbins = int((high - low) / bin_width) + 1
+    sums = np.zeros(nbins, dtype=np.float64)
+
+    def mean_spectrum(count: int) -> tuple[np.ndarray, np.ndarray]:
+        nonzero = np.flatnonzero(sums)
+        return low + (nonzero + 0.5) * bin_width, sums[nonzero] / count
+
+    binary = open_binary(imzml.external_binary)
+    for start in range(0, spectra.size, chunk_size):
+        chunk = spectra[start : start + chunk_size]
+        mz = read_arrays(binary, chunk["mz_offset"], chunk["mz_length"], mz_dtype)
+        intensity = read_arrays(
+            binary,
+            chunk["intensity_offset"],
+            chunk["intensity_length"],
+            intensity_dtype,
+        )
+
+        bins = ((mz - low) / bin_width).astype(np.int64)
+        np.clip(bins, 0, nbins - 1, out=bins)
+        sums += np.bincount(bins, weights=intensity, minlength=nbins)
+
+        chunk_tic = chunk["tic"].copy()
+        missing = np.isnan(chunk_tic)
+        if np.any(missing):
+            chunk_sizes = sizes[start : start + chunk_size]
+            ends = np.cumsum(chunk_sizes)
+            cumsum = np.zeros(intensity.size + 1, dtype=np.float64)
+            np.cumsum(intensity, out=cumsum[1:])
+            chunk_tic[missing] = (cumsum[ends] - cumsum[ends - chunk_sizes])[missing]
+        tic[chunk["y"] - 1, chunk["x"] - 1] = chunk_tic
+
+        done = start + chunk.size
+        if partial is not None:
+            partial(tic, *mean_spectrum(done), done, spectra.size)
+        if cancelled is not None and cancelled():
+            raise InterruptedError("Summary cancelled.")
+
+    return (tic, *mean_spectrum(spectra.size))
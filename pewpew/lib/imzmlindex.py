@@ -0,0 +1,488 @@
+"""Persistent indexes of imzML datasets.
+
+Parsing the XML of an imzML is slow for large datasets, but only the position,
+TIC and binary offsets of each spectrum are needed to read it. These are stored
+in a sidecar directory next to the '.imzML', with the scan settings and the
+params of the binary arrays, so that re-opening a dataset skips XML parsing.
+
+The index is validated by the size and modification time of the '.imzML' and
+'.ibd' and is rebuilt if either changes. The TIC image and mean spectrum of the
+dataset can also be stored, see :meth:`ImzMLIndex.saveSummary`.
+
+An optional m/z index, :class:`MassIndex`, stores every centroid of the dataset
+sorted by m/z alongside its intensity and pixel. Ion images of any window are
+then extracted from a contiguous slice of memory-mapped arrays, rather than by
+reading every spectrum.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+from pewlib.io.imzml import ImzML, ParamGroup, ScanSettings, Spectrum
+
+logger = logging.getLogger(__name__)
+
+spectra_dtype = np.dtype(
+    [
+        ("x", np.int32),
+        ("y", np.int32),
+        ("tic", np.float64),
+        ("mz_offset", np.int64),
+        ("mz_length", np.int64),
+        ("intensity_offset", np.int64),
+        ("intensity_length", np.int64),
+    ]
+)
+
+
+def _write_atomic(path: Path, write) -> None:
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            write(fp)
+        os.replace(tmp, path)
+    except Exception:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _stat(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _chunks(sizes: np.ndarray, chunk_size: int) -> Generator[slice, None, None]:
+    """Slices of consecutive spectra, each with about 'chunk_size' centroids."""
+    ends = np.cumsum(sizes)
+    start = 0
+    while start < sizes.size:
+        end = int(np.searchsorted(ends, ends[start] - sizes[start] + chunk_size))
+        end = max(start + 1, min(end, sizes.size))
+        yield slice(start, end)
+        start = end
+
+
+def spectra_array(imzml: ImzML) -> np.ndarray:
+    """The spectra of 'imzml' as an array, see `spectra_dtype`."""
+    mz_id, intensity_id = imzml.mz_params.id, imzml.intensity_params.id
+    array = np.empty(len(imzml.spectra), dtype=spectra_dtype)
+    for i, spectrum in enumerate(imzml.spectra.values()):
+        array[i] = (
+            spectrum.x,
+            spectrum.y,
+            np.nan if spectrum.tic is None else spectrum.tic,
+            spectrum.offsets[mz_id],
+            spectrum.lengths[mz_id],
+            spectrum.offsets[intensity_id],
+            spectrum.lengths[intensity_id],
+        )
+    return array
+
+
+def read_arrays(
+    binary: np.ndarray, offsets: np.ndarray, lengths: np.ndarray, dtype: np.dtype
+) -> np.ndarray:
+    """The concatenated arrays of 'binary' at 'offsets', each 'lengths' bytes."""
+    return np.concatenate(
+        [
+            binary[offset : offset + length].view(dtype)
+            for offset, length in zip(offsets.tolist(), lengths.tolist())
+        ]
+    )
+
+
+class ImzMLIndex(object):
+    """The sidecar index of an imzML and its binary.
+
+    The index is stored in the directory 'imzml' with suffix '.pewidx'.
+
+    Args:
+        imzml: path to the '.imzML'
+        external_binary: path to the '.ibd', default is 'imzml' with suffix '.ibd'
+    """
+
+    version = 1
+    header_name = "header.json"
+    spectra_name = "spectra.npy"
+    mass_index_name = "mass_index.json"
+    mass_index_arrays = ["mz", "pixel", "intensity"]
+    tic_name = "tic.npy"
+    mean_spectrum_name = "mean_spectrum.npy"
+
+    def __init__(self, imzml: Path | str, external_binary: Path | str | None = None):
+        self.imzml = Path(imzml)
+        if external_binary is None:
+            external_binary = self.imzml.with_suffix(".ibd")
+        self.external_binary = Path(external_binary)
+        self.path = self.imzml.with_suffix(".pewidx")
+
+    def sources(self) -> dict[str, list[int]]:
+        """The size and modification time of the indexed files."""
+        return {
+            "imzml": _stat(self.imzml),
+            "external_binary": _stat(self.external_binary),
+        }
+
+    def header(self) -> dict[str, Any] | None:
+        """The header of a valid index, None if invalid or missing."""
+        try:
+            header = json.loads(self.path.joinpath(self.header_name).read_text())
+            sources = self.sources()
+        except (OSError, ValueError):
+            return None
+        if header.get("version") != self.version or header.get("sources") != sources:
+            return None
+        return header
+
+    def isValid(self) -> bool:
+        return self.header() is not None
+
+    def load(self) -> ImzML:
+        """Reads the indexed imzML, without parsing the XML.
+
+        Raises:
+            ValueError: if the index is invalid
+        """
+        header = self.header()
+        if header is None:
+            raise ValueError(f"No valid index for '{self.imzml.name}'.")
+
+        mz_id, mz_dtype = header["mz_params"]
+        intensity_id, intensity_dtype = header["intensity_params"]
+        array = np.load(self.path.joinpath(self.spectra_name))
+
+        spectra: dict[tuple[int, int], Spectrum] = {}
+        for x, y, tic, mz_off, mz_len, int_off, int_len in array.tolist():
+            spectra[(x, y)] = Spectrum(
+                (x, y),
+                None if np.isnan(tic) else tic,
+                {mz_id: mz_off, intensity_id: int_off},
+                {mz_id: mz_len, intensity_id: int_len},
+            )
+
+        image_size = header["image_size"]
+        return ImzML(
+            ScanSettings(
+                tuple(image_size) if image_size is not None else None,
+                tuple(header["pixel_size"]),
+            ),
+            ParamGroup(mz_id, np.dtype(mz_dtype).type, external=True),
+            ParamGroup(intensity_id, np.dtype(intensity_dtype).type, external=True),
+            spectra,
+            external_binary=self.external_binary,
+        )
+
+    def save(self, imzml: ImzML) -> None:
+        """Indexes 'imzml', replacing any existing index.
+
+        Raises:
+            OSError: if the index cannot be written
+        """
+        mz_id, intensity_id = imzml.mz_params.id, imzml.intensity_params.id
+        array = spectra_array(imzml)
+
+        image_size = imzml.scan_settings.image_size
+        header = {
+            "version": self.version,
+            "sources": self.sources(),
+            "image_size": list(image_size) if image_size is not None else None,
+            "pixel_size": list(imzml.scan_settings.pixel_size),
+            "mz_params": [mz_id, np.dtype(imzml.mz_params.dtype).str],
+            "intensity_params": [
+                intensity_id,
+                np.dtype(imzml.intensity_params.dtype).str,
+            ],
+        }
+
+        # Any existing files belong to the previous index
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        self.path.mkdir()
+        _write_atomic(
+            self.path.joinpath(self.spectra_name), lambda fp: np.save(fp, array)
+        )
+        # Written last, the index is only valid once complete
+        _write_atomic(
+            self.path.joinpath(self.header_name),
+            lambda fp: fp.write(json.dumps(header).encode()),
+        )
+        logger.info(f"Indexed {len(array)} spectra of '{self.imzml.name}'.")
+
+    def spectra(self) -> np.ndarray:
+        """The indexed spectra, see `spectra_dtype`."""
+        return np.load(self.path.joinpath(self.spectra_name))
+
+    def summary(self) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+        """The stored TIC image, m/z and mean intensity, None if not stored."""
+        if not self.isValid():
+            return None
+        try:
+            tic = np.load(self.path.joinpath(self.tic_name))
+            spectrum = np.load(self.path.joinpath(self.mean_spectrum_name))
+        except (OSError, ValueError):
+            return None
+        return tic, spectrum["m/z"], spectrum["intensity"]
+
+    def saveSummary(self, tic: np.ndarray, mz: np.ndarray, mean: np.ndarray) -> None:
+        """Stores the TIC image and mean spectrum of the dataset.
+
+        Raises:
+            ValueError: if the index is invalid
+            OSError: if the summary cannot be written
+        """
+        if not self.isValid():
+            raise ValueError(f"No valid index for '{self.imzml.name}'.")
+        spectrum = np.empty(
+            mz.size, dtype=[("m/z", np.float64), ("intensity", np.float64)]
+        )
+        spectrum["m/z"], spectrum["intensity"] = mz, mean
+        _write_atomic(
+            self.path.joinpath(self.mean_spectrum_name),
+            lambda fp: np.save(fp, spectrum),
+        )
+        _write_atomic(self.path.joinpath(self.tic_name), lambda fp: np.save(fp, tic))
+
+    def hasMassIndex(self) -> bool:
+        if not self.isValid():
+            return False
+        return self.path.joinpath(self.mass_index_name).exists()
+
+    def massIndex(self) -> "MassIndex":
+        """The m/z index of the dataset.
+
+        Raises:
+            ValueError: if there is no valid m/z index
+        """
+        header = self.header()
+        if header is None or not self.hasMassIndex():
+            raise ValueError(f"No valid m/z index for '{self.imzml.name}'.")
+
+        spectra = self.spectra()
+        if header["image_size"] is not None:
+            x, y = header["image_size"]
+        else:
+            x, y = int(np.amax(spectra["x"])), int(np.amax(spectra["y"]))
+        mask = np.zeros((y, x), dtype=bool)
+        mask[spectra["y"] - 1, spectra["x"] - 1] = True
+
+        mz, pixel, intensity = (
+            np.load(self.path.joinpath(f"{name}.npy"), mmap_mode="r")
+            for name in self.mass_index_arrays
+        )
+        return MassIndex(mz, pixel, intensity, mask)
+
+    def buildMassIndex(
+        self,
+        chunk_size: int = 1 << 22,
+        bucket_size: int = 1 << 23,
+        progress: Callable[[int, int], None] | None = None,
+        cancelled: Callable[[], bool] | None = None,
+    ) -> None:
+        """Builds the m/z index of the indexed dataset.
+
+        Centroids are sorted out of memory, in two passes of the binary. The first
+        counts the centroids in fine m/z bins, which are grouped into buckets of
+        about 'bucket_size' centroids. The second scatters each centroid to the
+        position of its bucket in the memory-mapped output. Each bucket is then
+        sorted in memory.
+
+        Args:
+            chunk_size: centroids read at once
+            bucket_size: centroids sorted at once
+            progress: called with the number of steps completed and the total
+            cancelled: polled after each step, raises InterruptedError if True
+
+        Raises:
+            ValueError: if the index is invalid
+            OSError: if the index cannot be written
+        """
+        header = self.header()
+        if header is None:
+            raise ValueError(f"No valid index for '{self.imzml.name}'.")
+
+        spectra = self.spectra()
+        mz_dtype = np.dtype(header["mz_params"][1])
+        intensity_dtype = np.dtype(header["intensity_params"][1])
+        sizes = spectra["mz_length"] // mz_dtype.itemsize
+        if header["image_size"] is not None:
+            width = header["image_size"][0]
+        else:
+            width = int(np.amax(spectra["x"]))
+        pixels = ((spectra["y"] - 1) * width + spectra["x"] - 1).astype(np.int32)
+
+        binary = np.memmap(self.external_binary, dtype=np.uint8, mode="r")
+        chunks = list(_chunks(sizes, chunk_size))
+        # Fine bins of constant relative width, about 200 ppm
+        edges = np.geomspace(1.0, 1e6, 1 << 16)
+
+        step, total = 0, 2 * len(chunks)
+
+        def step_completed() -> None:
+            nonlocal step
+            step += 1
+            if progress is not None:
+                progress(step, total)
+            if cancelled is not None and cancelled():
+                raise InterruptedError("Indexing cancelled.")
+
+        counts = np.zeros(edges.size + 1, dtype=np.int64)
+        for chunk in chunks:
+            mz = read_arrays(
+                binary,
+                spectra["mz_offset"][chunk],
+                spectra["mz_length"][chunk],
+                mz_dtype,
+            )
+            counts += np.bincount(np.searchsorted(edges, mz), minlength=counts.size)
+            step_completed()
+
+        # Consecutive bins are grouped into buckets
+        _, bucket_of_bin = np.unique(
+            (np.cumsum(counts) - counts) // bucket_size, return_inverse=True
+        )
+        bucket_counts = np.bincount(bucket_of_bin, weights=counts).astype(np.int64)
+        bucket_ends = np.cumsum(bucket_counts)
+        bucket_starts = bucket_ends - bucket_counts
+        total += bucket_counts.size
+
+        paths = {
+            name: self.path.joinpath(f"{name}.npy.tmp")
+            for name in self.mass_index_arrays
+        }
+        try:
+            arrays = {
+                name: np.lib.format.open_memmap(
+                    path, mode="w+", dtype=dtype, shape=(int(sizes.sum()),)
+                )
+                for (name, path), dtype in zip(
+                    paths.items(), [mz_dtype, np.int32, intensity_dtype]
+                )
+            }
+
+            filled = bucket_starts.copy()
+            for chunk in chunks:
+                mz = read_arrays(
+                    binary,
+                    spectra["mz_offset"][chunk],
+                    spectra["mz_length"][chunk],
+                    mz_dtype,
+                )
+                intensity = read_arrays(
+                    binary,
+                    spectra["intensity_offset"][chunk],
+                    spectra["intensity_length"][chunk],
+                    intensity_dtype,
+                )
+                pixel = np.repeat(pixels[chunk], sizes[chunk])
+
+                buckets = bucket_of_bin[np.searchsorted(edges, mz)]
+                order = np.argsort(buckets, kind="stable")
+                buckets = buckets[order]
+                chunk_counts = np.bincount(buckets, minlength=bucket_counts.size)
+                rank = (
+                    np.arange(buckets.size)
+                    - (np.cumsum(chunk_counts) - chunk_counts)[buckets]
+                )
+                dest = filled[buckets] + rank
+                arrays["mz"][dest] = mz[order]
+                arrays["pixel"][dest] = pixel[order]
+                arrays["intensity"][dest] = intensity[order]
+                filled += chunk_counts
+                step_completed()
+
+            for start, end in zip(bucket_starts, bucket_ends):
+                order = np.argsort(arrays["mz"][start:end], kind="stable")
+                for array in arrays.values():
+                    array[start:end] = array[start:end][order]
+                step_completed()
+
+            for array in arrays.values():
+                array.flush()
+            del arrays
+            for name, path in paths.items():
+                os.replace(path, self.path.joinpath(f"{name}.npy"))
+        finally:
+            for path in paths.values():
+                path.unlink(missing_ok=True)
+
+        _write_atomic(
+            self.path.joinpath(self.mass_index_name),
+            lambda fp: fp.write(json.dumps({"size": int(sizes.sum())}).encode()),
+        )
+        logger.info(f"Indexed {sizes.sum()} centroids of '{self.imzml.name}' by m/z.")
+
+
+class MassIndex(object):
+    """Centroids of an imzML sorted by m/z.
+
+    Create using :meth:`ImzMLIndex.massIndex`.
+
+    Args:
+        mz: sorted m/z of each centroid
+        pixel: flat pixel index of each centroid
+        intensity: intensity of each centroid
+        mask: pixels with a spectrum, shape (Y, X)
+    """
+
+    def __init__(
+        self, mz: np.ndarray, pixel: np.ndarray, intensity: np.ndarray, mask: np.ndarray
+    ):
+        self.mz = mz
+        self.pixel = pixel
+        self.intensity = intensity
+        self.mask = mask
+
+    def extract_masses(
+        self,
+        target_masses: np.ndarray | float,
+        mass_width_ppm: float | None = None,
+        mass_width_mz: float | None = None,
+    ) -> np.ndarray:
+        """Extracts image of one or more m/z.
+
+        Data within +/- 0.5 `mass_width_ppm` or `mass_width_mz` is summed, pixels
+        without a spectrum are NaN. Windows include both edges and empty windows
+        are 0, as for :func:`pewpew.lib.imzmlextract.extract_masses`. This differs
+        from :meth:`pewlib.io.imzml.ImzML.extract_masses`, which excludes the upper
+        edge and returns a neighbouring intensity for empty windows.
+
+        Args:
+            target_masses: m/z to extract
+            mass_width_ppm: extraction width in ppm
+            mass_width_mz: extraction width in m/z (Da)
+
+        Returns:
+            array of intensities, shape (Y, X, N)
+        """
+        target_masses = np.atleast_1d(target_masses)
+        if mass_width_ppm is not None and mass_width_mz is None:
+            widths = target_masses * mass_width_ppm / 1e6 / 2.0
+        elif mass_width_mz is not None and mass_width_ppm is None:
+            widths = np.full(target_masses.size, mass_width_mz / 2.0)
+        else:
+            raise ValueError(
+                "one of 'mass_width_ppm' or 'mass_width_mz' must be supplied."
+            )
+
+        starts = np.searchsorted(self.mz, target_masses - widths, side="left")
+        ends = np.searchsorted(self.mz, target_masses + widths, side="right")
+
+        data = np.empty(
+            (*self.mask.shape, target_masses.size),
+            dtype=np.promote_types(self.intensity.dtype, np.float32),
+        )
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            data[:, :, i] = np.bincount(
+                self.pixel[start:end],
+                weights=self.intensity[start:end],
+                minlength=self.mask.size,
+            ).reshape(self.mask.shape)
+        data[~self.mask] = np.nan
+        return data
@@ -0,0 +1,334 @@
+"""Lazy loading of pew² '.npz' documents.
+
+Only the small members of the archive (header, info, calibration and config)
+are read on load, the laser data is read on first access.
+
+Documents saved with :func:`pewlib.io.npz.save` store the data as a single
+compressed structured array, which must be read completely. Archives written
+by pew² for its own use (projects and autosaves) instead store each element as
+an uncompressed single field array, 'data/<index>.npy', see
+:func:`write_elements`. These elements are memory-mapped individually by
+:meth:`LazyNpzLaser.get`, so only the elements displayed are read.
+"""
+
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+import numpy as np
+from pewlib.calibration import Calibration
+from pewlib.config import Config, SpotConfig
+from pewlib.laser import Laser
+
+
+def read_npy_header(fp) -> tuple[np.dtype, tuple[int, ...], bool]:
+    """Reads the dtype, shape and order of a '.npy' file object."""
+    major, _ = np.lib.format.read_magic(fp)
+    if major == 1:
+        shape, fortran, dtype = np.lib.format.read_array_header_1_0(fp)
+    else:
+        shape, fortran, dtype = np.lib.format.read_array_header_2_0(fp)
+    return dtype, shape, fortran
+
+
+def write_elements(
+    zf: zipfile.ZipFile,
+    prefix: str,
+    data: np.ndarray,
+    chunk_size: int = 1 << 24,
+    cancelled: Callable[[], bool] | None = None,
+) -> None:
+    """Writes each element of 'data' as a stored member '<prefix>data/<i>.npy'.
+
+    Members are single field structured arrays, storing the element name.
+
+    Args:
+        zf: archive to write to
+        prefix: prefix of member names
+        data: structured array
+        chunk_size: approximate bytes written at once
+        cancelled: polled after each chunk, raises InterruptedError if True
+    """
+    for i, name in enumerate(data.dtype.names):
+        element = data[name]
+        header = {
+            "descr": np.lib.format.dtype_to_descr(np.dtype([(name, element.dtype)])),
+            "fortran_order": False,
+            "shape": element.shape,
+        }
+        row_size = element.itemsize * int(np.prod(element.shape[1:]))
+        rows = max(1, chunk_size // max(1, row_size))
+        with zf.open(f"{prefix}data/{i}.npy", "w", force_zip64=True) as fp:
+            np.lib.format.write_array_header_1_0(fp, header)
+            for start in range(0, element.shape[0], rows):
+                if cancelled is not None and cancelled():
+                    raise InterruptedError("Write cancelled.")
+                fp.write(np.ascontiguousarray(element[start : start + rows]).data)
+
+
+def read_elements(
+    zf: zipfile.ZipFile, prefix: str = ""
+) -> tuple[np.dtype, tuple[int, ...], dict[str, str]] | None:
+    """Reads the layout of elements written by :func:`write_elements`.
+
+    Returns:
+        dtype and shape of the data, dict mapping elements to members,
+        None if there are no element members
+    """
+    names = [
+        name
+        for name in zf.namelist()
+        if name.startswith(f"{prefix}data/") and name.endswith(".npy")
+    ]
+    if len(names) == 0:
+        return None
+    names.sort(key=lambda name: int(name[len(prefix) + 5 : -4]))
+
+    fields: list[tuple[str, np.dtype]] = []
+    members: dict[str, str] = {}
+    shape: tuple[int, ...] = ()
+    for name in names:
+        with zf.open(name) as fp:
+            dtype, shape, _ = read_npy_header(fp)
+        fields.append((dtype.names[0], dtype[0]))
+        members[dtype.names[0]] = name
+    return np.dtype(fields), shape, members
+
+
+def save_elements(
+    fp: BinaryIO | Path,
+    data: np.ndarray,
+    cancelled: Callable[[], bool] | None = None,
+    **arrays,
+) -> None:
+    """Writes an uncompressed '.npz' of 'arrays', with 'data' by element.
+
+    See :func:`write_elements`.
+    """
+    with zipfile.ZipFile(fp, "w") as zf:
+        for name, array in arrays.items():
+            with zf.open(f"{name}.npy", "w", force_zip64=True) as member:
+                np.lib.format.write_array(member, np.asanyarray(array))
+        write_elements(zf, "", data, cancelled=cancelled)
+
+
+class LazyNpzLaser(Laser):
+    """Laser with data loaded from a '.npz' archive on first use.
+
+    Elements and shape are available without loading the data.
+    If 'members' is passed, single elements are memory-mapped by :meth:`get`
+    until the data is loaded. Use :func:`load` to create.
+
+    Args:
+        path: path to the archive
+        dtype: dtype of the data
+        shape: shape of the data
+        calibration: dict mapping elements to calibrations, optional
+        config: laser parameters
+        info: dict (str, str) of additional info
+        member: name of the data member in the archive
+        members: dict mapping elements to members, see :func:`write_elements`
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        dtype: np.dtype,
+        shape: tuple[int, ...],
+        calibration: dict[str, Calibration] | None = None,
+        config: Config | None = None,
+        info: dict[str, str] | None = None,
+        member: str = "data.npy",
+        members: dict[str, str] | None = None,
+    ):
+        self.path = path
+        self.member = member
+        self.members = members
+        self._dtype = dtype
+        self._shape = shape
+        self._maps: dict[str, np.ndarray] = {}
+        self.updateSource()
+        super().__init__(None, calibration=calibration, config=config, info=info)
+
+    @property
+    def data(self) -> np.ndarray:
+        if self._data is None:
+            self._data = self.readData()
+            self._maps.clear()
+        return self._data
+
+    @data.setter
+    def data(self, data: np.ndarray | None) -> None:
+        self._data = data
+
+    @property
+    def elements(self) -> tuple[str, ...]:
+        if self._data is None:
+            return self._dtype.names
+        return self._data.dtype.names
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        if self._data is None:
+            return self._shape
+        return self._data.shape
+
+    def isLoaded(self) -> bool:
+        return self._data is not None
+
+    def isMapped(self) -> bool:
+        return len(self._maps) > 0
+
+    def isSourceModified(self) -> bool:
+        """Whether the archive was changed or removed since :meth:`updateSource`."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return True
+        return (stat.st_mtime_ns, stat.st_size) != self.source_stat
+
+    def updateSource(self) -> None:
+        """Records the current state of the archive, e.g. after writing to it."""
+        stat = self.path.stat()
+        self.source_stat = (stat.st_mtime_ns, stat.st_size)
+
+    def detach(self) -> None:
+        """Release any mapping of the archive."""
+        self._maps.clear()
+
+    def get(
+        self,
+        element: str | None = None,
+        calibrate: bool | None = False,
+        extent: tuple[float, float, float, float] | None = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """Get elemental data.
+
+        Single elements are memory-mapped if the data is not loaded.
+
+        See Also:
+            :meth:`pewlib.laser.Laser.get`
+        """
+        if self._data is not None or self.members is None or element is None:
+            return super().get(element, calibrate=calibrate, extent=extent, **kwargs)
+
+        if element not in self._maps:
+            self._maps[element] = self.mapElement(element)
+        data = self._maps[element]
+
+        if extent is not None:
+            x0, x1, y0, y1 = extent
+            px, py = self.config.get_pixel_width(), self.config.get_pixel_height()
+            x0, x1 = int(x0 / px), int(x1 / px)
+            y0, y1 = int(y0 / py), int(y1 / py)
+            data = data[y0:y1, x0:x1]
+
+        if calibrate:
+            data = self.calibration[element].calibrate(data)
+        return data
+
+    def mapElement(self, element: str) -> np.ndarray:
+        with zipfile.ZipFile(self.path) as zf:
+            zinfo = zf.getinfo(self.members[element])
+            with zf.open(zinfo) as fp:
+                if zinfo.compress_type != zipfile.ZIP_STORED:
+                    return np.lib.format.read_array(fp)[element]
+                dtype, shape, fortran = read_npy_header(fp)
+                header_size = fp.tell()
+
+            # Stored members are contiguous, skip the local file header
+            with open(self.path, "rb") as raw:
+                raw.seek(zinfo.header_offset + 26)
+                name_size, extra_size = np.frombuffer(raw.read(4), dtype="<u2")
+            offset = zinfo.header_offset + 30 + int(name_size) + int(extra_size)
+
+        # Copy on write, changes are never written to the archive
+        return np.memmap(
+            self.path,
+            dtype=dtype,
+            mode="c",
+            offset=offset + header_size,
+            shape=shape,
+            order="F" if fortran else "C",
+        )[element]
+
+    def readData(self) -> np.ndarray:
+        with zipfile.ZipFile(self.path) as zf:
+            if self.members is None:
+                with zf.open(self.member) as fp:
+                    return np.lib.format.read_array(fp)
+
+            data = np.empty(self._shape, dtype=self._dtype)
+            for element, member in self.members.items():
+                with zf.open(member) as fp:
+                    data[element] = np.lib.format.read_array(fp)[element]
+            return data
+
+
+def load(path: str | Path) -> Laser:
+    """Loads a '.npz' file, deferring loading of the data.
+
+    Files not supported by :class:`LazyNpzLaser` (SRR lasers and versions prior
+    to 0.8.0) are fully loaded using :func:`pewlib.io.npz.load`.
+
+    Args:
+        path: path to '.npz'
+
+    Returns:
+        :class:`LazyNpzLaser` or as per :func:`pewlib.io.npz.load`
+    """
+    from pewlib.io import npz as io_npz
+
+    path = Path(path)
+    with np.load(path) as archive:  # members are only read on access
+        if "header" not in archive.files:
+            return io_npz.load(path)
+        header = io_npz.unpack_info(archive["header"])
+        if (
+            header["class"] not in ["Laser", "Raster", "Spot"]
+            or io_npz.compare_version(str(header["version"]), "0.8.0") == -1
+        ):
+            return io_npz.load(path)
+
+        if header["class"] == "Spot":
+            config = SpotConfig.from_array(archive["config"])
+        else:
+            config = Config.from_array(archive["config"])
+        calibration = io_npz.unpack_calibration(archive["calibration"])
+        info = io_npz.unpack_info(archive["info"])
+
+    with zipfile.ZipFile(path) as zf:
+        if "data.npy" in zf.namelist():
+            with zf.open("data.npy") as fp:
+                dtype, shape, _ = read_npy_header(fp)
+            members = None
+        else:
+            dtype, shape, members = read_elements(zf)
+
+    info["Name"] = info.get("Name", path.stem)
+    info["File Path"] = str(path.resolve())
+    info["File Version"] = str(header["version"])
+
+    return LazyNpzLaser(
+        path,
+        dtype,
+        shape,
+        calibration=calibration,
+        config=config,
+        info=info,
+        members=members,
+    )
+
+
+def save(path: str | Path, laser: Laser) -> None:
+    """Saves a laser using :func:`pewlib.io.npz.save`.
+
+    The data of lazy lasers is read before the file is opened and any mapped
+    elements released, allowing them to overwrite their own archive.
+    """
+    from pewlib.io import npz as io_npz
+
+    if isinstance(laser, LazyNpzLaser):
+        laser.detach()
+    io_npz.save(path, laser)
@@ -1,24 +1,72 @@
 import ctypes
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import numpy as np
 import shiboken6
 from PySide6 import QtCore, QtGui
 
+import pewpew.lib.imageext
 
-def array_to_image(array: np.ndarray) -> QtGui.QImage:
-    """Converts a numpy array to a Qt image."""
+QUANTISE_CHUNK_SIZE = 1 << 20
+
+
+def quantise_array(
+    array: np.ndarray, vmin: float, vmax: float, threads: int | None = None
+) -> np.ndarray:
+    """Maps a float array to colortable indicies.
+
+    Data is clipped to 'vmin' - 'vmax' and set to 1 - 255, NaNs are set to 0.
+    Performed in a single pass without temporaries.
+
+    Args:
+        array: float32 or float64 array
+        vmin: value at index 1
+        vmax: value at index 255
+        threads: number of threads, default is one per 1M values up to cpu count
+
+    Returns:
+        uint8 array of same shape
+    """
+    if array.dtype not in [np.float32, np.float64]:
+        array = array.astype(np.float64)
+    array = np.ascontiguousarray(array)
+    out = np.empty(array.shape, dtype=np.uint8)
+
+    if threads is None:
+        threads = min(array.size // QUANTISE_CHUNK_SIZE, os.cpu_count() or 1)
+
+    if threads < 2:
+        pewpew.lib.imageext.quantise(array, out, vmin, vmax)
+    else:
+        xs = np.array_split(array.reshape(-1), threads)
+        outs = np.array_split(out.reshape(-1), threads)
+        with ThreadPoolExecutor(threads) as pool:
+            for future in [
+                pool.submit(pewpew.lib.imageext.quantise, x, o, vmin, vmax)
+                for x, o in zip(xs, outs)
+            ]:
+                future.result()
+    return out
+
+
+def array_to_image(
+    array: np.ndarray, vrange: tuple[float, float] = (0.0, 1.0)
+) -> QtGui.QImage:
+    """Converts a numpy array to a Qt image.
+
+    Float and bool arrays are mapped to an indexed image, see `quantise_array`.
+
+    Args:
+        array: 2d array, or 3d array of RGB values
+        vrange: the range of float data, (vmin, vmax)
+    """
 
     array = np.atleast_2d(array)
 
-    # Clip float arrays to 0.0 - 1.0 then convert to uint8
-    # Data is set to 1 - 255, NaNs are set to 0
-    if array.dtype in [np.float32, np.float64]:
-        nans = np.isnan(array)
-        array = np.clip(array, 0.0, 1.0)
-        with np.errstate(invalid="ignore"):
-            array = (array * 254.0).astype(np.uint8) + 1
-        array[nans] = 0
+    if array.dtype.kind in ["b", "f"]:
+        array = quantise_array(array, vrange[0], vrange[1])
 
     # 3D arrays interpreted as RGB
     if array.ndim == 3:
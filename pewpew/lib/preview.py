@@ -0,0 +1,117 @@
+"""Bounded previews of files and directories for the import options.
+
+The options of the import wizard are guessed from the start of a file or a
+listing of a directory. A :class:`PathPreview` reads these once, with a limited
+size, so that large exports are never fully read until imported.
+"""
+
+import os
+import re
+from pathlib import Path
+
+from pewpew.lib.cache import LRUCache
+
+
+class PathPreview(object):
+    """The start of a file or the file names in a directory.
+
+    Args:
+        path: file or directory
+        max_bytes: maximum bytes read from a file
+        max_entries: maximum files listed from a directory
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 65536, max_entries: int = 100000):
+        self.path = path
+        self.head = b""
+        self.names: list[str] = []
+        self.truncated = False
+
+        if path.is_dir():
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    if len(self.names) == max_entries:
+                        self.truncated = True
+                        break
+                    self.names.append(entry.name)
+            self.names.sort()
+        else:
+            with path.open("rb") as fp:
+                self.head = fp.read(max_bytes + 1)
+            self.truncated = len(self.head) > max_bytes
+            self.head = self.head[:max_bytes]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.head) + sum(len(name) for name in self.names)
+
+    def lines(self, encoding: str = "utf-8-sig") -> list[str]:
+        """Complete lines of the file preview, including line endings."""
+        lines = self.head.decode(encoding, errors="replace").splitlines(keepends=True)
+        if self.truncated and len(lines) > 0 and not lines[-1].endswith(("\n", "\r")):
+            lines.pop()
+        return lines
+
+    def line(self, index: int, encoding: str = "utf-8-sig") -> str:
+        """A line of the file preview, empty if not previewed."""
+        lines = self.lines(encoding)
+        return lines[index] if 0 <= index < len(lines) else ""
+
+    def contains(self, text: str, encoding: str = "utf-8-sig") -> bool:
+        return text.encode(encoding.replace("-sig", "")) in self.head
+
+    def match(self, regex: str | re.Pattern) -> list[str]:
+        """Listed file names matching 'regex'."""
+        if isinstance(regex, str):
+            regex = re.compile(regex)
+        return [name for name in self.names if regex.match(name) is not None]
+
+    def sniffDelimiter(self, delimiters: str = ",;\t ", nlines: int = 10) -> str:
+        """The delimiter occuring most, and equally, in the last previewed lines.
+
+        Only the latter half of the preview is used, to skip any header.
+
+        Returns:
+            the delimiter, or an empty string if none are consistent
+        """
+        lines = [line for line in self.lines() if line.strip() != ""]
+        lines = lines[len(lines) // 2 :][-nlines:]
+        best, best_count = "", 0
+        for delimiter in delimiters:
+            counts = {line.strip().count(delimiter) for line in lines}
+            if len(counts) == 1 and (count := counts.pop()) > best_count:
+                best, best_count = delimiter, count
+        return best
+
+
+class PreviewCache(object):
+    """Caches previews by path.
+
+    Previews are invalidated by changes in the modification time or size of
+    the path.
+
+    Args:
+        max_bytes: memory budget of stored previews
+        **kwargs: passed to :class:`PathPreview`
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024**2, **kwargs):
+        self.cache = LRUCache(max_bytes, sizeof=lambda preview: preview.nbytes)
+        self.kwargs = kwargs
+
+    def get(self, path: Path | str) -> PathPreview:
+        """The preview of 'path', only read if not cached.
+
+        Raises:
+            OSError: if 'path' can not be read
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        preview = self.cache.get(key)
+        if preview is None:
+            preview = PathPreview(path, **self.kwargs)
+            self.cache.put(key, preview)
+        return preview
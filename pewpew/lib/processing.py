@@ -0,0 +1,312 @@
+"""Processing of laser data, shared by the GUI tools and batch processing.
+
+Processes are stored in the 'Processing' info of lasers as a string, e.g.
+'Filter(*,Local Median,size=5,k=3.0);Calculator(Ratio,/ Cu63 Zn66);', see
+:func:`parse_processing` and :func:`apply_processing`.
+"""
+
+import numpy as np
+from pewlib.laser import Laser
+from pewlib.process import filters
+from pewlib.process.calc import normalise
+from pewlib.process.threshold import otsu
+
+from pewpew.lib import kmeans
+from pewpew.lib.pratt import BinaryFunction, Reducer, TernaryFunction, UnaryFunction
+
+
+# Filters
+def rolling_mean(x: np.ndarray, size: int, threshold: float) -> np.ndarray:
+    """For mapping size to (size, size)."""
+    size = int(size)
+    return filters.rolling_mean(x, (size, size), threshold)
+
+
+def rolling_median(x: np.ndarray, size: int, threshold: float) -> np.ndarray:
+    """For mapping size to (size, size)."""
+    size = int(size)
+    return filters.rolling_median(x, (size, size), threshold)
+
+
+def gaussian_filter(x: np.ndarray, sigma: float) -> np.ndarray:
+    size = int(2.0 * sigma * 5.0)
+    if size % 2 == 0:
+        size += 1
+    xs = np.linspace(-sigma * 5.0, sigma * 5.0, size)
+    psf = 1.0 / (sigma * np.sqrt(2.0 * np.pi)) * np.exp(-0.5 * (xs / sigma) ** 2)
+    psf /= psf.sum()
+
+    x = np.apply_along_axis(np.convolve, 0, x, psf, mode="same")
+    x = np.apply_along_axis(np.convolve, 1, x, psf, mode="same")
+    return x
+
+
+# def simple_highpass(x: np.ndarray, limit: float, replace: float) -> np.ndarray:
+#     return np.where(x < limit, replace, x)
+
+
+# def simple_lowpass(x: np.ndarray, limit: float, replace: float) -> np.ndarray:
+#     return np.where(x > limit, replace, x)
+
+
+def segment_image(x: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    mask = np.zeros(x.shape, dtype=int)
+    for i, t in enumerate(np.atleast_1d(thresholds)):
+        mask[x > t] = i + 1
+    return mask
+
+
+filter_methods: dict = {
+    "Local Mean": {
+        "filter": rolling_mean,
+        "params": [
+            ("size", 5, (2.5, 99), lambda x: (x + 1) % 2 == 0),
+            ("σ", 3.0, (0.0, np.inf), None),
+        ],
+        "desc": ["Window size for local mean.", "Filter if > σ stddevs from mean."],
+    },
+    "Local Median": {
+        "filter": rolling_median,
+        "params": [
+            ("size", 5, (2.5, 99), lambda x: (x + 1) % 2 == 0),
+            ("k", 3.0, (0.0, np.inf), None),
+        ],
+        "desc": [
+            "Window size for local median.",
+            "Filter if median absolute deviation > k stddevs",
+        ],
+    },
+    "Gaussian": {
+        "filter": gaussian_filter,
+        "params": [
+            ("σ", 0.5, (0.0, np.inf), None),
+        ],
+        "desc": ["Gaussian filter for smoothing."],
+    },
+    # "Simple High-pass": {
+    #     "filter": simple_highpass,
+    #     "params": [
+    #         ("min", 1e3, (-np.inf, np.inf), None),
+    #         ("replace", 0.0, (-np.inf, np.inf), None),
+    #     ],
+    #     "desc": ["Filter if below this value.", "Value to replace with."],
+    # },
+    # "Simple Low-pass": {
+    #     "filter": simple_lowpass,
+    #     "params": [
+    #         ("max", 1e3, (-np.inf, np.inf), None),
+    #         ("replace", 0.0, (-np.inf, np.inf), None),
+    #     ],
+    #     "desc": ["Filter if above this value.", "Value to replace with."],
+    # },
+}
+
+
+calculator_functions: dict = {
+    "abs": (
+        (UnaryFunction("abs"), "(<x>)", "The absolute value of <x>."),
+        (np.abs, 1),
+    ),
+    "kmeans": (
+        (
+            BinaryFunction("kmeans"),
+            "(<x>, <k>)",
+            "Returns lower bounds of 1 to <k> kmeans clusters.",
+        ),
+        (kmeans.thresholds, 2),
+    ),
+    "mask": (
+        (
+            BinaryFunction("mask"),
+            "(<x>, <mask>)",
+            "Selects <x> where <mask>, otherwise NaN.",
+        ),
+        (lambda x, m: np.where(m, x, np.nan), 2),
+    ),
+    "mean": (
+        (UnaryFunction("mean"), "(<x>)", "Returns the mean of <x>."),
+        (np.nanmean, 1),
+    ),
+    "median": (
+        (
+            UnaryFunction("median"),
+            "(<x>)",
+            "Returns the median of <x>.",
+        ),
+        (np.nanmedian, 1),
+    ),
+    "nantonum": (
+        (UnaryFunction("nantonum"), "(<x>)", "Sets nan values to 0."),
+        (np.nan_to_num, 1),
+    ),
+    "normalise": (
+        (
+            TernaryFunction("normalise"),
+            "(<x>, <min>, <max>)",
+            "Normalise <x> from from <min> to <max>.",
+        ),
+        (normalise, 3),
+    ),
+    "otsu": (
+        (
+            UnaryFunction("otsu"),
+            "(<x>)",
+            "Returns Otsu's threshold for <x>.",
+        ),
+        (otsu, 1),
+    ),
+    "percentile": (
+        (
+            BinaryFunction("percentile"),
+            "(<x>, <percent>)",
+            "Returns the <percent> percentile of <x>.",
+        ),
+        (np.nanpercentile, 2),
+    ),
+    "segment": (
+        (
+            BinaryFunction("segment"),
+            "(<x>, <threshold(s)>)",
+            "Create a masking image from the given thrshold(s).",
+        ),
+        (segment_image, 2),
+    ),
+    "threshold": (
+        (
+            BinaryFunction("threshold"),
+            "(<x>, <value>)",
+            "Sets <x> below <value> to NaN.",
+        ),
+        (lambda x, a: np.where(x > a, x, np.nan), 2),
+    ),
+}
+
+
+def filter_laser(
+    laser: Laser, name: str | None, method: str, method_args: list[float]
+) -> None:
+    """Filters element 'name' of 'laser', or all elements if None.
+
+    The filter is appended to the 'Processing' info of the laser.
+
+    Args:
+        laser: laser to filter, modified in place
+        name: element to filter, None for all
+        method: key of `filter_methods`
+        method_args: parameters of the method
+    """
+    filter_ = filter_methods[method]["filter"]
+    proc = laser.info.get("Processing", "")
+    params = [
+        f"{p[0]}={v}" for p, v in zip(filter_methods[method]["params"], method_args)
+    ]
+    pstr = ",".join(params)
+
+    if name is None:
+        for name in laser.elements:
+            laser.data[name] = filter_(laser.data[name], *method_args)
+        proc += f"Filter(*,{method},{pstr});"
+    else:
+        laser.data[name] = filter_(laser.data[name], *method_args)
+        proc += f"Filter({name},{method},{pstr});"
+
+    laser.info["Processing"] = proc
+
+
+def calculate_laser(laser: Laser, name: str, expr: str) -> bool:
+    """Sets element 'name' of 'laser' to the result of calculator 'expr'.
+
+    The calculation is appended to the 'Processing' info of the laser.
+
+    Args:
+        laser: laser to modify, in place
+        name: element to create or replace
+        expr: expression in prefix notation, see `pewpew.lib.pratt`
+
+    Returns:
+        True if 'name' is a new element
+    """
+    reducer = Reducer(variables={e: laser.data[e] for e in laser.elements})
+    reducer.operations.update({k: v[1] for k, v in calculator_functions.items()})
+    data = reducer.reduce(expr)
+
+    added = name not in laser.elements
+    if added:
+        laser.add(name, data)
+    else:
+        laser.data[name] = data
+    proc = laser.info.get("Processing", "")
+    laser.info["Processing"] = proc + f"Calculator({name},{expr});"
+    return added
+
+
+def parse_processing(processing: str) -> list[tuple]:
+    """Parses a processing string into a list of processes.
+
+    Args:
+        processing: sequence of 'Filter' and 'Calculator' processes
+
+    Returns:
+        list of ('Filter', name, method, params) and ('Calculator', name, expr),
+        name of filters is None for all elements and params is a list of float
+
+    Raises:
+        ValueError: unknown process or filter
+    """
+    processes: list[tuple] = []
+    for proc in processing.split(";"):
+        proc = proc.strip()
+        if len(proc) == 0:
+            continue
+        proc_type = proc[: proc.find("(")]
+        proc_params = proc[proc.find("(") + 1 : proc.rfind(")")]
+
+        if proc_type == "Filter":
+            name, method, *pstrs = proc_params.split(",")
+            if method not in filter_methods:
+                raise ValueError(f"unknown filter '{method}'")
+            fparams = [float(pstr.split("=")[1]) for pstr in pstrs]
+            processes.append(("Filter", None if name == "*" else name, method, fparams))
+        elif proc_type == "Calculator":
+            name, expr = proc_params.split(",", 1)
+            processes.append(("Calculator", name, expr))
+        else:
+            raise ValueError(f"unknown processing type '{proc_type}'")
+    return processes
+
+
+def apply_processes(laser: Laser, processes: list[tuple]) -> bool:
+    """Applies processes to 'laser', in order.
+
+    Each process uses the data produced by the previous processes.
+
+    Args:
+        laser: laser to process, modified in place
+        processes: as returned by :func:`parse_processing`
+
+    Returns:
+        True if elements were added
+
+    Raises:
+        ValueError: unknown process type
+    """
+    added = False
+    for proc_type, *params in processes:
+        if proc_type == "Filter":
+            filter_laser(laser, *params)
+        elif proc_type == "Calculator":
+            added |= calculate_laser(laser, *params)
+        else:
+            raise ValueError(f"unknown processing type '{proc_type}'")
+    return added
+
+
+def apply_processing(laser: Laser, processing: str) -> bool:
+    """Apply a processing string to 'laser'.
+
+    See :func:`parse_processing` and :func:`apply_processes`.
+
+    Returns:
+        True if elements were added
+    """
+    return apply_processes(laser, parse_processing(processing))
@@ -0,0 +1,332 @@
+"""Single file pew² projects.
+
+A project is a zip archive storing the lasers and overlay images of a scene,
+along with the scene layout and graphics options in a JSON manifest. Each
+laser is stored as a set of uncompressed '.npy' members, as in the pewlib
+'.npz' format but with each element stored separately, so that displayed
+elements may be memory-mapped by :class:`pewpew.lib.lazynpz.LazyNpzLaser`.
+
+Saves are incremental, only new or modified lasers and images are appended to
+the archive, along with a new manifest. Members no longer referenced by the
+latest manifest are removed once they make up the majority of the archive,
+unless the archive is in use and cannot be replaced.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from importlib.metadata import version
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+from pewlib.laser import Laser
+
+from pewpew.lib.lazynpz import LazyNpzLaser, read_elements, write_elements
+
+logger = logging.getLogger(__name__)
+
+PROJECT_FORMAT_VERSION = 1
+
+
+def _write_array(zf: zipfile.ZipFile, name: str, array: np.ndarray) -> None:
+    with zf.open(name, "w", force_zip64=True) as fp:
+        np.lib.format.write_array(fp, np.asanyarray(array))
+
+
+def _read_array(zf: zipfile.ZipFile, name: str) -> np.ndarray:
+    with zf.open(name) as fp:
+        return np.lib.format.read_array(fp)
+
+
+class ProjectFile(object):
+    """A pew² project archive.
+
+    Lasers and images are referenced in the manifest by a unique key, their
+    members are stored under 'lasers/<key>/' and 'images/<key>.png'. Laser
+    elements are stored as 'lasers/<key>/data/<index>.npy', see
+    :func:`pewpew.lib.lazynpz.write_elements`.
+
+    Appending to the archive is not atomic, if interrupted the archive may be
+    corrupted. Autosaves should be written elsewhere.
+
+    Args:
+        path: path to the archive
+        compact_ratio: fraction of unreferenced data that triggers a rewrite
+    """
+
+    extension = ".pewz"
+
+    def __init__(self, path: Path | str, compact_ratio: float = 0.5):
+        self.path = Path(path).resolve()
+        self.compact_ratio = compact_ratio
+
+    @staticmethod
+    def laserPrefix(key: str) -> str:
+        return f"lasers/{key}/"
+
+    @staticmethod
+    def laserMembers(key: str) -> list[str]:
+        """Members of a laser, excluding the element data."""
+        return [
+            f"lasers/{key}/{name}.npy"
+            for name in ["header", "calibration", "config", "info"]
+        ]
+
+    @staticmethod
+    def imageMember(key: str) -> str:
+        return f"images/{key}.png"
+
+    @staticmethod
+    def manifestRevision(name: str) -> int:
+        """Revision of a manifest member, -1 if not a manifest."""
+        if not (name.startswith("manifest-") and name.endswith(".json")):
+            return -1
+        try:
+            return int(name[9:-5])
+        except ValueError:
+            return -1
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def manifestName(self, zf: zipfile.ZipFile) -> str | None:
+        names = [n for n in zf.namelist() if self.manifestRevision(n) > -1]
+        if len(names) == 0:
+            return None
+        return max(names, key=self.manifestRevision)
+
+    def readManifest(self) -> dict:
+        """The latest manifest.
+
+        Raises:
+            ValueError: not a project or an unsupported version
+        """
+        with zipfile.ZipFile(self.path) as zf:
+            name = self.manifestName(zf)
+            if name is None:
+                raise ValueError(f"{self.path.name} is not a pew² project.")
+            manifest = json.loads(zf.read(name))
+        if manifest.get("format", 0) > PROJECT_FORMAT_VERSION:
+            raise ValueError(
+                f"{self.path.name} was saved with a newer version of pew², "
+                f"{manifest.get('pewpew')}."
+            )
+        return manifest
+
+    def readLaser(self, key: str) -> LazyNpzLaser:
+        """Loads a laser, deferring loading of the data until first use."""
+        from pewlib.config import Config, SpotConfig
+        from pewlib.io.npz import unpack_calibration, unpack_info
+
+        header, calibration, config, info = self.laserMembers(key)
+        with zipfile.ZipFile(self.path) as zf:
+            header_info = unpack_info(_read_array(zf, header))
+            layout = read_elements(zf, self.laserPrefix(key))
+            if layout is None:
+                raise KeyError(f"Laser {key} has no data in {self.path.name}.")
+            dtype, shape, members = layout
+            calibrations = unpack_calibration(_read_array(zf, calibration))
+            config_array = _read_array(zf, config)
+            laser_info = unpack_info(_read_array(zf, info))
+
+        if header_info["class"] == "Spot":
+            laser_config = SpotConfig.from_array(config_array)
+        else:
+            laser_config = Config.from_array(config_array)
+
+        laser_info["File Path"] = str(self.path)
+        return LazyNpzLaser(
+            self.path,
+            dtype,
+            shape,
+            calibration=calibrations,
+            config=laser_config,
+            info=laser_info,
+            members=members,
+        )
+
+    def readImage(self, key: str) -> bytes:
+        with zipfile.ZipFile(self.path) as zf:
+            return zf.read(self.imageMember(key))
+
+    def writeLaser(self, zf: zipfile.ZipFile, key: str, laser: Laser) -> None:
+        from pewlib.io.npz import pack_calibration, pack_info
+
+        if laser.config._class not in ["Laser", "Raster", "Spot"]:
+            raise ValueError(f"Unable to save {laser.config._class} in a project.")
+
+        header, calibration, config, info = self.laserMembers(key)
+        _write_array(
+            zf,
+            header,
+            pack_info(
+                {
+                    "version": version("pewlib"),
+                    "class": str(laser.config._class),
+                    "time": str(time.time()),
+                }
+            ),
+        )
+        write_elements(zf, self.laserPrefix(key), laser.data)
+        _write_array(zf, calibration, pack_calibration(laser.calibration))
+        _write_array(zf, config, laser.config.to_array())
+        _write_array(zf, info, pack_info(laser.info))
+
+    def referencedMembers(self, manifest: dict) -> set[str]:
+        """Members required by 'manifest', excluding the element data."""
+        members = set()
+        for record in manifest.get("lasers", []):
+            members.update(self.laserMembers(record["key"]))
+        for record in manifest.get("images", []):
+            members.add(self.imageMember(record["key"]))
+        return members
+
+    def keptMembers(
+        self,
+        names: Iterable[str],
+        manifest: dict,
+        lasers: dict[str, Laser],
+        images: dict[str, bytes],
+    ) -> set[str]:
+        """Members of 'names' referenced by 'manifest' and not replaced."""
+        prefixes = tuple(
+            self.laserPrefix(record["key"])
+            for record in manifest.get("lasers", [])
+            if record["key"] not in lasers
+        )
+        image_names = {
+            self.imageMember(record["key"])
+            for record in manifest.get("images", [])
+            if record["key"] not in images
+        }
+        return {
+            name for name in names if name.startswith(prefixes) or name in image_names
+        }
+
+    def write(
+        self,
+        state: dict,
+        lasers: dict[str, Laser] | None = None,
+        images: dict[str, bytes] | None = None,
+    ) -> None:
+        """Writes a new manifest for 'state'.
+
+        The 'lasers' and 'images' are written to the archive under their keys,
+        all other keys referenced in 'state' must already exist in the archive.
+
+        Args:
+            state: scene state, with 'lasers' and 'images' lists of records
+            lasers: dict mapping keys to new or modified lasers
+            images: dict mapping keys to new PNG images
+        """
+        lasers = lasers or {}
+        images = images or {}
+
+        manifest = {
+            "format": PROJECT_FORMAT_VERSION,
+            "pewpew": version("pewpew"),
+            "time": time.time(),
+            **state,
+        }
+        referenced = self.referencedMembers(manifest)
+
+        if not self.exists():
+            self.rewrite(manifest, set(), lasers, images, revision=0)
+            return
+
+        with zipfile.ZipFile(self.path) as zf:
+            existing = {info.filename: info for info in zf.infolist()}
+            latest = self.manifestName(zf)
+        revision = 0 if latest is None else self.manifestRevision(latest) + 1
+
+        new = set()
+        for key in lasers:
+            new.update(self.laserMembers(key))
+        new.update(self.imageMember(key) for key in images)
+        missing = referenced - new - existing.keys()
+        if len(missing) > 0:
+            raise KeyError(f"Members {sorted(missing)} missing from {self.path.name}.")
+
+        # Compare the unreferenced to referenced bytes after writing
+        kept = self.keptMembers(existing, manifest, lasers, images)
+        kept_size = sum(existing[name].compress_size for name in kept)
+        dead = sum(info.compress_size for info in existing.values()) - kept_size
+        live = (
+            kept_size
+            + sum(laser.data.nbytes for laser in lasers.values())
+            + sum(len(image) for image in images.values())
+        )
+        if dead > self.compact_ratio * (live + dead):
+            try:
+                self.rewrite(manifest, kept, lasers, images, revision=revision)
+                return
+            except PermissionError as e:  # archive is open or mapped on Windows
+                logger.warning(f"Unable to compact {self.path.name}, appending: {e}")
+
+        with zipfile.ZipFile(self.path, "a") as zf:
+            self.writeMembers(zf, manifest, lasers, images, revision)
+
+    def writeMembers(
+        self,
+        zf: zipfile.ZipFile,
+        manifest: dict,
+        lasers: dict[str, Laser],
+        images: dict[str, bytes],
+        revision: int,
+    ) -> None:
+        for key, laser in lasers.items():
+            self.writeLaser(zf, key, laser)
+        for key, image in images.items():
+            zf.writestr(self.imageMember(key), image)
+        # The manifest is written last, older manifests remain valid until then
+        zf.writestr(f"manifest-{revision}.json", json.dumps(manifest))
+
+    def rewrite(
+        self,
+        manifest: dict,
+        kept: set[str],
+        lasers: dict[str, Laser],
+        images: dict[str, bytes],
+        revision: int,
+    ) -> None:
+        """Writes a new archive, copying the 'kept' members of the old."""
+        exists = self.exists()
+        if exists:  # write to a temporary file, replacing the archive on success
+            fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.path.parent)
+            os.close(fd)
+            shutil.copymode(self.path, tmp)
+            target = Path(tmp)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            target = self.path
+
+        try:
+            with zipfile.ZipFile(target, "w") as zf:
+                if exists:
+                    self.copyMembers(zf, kept)
+                self.writeMembers(zf, manifest, lasers, images, revision)
+            if exists:
+                # Memory maps of the old archive remain valid on POSIX, on Windows
+                # mapped archives cannot be replaced and a PermissionError is raised
+                os.replace(target, self.path)
+                logger.info(f"Compacted project {self.path.name}.")
+        except Exception:
+            target.unlink(missing_ok=True)
+            raise
+
+    def copyMembers(self, zf: zipfile.ZipFile, names: set[str]) -> None:
+        """Copies members 'names' from this archive to 'zf'."""
+        with zipfile.ZipFile(self.path) as src_zf:
+            for info in src_zf.infolist():
+                if info.filename not in names:
+                    continue
+                with (
+                    src_zf.open(info) as src,
+                    zf.open(info.filename, "w", force_zip64=True) as dst,
+                ):
+                    shutil.copyfileobj(src, dst, 1 << 20)
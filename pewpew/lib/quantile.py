@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class QuantileSketch(object):
+    """Approximate percentiles of the finite values in an array.
+
+    Small arrays are stored sorted and give exact results. Larger arrays are
+    reduced to a histogram with bins of equal width in asinh space, giving a
+    resolution relative to the magnitude of values that handles both negative
+    values and long tails. Building the sketch is a single pass over the data,
+    percentiles are then interpolated from the cumulative counts in O(log bins).
+
+    Args:
+        data: array, non-finite values are ignored
+        bins: number of histogram bins
+        exact_size: store arrays with at most this many values exactly
+    """
+
+    def __init__(self, data: np.ndarray, bins: int = 4096, exact_size: int = 65536):
+        x = data[np.isfinite(data)].ravel()
+        self.size = x.size
+
+        if x.size == 0:
+            self.ranks = np.array([])
+            self.values = np.array([])
+        elif x.size <= exact_size:
+            self.ranks = np.arange(x.size, dtype=np.float64)
+            self.values = np.sort(x)
+        else:
+            # Scale the linear region of asinh to the typical non-zero magnitude
+            sample = np.abs(x[:: max(x.size // exact_size, 1)])
+            sample = sample[sample > 0.0]
+            scale = np.median(sample) if sample.size > 0 else 1.0
+
+            y = np.arcsinh(x / scale)
+            ymin, ymax = np.amin(y), np.amax(y)
+            if ymin == ymax:
+                ymax = ymin + 1.0
+
+            idx = ((y - ymin) * (bins / (ymax - ymin))).astype(np.intp)
+            np.clip(idx, 0, bins - 1, out=idx)
+            counts = np.bincount(idx, minlength=bins)
+
+            # Scale to the rank of the last value
+            cdf = np.concatenate([[0], np.cumsum(counts)])
+            self.ranks = cdf * (x.size - 1) / x.size
+            self.values = np.sinh(np.linspace(ymin, ymax, bins + 1)) * scale
+            self.values[0], self.values[-1] = np.amin(x), np.amax(x)
+
+    @property
+    def nbytes(self) -> int:
+        return self.ranks.nbytes + self.values.nbytes
+
+    def percentile(self, q: float | np.ndarray) -> float | np.ndarray:
+        """Percentile(s) 'q' of the data, as per `np.nanpercentile`."""
+        q = np.asarray(q, dtype=np.float64)
+        if np.any((q < 0.0) | (q > 100.0)):
+            raise ValueError("Percentiles must be in the range [0, 100]")
+        if self.size == 0:
+            return np.full(q.shape, np.nan)[()]
+        return np.interp(q / 100.0 * (self.size - 1), self.ranks, self.values)[()]
@@ -0,0 +1,318 @@
+"""Streaming import of Thermo iCap CSV exports.
+
+Exports are read in fixed size blocks, with the lines of each block parsed
+directly into a preallocated array. The size of the array is estimated from the
+size of the export and the first lines read, so that peak memory is close to
+that of the imported data.
+
+See `pewlib.io.thermo` for a description of the formats.
+"""
+
+import logging
+import math
+import os
+from collections.abc import Generator
+from pathlib import Path
+from typing import IO, Any, Callable
+
+import numpy as np
+from pewlib.io.thermo import icap_csv_sample_format
+
+logger = logging.getLogger(__name__)
+
+
+def _read_blocks(
+    fp: IO[bytes],
+    block_size: int,
+    comma_decimal: bool = False,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> Generator[list[bytes], None, None]:
+    """Yields the complete lines of each block read from 'fp'."""
+    total = os.fstat(fp.fileno()).st_size
+    remainder = b""
+    while True:
+        block = fp.read(block_size)
+        if len(block) == 0:
+            break
+        block = remainder + block
+        end = block.rfind(b"\n") + 1
+        remainder = block[end:]
+        block = block[:end]
+        if comma_decimal:
+            block = block.replace(b",", b".")
+        yield block.splitlines()
+
+        if progress is not None:
+            progress(fp.tell(), total)
+        if cancelled is not None and cancelled():
+            raise InterruptedError("Import cancelled.")
+
+    if remainder.strip() != b"":
+        yield [remainder.replace(b",", b".") if comma_decimal else remainder]
+
+
+def _grow_last_axis(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.full((*array.shape[:-1], capacity), np.nan)
+    grown[..., : array.shape[-1]] = array
+    return grown
+
+
+def _shrink_last_axis(array: np.ndarray, size: int) -> np.ndarray:
+    """Shrinks the last axis of the C-contiguous 'array' in place."""
+    *shape, capacity = array.shape
+    if size == capacity:
+        return array
+    rows = math.prod(shape)
+    flat, src = array.reshape(-1), array.reshape(rows, capacity)
+    # Rows move towards the start, each chunk is copied before being overwritten
+    step = max(1, (1 << 20) // capacity)
+    for start in range(0, rows, step):
+        end = min(rows, start + step)
+        flat[start * size : end * size] = src[start:end, :size].ravel()
+    del flat, src
+    array.resize(rows * size, refcheck=False)
+    return array.reshape(*shape, size)
+
+
+def _as_structured(array: np.ndarray, names: list[str]) -> np.ndarray:
+    """View the last axis of 'array' as fields."""
+    dtype = np.dtype([(name, np.float64) for name in names])
+    return array.view(dtype)[..., 0]
+
+
+def _read_columns(
+    fp: IO[bytes],
+    blocks: Generator[list[bytes], None, None],
+    delimiter: str,
+    kind: str,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    total = os.fstat(fp.fileno()).st_size
+    header = fp.readline().decode("utf-8-sig").rstrip("\r\n").split(delimiter)
+    nsamples = sum(field.strip() != "" for field in header)
+    if nsamples == 0:  # pragma: no cover
+        raise ValueError("Invalid iCap export, expected samples in columns.")
+    fp.readline()  # identifiers
+    start = fp.tell()
+
+    sep = delimiter.encode()
+    usecols = range(4, 4 + nsamples)
+    names: dict[bytes, int] = {}
+    first_name: bytes | None = None
+    first_bytes, nscans = 0, 0
+
+    # Lines read until the size can be estimated, (scans, elements, values)
+    pending: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    buffer: np.ndarray | None = None
+    times: dict[int, np.ndarray] = {}
+
+    for lines in blocks:
+        selected, scans, elements = [], [], []
+        time_lines, time_scans = [], []
+        for line in lines:
+            if not line.startswith(b"MainRuns"):
+                continue
+            _, scan, name, line_kind, _ = line.split(sep, 4)
+            if first_name is None:
+                first_name = name
+            if name == first_name:
+                first_bytes += len(line) + 1
+            if line_kind == kind.encode():
+                selected.append(line)
+                scans.append(int(scan))
+                elements.append(names.setdefault(name, len(names)))
+                if buffer is None and elements[-1] == 0:
+                    nscans = max(nscans, scans[-1] + 1)
+            elif line_kind == b"Time" and name == first_name:
+                time_lines.append(line)
+                time_scans.append(int(scan))
+
+        if len(time_lines) > 0:
+            values = np.loadtxt(
+                time_lines, delimiter=delimiter, usecols=usecols, ndmin=2
+            )
+            times.update(zip(time_scans, values))
+        if len(selected) == 0:
+            continue
+
+        values = np.loadtxt(selected, delimiter=delimiter, usecols=usecols, ndmin=2)
+        pending.append((np.array(scans), np.array(elements), values))
+
+        if buffer is None and len(names) > 1:
+            # Elements are exported in blocks, estimate the count from the first
+            capacity = max(len(names), math.ceil((total - start) / first_bytes))
+            buffer = np.full((nsamples, nscans, capacity), np.nan)
+            logger.debug(f"Estimated {capacity} elements of {nscans} scans.")
+
+        if buffer is not None:
+            for scans_, elements_, values in pending:
+                if len(names) > buffer.shape[2]:
+                    buffer = _grow_last_axis(
+                        buffer, max(len(names), int(buffer.shape[2] * 1.25) + 1)
+                    )
+                if np.any(scans_ >= nscans):
+                    raise ValueError("Invalid iCap export, inconsistent scans.")
+                buffer[:, scans_, elements_] = values.T
+            pending.clear()
+
+    if len(names) == 0:
+        raise ValueError(f"Invalid iCap export, no '{kind}' lines found.")
+    if buffer is None:  # a single element
+        buffer = np.full((nsamples, nscans, 1), np.nan)
+        for scans_, elements_, values in pending:
+            buffer[:, scans_, elements_] = values.T
+
+    buffer = _shrink_last_axis(buffer, len(names))
+    data = _as_structured(buffer, [name.decode() for name in names])
+
+    time_data = None
+    if len(times) > 0:
+        time_data = np.full((nsamples, nscans), np.nan)
+        for scan, values in times.items():
+            if scan < nscans:
+                time_data[:, scan] = values
+    return data, time_data
+
+
+def _read_rows(
+    fp: IO[bytes],
+    blocks: Generator[list[bytes], None, None],
+    delimiter: str,
+    kind: str,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    total = os.fstat(fp.fileno()).st_size
+
+    def read_header(dtype: str) -> np.ndarray:
+        line = fp.readline().decode("utf-8-sig").rstrip("\r\n")
+        return np.array(line.split(delimiter), dtype=dtype)
+
+    runs = read_header("U8")
+    scans = read_header("U8")
+    names = read_header("U32")
+    kinds = read_header("U7")
+    start = fp.tell()
+
+    run_mask = runs == "MainRuns"
+    if np.count_nonzero(run_mask) == 0:  # pragma: no cover
+        raise ValueError("Invalid iCap export, expected samples in rows.")
+
+    data_cols = np.flatnonzero(run_mask & (kinds == kind))
+    if data_cols.size == 0:
+        raise ValueError(f"Invalid iCap export, no '{kind}' columns found.")
+    unames, idx = np.unique(names[data_cols], return_index=True)
+    unames = unames[np.argsort(idx)]
+    data_scans = scans[data_cols].astype(int)
+    order = {name: i for i, name in enumerate(unames)}
+    data_elements = np.array([order[name] for name in names[data_cols]])
+    nscans = int(np.amax(data_scans)) + 1
+
+    time_cols = np.flatnonzero(run_mask & (kinds == "Time"))
+    time_cols = time_cols[names[time_cols] == unames[0]]
+    time_scans = scans[time_cols].astype(int)
+    usecols = np.concatenate([data_cols, time_cols])
+
+    buffer: np.ndarray | None = None
+    time_data: np.ndarray | None = None
+    nrows = 0
+
+    for lines in blocks:
+        lines = [line for line in lines if line.strip() != b""]
+        if len(lines) == 0:
+            continue
+        values = np.loadtxt(lines, delimiter=delimiter, usecols=usecols, ndmin=2)
+
+        if buffer is None:
+            # Estimate the number of rows from those of the first block
+            read = sum(len(line) + 1 for line in lines)
+            capacity = len(lines) + math.ceil(
+                (total - start - read) / read * len(lines)
+            )
+            buffer = np.full((capacity, nscans, unames.size), np.nan)
+            time_data = np.full((capacity, nscans), np.nan)
+            logger.debug(f"Estimated {capacity} rows of {nscans} scans.")
+
+        assert time_data is not None
+        if nrows + len(lines) > buffer.shape[0]:
+            capacity = max(nrows + len(lines), int(buffer.shape[0] * 1.25) + 1)
+            buffer.resize((capacity, *buffer.shape[1:]), refcheck=False)
+            time_data.resize((capacity, nscans), refcheck=False)
+
+        rows = slice(nrows, nrows + len(lines))
+        buffer[rows, data_scans, data_elements] = values[:, : data_cols.size]
+        time_data[rows, time_scans] = values[:, data_cols.size :]
+        nrows += len(lines)
+
+    if buffer is None or time_data is None:
+        raise ValueError("Invalid iCap export, no samples found.")
+
+    buffer.resize((nrows, *buffer.shape[1:]), refcheck=False)
+    time_data.resize((nrows, nscans), refcheck=False)
+    data = _as_structured(buffer, [str(name) for name in unames])
+    return data, time_data if time_cols.size > 0 else None
+
+
+def load(
+    path: str | Path,
+    use_analog: bool = False,
+    sample_format: str | None = None,
+    delimiter: str | None = None,
+    comma_decimal: bool = False,
+    block_size: int = 1 << 24,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> tuple[np.ndarray, dict[str, Any]]:
+    """Imports an iCap CSV export, reading in blocks.
+
+    Args:
+        path: path to CSV
+        use_analog: use 'Analog' instead of 'Counts'
+        sample_format: 'rows' or 'columns', default is read from the export
+        delimiter: CSV delimiter, default is the first character of the export
+        comma_decimal: the decimal separator is a comma
+        block_size: size of each read, in bytes
+        progress: called with the number of bytes read and the total
+        cancelled: polled after each block, raises InterruptedError if True
+
+    Returns:
+        structured array of data, dict of params
+
+    Raises:
+        ValueError: unknown or invalid CSV
+
+    See Also:
+        :func:`pewlib.io.thermo.load`
+    """
+    if isinstance(path, str):  # pragma: no cover
+        path = Path(path)
+
+    if sample_format is None:
+        sample_format = icap_csv_sample_format(path)
+    if sample_format not in ["rows", "columns"]:
+        raise ValueError("Unknown iCap CSV format.")
+
+    kind = "Analog" if use_analog else "Counter"
+    with path.open("rb") as fp:
+        if delimiter is None:
+            delimiter = fp.readline().decode("utf-8-sig")[0]
+            fp.seek(0)
+
+        # Lazy, header lines are read by each format before the first block
+        blocks = _read_blocks(
+            fp,
+            block_size,
+            comma_decimal=comma_decimal,
+            progress=progress,
+            cancelled=cancelled,
+        )
+        if sample_format == "rows":
+            data, times = _read_rows(fp, blocks, delimiter, kind)
+        else:
+            data, times = _read_columns(fp, blocks, delimiter, kind)
+
+    params: dict[str, Any] = {}
+    if times is not None and times.shape[1] > 1:
+        params["times"] = times
+        params["scantime"] = np.round(np.nanmean(np.diff(times, axis=1)), 4)
+    else:
+        logger.warning(f"Unable to read params from {path.name}")
+    return data, params
@@ -5,22 +5,13 @@ from pathlib import Path
 from types import TracebackType
 
 from pewlib.config import Config, SpotConfig
-from pewlib.io.imzml import is_imzml, is_imzml_binary_data
-from pewlib.io.laser import is_nwi_laser_log
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from pewpew.actions import qAction, qActionGroup
+from pewpew.autosave import AutosaveService
 from pewpew.graphics.colortable import get_icon
 from pewpew.log import LoggingDialog
-from pewpew.widgets import dialogs
-from pewpew.widgets.exportdialogs import ExportAllDialog
-from pewpew.widgets.laser import LaserTabView
-from pewpew.widgets.wizards import (
-    ImportWizard,
-    ImzMLImportWizard,
-    LaserLogImportWizard,
-    SpotImportWizard,
-)
+from pewpew.widgets.laser import LaserTabView, LaserTabWidget
 
 logger = logging.getLogger(__name__)
 
@@ -64,8 +55,51 @@ class MainWindow(QtWidgets.QMainWindow):
         self.updateRecentFiles()
 
         self.default_config = Config()
+        self.autosave: AutosaveService | None = None
+
+    def startAutosave(self) -> None:
+        """Start autosaving to the recovery directory, if enabled.
+
+        Sessions left by a crash are offered for recovery.
+        """
+        interval = int(QtCore.QSettings().value("Autosave/Interval", 300))
+        if interval <= 0:
+            return
+
+        directory = Path(
+            QtCore.QStandardPaths.writableLocation(
+                QtCore.QStandardPaths.AppDataLocation
+            )
+        ).joinpath("recovery")
+        self.autosave = AutosaveService(
+            self.tabview, directory, interval=interval * 1000, parent=self
+        )
+        self.autosave.start()
+
+        sessions = self.autosave.recoverableSessions()
+        if len(sessions) == 0:
+            return
+        button = QtWidgets.QMessageBox.question(
+            self,
+            "Recover Session",
+            f"pew² did not exit cleanly, recover {len(sessions)} autosaved "
+            "session(s)?",
+        )
+        if button == QtWidgets.QMessageBox.Yes:
+            for session in sessions:
+                self.autosave.restoreSession(session)
+        else:
+            self.autosave.removeRecovered()
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        if self.autosave is not None:
+            self.autosave.stop(remove=True)
+        super().closeEvent(event)
 
     def dragEnterEvent(self, event: QtGui.QDragEnterEvent) -> None:
+        from pewlib.io.imzml import is_imzml
+        from pewlib.io.laser import is_nwi_laser_log
+
         paths = [Path(url.toLocalFile()) for url in event.mimeData().urls()]
         if event.mimeData().hasUrls():
             paths = [Path(url.toLocalFile()) for url in event.mimeData().urls()]
@@ -79,6 +113,11 @@ class MainWindow(QtWidgets.QMainWindow):
         if not event.mimeData().hasUrls():
             return super().dropEvent(event)
 
+        from pewlib.io.imzml import is_imzml, is_imzml_binary_data
+        from pewlib.io.laser import is_nwi_laser_log
+
+        from pewpew.widgets.wizards import ImzMLImportWizard, LaserLogImportWizard
+
         paths = [Path(url.toLocalFile()) for url in event.mimeData().urls()]
 
         if any(is_nwi_laser_log(path) for path in paths):
@@ -195,6 +234,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.action_open.setShortcut("Ctrl+O")
 
         re
+        self.action_watch = qAction(
+            "document-open-folder",
+            "&Watch Directory",
+            "Import new data in a directory as it is written.",
+            self.actionWatch,
+        )
+        self.action_watch.setCheckable(True)
+
         self.action_open_recent = QtGui.QActionGroup(self)
         self.action_open_recent.triggered.connect(self.openRecentFile)
 
@@ -218,6 +265,14 @@ class MainWindow(QtWidgets.QMainWindow):
         )
         self.action_refresh.setShortcut("F5")
 
+        self.action_save_project = qAction(
+            "document-save",
+            "Save &Project",
+            "Save the current tab as a single file project.",
+            self.actionSaveProject,
+        )
+        self.action_save_project.setShortcut("Ctrl+Shift+S")
+
         self.action_smooth = qAction(
             "smooth",
             "&Smooth",
@@ -288,6 +343,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.menu_recent = menu_file.addMenu("Open Recent")
         self.menu_recent.setIcon(QtGui.QIcon.fromTheme("document-open-recent"))
         self.menu_recent.setEnabled(False)
+        menu_file.addAction(self.action_watch)
 
         # File -> Import
         menu_import = menu_file.addMenu("&Import")
@@ -299,6 +355,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         menu_file.addSeparator()
 
+        menu_file.addAction(self.action_save_project)
         menu_file.addAction(self.action_export_all)
 
         menu_file.addSeparator()
@@ -353,6 +410,9 @@ class MainWindow(QtWidgets.QMainWindow):
         QtGui.QDesktopServices.openUrl("https://pew2.readthedocs.io")
 
     def openRecentFile(self, action: QtGui.QAction) -> None:
+        from pewlib.io.imzml import is_imzml
+        from pewlib.io.laser import is_nwi_laser_log
+
         path = Path(re_strip_amp.sub("", action.text()))
 
         if is_imzml(path):
@@ -401,6 +461,7 @@ class MainWindow(QtWidgets.QMainWindow):
         """
         Open a `:class:pewpew.widgets.dialogs.ColocalisationDialog` and apply result.
         """
+        from pewpew.widgets import dialogs
 
         def applyDialog(dialog: dialogs.ApplyDialog) -> None:
             self.tabview.options._colorranges = dialog.ranges
@@ -422,15 +483,16 @@ class MainWindow(QtWidgets.QMainWindow):
     def actionDialogNaNColor(self) -> QtWidgets.QDialog:
         def applyDialog(color: QtGui.QColor) -> None:
             if color != self.tabview.options.nan_color:
-                self.tabview.options.nan_color = color
-                self.tabview.refresh()
+                self.tabview.options.setNanColor(color)
 
         dlg = QtWidgets.QColorDialog(self.tabview.options.nan_color, parent=self)
         dlg.colorSelected.connect(applyDialog)  # type: ignore
         dlg.open()
         return dlg
 
-    def actionDialogProcess(self) -> dialogs.ProcessingDialog:
+    def actionDialogProcess(self) -> QtWidgets.QDialog:
+        from pewpew.widgets import dialogs
+
         dlg = dialogs.ProcessingDialog(
             self.tabview.uniqueElements(), self.tabview.laserItems(), parent=self
         )
@@ -455,14 +517,15 @@ class MainWindow(QtWidgets.QMainWindow):
         return dlg
 
     def actionExportAll(self) -> QtWidgets.QDialog:
+        from pewpew.widgets.exportdialogs import ExportAllDialog
+
         dlg = ExportAllDialog(self.tabview.laserItems(), self)
         dlg.open()
         return dlg
 
     def actionGroupColortable(self, action: QtGui.QAction) -> None:
         text = action.text().replace("&", "")
-        self.tabview.options.colortable = text
-        self.tabview.refresh()
+        self.tabview.options.setColortable(text)
 
     # def actionOpen(self) -> QtWidgets.QDialog:
     #     view = self.tabview.activeView()
@@ -480,6 +543,7 @@ class MainWindow(QtWidgets.QMainWindow):
             "CSV Documents(*.csv *.txt *.text);;"
             "Images(*.bmp *.jpg *.jpeg *.png);;"
             "Numpy Archives(*.npz);;"
+            "pew² Projects(*.pewz);;"
             "All files(*)",
         )
         dlg.selectNameFilter("All files(*)")
@@ -488,9 +552,36 @@ class MainWindow(QtWidgets.QMainWindow):
         dlg.open()
         return dlg
 
+    def actionSaveProject(self) -> QtWidgets.QDialog | None:
+        widget = self.tabview.activeWidget()
+        if not isinstance(widget, LaserTabWidget):
+            return None
+        return widget.dialogSaveProject()
+
+    def actionWatch(self, checked: bool = True) -> QtWidgets.QDialog | None:
+        """Select a directory to watch, or stop the current watch."""
+        if not checked:
+            self.tabview.stopWatching()
+            return None
+
+        dlg = QtWidgets.QFileDialog(self, "Watch Directory")
+        dlg.setFileMode(QtWidgets.QFileDialog.Directory)
+        dlg.setOption(QtWidgets.QFileDialog.ShowDirsOnly, True)
+        dlg.fileSelected.connect(self.watchDirectory)
+        dlg.rejected.connect(lambda: self.action_watch.setChecked(False))
+        dlg.open()
+        return dlg
+
+    def watchDirectory(self, directory: Path | str) -> None:
+        self.tabview.watchDirectory(directory)
+        self.action_watch.setChecked(True)
+        self.statusBar().showMessage(f"Watching {directory}.")
+
     def actionWizardImport(
         self, checked: bool = False, path: Path | str = ""
     ) -> QtWidgets.QWizard:
+        from pewpew.widgets.wizards import ImportWizard
+
         wiz = ImportWizard(path, config=self.tabview.config, parent=self)
         wiz.laserImported.connect(self.tabview.importFile)
         wiz.open()
@@ -499,6 +590,8 @@ class MainWindow(QtWidgets.QMainWindow):
     def actionWizardImzML(
         self, checked: bool = False, path: Path | str = ""
     ) -> QtWidgets.QWizard:
+        from pewpew.widgets.wizards import ImzMLImportWizard
+
         wiz = ImzMLImportWizard(path, options=self.tabview.options, parent=self)
         wiz.laserImported.connect(self.tabview.importFile)
         wiz.open()
@@ -507,6 +600,8 @@ class MainWindow(QtWidgets.QMainWindow):
     def actionWizardSpot(
         self, checked: bool = False, path: Path | str = ""
     ) -> QtWidgets.QWizard:
+        from pewpew.widgets.wizards import SpotImportWizard
+
         config = SpotConfig(self.tabview.config.spotsize, self.tabview.config.spotsize)
         wiz = SpotImportWizard(
             [path], config=config, options=self.tabview.options, parent=self
@@ -518,6 +613,8 @@ class MainWindow(QtWidgets.QMainWindow):
     def actionWizardLaserLog(
         self, checked: bool = False, path: Path | str = ""
     ) -> QtWidgets.QWizard:
+        from pewpew.widgets.wizards import LaserLogImportWizard
+
         wiz = LaserLogImportWizard(path, options=self.tabview.options, parent=self)
         wiz.laserImported.connect(self.tabview.importFile)
         wiz.laserImported.connect(
@@ -534,6 +631,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def dialogColortableRange(self) -> QtWidgets.QDialog:
         """Open a `:class:pewpew.widgets.dialogs.ColorRangeDialog` and apply result."""
+        from pewpew.widgets import dialogs
 
         def applyDialog(dialog: dialogs.ColorRangeDialog) -> None:
             self.tabview.options.color_ranges = dialog.ranges
@@ -555,6 +653,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def dialogConfig(self) -> QtWidgets.QDialog:
         """Open a `:class:pewpew.widgets.dialogs.ConfigDialog` and apply result."""
+        from pewpew.widgets import dialogs
+
         # Todo Potential config item
         dlg = dialogs.ConfigDialog(self.default_config, parent=self)
         dlg.check_all.setChecked(True)
@@ -1,135 +1,499 @@
 import logging
+import multiprocessing
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from importlib.metadata import version
 from pathlib import Path
+from typing import Any, Callable
 
-from pewlib import io
+import numpy as np
 from pewlib.config import Config, SpotConfig
 from pewlib.laser import Laser
 from PySide6 import QtCore, QtGui
 
+from pewpew.lib import lazynpz
+from pewpew.lib.importcache import ImportCache
+
 logger = logging.getLogger(__name__)
 
 
+def parse_path(
+    path: Path,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> tuple[np.ndarray, dict, dict[str, str]]:
+    """Parse the vendor data at 'path'.
+
+    Agilent batches are read line by line, see `pewpew.lib.agilent.load`, and
+    Thermo iCap exports in blocks, see `pewpew.lib.thermo.load`.
+
+    Args:
+        path: file or directory to import
+        progress: called with the lines or bytes read and the total, optional
+        cancelled: polled while reading, optional
+
+    Returns:
+        structured array of data, import parameters, vendor information
+    """
+    from pewlib import io
+
+    from pewpew.lib import agilent, thermo
+
+    params: dict = {}
+    info: dict[str, str] = {}
+
+    if path.is_dir():
+        if path.suffix.lower() == ".b":
+            data = None
+            for methods in [["batch_xml", "batch_csv"], ["acq_method_xml"]]:
+                try:
+                    data, params = agilent.load(
+                        path,
+                        collection_methods=methods,
+                        progress=progress,
+                        cancelled=cancelled,
+                    )
+                    info.update(io.agilent.load_info(path))
+                    break
+                except ValueError as e:
+                    logger.warning(f"Error for collection methods {methods}: {e}")
+            if data is None:
+                raise ValueError(f"Unable to import batch '{path.name}'!")
+        elif io.perkinelmer.is_valid_directory(path):
+            data, params = io.perkinelmer.load(path, full=True)
+            info["Instrument Vendor"] = "PerkinElemer"
+        elif io.csv.is_valid_directory(path):
+            data, params = io.csv.load(path, full=True)
+        else:  # pragma: no cover
+            raise ValueError(f"{path.name}: Unknown extention '{path.suffix}'.")
+    else:
+        if path.suffix.lower() == ".csv":
+            sample_format = io.thermo.icap_csv_sample_format(path)
+            if sample_format in ["columns", "rows"]:
+                data, params = thermo.load(
+                    path,
+                    sample_format=sample_format,
+                    progress=progress,
+                    cancelled=cancelled,
+                )
+                info["Instrument Vendor"] = "Thermo"
+            else:
+                data = io.textimage.load(path, name="_element_")
+        elif path.suffix.lower() in [".txt", ".text"]:
+            data = io.textimage.load(path, name="_element_")
+        else:  # pragma: no cover
+            raise ValueError(f"{path.name}: Unknown extention '{path.suffix}'.")
+
+    return data, params, info
+
+
+def parse_cached(
+    path: Path,
+    cache: ImportCache | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> tuple[np.ndarray, dict, dict[str, str]]:
+    """Parse the vendor data at 'path', using 'cache' if not None.
+
+    See `parse_path`.
+    """
+    if cache is None:
+        return parse_path(path, progress=progress, cancelled=cancelled)
+
+    key = cache.key(path)
+    parsed = cache.get(key)
+    if parsed is None:
+        parsed = parse_path(path, progress=progress, cancelled=cancelled)
+        try:
+            cache.put(key, *parsed)
+        except OSError as e:
+            logger.warning(f"Unable to cache import of {path.name}: {e}")
+    return parsed
+
+
+def import_path(
+    path: Path,
+    config: Config,
+    lazy: bool = False,
+    cache: ImportCache | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+    parsed: tuple[np.ndarray, dict, dict[str, str]] | None = None,
+) -> Laser:
+    """Import the laser data at 'path'.
+
+    Args:
+        path: file or directory to import
+        config: default config, used if the file does not store one
+        lazy: defer loading the data of '.npz' documents until first use
+        cache: cache of parsed vendor data, optional
+        progress: passed to `parse_path`
+        cancelled: passed to `parse_path`
+        parsed: result of `parse_cached` for 'path', if already parsed
+    """
+    info = {
+        "Name": path.stem,
+        "File Path": str(path.resolve()),
+        "Import Date": time.strftime(
+            "%Y-%m-%dT%H:%M:%S%z", time.localtime(time.time())
+        ),
+        "Import Path": str(path.resolve()),
+        "Import Version pewlib": version("pewlib"),
+        "Import Version pew2": version("pewpew"),
+    }
+
+    if not path.exists():
+        raise FileNotFoundError(f"{path.name} not found.")
+
+    if path.is_file() and path.suffix.lower() == ".npz":
+        if lazy:
+            return lazynpz.load(path)
+        from pewlib.io import npz
+
+        return npz.load(path)
+
+    if parsed is None:
+        parsed = parse_cached(path, cache, progress=progress, cancelled=cancelled)
+    data, params, vendor_info = parsed
+    info.update(vendor_info)
+
+    # Check for SpotConfig (x and y in spotsize)
+    try:
+        config = SpotConfig(*params["spotsize"])
+    except (KeyError, TypeError):
+        config = Config(
+            spotsize=params.get("spotsize", config.spotsize),
+            speed=params.get("speed", config.speed),
+            scantime=params.get("scantime", config.scantime),
+        )
+
+    return Laser(data=data, config=config, info=info)
+
+
 class ImportThread(QtCore.QThread):
     """Threaded file importer.
 
     To use connect importFinished and call 'run'.
 
+    If 'processes' is greater than 1 then the vendor data of large paths, at
+    least `concurrent_min_bytes`, is parsed concurrently in a pool of
+    processes. The pool is only used if there are at least two such paths,
+    all other paths are read in the thread. Every laser is created by
+    :meth:`importPath`. Progress within a path is only reported when it is
+    parsed in the thread, i.e. the lines of Agilent batches and the bytes of
+    Thermo exports.
+
     Args:
         paths: list of paths to import
         config: default config to apply
+        processes: number of processes used to parse lasers
+        ordered: emit imports in the order of 'paths', otherwise as completed
+        lazy: defer loading the data of '.npz' documents until first use
+        cache: cache of parsed vendor data, optional
 
     Signals:
         importStarted: str, import started for path
         importFinished: Laser, laser object imported
         importFailed: str, import failed for path
-        progressChanged: int, number of paths completed
+        progressChanged: int, progress in `progress_steps` per path
+        lineProgressChanged: str, int, int, name of path, lines read and total
     """
 
     importStarted = QtCore.Signal(str)
     importFinished = QtCore.Signal(Path, object)
     importFailed = QtCore.Signal(str)
     progressChanged = QtCore.Signal(int)
+    lineProgressChanged = QtCore.Signal(str, int, int)
+
+    progress_steps = 100
+    concurrent_min_bytes = 1 << 24
 
     def __init__(
-        self, paths: list[Path], config: Config, parent: QtCore.QObject | None = None
+        self,
+        paths: list[Path],
+        config: Config,
+        processes: int = 1,
+        ordered: bool = True,
+        lazy: bool = True,
+        cache: ImportCache | None = None,
+        parent: QtCore.QObject | None = None,
     ):
         super().__init__(parent)
         self.paths = paths
         self.config = config
+        self.processes = processes
+        self.ordered = ordered
+        self.lazy = lazy
+        self.cache = cache
+
+    def isImage(self, path: Path) -> bool:
+        return bool(QtGui.QImageReader.imageFormat(str(path.absolute())))
+
+    def importImage(self, path: Path) -> QtGui.QImage:
+        return QtGui.QImage(str(path))
+
+    def importPath(
+        self,
+        path: Path,
+        index: int = 0,
+        parsed: tuple[np.ndarray, dict, dict[str, str]] | None = None,
+    ) -> Laser:
+        """Import 'path', the 'index'th path, reporting progress within it.
+
+        If 'parsed' is passed, it is used instead of parsing 'path'.
+        """
+
+        def progress(done: int, total: int) -> None:
+            step = self.progress_steps * done // max(total, 1)
+            self.progressChanged.emit(index * self.progress_steps + step)
+            if path.suffix.lower() == ".b":
+                self.lineProgressChanged.emit(path.name, done, total)
+
+        return import_path(
+            path,
+            self.config,
+            lazy=self.lazy,
+            cache=self.cache,
+            progress=progress,
+            cancelled=self.isInterruptionRequested,
+            parsed=parsed,
+        )
+
+    def isLocal(self, path: Path) -> bool:
+        """Whether 'path' is read in this thread rather than the process pool."""
+        if self.isImage(path) or (self.lazy and path.suffix.lower() == ".npz"):
+            return True
+        try:
+            if path.is_dir():
+                size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+            else:
+                size = path.stat().st_size
+        except OSError:  # reported by importPath
+            return True
+        return size < self.concurrent_min_bytes
+
+    def emitResult(self, path: Path, result: Any, error: Exception | None) -> None:
+        if error is not None:
+            logger.exception(error, exc_info=error)
+            self.importFailed.emit(f"Unable to import {path.name}.")
+        else:
+            self.importFinished.emit(path, result)
+            kind = "image" if isinstance(result, QtGui.QImage) else "laser"
+            logger.info(f"Imported {kind} from {path.name}.")
 
     def run(self) -> None:
         """Start the import thread."""
+        if (
+            self.processes > 1
+            and sum(not self.isLocal(path) for path in self.paths) > 1
+        ):
+            self.runConcurrent()
+        else:
+            self.runSequential()
+        self.progressChanged.emit(len(self.paths) * self.progress_steps)
+
+    def runSequential(self) -> None:
         for i, path in enumerate(self.paths):
             if self.isInterruptionRequested():  # pragma: no cover
                 break
-            self.progressChanged.emit(i)
+            self.progressChanged.emit(i * self.progress_steps)
             self.importStarted.emit(f"Importing {path.name}...")
 
-            if QtGui.QImageReader.imageFormat(
-                str(path.absolute())
-            ):  # mime in QtGui.QImageReader.supportedMimeTypes():
-                try:
-                    image = QtGui.QImage(str(path))
-                    self.importFinished.emit(path, image)
-                except Exception as e:
-                    logger.exception(e)
-                    self.importFailed.emit(f"Unable to import {path.name}.")
+            try:
+                if self.isImage(path):
+                    result = self.importImage(path)
                 else:
-                    logger.info(f"Imported image from {path.name}.")
+                    result = self.importPath(path, i)
+            except InterruptedError:
+                break
+            except Exception as e:
+                self.emitResult(path, None, e)
             else:
-                try:
-                    laser = self.importPath(path)
-                    self.importFinished.emit(path, laser)
-                except Exception as e:
-                    logger.exception(e)
-                    self.importFailed.emit(f"Unable to import {path.name}.")
-                else:
-                    logger.info(f"Imported laser from {path.name}.")
-        self.progressChanged.emit(len(self.paths))
-
-    def importPath(self, path: Path) -> Laser:
-        info = {
-            "Name": path.stem,
-            "File Path": str(path.resolve()),
-            "Import Date": time.strftime(
-                "%Y-%m-%dT%H:%M:%S%z", time.localtime(time.time())
-            ),
-            "Import Path": str(path.resolve()),
-            "Import Version pewlib": version("pewlib"),
-            "Import Version pew2": version("pewpew"),
-        }
-        params = {}
-
-        if not path.exists():
-            raise FileNotFoundError(f"{path.name} not found.")
-
-        if path.is_dir():
-            if path.suffix.lower() == ".b":
-                data = None
-                for methods in [["batch_xml", "batch_csv"], ["acq_method_xml"]]:
+                self.emitResult(path, result, None)
+
+    def runConcurrent(self) -> None:
+        local: list[int] = []
+        pooled: list[int] = []
+        for i, path in enumerate(self.paths):
+            (local if self.isLocal(path) else pooled).append(i)
+
+        # Spawn to avoid forking the Qt threads of this process
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(
+            max_workers=min(self.processes, len(pooled)), mp_context=context
+        )
+
+        futures: dict[Future, int] = {}
+        for i in pooled:
+            future = pool.submit(parse_cached, self.paths[i], self.cache)
+            futures[future] = i
+
+        results: dict[int, tuple[Any, Exception | None]] = {}
+        next_emit, completed, started = 0, 0, -1
+        self.progressChanged.emit(0)
+        try:
+            pending = set(futures.keys())
+            while len(local) > 0 or len(results) > 0 or len(pending) > 0:
+                if self.isInterruptionRequested():
+                    break
+                # Read one local path between each poll of the pool
+                if len(local) > 0:
+                    i = local.pop(0)
+                    path = self.paths[i]
+                    self.importStarted.emit(f"Importing {path.name}...")
                     try:
-                        data, params = io.agilent.load(
-                            path, collection_methods=methods, full=True
-                        )
-                        info.update(io.agilent.load_info(path))
+                        if self.isImage(path):
+                            results[i] = (self.importImage(path), None)
+                        else:
+                            results[i] = (self.importPath(path, i), None)
+                    except InterruptedError:
                         break
-                    except ValueError as e:
-                        logger.warning(f"Error for collection methods {methods}: {e}")
-                if data is None:
-                    raise ValueError(f"Unable to import batch '{path.name}'!")
-            elif io.perkinelmer.is_valid_directory(path):
-                data, params = io.perkinelmer.load(path, full=True)
-                info["Instrument Vendor"] = "PerkinElemer"
-            elif io.csv.is_valid_directory(path):
-                data, params = io.csv.load(path, full=True)
-            else:  # pragma: no cover
-                raise ValueError(f"{path.name}: Unknown extention '{path.suffix}'.")
-        else:
-            if path.suffix.lower() == ".npz":
-                laser = io.npz.load(path)
-                return laser
-            if path.suffix.lower() == ".csv":
-                sample_format = io.thermo.icap_csv_sample_format(path)
-                if sample_format in ["columns", "rows"]:
-                    data, params = io.thermo.load(path, full=True)
-                    info["Instrument Vendor"] = "Thermo"
+                    except Exception as e:
+                        results[i] = (None, e)
+                elif len(pending) > 0:
+                    first = min(futures[future] for future in pending)
+                    if first != started:
+                        self.importStarted.emit(
+                            f"Importing {self.paths[first].name}..."
+                        )
+                        started = first
+                if len(pending) > 0:
+                    done, pending = wait(
+                        pending,
+                        timeout=0.0 if len(local) > 0 else 0.1,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        i = futures[future]
+                        try:
+                            laser = self.importPath(
+                                self.paths[i], i, parsed=future.result()
+                            )
+                            results[i] = (laser, None)
+                        except Exception as e:
+                            results[i] = (None, e)
+
+                # Emit all results that are ready, in order if required
+                while len(results) > 0:
+                    if self.ordered:
+                        if next_emit not in results:
+                            break
+                        i = next_emit
+                        next_emit += 1
+                    else:
+                        i = next(iter(results))
+                    self.emitResult(self.paths[i], *results.pop(i))
+                    completed += 1
+                    self.progressChanged.emit(completed * self.progress_steps)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+class CoalescingJob(QtCore.QRunnable):
+    """Runs a function in a thread pool.
+
+    Emitted signals are queued to the thread of their receivers. The finished
+    signal is always emitted, even if the job was cancelled or 'func' failed.
+
+    Args:
+        func: function to run, must be thread safe
+        generation: identifier passed to finished
+        cancellable: pass :meth:`isCancelled` to 'func', to stop once cancelled
+
+    Signals:
+        finished: int, bool, object, the generation, success and result of 'func'
+    """
+
+    class Signals(QtCore.QObject):
+        finished = QtCore.Signal(int, bool, object)
+
+    def __init__(
+        self, func: Callable[..., Any], generation: int, cancellable: bool = False
+    ):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.func = func
+        self.generation = generation
+        self.cancellable = cancellable
+        self.cancelled = False
+        self.signals = CoalescingJob.Signals()
+
+    def cancel(self) -> None:
+        """Skip the job if it has not yet started, see :meth:`isCancelled`."""
+        self.cancelled = True
+
+    def isCancelled(self) -> bool:
+        return self.cancelled
+
+    def run(self) -> None:
+        success, result = False, None
+        if not self.cancelled:
+            try:
+                if self.cancellable:
+                    result = self.func(self.isCancelled)
                 else:
-                    data = io.textimage.load(path, name="_element_")
-            elif path.suffix.lower() in [".txt", ".text"]:
-                data = io.textimage.load(path, name="_element_")
-            else:  # pragma: no cover
-                raise ValueError(f"{path.name}: Unknown extention '{path.suffix}'.")
+                    result = self.func()
+                success = True
+            except InterruptedError:
+                pass
+            except Exception as e:  # pragma: no cover
+                logger.exception(e)
+        self.signals.finished.emit(self.generation, success, result)
 
-        # Check for SpotConfig (x and y in spotsize)
-        try:
-            config = SpotConfig(*params["spotsize"])
-        except (KeyError, TypeError):
-            config = Config(
-                spotsize=params.get("spotsize", self.config.spotsize),
-                speed=params.get("speed", self.config.speed),
-                scantime=params.get("scantime", self.config.scantime),
-            )
-
-        return Laser(data=data, config=config, info=info)
+
+class CoalescingQueue(QtCore.QObject):
+    """Coalescing background jobs, e.g. the renders of a single item.
+
+    Submitting a job supersedes any previous jobs, queued jobs are cancelled and
+    the results of running jobs are discarded. Only the result of the latest job
+    is emitted.
+
+    Args:
+        pool: thread pool to use, defaults to the global instance
+        parent: parent object
+
+    Signals:
+        resultReady: object, result of the latest job
+    """
+
+    resultReady = QtCore.Signal(object)
+
+    def __init__(
+        self,
+        pool: QtCore.QThreadPool | None = None,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.pool = pool or QtCore.QThreadPool.globalInstance()
+        self.generation = 0
+        # Reference all jobs until finished
+        self.jobs: list[CoalescingJob] = []
+
+    def isActive(self) -> bool:
+        """True if the latest job has not finished."""
+        return any(job.generation == self.generation for job in self.jobs)
+
+    def cancel(self) -> None:
+        """Cancel all jobs, no results will be emitted."""
+        self.generation += 1
+        for job in list(self.jobs):
+            job.cancel()
+            if self.pool.tryTake(job):
+                self.jobs.remove(job)
+
+    def submit(self, func: Callable[..., Any], cancellable: bool = False) -> None:
+        """Cancels existing jobs and runs 'func' in the pool.
+
+        If 'cancellable', 'func' is passed a function that returns True once the
+        job is superseded, and may then raise InterruptedError to stop early.
+        """
+        self.cancel()
+        job = CoalescingJob(func, self.generation, cancellable=cancellable)
+        job.signals.finished.connect(self.jobFinished)
+        self.jobs.append(job)
+        self.pool.start(job)
+
+    def jobFinished(self, generation: int, success: bool, result: Any) -> None:
+        self.jobs = [job for job in self.jobs if job.generation != generation]
+        if success and generation == self.generation:
+            self.resultReady.emit(result)
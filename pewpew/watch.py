@@ -0,0 +1,148 @@
+import logging
+from pathlib import Path
+
+from PySide6 import QtCore
+
+from pewpew.threads import CoalescingQueue
+
+logger = logging.getLogger(__name__)
+
+IMPORT_EXTENSIONS = [".csv", ".npz", ".text", ".txt"]
+
+
+def path_signature(path: Path) -> tuple[tuple[str, int, int], ...]:
+    """The name, modification time and size of every file at 'path'."""
+    files = (
+        sorted(x for x in path.rglob("*") if x.is_file()) if path.is_dir() else [path]
+    )
+    signature = []
+    for file in files:
+        try:
+            stat = file.stat()
+        except FileNotFoundError:  # removed during the scan
+            continue
+        signature.append(
+            (str(file.relative_to(path.parent)), stat.st_mtime_ns, stat.st_size)
+        )
+    return tuple(signature)
+
+
+def is_importable(path: Path) -> bool:
+    """Whether 'path' can be imported by :func:`pewpew.threads.import_path`."""
+    if path.name.startswith("."):
+        return False
+    if path.is_file():
+        return path.suffix.lower() in IMPORT_EXTENSIONS
+    if path.suffix.lower() == ".b":
+        return True
+    from pewlib import io
+
+    return io.perkinelmer.is_valid_directory(path) or io.csv.is_valid_directory(path)
+
+
+def scan_directory(directory: Path) -> dict[Path, tuple]:
+    """The :func:`path_signature` of every importable path in 'directory'."""
+    try:
+        paths = [path for path in directory.iterdir() if is_importable(path)]
+    except OSError as e:  # pragma: no cover, directory removed or unavailable
+        logger.warning(f"Unable to scan {directory}: {e}")
+        return {}
+    return {path: path_signature(path) for path in paths}
+
+
+class DirectoryWatcher(QtCore.QObject):
+    """Watches a directory for new or modified importable files.
+
+    The directory is scanned every 'interval' ms, and when it changes. Scans
+    run in a worker thread, see :func:`scan_directory`, and a scan is skipped
+    while the previous one is running. A path is only reported once its files
+    are unchanged for at least 'debounce' ms, to prevent reading files that
+    are still being written.
+
+    Args:
+        directory: directory to watch
+        interval: time between scans, in ms
+        debounce: time a path must be unchanged before it is reported, in ms
+        existing: also report paths existing when the watch is started
+
+    Signals:
+        pathChanged: Path, a new or modified path
+    """
+
+    pathChanged = QtCore.Signal(Path)
+
+    def __init__(
+        self,
+        directory: Path | str,
+        interval: int = 1000,
+        debounce: int = 2000,
+        existing: bool = True,
+        parent: QtCore.QObject | None = None,
+    ):
+        super().__init__(parent)
+        self.directory = Path(directory)
+        self.debounce = debounce
+        self.existing = existing
+
+        # Signatures of reported paths
+        self.reported: dict[Path, tuple] = {}
+        # Signatures of changed paths and when they last changed
+        self.pending: dict[Path, tuple[tuple, QtCore.QElapsedTimer]] = {}
+        # Record the first scan as reported, if not 'existing'
+        self.ignore_scan = False
+
+        self.queue = CoalescingQueue(parent=self)
+        self.queue.resultReady.connect(self.scanFinished)
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.scan)
+
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.scan)
+
+    def isActive(self) -> bool:
+        return self.timer.isActive()
+
+    def start(self) -> None:
+        if not self.directory.is_dir():
+            raise NotADirectoryError(f"{self.directory} is not a directory.")
+        self.ignore_scan = not self.existing
+        self.watcher.addPath(str(self.directory))
+        self.timer.start()
+        self.scan()
+
+    def stop(self) -> None:
+        self.timer.stop()
+        self.watcher.removePaths(self.watcher.directories())
+        self.queue.cancel()
+        self.pending.clear()
+
+    def scan(self) -> None:
+        """Start a scan of the directory, unless one is running."""
+        if self.queue.isActive():
+            return
+        directory = self.directory
+        self.queue.submit(lambda: scan_directory(directory))
+
+    def scanFinished(self, signatures: dict[Path, tuple]) -> None:
+        """Report any paths that have settled."""
+        if self.ignore_scan:
+            self.reported.update(signatures)
+            self.ignore_scan = False
+            return
+
+        for path, signature in signatures.items():
+            if self.reported.get(path) == signature:
+                self.pending.pop(path, None)
+                continue
+
+            last, elapsed = self.pending.get(path, (None, None))
+            if last != signature:  # new change, restart the debounce
+                elapsed = QtCore.QElapsedTimer()
+                elapsed.start()
+                self.pending[path] = (signature, elapsed)
+            elif elapsed.elapsed() >= self.debounce:
+                self.pending.pop(path)
+                self.reported[path] = signature
+                self.pathChanged.emit(path)
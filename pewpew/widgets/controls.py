@@ -7,7 +7,6 @@ from pewpew.graphics.imageitems import (
     RGBLaserImageItem,
     ScaledImageItem,
 )
-from pewpew.widgets.dialogs import NameEditDialog
 from pewpew.widgets.ext import RangeSlider
 
 
@@ -26,6 +25,8 @@ class EditComboBox(QtWidgets.QComboBox):
         )
 
     def actionNameEditDialog(self) -> QtWidgets.QDialog:
+        from pewpew.widgets.dialogs import NameEditDialog
+
         names = [self.itemText(i) for i in range(self.count())]
         dlg = NameEditDialog(names, allow_remove=True, parent=self)
         dlg.namesSelected.connect(self.namesSelected)
@@ -19,7 +19,7 @@ from pewpew.charts.colocal import ColocalisationView
 from pewpew.charts.histogram import HistogramView
 from pewpew.graphics.imageitems import LaserImageItem
 from pewpew.lib import kmeans
-from pewpew.lib.pratt import Reducer
+from pewpew.lib.processing import apply_processes, filter_methods, parse_processing
 from pewpew.models import CalibrationPointsTableModel
 from pewpew.validators import (
     ConditionalLimitValidator,
@@ -30,8 +30,7 @@ from pewpew.validators import (
 )
 from pewpew.widgets.ext import CollapsableWidget, ValidColorLineEdit
 from pewpew.widgets.modelviews import BasicTableView
-from pewpew.widgets.tools.calculator import CalculatorFormula, CalculatorTool
-from pewpew.widgets.tools.filtering import FilteringTool
+from pewpew.widgets.tools.calculator import CalculatorFormula
 
 
 class ApplyDialog(QtWidgets.QDialog):
@@ -1069,7 +1068,7 @@ class ProcessFilterItemWidget(ProcessItemWidget):
         super().__init__(parent)
 
         self.combo_filter = QtWidgets.QComboBox()
-        self.combo_filter.addItems(FilteringTool.methods.keys())
+        self.combo_filter.addItems(filter_methods.keys())
         self.combo_filter.setCurrentText("Local Median")
         self.combo_filter.activated.connect(self.filterChanged)
 
@@ -1077,7 +1076,7 @@ class ProcessFilterItemWidget(ProcessItemWidget):
         self.combo_names.addItems(names)
         self.combo_names.addItem("*")
 
-        nparams = np.amax([len(f["params"]) for f in FilteringTool.methods.values()])
+        nparams = np.amax([len(f["params"]) for f in filter_methods.values()])
         self.label_fparams = [QtWidgets.QLabel() for _ in range(nparams)]
         self.lineedit_fparams = [ValidColorLineEdit() for _ in range(nparams)]
         for le in self.lineedit_fparams:
@@ -1118,7 +1117,7 @@ class ProcessFilterItemWidget(ProcessItemWidget):
         return True
 
     def filterChanged(self) -> None:
-        filter_ = FilteringTool.methods[self.combo_filter.currentText()]
+        filter_ = filter_methods[self.combo_filter.currentText()]
         # Clear all the current params
         for le in self.label_fparams:
             le.setVisible(False)
@@ -1275,54 +1274,39 @@ class ProcessingDialog(QtWidgets.QDialog):
                 self.list.takeItem(i)
                 break
 
-    def applyPipelineToLaser(self, laser: Laser) -> bool:
-        update_required = False
-        data = laser.get(flat=True, calibrated=False)
-        reducer = Reducer(variables={name: data[name] for name in data.dtype.names})
-        reducer.operations.update(
-            {k: v[1] for k, v in CalculatorTool.functions.items()}
-        )
+    def processes(self) -> list[tuple]:
+        """The pipeline, see :func:`pewpew.lib.processing.apply_processes`."""
+        processes: list[tuple] = []
         for i in range(self.list.count()):
             proc = self.list.itemWidget(self.list.item(i))
             if isinstance(proc, ProcessFilterItemWidget):
-                FilteringTool.filterLaser(laser, proc.name, proc.method, proc.fparams)
+                processes.append(("Filter", proc.name, proc.method, proc.fparams))
             elif isinstance(proc, ProcessCalculatorItemWidget):
-                calc = reducer.reduce(proc.expr)
-                if proc.name in laser.elements:
-                    laser.data[proc.name] = calc
-                else:
-                    update_required = True
-                    laser.add(proc.name, calc)
+                processes.append(("Calculator", proc.name, proc.expr))
             else:
                 raise ValueError("unknown process item type")
-        return update_required
+        return processes
+
+    def applyPipelineToLaser(self, laser: Laser) -> bool:
+        return apply_processes(laser, self.processes())
 
     def loadFromString(self, proc_string: str) -> None:
-        processes = proc_string.split(";")
-        for proc in processes:
-            if len(proc) == 0:
-                continue
-            proc_type = proc[: proc.find("(")]
-            proc_params = proc[proc.find("(") + 1 : proc.find(")")]
+        for proc_type, *params in parse_processing(proc_string):
             if proc_type == "Calculator":
                 widget = self.addCalculatorProcess()
-                oname, expr = proc_params.split(",")
+                oname, expr = params
                 widget.lineedit_name.setText(oname)
                 widget.lineedit_expr.setText(expr)
             elif proc_type == "Filter":
                 widget = self.addFilterProcess()
-                name, filter_type, *filter_pstr = proc_params.split(",")
-                widget.combo_names.setCurrentText(name)
+                name, filter_type, fparams = params
+                widget.combo_names.setCurrentText(name or "*")
                 widget.combo_filter.setCurrentText(filter_type)
                 widget.filterChanged()
-                for pstr, le in zip(
-                    filter_pstr,
-                    [le for le in widget.lineedit_fparams if le.isVisible()],
+                for p, le in zip(
+                    fparams, [le for le in widget.lineedit_fparams if le.isVisible()]
                 ):
-                    _, p = pstr.split("=")
-                    le.setText(p)
-            else:
-                raise ValueError(f"unknown processing type '{proc_type}'")
+                    le.setText(str(p))
 
     def dialogLoadFromLaser(self) -> LaserImageItem | None:
         item_names = {item.name(): item for item in self.items}
@@ -1356,6 +1340,7 @@ class ProcessingDialog(QtWidgets.QDialog):
         for i in range(self.apply_list.count()):
             item = item_names[self.apply_list.item(i).text()]
             update_required = self.applyPipelineToLaser(item.laser)
+            item.modified.emit()
             if update_required:
                 item.elementsChanged.emit()
             else:
@@ -1438,7 +1423,10 @@ class SelectionDialog(ApplyDialog):
         data = self.item.raw_data
         if data is None or len(data) == 0:
             return
-        if self.check_limit_threshold.isChecked() and self.item.mask_image is not None:
+        if (
+            self.check_limit_threshold.isChecked()
+            and not self.item.selection_mask.isEmpty()
+        ):
             data = data[self.item.mask]
 
         # Remove nans
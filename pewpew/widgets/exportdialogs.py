@@ -9,6 +9,8 @@ from PySide6 import QtCore, QtGui, QtWidgets
 from pewpew.graphics.export import generate_laser_image, generate_rgb_laser_image
 from pewpew.graphics.imageitems import LaserImageItem, RGBLaserImageItem
 from pewpew.graphics.options import GraphicsOptions
+from pewpew.lib import lazynpz
+from pewpew.lib.quantile import QuantileSketch
 from pewpew.widgets.prompts import OverwriteFilePrompt
 
 logger = logging.getLogger(__name__)
@@ -607,8 +609,15 @@ class ExportDialog(_ExportDialogBase):
         laser: Laser,
         element: str | None = None,
         graphics_options: GraphicsOptions | None = None,
+        sketches: dict[tuple[str, bool], QuantileSketch] | None = None,
     ) -> None:
+        """Export 'element' of 'laser' to 'path'.
+
+        Cached quantile `sketches` of the laser's item, keyed by element and
+        calibration, are used for percentile ranges of images.
+        """
         option = self.options.currentOption()
+        sketches = sketches or {}
 
         if option.ext == ".csv":
             if element is not None and element in laser.elements:
@@ -634,6 +643,11 @@ class ExportDialog(_ExportDialogBase):
                         size=size,
                         scale=scale,
                         dpi=option.dpi(),
+                        sketches={
+                            name: sketches[(name, False)]
+                            for name in option.elements()
+                            if (name, False) in sketches
+                        },
                     )
                     image.setDotsPerMeterX(option.dpi() * 39.37007874)
                     image.setDotsPerMeterY(option.dpi() * 39.37007874)
@@ -653,6 +667,7 @@ class ExportDialog(_ExportDialogBase):
                         size=size,
                         scale=scale,
                         dpi=option.dpi(),
+                        sketch=sketches.get((element, graphics_options.calibrate)),
                     )
                     image.setDotsPerMeterX(option.dpi() * 39.37007874)
                     image.setDotsPerMeterY(option.dpi() * 39.37007874)
@@ -665,7 +680,7 @@ class ExportDialog(_ExportDialogBase):
             io.vtk.save(path, data, spacing)
 
         elif option.ext == ".npz":  # npz
-            io.npz.save(path, laser)
+            lazynpz.save(path, laser)
 
         else:
             raise ValueError(f"Unable to export file as '{option.ext}'.")
@@ -682,7 +697,13 @@ class ExportDialog(_ExportDialogBase):
 
         try:
             for path, element in paths:
-                self.export(path, self.item.laser, element, self.item.options)
+                self.export(
+                    path,
+                    self.item.laser,
+                    element,
+                    self.item.options,
+                    self.item.quantile_sketches,
+                )
         except Exception as e:  # pragma: no cover
             logger.exception(e)
             QtWidgets.QMessageBox.critical(self, "Unable to Export!", str(e))
@@ -787,7 +808,9 @@ class ExportAllDialog(ExportDialog):
                     dlg.setValue(exported)
                     if dlg.wasCanceled():
                         break
-                    self.export(path, item.laser, element, item.options)
+                    self.export(
+                        path, item.laser, element, item.options, item.quantile_sketches
+                    )
                     exported += 1
         except Exception as e:  # pragma: no cover
             logger.exception(e)
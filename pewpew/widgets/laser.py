@@ -1,10 +1,11 @@
 import copy
 import logging
+import os
+import uuid
 from io import BytesIO
 from pathlib import Path
 
 import numpy as np
-from pewlib import io
 from pewlib.calibration import Calibration
 from pewlib.config import Config, SpotConfig
 from pewlib.laser import Laser
@@ -21,18 +22,17 @@ from pewpew.graphics.imageitems import (
 )
 from pewpew.graphics.lasergraphicsview import LaserGraphicsView
 from pewpew.graphics.options import GraphicsOptions
+from pewpew.lib.importcache import ImportCache
+from pewpew.lib.lazynpz import LazyNpzLaser
+from pewpew.lib.project import ProjectFile
 from pewpew.threads import ImportThread
-from pewpew.widgets import dialogs, exportdialogs
+from pewpew.watch import DirectoryWatcher
 from pewpew.widgets.controls import (
     ControlBar,
     ImageControlBar,
     LaserControlBar,
     RGBLaserControlBar,
 )
-from pewpew.widgets.tools import ToolWidget
-from pewpew.widgets.tools.calculator import CalculatorTool
-from pewpew.widgets.tools.filtering import FilteringTool
-from pewpew.widgets.tools.standards import StandardsTool
 from pewpew.widgets.views import TabView, TabViewWidget
 
 logger = logging.getLogger(__name__)
@@ -41,6 +41,20 @@ logger = logging.getLogger(__name__)
 # @todo, add button to toolbars to lock the current item as active
 
 
+def _transform_to_list(transform: QtGui.QTransform) -> list[float]:
+    return [
+        transform.m11(),
+        transform.m12(),
+        transform.m13(),
+        transform.m21(),
+        transform.m22(),
+        transform.m23(),
+        transform.m31(),
+        transform.m32(),
+        transform.m33(),
+    ]
+
+
 class LaserTabView(TabView):
     """Tabbed view for displaying laser images."""
 
@@ -53,6 +67,7 @@ class LaserTabView(TabView):
 
         self.config = Config()
         self.options = GraphicsOptions()
+        self.watcher: DirectoryWatcher | None = None
         self.tabs.setAutoHide(True)
 
     def insertTab(self, index: int, text: str, widget: "LaserTabWidget") -> int:
@@ -94,6 +109,8 @@ class LaserTabView(TabView):
     # Events
     def dragEnterEvent(self, event: QtGui.QDragEnterEvent) -> None:
         if event.mimeData().hasUrls():
+            from pewlib import io
+
             paths = [Path(url.toLocalFile()) for url in event.mimeData().urls()]
             # logs / imzml go to mainwindow for wizard
             if not any(
@@ -112,23 +129,61 @@ class LaserTabView(TabView):
         self.openDocument(paths)
 
     # Callbacks
+    def createImportThread(self, paths: list[Path]) -> ImportThread:
+        """An import thread for 'paths', configured from the import settings."""
+        settings = QtCore.QSettings()
+        if settings.value("Import/Cache", True, type=bool):
+            cache = ImportCache(
+                Path(
+                    QtCore.QStandardPaths.writableLocation(
+                        QtCore.QStandardPaths.CacheLocation
+                    )
+                ).joinpath("imports"),
+                max_bytes=int(settings.value("Import/CacheSize", 1 << 30)),
+            )
+        else:
+            cache = None
+
+        return ImportThread(
+            paths,
+            config=self.config,
+            processes=int(settings.value("Import/Processes", os.cpu_count() or 1)),
+            ordered=settings.value("Import/Ordered", True, type=bool),
+            cache=cache,
+            parent=self,
+        )
+
     def openDocument(self, paths: list[Path] | Path) -> None:
         """Open `paths` as new laser images."""
         if isinstance(paths, (Path, str)):
             paths = [paths]
 
         paths = [Path(path) for path in paths]  # Ensure Path
+        for path in [p for p in paths if p.suffix.lower() == ProjectFile.extension]:
+            self.openProject(path)
+            paths.remove(path)
+        if len(paths) == 0:
+            return
 
         progress = QtWidgets.QProgressDialog(
-            "Importing...", "Cancel", 0, 0, parent=self
+            "Importing...",
+            "Cancel",
+            0,
+            len(paths) * ImportThread.progress_steps,
+            parent=self,
         )
         progress.setWindowTitle("Importing...")
         progress.setMinimumDuration(2000)
-        thread = ImportThread(paths, config=self.config, parent=self)
+        thread = self.createImportThread(paths)
 
         progress.canceled.connect(thread.requestInterruption)
         thread.importStarted.connect(progress.setLabelText)
         thread.progressChanged.connect(progress.setValue)
+        thread.lineProgressChanged.connect(
+            lambda name, i, n: progress.setLabelText(
+                f"Importing {name}... line {i} of {n}"
+            )
+        )
 
         thread.importFinished.connect(self.importFile)
         thread.importFailed.connect(logger.exception)
@@ -136,6 +191,62 @@ class LaserTabView(TabView):
 
         thread.start()
 
+    def openProject(self, path: Path | str) -> "LaserTabWidget":
+        """Open a project in a new tab, laser data is loaded on first use."""
+        project = ProjectFile(path)
+        widget = LaserTabWidget(self.options, self)
+        widget.loadProject(project)
+        self.addTab(project.path.stem, widget)
+        self.setActiveWidget(widget)
+        self.fileImported.emit(project.path)
+        return widget
+
+    def watchDirectory(self, directory: Path | str) -> DirectoryWatcher:
+        """Import new files in 'directory' and update them as they change.
+
+        Lasers imported from a changed path are updated in place.
+        """
+        self.stopWatching()
+        settings = QtCore.QSettings()
+        self.watcher = DirectoryWatcher(
+            directory,
+            debounce=int(settings.value("Watch/Debounce", 2000)),
+            parent=self,
+        )
+        self.watcher.pathChanged.connect(self.importWatchedPath)
+        self.watcher.start()
+        logger.info(f"Watching {self.watcher.directory} for new data.")
+        return self.watcher
+
+    def stopWatching(self) -> None:
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher.deleteLater()
+            self.watcher = None
+
+    def importWatchedPath(self, path: Path) -> None:
+        thread = self.createImportThread([path])
+        thread.lazy = False
+        # Each change would add an entry that is never read again
+        thread.cache = None
+        thread.importFinished.connect(self.updateOrImportFile)
+        thread.importFailed.connect(logger.warning)
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+
+    def updateOrImportFile(self, path: Path, laser: Laser) -> None:
+        """Update the laser item imported from 'path', or import as new."""
+        import_path = str(path.resolve())
+        for item in self.laserItems():
+            if import_path in [
+                item.laser.info.get("Import Path"),
+                item.laser.info.get("File Path"),
+            ]:
+                item.applyData(laser.data)
+                logger.info(f"Updated {item.name()} from {path.name}.")
+                return
+        self.importFile(path, laser)
+
     def applyCalibration(self, calibration: dict[str, Calibration]) -> None:
         """Set calibrations in all tabs."""
         for widget in self.widgets():
@@ -203,6 +314,10 @@ class LaserTabWidget(TabViewWidget):
         self.graphics.scene().focusItemChanged.connect(self.updateForItem)
         self.graphics.scene().setStickyFocus(True)
 
+        # Items saved in the project, and their keys
+        self.project: ProjectFile | None = None
+        self.project_keys: dict[QtWidgets.QGraphicsItem, str] = {}
+
         self.action_copy_image = qAction(
             "insert-image",
             "Copy Scene &Image",
@@ -384,6 +499,7 @@ class LaserTabWidget(TabViewWidget):
 
         # Modification
         item.modified.connect(lambda: self.setWindowModified(True))
+        item.modified.connect(lambda: self.project_keys.pop(item, None))
         item.destroyed.connect(self.numLaserItemsChanged)
 
         item.redraw()
@@ -398,7 +514,7 @@ class LaserTabWidget(TabViewWidget):
 
         self.numLaserItemsChanged.emit()
 
-    def addImage(self, path: str | Path) -> "ImageOverlayItem":
+    def addImage(self, path: str | Path | QtGui.QImage) -> "ImageOverlayItem":
         if isinstance(path, Path):
             path = str(path.absolute())
         image = QtGui.QImage(path)
@@ -507,10 +623,10 @@ class LaserTabWidget(TabViewWidget):
 
     # Virtual
     def refresh(self) -> None:
-        """Redraw images."""
+        """Redraw images, in worker threads."""
         for item in self.graphics.items():
             if isinstance(item, LaserImageItem):
-                item.redraw()
+                item.requestRedraw()
 
         self.graphics.invalidateScene()
         super().refresh()
@@ -549,6 +665,8 @@ class LaserTabWidget(TabViewWidget):
         item: ImageOverlayItem | LaserImageItem | None = None,
         selection: bool = False,
     ) -> QtWidgets.QDialog:
+        from pewpew.widgets import dialogs
+
         if item is None:
             item = self.graphics.scene().focusItem()
 
@@ -607,12 +725,19 @@ class LaserTabWidget(TabViewWidget):
         dlg.open()
         return dlg
 
-    def openTool(self, tool: str, item: LaserImageItem) -> ToolWidget:
+    def openTool(self, tool: str, item: LaserImageItem) -> QtWidgets.QWidget:
+        """Open 'tool' for 'item' in a new tab, tools are imported on first use."""
         if tool == "Calculator":
+            from pewpew.widgets.tools.calculator import CalculatorTool
+
             widget = CalculatorTool(item, view=self.view)
         elif tool == "Filtering":
+            from pewpew.widgets.tools.filtering import FilteringTool
+
             widget = FilteringTool(item, view=self.view)
         elif tool == "Standards":
+            from pewpew.widgets.tools.standards import StandardsTool
+
             widget = StandardsTool(item, view=self.view)
         else:
             raise ValueError(f"Invalid tool type {tool}.")
@@ -627,11 +752,15 @@ class LaserTabWidget(TabViewWidget):
             item = self.graphics.scene().focusItem()
             assert item is not None
 
+        from pewpew.widgets import exportdialogs
+
         dlg = exportdialogs.ExportDialog(item, parent=self)
         dlg.open()
         return dlg
 
     def dialogExportAll(self) -> QtWidgets.QDialog:
+        from pewpew.widgets import exportdialogs
+
         dlg = exportdialogs.ExportAllDialog(self.laserItems(), parent=self)
         dlg.open()
         return dlg
@@ -665,6 +794,167 @@ class LaserTabWidget(TabViewWidget):
         dlg.open()
         return dlg
 
+    def dialogSaveProject(self, save_as: bool = False) -> QtWidgets.QDialog | None:
+        """Save the tab to a project.
+
+        If not already associated with a project, or 'save_as' is True, a dialog
+        is opened to select one.
+        """
+        if self.project is not None and not save_as:
+            self.saveProject(self.project.path)
+            return None
+
+        dlg = QtWidgets.QFileDialog(
+            self,
+            "Save Project",
+            str(self.project.path) if self.project is not None else "",
+            f"pew² Project(*{ProjectFile.extension});;All files(*)",
+        )
+        dlg.setAcceptMode(QtWidgets.QFileDialog.AcceptSave)
+        dlg.setDefaultSuffix(ProjectFile.extension[1:])
+        dlg.fileSelected.connect(self.saveProject)
+        dlg.open()
+        return dlg
+
+    def itemState(self, item: LaserImageItem | ImageOverlayItem) -> dict:
+        """The layout and display state of 'item', see `addItemFromState`."""
+        state = {
+            "pos": [item.pos().x(), item.pos().y()],
+            # LaserImageItem.transform flips and rotates the data
+            "transform": _transform_to_list(QtWidgets.QGraphicsItem.transform(item)),
+            "z": item.zValue(),
+        }
+        if isinstance(item, LaserImageItem):
+            state["class"] = type(item).__name__
+            state["element"] = item.element()
+            if isinstance(item, RGBLaserImageItem):
+                state["rgb"] = [
+                    [rgb.element, rgb.color.name(), list(rgb.prange)]
+                    for rgb in item.current_elements
+                ]
+        else:
+            rect = item.rect
+            state["rect"] = [rect.x(), rect.y(), rect.width(), rect.height()]
+            state["locked"] = item.isLocked()
+        return state
+
+    def addItemFromState(
+        self, data: Laser | QtGui.QImage, state: dict
+    ) -> LaserImageItem | ImageOverlayItem:
+        """Add a laser or image with the state from `itemState`."""
+        if isinstance(data, Laser):
+            if state.get("class") == "RGBLaserImageItem":
+                elements = [
+                    RGBLaserImageItem.RGBElement(
+                        element, QtGui.QColor(color), tuple(prange)
+                    )
+                    for element, color, prange in state["rgb"]
+                ]
+                item = RGBLaserImageItem(
+                    data, self.graphics.options, current_elements=elements
+                )
+            else:
+                item = LaserImageItem(
+                    data, self.graphics.options, current_element=state.get("element")
+                )
+            self.addLaserItem(item, pos=QtCore.QPointF(*state["pos"]))
+        else:
+            item = self.addImage(data)
+            item.rect = QtCore.QRectF(*state["rect"])
+            item.setPos(QtCore.QPointF(*state["pos"]))
+            if state.get("locked", False):
+                item.lock()
+        item.setTransform(QtGui.QTransform(*state["transform"]))
+        item.setZValue(state["z"])
+        return item
+
+    def saveProject(self, path: Path | str) -> None:
+        """Save all items, their layout and the graphics options to 'path'.
+
+        If 'path' is the current project only items modified since the last
+        save are written, otherwise 'path' is overwritten. Errors writing the
+        project are reported in a message box.
+        """
+        path = Path(path).resolve()
+        if self.project is None or self.project.path != path:
+            project = ProjectFile(path)
+            project_keys: dict[QtWidgets.QGraphicsItem, str] = {}
+        else:
+            project, project_keys = self.project, self.project_keys
+
+        state: dict = {
+            "lasers": [],
+            "images": [],
+            "options": self.graphics.options.state(),
+        }
+        lasers: dict[str, Laser] = {}
+        images: dict[str, bytes] = {}
+        keys: dict[QtWidgets.QGraphicsItem, str] = {}
+
+        for item in self.graphics.scene().items(QtCore.Qt.AscendingOrder):
+            if not isinstance(item, (LaserImageItem, ImageOverlayItem)):
+                continue
+            key = project_keys.get(item, uuid.uuid4().hex)
+            keys[item] = key
+
+            record = {"key": key, **self.itemState(item)}
+            if isinstance(item, LaserImageItem):
+                if item not in project_keys:
+                    lasers[key] = item.laser
+                state["lasers"].append(record)
+            else:
+                if item not in project_keys:
+                    buffer = QtCore.QBuffer()
+                    buffer.open(QtCore.QIODevice.WriteOnly)
+                    item.image.save(buffer, "PNG")
+                    images[key] = buffer.data().data()
+                state["images"].append(record)
+
+        # Release element maps of the archive, allowing it to be replaced
+        for item in self.laserItems():
+            if isinstance(item.laser, LazyNpzLaser) and item.laser.path == path:
+                item.laser.detach()
+
+        try:
+            if project is not self.project:
+                path.unlink(missing_ok=True)
+            project.write(state, lasers, images)
+        except OSError as e:
+            logger.exception(e)
+            QtWidgets.QMessageBox.critical(self, "Unable to Save!", str(e))
+            return
+
+        self.project = project
+        self.project_keys = keys
+        for item in self.laserItems():
+            item.laser.info["File Path"] = str(path)
+            if isinstance(item.laser, LazyNpzLaser) and item.laser.path == path:
+                item.laser.updateSource()
+
+        self.setWindowModified(False)
+        logger.info(
+            f"Saved project {path.name}, {len(lasers)} of "
+            f"{len(state['lasers'])} lasers written."
+        )
+
+    def loadProject(self, project: ProjectFile) -> None:
+        """Add the items of 'project' and restore the graphics options."""
+        manifest = project.readManifest()
+        self.graphics.options.restoreState(manifest.get("options", {}))
+
+        self.project = project
+        for record in manifest.get("lasers", []):
+            item = self.addItemFromState(project.readLaser(record["key"]), record)
+            self.project_keys[item] = record["key"]
+
+        for record in manifest.get("images", []):
+            image = QtGui.QImage.fromData(project.readImage(record["key"]))
+            item = self.addItemFromState(image, record)
+            self.project_keys[item] = record["key"]
+
+        self.graphics.zoomReset()
+        self.setWindowModified(False)
+
     def actionDuplicate(self) -> None:
         """Duplicate document to a new tab."""
         self.view.addLaser(copy.deepcopy(self.laser))
@@ -727,9 +1017,11 @@ class LaserTabWidget(TabViewWidget):
                     calibration = None
 
                 if mime.hasFormat("application/x-pew2info"):
+                    from pewlib.io.npz import unpack_info
+
                     with BytesIO(mime.data("application/x-pew2info")) as fp:
                         array = np.load(fp)
-                        info = io.npz.unpack_info(array)
+                        info = unpack_info(array)
                 else:
                     info = {"Name": "unknown"}
 
@@ -1,32 +1,15 @@
 import numpy as np
-from pewlib.process.calc import normalise
-from pewlib.process.threshold import otsu
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from pewpew.graphics import colortable
 from pewpew.graphics.imageitems import LaserImageItem, ScaledImageItem
-from pewpew.lib import kmeans
-from pewpew.lib.pratt import (
-    BinaryFunction,
-    Parser,
-    ParserException,
-    Reducer,
-    ReducerException,
-    TernaryFunction,
-    UnaryFunction,
-)
+from pewpew.lib.pratt import Parser, ParserException, Reducer, ReducerException
+from pewpew.lib.processing import calculator_functions
 from pewpew.widgets.ext import ValidColorLineEdit, ValidColorTextEdit
 from pewpew.widgets.tools import ToolWidget
 from pewpew.widgets.views import TabView
 
 
-def segment_image(x: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
-    mask = np.zeros(x.shape, dtype=int)
-    for i, t in enumerate(np.atleast_1d(thresholds)):
-        mask[x > t] = i + 1
-    return mask
-
-
 class CalculatorName(ValidColorLineEdit):
     """A lineedit that excludes invalid or existing element names.
 
@@ -152,84 +135,7 @@ class CalculatorFormula(ValidColorTextEdit):
 class CalculatorTool(ToolWidget):
     """Calculator for element data operations."""
 
-    functions = {
-        "abs": (
-            (UnaryFunction("abs"), "(<x>)", "The absolute value of <x>."),
-            (np.abs, 1),
-        ),
-        "kmeans": (
-            (
-                BinaryFunction("kmeans"),
-                "(<x>, <k>)",
-                "Returns lower bounds of 1 to <k> kmeans clusters.",
-            ),
-            (kmeans.thresholds, 2),
-        ),
-        "mask": (
-            (
-                BinaryFunction("mask"),
-                "(<x>, <mask>)",
-                "Selects <x> where <mask>, otherwise NaN.",
-            ),
-            (lambda x, m: np.where(m, x, np.nan), 2),
-        ),
-        "mean": (
-            (UnaryFunction("mean"), "(<x>)", "Returns the mean of <x>."),
-            (np.nanmean, 1),
-        ),
-        "median": (
-            (
-                UnaryFunction("median"),
-                "(<x>)",
-                "Returns the median of <x>.",
-            ),
-            (np.nanmedian, 1),
-        ),
-        "nantonum": (
-            (UnaryFunction("nantonum"), "(<x>)", "Sets nan values to 0."),
-            (np.nan_to_num, 1),
-        ),
-        "normalise": (
-            (
-                TernaryFunction("normalise"),
-                "(<x>, <min>, <max>)",
-                "Normalise <x> from from <min> to <max>.",
-            ),
-            (normalise, 3),
-        ),
-        "otsu": (
-            (
-                UnaryFunction("otsu"),
-                "(<x>)",
-                "Returns Otsu's threshold for <x>.",
-            ),
-            (otsu, 1),
-        ),
-        "percentile": (
-            (
-                BinaryFunction("percentile"),
-                "(<x>, <percent>)",
-                "Returns the <percent> percentile of <x>.",
-            ),
-            (np.nanpercentile, 2),
-        ),
-        "segment": (
-            (
-                BinaryFunction("segment"),
-                "(<x>, <threshold(s)>)",
-                "Create a masking image from the given thrshold(s).",
-            ),
-            (segment_image, 2),
-        ),
-        "threshold": (
-            (
-                BinaryFunction("threshold"),
-                "(<x>, <value>)",
-                "Sets <x> below <value> to NaN.",
-            ),
-            (lambda x, a: np.where(x > a, x, np.nan), 2),
-        ),
-    }
+    functions = calculator_functions
 
     def __init__(self, item: LaserImageItem, view: TabView | None = None):
         super().__init__(item, graphics_label="Preview", view=view)
@@ -292,6 +198,7 @@ class CalculatorTool(ToolWidget):
             self.item.laser.data[name] = data
         else:
             self.item.laser.add(self.lineedit_name.text(), data)
+        self.item.modified.emit()
         # Make sure to repop elements
         self.itemModified.emit(self.item)
 
@@ -378,15 +285,12 @@ class CalculatorTool(ToolWidget):
         rect = QtCore.QRectF(x0, y0, x1 - x0, y1 - y0)
 
         vmin, vmax = self.item.options.get_color_range_as_float("<calc>", data)
-        data = np.clip(data, vmin, vmax)
-        if vmin != vmax:
-            data = (data - vmin) / (vmax - vmin)
 
         table = colortable.get_table(self.item.options.colortable)
 
         if self.image is not None:
             self.graphics.scene().removeItem(self.image)
-        self.image = ScaledImageItem.fromArray(data, rect, table)
+        self.image = ScaledImageItem.fromArray(data, rect, table, vrange=(vmin, vmax))
         self.image.setFlag(
             QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False
         )
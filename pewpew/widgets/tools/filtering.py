@@ -1,99 +1,22 @@
 from typing import Callable
 
 import numpy as np
-from pewlib.process import filters
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from pewpew.actions import qAction, qToolButton
 from pewpew.graphics import colortable
 from pewpew.graphics.imageitems import LaserImageItem, ScaledImageItem
+from pewpew.lib.processing import filter_laser, filter_methods
 from pewpew.validators import ConditionalLimitValidator
 from pewpew.widgets.ext import ValidColorLineEdit
 from pewpew.widgets.tools import ToolWidget
 from pewpew.widgets.views import TabView
 
 
-# Filters
-def rolling_mean(x: np.ndarray, size: int, threshold: float) -> np.ndarray:
-    """For mapping size to (size, size)."""
-    size = int(size)
-    return filters.rolling_mean(x, (size, size), threshold)
-
-
-def rolling_median(x: np.ndarray, size: int, threshold: float) -> np.ndarray:
-    """For mapping size to (size, size)."""
-    size = int(size)
-    return filters.rolling_median(x, (size, size), threshold)
-
-
-def gaussian_filter(x: np.ndarray, sigma: float) -> np.ndarray:
-    size = int(2.0 * sigma * 5.0)
-    if size % 2 == 0:
-        size += 1
-    xs = np.linspace(-sigma * 5.0, sigma * 5.0, size)
-    psf = 1.0 / (sigma * np.sqrt(2.0 * np.pi)) * np.exp(-0.5 * (xs / sigma) ** 2)
-    psf /= psf.sum()
-
-    x = np.apply_along_axis(np.convolve, 0, x, psf, mode="same")
-    x = np.apply_along_axis(np.convolve, 1, x, psf, mode="same")
-    return x
-
-
-# def simple_highpass(x: np.ndarray, limit: float, replace: float) -> np.ndarray:
-#     return np.where(x < limit, replace, x)
-
-
-# def simple_lowpass(x: np.ndarray, limit: float, replace: float) -> np.ndarray:
-#     return np.where(x > limit, replace, x)
-
-
 class FilteringTool(ToolWidget):
     """View and calculate mean and meidan filtered images."""
 
-    methods: dict = {
-        "Local Mean": {
-            "filter": rolling_mean,
-            "params": [
-                ("size", 5, (2.5, 99), lambda x: (x + 1) % 2 == 0),
-                ("σ", 3.0, (0.0, np.inf), None),
-            ],
-            "desc": ["Window size for local mean.", "Filter if > σ stddevs from mean."],
-        },
-        "Local Median": {
-            "filter": rolling_median,
-            "params": [
-                ("size", 5, (2.5, 99), lambda x: (x + 1) % 2 == 0),
-                ("k", 3.0, (0.0, np.inf), None),
-            ],
-            "desc": [
-                "Window size for local median.",
-                "Filter if median absolute deviation > k stddevs",
-            ],
-        },
-        "Gaussian": {
-            "filter": gaussian_filter,
-            "params": [
-                ("σ", 0.5, (0.0, np.inf), None),
-            ],
-            "desc": ["Gaussian filter for smoothing."],
-        },
-        # "Simple High-pass": {
-        #     "filter": simple_highpass,
-        #     "params": [
-        #         ("min", 1e3, (-np.inf, np.inf), None),
-        #         ("replace", 0.0, (-np.inf, np.inf), None),
-        #     ],
-        #     "desc": ["Filter if below this value.", "Value to replace with."],
-        # },
-        # "Simple Low-pass": {
-        #     "filter": simple_lowpass,
-        #     "params": [
-        #         ("max", 1e3, (-np.inf, np.inf), None),
-        #         ("replace", 0.0, (-np.inf, np.inf), None),
-        #     ],
-        #     "desc": ["Filter if above this value.", "Value to replace with."],
-        # },
-    }
+    methods = filter_methods
 
     def __init__(self, item: LaserImageItem, view: TabView | None = None):
         super().__init__(item, graphics_label="Preview", view=view)
@@ -153,33 +76,12 @@ class FilteringTool(ToolWidget):
             if self.checkbox_all_elements.isChecked()
             else self.combo_element.currentText()
         )
-        FilteringTool.filterLaser(self.item.laser, name, method, self.fparams)
+        filter_laser(self.item.laser, name, method, self.fparams)
 
+        self.item.modified.emit()
         self.item.redraw()
         self.initialise()
 
-    @staticmethod
-    def filterLaser(
-        laser, name: str | None, method: str, method_args: list[float]
-    ) -> None:
-        filter_ = FilteringTool.methods[method]["filter"]
-        proc = laser.info.get("Processing", "")
-        params = [
-            f"{p[0]}={v}"
-            for p, v in zip(FilteringTool.methods[method]["params"], method_args)
-        ]
-        pstr = ",".join(params)
-
-        if name is None:
-            for name in laser.elements:
-                laser.data[name] = filter_(laser.data[name], *method_args)
-            proc += f"Filter(*,{method},{pstr});"
-        else:
-            laser.data[name] = filter_(laser.data[name], *method_args)
-            proc += f"Filter({name},{method},{pstr});"
-
-        laser.info["Processing"] = proc
-
     @property
     def fparams(self) -> list[float]:
         return [float(le.text()) for le in self.lineedit_fparams if le.isEnabled()]
@@ -243,16 +145,13 @@ class FilteringTool(ToolWidget):
         rect = QtCore.QRectF(x0, y0, x1 - x0, y1 - y0)
 
         vmin, vmax = self.item.options.get_color_range_as_float("<calc>", data)
-        data = np.clip(data, vmin, vmax)
-        if vmin != vmax:
-            data = (data - vmin) / (vmax - vmin)
 
         table = colortable.get_table(self.item.options.colortable)
 
         if self.image is not None:
             self.graphics.scene().removeItem(self.image)
 
-        self.image = ScaledImageItem.fromArray(data, rect, table)
+        self.image = ScaledImageItem.fromArray(data, rect, table, vrange=(vmin, vmax))
         self.image.setFlag(
             QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False
         )
@@ -159,13 +159,10 @@ class StandardsTool(ToolWidget):
         rect = QtCore.QRectF(x0, y0, x1 - x0, y1 - y0)
 
         vmin, vmax = self.item.options.get_color_range_as_float("<calc>", data)
-        data = np.clip(data, vmin, vmax)
-        if vmin != vmax:
-            data = (data - vmin) / (vmax - vmin)
 
         table = colortable.get_table(self.item.options.colortable)
 
-        image = ScaledImageItem.fromArray(data, rect, table)
+        image = ScaledImageItem.fromArray(data, rect, table, vrange=(vmin, vmax))
         image.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
         image.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsFocusable, False)
         image.setFlag(QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
@@ -50,6 +50,7 @@ class ToolWidget(TabViewWidget):
         self.graphics.setMouseTracking(True)
 
         self.item = item
+        self.item.options.colortableOptionsChanged.connect(self.refresh)
 
         self.button_box = QtWidgets.QDialogButtonBox(
             QtWidgets.QDialogButtonBox.Cancel
@@ -1,5 +1,37 @@
-from .import_ import ImportWizard
-from .spot import SpotImportWizard
-from .srr import SRRImportWizard
-from .laser import LaserLogImportWizard
-from .imzml import ImzMLImportWizard
+"""Import wizards, each wizard module is only imported on first access.
+
+The imports are explicit, rather than by name, so that they are found by
+PyInstaller.
+"""
+
+__all__ = [
+    "ImportWizard",
+    "SpotImportWizard",
+    "SRRImportWizard",
+    "LaserLogImportWizard",
+    "ImzMLImportWizard",
+]
+
+
+def __getattr__(name: str):
+    if name == "ImportWizard":
+        from .import_ import ImportWizard
+
+        return ImportWizard
+    elif name == "SpotImportWizard":
+        from .spot import SpotImportWizard
+
+        return SpotImportWizard
+    elif name == "SRRImportWizard":
+        from .srr import SRRImportWizard
+
+        return SRRImportWizard
+    elif name == "LaserLogImportWizard":
+        from .laser import LaserLogImportWizard
+
+        return LaserLogImportWizard
+    elif name == "ImzMLImportWizard":
+        from .imzml import ImzMLImportWizard
+
+        return ImzMLImportWizard
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
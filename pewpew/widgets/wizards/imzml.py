@@ -2,6 +2,7 @@ import logging
 import time
 from importlib.metadata import version
 from pathlib import Path
+from typing import Callable
 
 import numpy as np
 import numpy.lib.recfunctions as rfn
@@ -16,7 +17,11 @@ from pewpew.graphics.colortable import get_table
 from pewpew.graphics.imageitems import ScaledImageItem
 from pewpew.graphics.lasergraphicsview import LaserGraphicsView
 from pewpew.graphics.options import GraphicsOptions
+from pewpew.lib import imzmlextract
+from pewpew.lib.cache import LRUCache
+from pewpew.lib.imzmlindex import ImzMLIndex, MassIndex
 from pewpew.lib.numpyqt import NumpyRecArrayTableModel
+from pewpew.threads import CoalescingQueue
 from pewpew.validators import DoublePrecisionDelegate, DoubleValidatorWithEmpty
 from pewpew.widgets.wizards.options import PathSelectWidget
 
@@ -98,6 +103,7 @@ class MassTable(QtWidgets.QTableView):
 
 class ImzMLImportPage(QtWidgets.QWizardPage):
     imzmlChanged = QtCore.Signal()
+    massIndexChanged = QtCore.Signal()
 
     def __init__(
         self,
@@ -132,17 +138,31 @@ class ImzMLImportPage(QtWidgets.QWizardPage):
         )
         self.path_binary.pathChanged.connect(self.completeChanged)
 
+        self.check_mass_index = QtWidgets.QCheckBox("Index m/z for fast ion images.")
+        self.check_mass_index.setToolTip(
+            "Sort all centroids by m/z, stored next to the imzML. "
+            "Ion images are extracted without reading every spectrum once the "
+            "index is built in the background."
+        )
+        self.check_mass_index.setChecked(
+            QtCore.QSettings().value("ImzML/MassIndex", False, type=bool)
+        )
+
         self._imzml: ImzML = None
+        self._mass_index: MassIndex | None = None
+        self.mass_index_thread: ImzMLMassIndexThread | None = None
 
         layout = QtWidgets.QVBoxLayout()
         layout.addWidget(label)
         layout.addWidget(self.path)
         layout.addWidget(self.path_binary)
+        layout.addWidget(self.check_mass_index)
         layout.addStretch(1)
         self.setLayout(layout)
 
         self.registerField("imzml_path", self.path.lineedit_path)
         self.registerField("imzml", self, "imzml_prop")
+        self.registerField("mass_index", self, "mass_index_prop")
 
     def isComplete(self) -> bool:
         return self.path.isComplete() and self.path_binary.isComplete()
@@ -156,6 +176,39 @@ class ImzMLImportPage(QtWidgets.QWizardPage):
             self.path_binary.addPath(self.path.path.with_suffix(".ibd"))
 
     def validatePage(self) -> bool:
+        index = ImzMLIndex(self.path.path, self.path_binary.path)
+        imzml: ImzML | None = None
+        if index.isValid():
+            try:
+                imzml = index.load()
+            except Exception as e:  # pragma: no cover
+                logger.warning(f"Unable to read index, parsing imzML: {e}")
+
+        if imzml is None:
+            imzml = self.parseImzML()
+            if imzml is None:
+                return False
+            try:
+                index.save(imzml)
+            except OSError as e:
+                logger.warning(f"Unable to write imzML index: {e}")
+
+        self.stopMassIndex()
+        self.setField("imzml", imzml)
+        self.setField("mass_index", None)
+
+        QtCore.QSettings().setValue(
+            "ImzML/MassIndex", self.check_mass_index.isChecked()
+        )
+        if self.check_mass_index.isChecked() and index.isValid():
+            # Images are extracted from the imzML until the index is available
+            self.mass_index_thread = ImzMLMassIndexThread(index, parent=self)
+            self.mass_index_thread.massIndexBuilt.connect(self.massIndexBuilt)
+            self.mass_index_thread.start()
+        return True
+
+    def parseImzML(self) -> ImzML | None:
+        """Parse the XML, None if cancelled."""
         file_size = self.path.path.stat().st_size
         dlg = QtWidgets.QProgressDialog("Parsing imzML", "Cancel", 0, file_size)
         dlg.setWindowTitle("imzML Import")
@@ -167,15 +220,23 @@ class ImzMLImportPage(QtWidgets.QWizardPage):
             return not dlg.wasCanceled()
 
         try:
-            imzml = fast_parse_imzml(
+            return fast_parse_imzml(
                 self.path.path, self.path_binary.path, callback=update_progress
             )
         except UserWarning:
-            return False
+            return None
+        finally:
+            dlg.close()
 
-        self.setField("imzml", imzml)
-        dlg.close()
-        return True
+    def massIndexBuilt(self, mass_index: MassIndex) -> None:
+        self.setField("mass_index", mass_index)
+
+    def stopMassIndex(self) -> None:
+        if self.mass_index_thread is not None:
+            self.mass_index_thread.requestInterruption()
+            self.mass_index_thread.wait()
+            self.mass_index_thread.deleteLater()
+            self.mass_index_thread = None
 
     def getImzML(self) -> ImzML:
         return self._imzml
@@ -183,7 +244,94 @@ class ImzMLImportPage(QtWidgets.QWizardPage):
     def setImzML(self, imzml: ImzML) -> None:
         self._imzml = imzml
 
+    def getMassIndex(self) -> MassIndex | None:
+        return self._mass_index
+
+    def setMassIndex(self, mass_index: MassIndex | None) -> None:
+        self._mass_index = mass_index
+
     imzml_prop = QtCore.Property("QVariant", getImzML, setImzML, notify=imzmlChanged)
+    mass_index_prop = QtCore.Property(
+        "QVariant", getMassIndex, setMassIndex, notify=massIndexChanged
+    )
+
+
+class ImzMLMassIndexThread(QtCore.QThread):
+    """Loads the m/z index of an imzML, building it if required.
+
+    See :meth:`pewpew.lib.imzmlindex.ImzMLIndex.buildMassIndex`.
+
+    Args:
+        index: index of the imzML
+
+    Signals:
+        massIndexBuilt: object, the :class:`pewpew.lib.imzmlindex.MassIndex`
+    """
+
+    massIndexBuilt = QtCore.Signal(object)
+
+    def __init__(self, index: ImzMLIndex, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.index = index
+
+    def run(self) -> None:
+        try:
+            if not self.index.hasMassIndex():
+                self.index.buildMassIndex(cancelled=self.isInterruptionRequested)
+            mass_index = self.index.massIndex()
+        except InterruptedError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unable to build m/z index: {e}")
+            return
+        self.massIndexBuilt.emit(mass_index)
+
+
+class ImzMLSummaryThread(QtCore.QThread):
+    """Computes the TIC and mean spectrum of an imzML.
+
+    See :func:`pewpew.lib.imzmlextract.tic_and_mean_spectrum`.
+
+    Args:
+        imzml: dataset to summarise
+        interval: minimum time between partial results, in ms
+
+    Signals:
+        summaryChanged: object, object, object, partial TIC, m/z and mean intensity
+        summaryFinished: object, object, object, the TIC, m/z and mean intensity
+    """
+
+    summaryChanged = QtCore.Signal(object, object, object)
+    summaryFinished = QtCore.Signal(object, object, object)
+
+    def __init__(
+        self, imzml: ImzML, interval: int = 250, parent: QtCore.QObject | None = None
+    ):
+        super().__init__(parent)
+        self.imzml = imzml
+        self.interval = interval
+
+    def run(self) -> None:
+        timer = QtCore.QElapsedTimer()
+        timer.start()
+
+        def partial(
+            tic: np.ndarray, mz: np.ndarray, mean: np.ndarray, done: int, total: int
+        ) -> None:
+            if timer.hasExpired(self.interval):
+                self.summaryChanged.emit(tic.copy(), mz, mean)
+                timer.restart()
+
+        try:
+            result = imzmlextract.tic_and_mean_spectrum(
+                self.imzml, partial=partial, cancelled=self.isInterruptionRequested
+            )
+        except InterruptedError:
+            return
+        except Exception as e:  # pragma: no cover
+            logger.exception(e)
+            return
+        self.summaryFinished.emit(*result)
 
 
 class ImzMLTargetMassPage(QtWidgets.QWizardPage):
@@ -200,12 +348,33 @@ class ImzMLTargetMassPage(QtWidgets.QWizardPage):
             options = GraphicsOptions()
 
         self.image: ClickableImageItem | None = None
-        self.image_cache: dict[float, np.ndarray] = {}
+        self.tic: np.ndarray | None = None
+        self.mean_spectrum: tuple[np.ndarray, np.ndarray] | None = None
+        # Partial summaries are only drawn if shown
+        self.tic_shown = False
+        self.mean_spectrum_shown = False
+        self.summary_thread: ImzMLSummaryThread | None = None
+        self.index: ImzMLIndex | None = None
+        # Ion images keyed by (m/z, mass width)
+        self.image_cache = LRUCache(options.image_cache_size)
+
+        # Images of the rows around a selected mass are extracted in the background
+        self.prefetch_rows = 2
+        self.prefetch_queue = CoalescingQueue(parent=self)
+        self.prefetch_queue.resultReady.connect(self.prefetchFinished)
+        # Targets and width of the latest prefetch
+        self.prefetch_targets: tuple[set[float], float] = (set(), 0.0)
 
         self.mass_table = MassTable()
         self.mass_table.model().dataChanged.connect(self.completeChanged)
         self.mass_table.model().rowsRemoved.connect(self.completeChanged)
-        self.mass_table.clicked.connect(self.massSelected)
+        # Clicking the current row redraws it, changing row also prefetches
+        self.mass_table.clicked.connect(
+            lambda index: self.massSelected(index, prefetch=False)
+        )
+        self.mass_table.selectionModel().currentRowChanged.connect(
+            lambda current, previous: self.massSelected(current)
+        )
 
         self.mass_width = QtWidgets.QSpinBox()
         self.mass_width.setRange(0, 1000)
@@ -213,7 +382,7 @@ class ImzMLTargetMassPage(QtWidgets.QWizardPage):
         self.mass_width.setSingleStep(10)
         self.mass_width.setSuffix(" ppm")
         self.mass_width.valueChanged.connect(self.completeChanged)
-        self.mass_width.valueChanged.connect(self.image_cache.clear)
+        self.mass_width.valueChanged.connect(self.prefetch_queue.cancel)
 
         self.graphics = LaserGraphicsView(options, parent=self)
         self.graphics.setMinimumSize(QtCore.QSize(640, 320))
@@ -223,10 +392,18 @@ class ImzMLTargetMassPage(QtWidgets.QWizardPage):
         self.action_tic = qAction(
             "black_sum", "Draw TIC", "Draw the total-ion-chromatogram.", self.drawTIC
         )
+        self.action_mean_spectrum = qAction(
+            "view-object-histogram-linear",
+            "Draw Mean Spectrum",
+            "Draw the mean spectrum of all pixels.",
+            self.drawMeanSpectrum,
+        )
         self.toolbar = QtWidgets.QToolBar()
         self.toolbar.addAction(self.action_tic)
+        self.toolbar.addAction(self.action_mean_spectrum)
         self.toolbar.setParent(self.graphics)
-        self.toolbar.widgetForAction(self.action_tic).setAutoFillBackground(True)
+        for action in [self.action_tic, self.action_mean_spectrum]:
+            self.toolbar.widgetForAction(action).setAutoFillBackground(True)
 
         self.registerField("mass_width", self.mass_width)
         self.registerField("target_masses", self, "target_masses_prop")
@@ -252,7 +429,52 @@ class ImzMLTargetMassPage(QtWidgets.QWizardPage):
         self.setLayout(layout)
 
     def initializePage(self) -> None:
-        self.drawTIC()
+        self.stopSummary()
+        imzml: ImzML = self.field("imzml")
+        self.index = ImzMLIndex(self.field("imzml_path"), imzml.external_binary)
+
+        summary = self.index.summary()
+        if summary is not None:
+            self.setSummary(*summary)
+            self.drawTIC()
+            self.drawMeanSpectrum()
+            return
+
+        # Computed in the background, partial results are drawn as they arrive
+        self.tic_shown, self.mean_spectrum_shown = True, True
+        self.summary_thread = ImzMLSummaryThread(imzml, parent=self)
+        self.summary_thread.summaryChanged.connect(self.setSummary)
+        self.summary_thread.summaryFinished.connect(self.summaryFinished)
+        self.summary_thread.start()
+
+    def cleanupPage(self) -> None:
+        self.stopSummary()
+
+    def stopSummary(self) -> None:
+        if self.summary_thread is not None:
+            self.summary_thread.requestInterruption()
+            self.summary_thread.wait()
+            self.summary_thread.deleteLater()
+            self.summary_thread = None
+
+    def setSummary(self, tic: np.ndarray, mz: np.ndarray, mean: np.ndarray) -> None:
+        self.tic = tic
+        self.mean_spectrum = (mz, mean)
+        if self.tic_shown:
+            self.drawTIC(zoom_reset=self.image is None)
+        if self.mean_spectrum_shown:
+            self.drawMeanSpectrum()
+
+    def summaryFinished(
+        self, tic: np.ndarray, mz: np.ndarray, mean: np.ndarray
+    ) -> None:
+        self.setSummary(tic, mz, mean)
+        if self.index is None:  # pragma: no cover
+            return
+        try:
+            self.index.saveSummary(tic, mz, mean)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unable to store imzML summary: {e}")
 
     def isComplete(self) -> bool:
         return (
@@ -263,7 +485,9 @@ class ImzMLTargetMassPage(QtWidgets.QWizardPage):
     def getTargetMasses(self) -> np.ndarray:
         return self.mass_table.targetMasses()
 
-    def drawImage(self, image: np.ndarray | ClickableImageItem) -> None:
+    def drawImage(
+        self, image: np.ndarray | ClickableImageItem, zoom_reset: bool = True
+    ) -> None:
         if self.image is not None:
             self.graphics.scene().removeItem(self.image)
 
@@ -273,7 +497,7 @@ class ImzMLTargetMassPage(QtWidgets.QWizardPage):
             px, py = imzml.scan_settings.pixel_size
             rect = QtCore.QRectF(0, 0, sx * px, sy * py)
             image = ClickableImageItem.fromArray(
-                image, rect, list(get_table(self.graphics.options.colortable))
+                image, rect, get_table(self.graphics.options.colortable)
             )
 
         self.image = image
@@ -288,32 +512,103 @@ class ImzMLTargetMassPage(QtWidgets.QWizardPage):
             QtWidgets.QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False
         )
         self.graphics.scene().addItem(self.image)
-        self.graphics.zoomReset()
+        if zoom_reset:
+            self.graphics.zoomReset()
 
-    def drawTIC(self) -> None:
-        imzml: ImzML = self.field("imzml")
-        tic = imzml.extract_tic()
-        tic -= np.nanmin(tic)
+    def drawTIC(self, zoom_reset: bool = True) -> None:
+        self.tic_shown = True
+        if self.tic is None or np.all(np.isnan(self.tic)):
+            return
+        tic = self.tic - np.nanmin(self.tic)
         tic /= np.nanmax(tic)
 
-        self.drawImage(tic)
+        self.drawImage(tic, zoom_reset=zoom_reset)
+
+    def drawMeanSpectrum(self) -> None:
+        self.mean_spectrum_shown = True
+        if self.mean_spectrum is None or self.mean_spectrum[0].size == 0:
+            return
+        self.spectra.clear()
+        spec = self.spectra.drawCentroidSpectra(*self.mean_spectrum)
+        spec.mzClicked.connect(self.mass_table.addMass)
+        spec.mzDoubleClicked.connect(self.drawMass)
+
+    def extractor(self) -> Callable[..., np.ndarray]:
+        """A function extracting images of m/z with a width in ppm.
+
+        Uses the m/z index if available, otherwise reads the imzML. Reading may
+        be stopped by passing 'cancelled', see
+        :func:`pewpew.lib.imzmlextract.extract_masses`.
+        """
+        mass_index: MassIndex | None = self.field("mass_index")
+        if mass_index is not None:
+            return lambda targets, width, cancelled=None: mass_index.extract_masses(
+                targets, mass_width_ppm=width
+            )
+        imzml: ImzML = self.field("imzml")
+        return lambda targets, width, cancelled=None: imzmlextract.extract_masses(
+            imzml, targets, mass_width_ppm=width, max_workers=1, cancelled=cancelled
+        )
 
     def drawMass(self, mz: float) -> None:
-        if mz not in self.image_cache:
-            imzml: ImzML = self.field("imzml")
-            img = imzml.extract_masses(
-                mz, mass_width_ppm=float(self.mass_width.value())
-            )[:, :, 0]
-            self.image_cache[mz] = img
-        else:
-            img = self.image_cache[mz]
+        key = (mz, float(self.mass_width.value()))
+        img = self.image_cache.get(key)
+        if img is None:
+            img = self.extractor()(mz, key[1])[:, :, 0]
+            self.image_cache.put(key, img)
 
-        img -= np.nanmin(img)
+        img = img - np.nanmin(img)
         img /= np.nanmax(img)
+        self.tic_shown = False
         self.drawImage(img)
 
+    def prefetchNeighbours(self, row: int) -> None:
+        """Extract the uncached images of masses within `prefetch_rows` of 'row'."""
+        masses = self.mass_table.model().array["m/z"]
+        mass_width = float(self.mass_width.value())
+        neighbours = masses[
+            max(0, row - self.prefetch_rows) : row + self.prefetch_rows + 1
+        ]
+        targets = np.unique(
+            [
+                mz
+                for mz in neighbours[~np.isnan(neighbours)].tolist()
+                if (mz, mass_width) not in self.image_cache
+            ]
+        )
+        if targets.size == 0:
+            return
+
+        # Already being extracted
+        active_targets, active_width = self.prefetch_targets
+        if (
+            self.prefetch_queue.isActive()
+            and active_width == mass_width
+            and active_targets.issuperset(targets.tolist())
+        ):
+            return
+
+        extractor = self.extractor()
+        self.prefetch_targets = (set(targets.tolist()), mass_width)
+        self.prefetch_queue.submit(
+            lambda cancelled: (
+                targets,
+                mass_width,
+                extractor(targets, mass_width, cancelled=cancelled),
+            ),
+            cancellable=True,
+        )
+
+    def prefetchFinished(self, result: tuple[np.ndarray, float, np.ndarray]) -> None:
+        targets, mass_width, data = result
+        for i, mz in enumerate(targets.tolist()):
+            if (mz, mass_width) not in self.image_cache:
+                # Copied, a view would keep all images in memory
+                self.image_cache.put((mz, mass_width), data[:, :, i].copy())
+
     def drawSpectraAtPos(self, pos: QtCore.QPoint) -> None:
         self.spectra.clear()
+        self.mean_spectrum_shown = False
 
         imzml: ImzML = self.field("imzml")
 
@@ -340,13 +635,15 @@ class ImzMLTargetMassPage(QtWidgets.QWizardPage):
         "QVariant", getTargetMasses, notify=targetMassesChanged
     )
 
-    def massSelected(self, index: QtCore.QModelIndex) -> None:
+    def massSelected(self, index: QtCore.QModelIndex, prefetch: bool = True) -> None:
         if not index.isValid():
             return
         text = self.mass_table.model().data(index, QtCore.Qt.ItemDataRole.EditRole)
         if text == "":
             return
         self.drawMass(float(text))
+        if prefetch:
+            self.prefetchNeighbours(index.row())
 
 
 class ImzMLImportWizard(QtWidgets.QWizard):
@@ -374,15 +671,21 @@ class ImzMLImportWizard(QtWidgets.QWizard):
 
         self.setPage(self.page_imzml, ImzMLImportPage(path, binary_path))
         self.setPage(self.page_masses, ImzMLTargetMassPage(options))
+        self.finished.connect(self.page(self.page_imzml).stopMassIndex)
+        self.finished.connect(self.page(self.page_masses).stopSummary)
 
     def accept(self) -> None:
         path = Path(self.field("imzml_path"))
         imzml: ImzML = self.field("imzml")
+        mass_index: MassIndex | None = self.field("mass_index")
         mass_width = float(self.field("mass_width"))
         target_masses: np.ndarray = self.field("target_masses")
 
         # cleanup the masses
-        mass_range = imzml.mass_range()
+        if mass_index is not None:
+            mass_range = float(mass_index.mz[0]), float(mass_index.mz[-1])
+        else:
+            mass_range = imzmlextract.mass_range(imzml)
         target_masses = target_masses[
             (target_masses > mass_range[0]) & (target_masses < mass_range[1])
         ]
@@ -396,7 +699,12 @@ class ImzMLImportWizard(QtWidgets.QWizard):
             return
         target_masses = np.unique(target_masses)
 
-        data = imzml.extract_masses(target_masses, mass_width)
+        if mass_index is not None:
+            data = mass_index.extract_masses(target_masses, mass_width_ppm=mass_width)
+        else:
+            data = self.extractMasses(imzml, target_masses, mass_width)
+            if data is None:
+                return
 
         data = rfn.unstructured_to_structured(
             data, names=[f"{x:.4f}" for x in target_masses]
@@ -421,3 +729,27 @@ class ImzMLImportWizard(QtWidgets.QWizard):
         self.laserImported.emit(laser.info["File Path"], laser)
 
         super().accept()
+
+    def extractMasses(
+        self, imzml: ImzML, target_masses: np.ndarray, mass_width: float
+    ) -> np.ndarray | None:
+        """Extract images in parallel, None if cancelled."""
+        dlg = QtWidgets.QProgressDialog(
+            "Extracting ion images", "Cancel", 0, len(imzml.spectra), self
+        )
+        dlg.setWindowTitle("imzML Import")
+        dlg.setMinimumWidth(320)
+        dlg.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+
+        try:
+            return imzmlextract.extract_masses(
+                imzml,
+                target_masses,
+                mass_width_ppm=mass_width,
+                progress=lambda done, _: dlg.setValue(done),
+                cancelled=dlg.wasCanceled,
+            )
+        except InterruptedError:
+            return None
+        finally:
+            dlg.close()
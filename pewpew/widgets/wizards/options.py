@@ -9,8 +9,13 @@ from pewlib import io
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from pewpew.events import DragDropRedirectFilter
+from pewpew.lib import agilent, thermo
+from pewpew.lib.preview import PreviewCache
 from pewpew.widgets.ext import MultipleDirDialog
 
+# Options are guessed from previews, files are only fully read on import
+previews = PreviewCache()
+
 
 class _OptionsBase(QtWidgets.QGroupBox):  # pragma: no cover
     optionsChanged = QtCore.Signal()
@@ -153,6 +158,7 @@ class CsvLinesOptions(_OptionsBase):
         super().__init__("CSV Lines", "Directory", [""], parent)
         self.csvs: list[Path] = []
         self.lines = 0
+        self.truncated = False
 
         self.option = io.csv.GenericOption()
 
@@ -226,7 +232,7 @@ class CsvLinesOptions(_OptionsBase):
         if regex == "":
             regex = ".*\\.csv"
         self.lines = sum([re.match(regex, p.name) is not None for p in self.csvs])
-        self.lineedit_nlines.setText(f"{self.lines}")
+        self.lineedit_nlines.setText(f"{self.lines}{'+' if self.truncated else ''}")
 
     def sortingChanged(self) -> None:
         sorting = self.combo_sortkey.currentText()
@@ -239,16 +245,26 @@ class CsvLinesOptions(_OptionsBase):
 
     def updateHeaderPreview(self, header: int) -> None:
         try:
-            with open(self.csvs[0], "r") as fp:
-                line = None
-                for _ in range(header + 1):
-                    line = fp.readline()
+            line = previews.get(self.csvs[0]).line(header)
             self.lineedit_header_preview.setText(line)
-        except (IndexError, ValueError):
+        except (IndexError, OSError):
             self.lineedit_header_preview.setText("")
 
     def updateForPath(self, path: Path) -> None:
-        option = io.csv.option_for_path(path)
+        preview = previews.get(path)
+        # As io.csv.option_for_path, using the listing
+        option = next(
+            (
+                op
+                for op in [
+                    io.csv.NuOption(),
+                    io.csv.ThermoLDROption(),
+                    io.csv.TofwerkOption(),
+                ]
+                if len(preview.match(op.regex)) > 0
+            ),
+            io.csv.GenericOption(),
+        )
         if isinstance(option, io.csv.NuOption):
             self.lineedit_regex.setText(option.regex.pattern)
             self.combo_sortkey.setCurrentText("Numerical")
@@ -265,7 +281,19 @@ class CsvLinesOptions(_OptionsBase):
             self.spinbox_header.setValue(13)
             self.combo_sortkey.setCurrentText("Numerical")
 
-        self.csvs = list(path.glob("*.csv"))
+        self.csvs = [path.joinpath(name) for name in preview.match(r".*\.csv$")]
+        self.truncated = preview.truncated
+
+        if type(option) is io.csv.GenericOption and len(self.csvs) > 0:
+            try:
+                delimiter = previews.get(self.csvs[0]).sniffDelimiter()
+            except OSError:
+                delimiter = ""
+            if delimiter != "":
+                self.combo_delimiter.setCurrentText(
+                    {"\t": "Tab", " ": "Space"}.get(delimiter, delimiter)
+                )
+
         self.regexChanged()
         self.updateHeaderPreview(self.spinbox_header.value())
 
@@ -358,21 +386,27 @@ class ThermoOptions(_OptionsBase):
     def isComplete(self) -> bool:
         return self.radio_rows.isChecked() or self.radio_columns.isChecked()
 
-    def preprocessFile(self, path: Path) -> tuple[str, str, bool]:
+    def preprocessFile(self, path: Path) -> tuple[str, str, bool | None]:
+        """The delimiter, sample format and whether analog readings exist.
+
+        Analog readings are None if not found in a truncated preview, as they
+        may be later in the file.
+        """
         method = "unknown"
-        has_analog = False
-        with path.open("r", encoding="utf-8-sig") as fp:
-            lines = [next(fp) for _ in range(3)]
-            delimiter = lines[0][0]
-            if "MainRuns" in lines[0]:  # pragma: no cover
-                method = "rows"
-            elif "MainRuns" in lines[2]:
-                method = "columns"
-            for line in fp:
-                if "Analog" in line:
-                    has_analog = True
-                    break
-            return delimiter, method, has_analog
+        preview = previews.get(path)
+        lines = [preview.line(i) for i in range(3)]
+        delimiter = lines[0][:1]
+        if "MainRuns" in lines[0]:  # pragma: no cover
+            method = "rows"
+        elif "MainRuns" in lines[2]:
+            method = "columns"
+        if preview.contains("Analog"):
+            has_analog = True
+        elif preview.truncated:
+            has_analog = None
+        else:
+            has_analog = False
+        return delimiter, method, has_analog
 
     def setEnabled(self, enabled: bool) -> None:
         self.combo_delimiter.setEnabled(enabled)
@@ -395,9 +429,18 @@ class ThermoOptions(_OptionsBase):
 
         if has_analog:
             self.check_use_analog.setEnabled(True)
+            self.check_use_analog.setToolTip("")
+        elif has_analog is None:
+            self.check_use_analog.setEnabled(True)
+            self.check_use_analog.setChecked(False)
+            self.check_use_analog.setToolTip(
+                "Analog readings were not found at the start of the file,"
+                " the export may not contain them."
+            )
         else:
             self.check_use_analog.setEnabled(False)
             self.check_use_analog.setChecked(False)
+            self.check_use_analog.setToolTip("")
 
 
 class _PathSelectBase(QtWidgets.QWidget):
@@ -791,6 +834,8 @@ class PathAndOptionsPage(QtWidgets.QWizardPage):
         except ValueError as e:
             QtWidgets.QMessageBox.critical(self, "Import Error", str(e))
             return False
+        except InterruptedError:
+            return False
 
         self.setField("laserdata", datas)
         self.setField("laserparam", params)
@@ -826,6 +871,23 @@ class PathAndOptionsPage(QtWidgets.QWizardPage):
             )
         return datas, params, infos
 
+    def readWithProgress(self, path: Path, func: Callable, **kwargs) -> Any:
+        """Call 'func' with the progress and cancelled kwargs of a dialog."""
+        dlg = QtWidgets.QProgressDialog(
+            f"Importing {path.name}...", "Cancel", 0, 1000, parent=self
+        )
+        dlg.setWindowTitle("Importing...")
+        dlg.setWindowModality(QtCore.Qt.WindowModal)
+        dlg.setMinimumDuration(1000)
+
+        def progress(i: int, n: int) -> None:
+            dlg.setValue(1000 * i // max(n, 1))  # processes events while modal
+
+        try:
+            return func(path, progress=progress, cancelled=dlg.wasCanceled, **kwargs)
+        finally:
+            dlg.close()
+
     def readAgilent(
         self, path: Path
     ) -> tuple[np.ndarray, dict[str, Any], dict[str, str]]:
@@ -841,11 +903,11 @@ class PathAndOptionsPage(QtWidgets.QWizardPage):
         else:  # pragma: no cover
             raise ValueError("Unknown data file collection method.")
 
-        data, params = io.agilent.load(
+        data, params = self.readWithProgress(
             path,
+            agilent.load,
             collection_methods=method,
             use_acq_for_names=self.field("agilent.useAcqNames"),
-            full=True,
         )
         info = io.agilent.load_info(path)
         return data, params, info
@@ -915,18 +977,13 @@ class PathAndOptionsPage(QtWidgets.QWizardPage):
             delimiter=self.field("thermo.delimiter"),
             comma_decimal=self.field("thermo.decimal") == ",",
         )
-        use_analog = self.field("thermo.useAnalog")
-
-        if self.field("thermo.sampleRows"):  # pragma: no cover
-            data = io.thermo.icap_csv_rows_read_data(
-                path, use_analog=use_analog, **kwargs
-            )
-            params = io.thermo.icap_csv_rows_read_params(path, **kwargs)
-        else:
-            data = io.thermo.icap_csv_columns_read_data(
-                path, use_analog=use_analog, **kwargs
-            )
-            params = io.thermo.icap_csv_columns_read_params(path, **kwargs)
+        data, params = self.readWithProgress(
+            path,
+            thermo.load,
+            use_analog=self.field("thermo.useAnalog"),
+            sample_format="rows" if self.field("thermo.sampleRows") else "columns",
+            **kwargs,
+        )
         return data, params, {"Instrument Vendor": "Thermo"}
 
     def getData(self) -> list[np.ndarray]:
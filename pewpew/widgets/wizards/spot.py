@@ -743,9 +743,7 @@ class SpotImagePage(QtWidgets.QWizardPage):
             image[::2, :] = image[::2, ::-1]
 
         table = get_table(self.graphics.options.colortable)
-        self.image = ScaledImageItem.fromArray(
-            image, QtCore.QRectF(0, 0, x, y), list(table)
-        )
+        self.image = ScaledImageItem.fromArray(image, QtCore.QRectF(0, 0, x, y), table)
         self.graphics.scene().addItem(self.image)
         self.graphics.fitInView(QtCore.QRectF(0, 0, x, y))
 
@@ -1,6 +1,8 @@
 import argparse
+import base64
 import sys
 from pathlib import Path
+from typing import TextIO
 
 import numpy as np
 
@@ -2338,31 +2340,77 @@ def convert_map_to_table(cmap: np.ndarray, a: float = 1.0) -> np.ndarray:
     return (table[:, 0] << 16) + (table[:, 1] << 8) + (table[:, 2] << 0) + alpha
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("output", type=Path, help="The output file.")
-    args = parser.parse_args(sys.argv[1:])
+header = '''"""Colortables as packed little-endian uint32 ARGB values.
+
+Generated by scripts/colormap_to_table.py, do not edit.
+"""
+
+import base64
+
+import numpy as np
+
+'''
+
+footer = '''
+_tables: dict[str, np.ndarray] = {}
+
+
+def list_tables() -> list[str]:
+    return list(_data.keys())
 
-    header = (
-        "import numpy as np\nfrom typing import Dict, List\n\n\n"
-        "colortables: dict[str, np.ndarray] = {\n"
-    )
 
-    footer = (
-        "}\n\n\ndef list_tables() -> list[str]:\n"
-        "    return list(colortables.keys())\n\n\n"
-        "def get_table(name: str) -> np.ndarray:\n"
-        "    return colortables[name]"
+def get_table(name: str) -> np.ndarray:
+    """The colortable 'name' as a read-only uint32 array.
+
+    Tables are decoded on first use and cached.
+    """
+    if name not in _tables:
+        table = np.frombuffer(base64.b64decode(_data[name]), dtype="<u4")
+        table = table.astype(np.uint32, copy=False)
+        table.flags.writeable = False
+        _tables[name] = table
+    return _tables[name]
+
+
+def get_icon(name: str, w: int = 32, h: int = 32) -> "QtGui.QIcon":
+    from PySide6 import QtGui
+
+    x = np.repeat(np.arange(0, 256, 256 // w)[None, :], h, axis=0).astype(np.uint8)
+    img = QtGui.QImage(
+        x.data,
+        x.shape[1],
+        x.shape[0],
+        x.strides[0],
+        QtGui.QImage.Format.Format_Indexed8,
     )
+    img._array = x
+    table = get_table(name)
+    img.setColorTable(table)
+    img.setColorCount(len(table))
+    return QtGui.QIcon(QtGui.QPixmap.fromImage(img))
+'''
 
-    with args.output.open("w") as fp:
-        fp.write(header)
 
-        for name in colormaps.keys():
-            table = convert_map_to_table(colormaps[name])
-            fp.write(f'    "{name}": [\n')
-            for row in table.reshape(-1, 4):
-                fp.write("        " + ", ".join(str(v) for v in row) + ",\n")
-            fp.write("    ],\n")
+def write_tables(fp: TextIO, tables: dict[str, np.ndarray]) -> None:
+    """Write tables as base64 encoded, packed little-endian uint32."""
+    fp.write(header)
+    fp.write("_data = {\n")
+    for name, table in tables.items():
+        encoded = base64.b64encode(table.astype("<u4").tobytes()).decode()
+        fp.write(f'    "{name}": (\n')
+        for i in range(0, len(encoded), 76):
+            fp.write(f'        "{encoded[i: i + 76]}"\n')
+        fp.write("    ),\n")
+    fp.write("}\n")
+    fp.write(footer)
+
 
-        fp.write(footer)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("output", type=Path, help="The output file.")
+    args = parser.parse_args(sys.argv[1:])
+
+    with args.output.open("w") as fp:
+        write_tables(
+            fp, {name: convert_map_to_table(cmap) for name, cmap in colormaps.items()}
+        )
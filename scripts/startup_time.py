@@ -0,0 +1,136 @@
+"""Measure the cold start time of pew² to the first paint of the main window.
+
+The application is started in a new interpreter with '-X importtime' and the
+slowest imports are reported. Exits with a non-zero status if the start up is
+over budget or if any module that should only be imported on use was loaded.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Modules that must only be imported when first used
+LAZY_MODULES = [
+    "pyqtgraph",
+    "pewlib.io",
+    "pewpew.charts",
+    "pewpew.widgets.dialogs",
+    "pewpew.widgets.exportdialogs",
+    "pewpew.widgets.tools.calculator",
+    "pewpew.widgets.tools.filtering",
+    "pewpew.widgets.tools.standards",
+    "pewpew.widgets.wizards.import_",
+    "pewpew.widgets.wizards.imzml",
+    "pewpew.widgets.wizards.laser",
+    "pewpew.widgets.wizards.spot",
+    "pewpew.widgets.wizards.srr",
+]
+
+program = """
+import sys
+from PySide6 import QtCore, QtWidgets
+
+app = QtWidgets.QApplication([])
+
+from pewpew import resources
+from pewpew.mainwindow import MainWindow
+
+
+class FirstPaint(QtCore.QObject):
+    def eventFilter(self, obj: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if event.type() == QtCore.QEvent.Paint:
+            QtCore.QTimer.singleShot(0, app.quit)
+        return False
+
+
+window = MainWindow()
+filter = FirstPaint()
+window.installEventFilter(filter)
+window.show()
+app.exec()
+print("\\n".join(sys.modules.keys()))
+"""
+
+regex_importtime = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(text: str) -> list[tuple[str, int, int, int]]:
+    """Parse '-X importtime' output as (module, self us, cumulative us, depth)."""
+    imports = []
+    for line in text.splitlines():
+        match = regex_importtime.match(line)
+        if match is not None:
+            imports.append(
+                (
+                    match.group(4),
+                    int(match.group(1)),
+                    int(match.group(2)),
+                    len(match.group(3)) // 2,
+                )
+            )
+    return imports
+
+
+def measure_startup() -> tuple[float, list[tuple[str, int, int, int]], list[str]]:
+    """Start pew² and return the time to first paint, imports and loaded modules."""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", program],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    elapsed = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"pew² failed to start:\n{proc.stderr}")
+
+    return elapsed, parse_importtime(proc.stderr), proc.stdout.splitlines()
+
+
+def lazy_modules_loaded(modules: list[str]) -> list[str]:
+    return [
+        module
+        for module in modules
+        if any(module == lazy or module.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget", type=float, default=2.0, help="Maximum start up time in seconds."
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=3, help="Number of starts, the best is used."
+    )
+    parser.add_argument(
+        "--top", type=int, default=20, help="Number of slowest imports to show."
+    )
+    args = parser.parse_args(sys.argv[1:])
+
+    results = [measure_startup() for _ in range(args.repeats)]
+    elapsed, imports, modules = min(results, key=lambda x: x[0])
+
+    total = sum(x[1] for x in imports) / 1e6
+    print(f"First paint: {elapsed:.3f} s, imports: {total:.3f} s")
+    print(f"{'self (ms)':>10} {'cumulative (ms)':>16}  module")
+    for name, self_us, cumulative_us, depth in sorted(
+        imports, key=lambda x: x[2], reverse=True
+    )[: args.top]:
+        print(f"{self_us / 1e3:10.1f} {cumulative_us / 1e3:16.1f}  {name}")
+
+    status = 0
+    loaded = lazy_modules_loaded(modules)
+    if len(loaded) > 0:
+        print(f"Lazy modules imported at start up: {', '.join(loaded)}")
+        status = 1
+    if elapsed > args.budget:
+        print(f"Start up of {elapsed:.3f} s is over budget ({args.budget:.3f} s).")
+        status = 1
+    sys.exit(status)
@@ -8,7 +8,14 @@ polyext = Extension(
     define_macros=[("NPY_NO_DEPRECATED_API", "NPY_2_0_API_VERSION")],
 )
 
+imageext = Extension(
+    "pewpew.lib.imageext",
+    sources=["src/imageextmodule.c"],
+    include_dirs=[numpy.get_include()],
+    define_macros=[("NPY_NO_DEPRECATED_API", "NPY_2_0_API_VERSION")],
+)
+
 setup(
     packages=find_packages(include=["pewpew", "pewpew.*"]),
-    ext_modules=[polyext],
+    ext_modules=[polyext, imageext],
 )
@@ -0,0 +1,86 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <numpy/arrayobject.h>
+
+/* Maps data to colortable indicies 1 - 255 with NaN at 0.
+ * Operations are performed in the input type and in the same order as
+ * clipping to vmin, vmax, normalising to 0.0 - 1.0 then scaling by 254.
+ * The range is computed in double precision, as numpy would. */
+#define QUANTISE_FUNC(NAME, TYPE)                                              \
+  static void NAME(const TYPE *x, uint8_t *out, npy_intp n, TYPE vmin,         \
+                   TYPE vmax, TYPE range) {                                    \
+    for (npy_intp i = 0; i < n; ++i) {                                         \
+      TYPE v = x[i];                                                           \
+      uint8_t nan = v != v;                                                    \
+      v = v > vmin ? v : vmin;                                                 \
+      v = v < vmax ? v : vmax;                                                 \
+      if (range != 0)                                                          \
+        v = (v - vmin) / range;                                                \
+      v = v > 0 ? v : 0;                                                       \
+      v = v < 1 ? v : 1;                                                       \
+      /* Branchless so that the loop can be vectorised */                      \
+      out[i] = nan ? 0 : (uint8_t)(v * (TYPE)254.0) + 1;                       \
+    }                                                                          \
+  }
+
+QUANTISE_FUNC(quantise_float, float)
+QUANTISE_FUNC(quantise_double, double)
+
+static PyObject *imageext_quantise(PyObject *self, PyObject *args) {
+  PyArrayObject *x, *out;
+  double vmin, vmax;
+
+  if (!PyArg_ParseTuple(args, "O!O!dd", &PyArray_Type, &x, &PyArray_Type, &out,
+                        &vmin, &vmax))
+    return NULL;
+
+  int type = PyArray_TYPE(x);
+  if (type != NPY_FLOAT && type != NPY_DOUBLE) {
+    PyErr_SetString(PyExc_TypeError, "data must be float32 or float64");
+    return NULL;
+  }
+  if (PyArray_TYPE(out) != NPY_UINT8) {
+    PyErr_SetString(PyExc_TypeError, "out must be uint8");
+    return NULL;
+  }
+  if (!PyArray_IS_C_CONTIGUOUS(x) || !PyArray_IS_C_CONTIGUOUS(out) ||
+      !PyArray_ISWRITEABLE(out)) {
+    PyErr_SetString(PyExc_ValueError,
+                    "arrays must be C contiguous and out writeable");
+    return NULL;
+  }
+  npy_intp n = PyArray_SIZE(x);
+  if (PyArray_SIZE(out) != n) {
+    PyErr_SetString(PyExc_ValueError, "data and out must be the same size");
+    return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS;
+  if (type == NPY_FLOAT)
+    quantise_float((const float *)PyArray_DATA(x), (uint8_t *)PyArray_DATA(out),
+                   n, (float)vmin, (float)vmax, (float)(vmax - vmin));
+  else
+    quantise_double((const double *)PyArray_DATA(x),
+                    (uint8_t *)PyArray_DATA(out), n, vmin, vmax, vmax - vmin);
+  Py_END_ALLOW_THREADS;
+
+  Py_RETURN_NONE;
+}
+
+static PyMethodDef imageext_methods[] = {
+    {"quantise", imageext_quantise, METH_VARARGS,
+     "Map float data in the range vmin - vmax to indicies 1 - 255, NaN to 0."},
+    {NULL, NULL, 0, NULL}};
+
+static struct PyModuleDef imageextmodule = {
+    PyModuleDef_HEAD_INIT, "imageext_module", "Image extension module.", -1,
+    imageext_methods};
+
+PyMODINIT_FUNC PyInit_imageext(void) {
+  PyObject *m;
+  m = PyModule_Create(&imageextmodule);
+  import_array();
+  if (PyErr_Occurred())
+    return NULL;
+  return m;
+}
@@ -73,9 +73,138 @@ static PyObject *polyext_polygonf_contains_points(PyObject *self,
   return (PyObject *)res;
 }
 
+static int compare_intp(const void *a, const void *b) {
+  npy_intp x = *(const npy_intp *)a, y = *(const npy_intp *)b;
+  return (x > y) - (x < y);
+}
+
+/* Rows with a pixel center y = r + 0.5 crossed by the edge, using the same
+ * crossing rule as polygonf_contains_point. */
+static void edge_rows(double ly, double py, npy_intp rows, npy_intp *r0,
+                      npy_intp *r1) {
+  double ymin = ly < py ? ly : py;
+  double ymax = ly < py ? py : ly;
+  *r0 = (npy_intp)floor(ymin - 0.5) + 1;
+  *r1 = (npy_intp)floor(ymax - 0.5) + 1;
+  if (*r0 < 0)
+    *r0 = 0;
+  if (*r1 > rows)
+    *r1 = rows;
+  /* crossing requires ymin < y, exclude rows where y == ymin */
+  if (*r0 < *r1 && (double)*r0 + 0.5 <= ymin)
+    *r0 += 1;
+}
+
+/* Fills 'mask' with the pixels whose centers are within 'poly'.
+ * Crossings of each row are collected into buckets as the first column whose
+ * center is not left of the crossing, then sorted and filled pairwise. */
+static int rasterise_polygon(const double *poly, npy_intp n, uint8_t *mask,
+                             npy_intp rows, npy_intp cols) {
+  npy_intp *counts = calloc(rows + 1, sizeof(npy_intp));
+  if (counts == NULL)
+    return -1;
+
+  npy_intp r0, r1;
+  for (npy_intp i = 0, j = n - 1; i < n; j = i++) {
+    edge_rows(poly[j * 2 + 1], poly[i * 2 + 1], rows, &r0, &r1);
+    for (npy_intp r = r0; r < r1; ++r)
+      counts[r + 1]++;
+  }
+  for (npy_intp r = 0; r < rows; ++r)
+    counts[r + 1] += counts[r];
+
+  npy_intp *xs = malloc((counts[rows] + 1) * sizeof(npy_intp));
+  npy_intp *fill = malloc((rows + 1) * sizeof(npy_intp));
+  if (xs == NULL || fill == NULL) {
+    free(counts);
+    free(xs);
+    free(fill);
+    return -1;
+  }
+  memcpy(fill, counts, (rows + 1) * sizeof(npy_intp));
+
+  for (npy_intp i = 0, j = n - 1; i < n; j = i++) {
+    double lx = poly[j * 2], ly = poly[j * 2 + 1];
+    double px = poly[i * 2], py = poly[i * 2 + 1];
+    edge_rows(ly, py, rows, &r0, &r1);
+    for (npy_intp r = r0; r < r1; ++r) {
+      double y = (double)r + 0.5;
+      double x = px + (y - py) * (lx - px) / (ly - py) - 0.5;
+      /* Centers on downward edges are inside, as in polygonf_contains_point */
+      xs[fill[r]++] = py >= y ? (npy_intp)floor(x) + 1 : (npy_intp)ceil(x);
+    }
+  }
+
+  for (npy_intp r = 0; r < rows; ++r) {
+    npy_intp start = counts[r], end = counts[r + 1];
+    qsort(xs + start, end - start, sizeof(npy_intp), compare_intp);
+    for (npy_intp k = start; k + 1 < end; k += 2) {
+      npy_intp c0 = xs[k], c1 = xs[k + 1];
+      if (c0 < 0)
+        c0 = 0;
+      if (c1 > cols)
+        c1 = cols;
+      if (c0 < c1)
+        memset(mask + r * cols + c0, 1, c1 - c0);
+    }
+  }
+
+  free(counts);
+  free(xs);
+  free(fill);
+  return 0;
+}
+
+static PyObject *polyext_polygonf_to_mask(PyObject *self, PyObject *args) {
+  PyObject *in;
+  PyArrayObject *poly;
+  npy_intp rows, cols;
+
+  if (!PyArg_ParseTuple(args, "Onn", &in, &rows, &cols))
+    return NULL;
+  if (rows < 0 || cols < 0) {
+    PyErr_SetString(PyExc_ValueError, "rows and cols must be positive");
+    return NULL;
+  }
+
+  poly = (PyArrayObject *)PyArray_FROM_OTF(in, NPY_DOUBLE, NPY_ARRAY_IN_ARRAY);
+  if (poly == NULL)
+    return NULL;
+  if (PyArray_NDIM(poly) != 2 || PyArray_DIM(poly, 1) != 2) {
+    Py_DECREF(poly);
+    PyErr_SetString(PyExc_ValueError, "polygon must have shape (n, 2)");
+    return NULL;
+  }
+
+  npy_intp dims[] = {rows, cols};
+  PyArrayObject *res = (PyArrayObject *)PyArray_ZEROS(2, dims, NPY_BOOL, 0);
+  if (res == NULL) {
+    Py_DECREF(poly);
+    return NULL;
+  }
+
+  int err = 0;
+  npy_intp n = PyArray_DIM(poly, 0);
+  if (n > 2 && rows > 0 && cols > 0) {
+    Py_BEGIN_ALLOW_THREADS;
+    err = rasterise_polygon((const double *)PyArray_DATA(poly), n,
+                            (uint8_t *)PyArray_DATA(res), rows, cols);
+    Py_END_ALLOW_THREADS;
+  }
+  Py_DECREF(poly);
+
+  if (err != 0) {
+    Py_DECREF(res);
+    return PyErr_NoMemory();
+  }
+  return (PyObject *)res;
+}
+
 static PyMethodDef polyext_methods[] = {
     {"polygonf_contains_points", polyext_polygonf_contains_points, METH_VARARGS,
      "Check if multiple points are within a float type polygon."},
+    {"polygonf_to_mask", polyext_polygonf_to_mask, METH_VARARGS,
+     "Rasterise a float type polygon to a mask of pixels with centers inside."},
     {NULL, NULL, 0, NULL}};
 
 static struct PyModuleDef polyextmodule = {
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from pytestqt.qtbot import QtBot
+
+from pewpew.graphics import colortable
+from pewpew.graphics.options import GraphicsOptions
+
+
+def test_colortable(qtbot: QtBot):
+    assert all(name in colortable.list_tables() for name in GraphicsOptions.colortables)
+
+    table = colortable.get_table("viridis")
+    assert table.dtype == np.uint32
+    assert table.shape == (256,)
+    assert np.all(table >> 24 == 255)
+    assert table[0] == 0xFF440154  # viridis starts dark purple
+    # Cached and read-only
+    assert colortable.get_table("viridis") is table
+    with pytest.raises(ValueError):
+        table[0] = 0
+
+    grey = colortable.get_table("grey")
+    assert grey[0] & 0xFF == 0 and grey[-1] & 0xFF == 255
+    assert np.all(np.diff(grey & 0xFF) >= 0)
+
+    with pytest.raises(KeyError):
+        colortable.get_table("notatable")
+
+    icon = colortable.get_icon("magma")
+    assert not icon.isNull()
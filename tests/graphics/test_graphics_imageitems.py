@@ -6,6 +6,7 @@ from PySide6 import QtCore, QtGui, QtWidgets
 from pytestqt.qtbot import QtBot
 from testing import rand_data
 
+from pewpew.graphics import colortable
 from pewpew.graphics.imageitems import (
     ImageOverlayItem,
     LaserImageItem,
@@ -101,7 +102,7 @@ def test_laser_image_item(qtbot: QtBot):
     item = LaserImageItem(laser, GraphicsOptions())
 
     assert np.all(item.mask)
-    assert item.mask_image is None
+    assert item.selection_mask.isEmpty()
 
     assert item.element() == "A"
     item.setElement("B")
@@ -121,7 +122,7 @@ def test_laser_image_item(qtbot: QtBot):
     mask = np.zeros((10, 10), dtype=bool)
     mask[5:] = True
     item.select(mask, ["intersect"])
-    assert item.mask_image is not None
+    assert not item.selection_mask.isEmpty()
     assert not item.selectedAt(QtCore.QPointF(0, 0))
     assert item.selectedAt(QtCore.QPointF(0, 50.0 * 5))
 
@@ -129,7 +130,7 @@ def test_laser_image_item(qtbot: QtBot):
     assert np.all(item.mask == mask)  # no change
     item.select(np.ones_like(mask), ["subtract"])
     assert np.all(item.mask)
-    assert item.mask_image is None
+    assert item.selection_mask.isEmpty()
 
     mask[:] = 0
     mask[0, 0] = 1
@@ -139,6 +140,164 @@ def test_laser_image_item(qtbot: QtBot):
     assert mime.text().startswith(f"{laser.data['B'][0][0]:.6f}")
 
 
+def test_laser_image_item_cache(qtbot: QtBot):
+    laser = Laser(data=rand_data(["A", "B", "C"]), info={"Name": "test"})
+    item = LaserImageItem(laser, GraphicsOptions())
+
+    item.redraw()
+    image_a = item.image
+    item.setElement("B")
+    assert item.image is not image_a
+    assert len(item.image_cache) == 2
+
+    item.setElement("A")
+    assert item.image is image_a
+    assert len(item.image_cache) == 2
+
+    # Change of options
+    item.options.color_ranges["A"] = (0.0, 1.0)
+    item.redraw()
+    assert item.image is not image_a
+    assert len(item.image_cache) == 3
+
+    item.options.approximate_percentiles = False
+    item.redraw()
+    assert len(item.image_cache) == 4
+
+    # Cleared on modification
+    item.transform(flip="horizontal")
+    assert len(item.image_cache) == 1
+    assert np.all(item.raw_data == laser.data["A"])
+
+    # Swapped names show the renamed data
+    item.setElement("B")
+    item.renameElements({"A": "B", "B": "A", "C": "C"})
+    assert item.element() == "A"
+    assert np.all(item.raw_data == laser.data["A"])
+
+
+def test_laser_image_item_quantile_sketch(qtbot: QtBot):
+    laser = Laser(data=rand_data(["A", "B", "C"]), info={"Name": "test"})
+    options = GraphicsOptions()
+    options.color_ranges["A"] = (0.0, "95%")
+    options.color_ranges["B"] = (0.0, 1.0)
+    options.calibrate = False
+    item = LaserImageItem(laser, options)
+
+    item.redraw()
+    assert list(item.quantile_sketches.keys()) == [("A", False)]
+    assert np.isclose(item.vmax, np.nanpercentile(laser.data["A"], 95.0))
+
+    # Range changes reuse the sketch
+    sketch = item.quantile_sketches[("A", False)]
+    options.color_ranges["A"] = ("1%", "99%")
+    item.redraw()
+    assert item.quantile_sketches[("A", False)] is sketch
+
+    # Not required for float ranges
+    item.setElement("B")
+    assert ("B", False) not in item.quantile_sketches
+
+    item.modified.emit()
+    assert len(item.quantile_sketches) == 0
+
+
+def test_laser_image_item_request_redraw(qtbot: QtBot):
+    laser = Laser(data=rand_data(["A", "B", "C"]), info={"Name": "test"})
+    options = GraphicsOptions()
+    item = LaserImageItem(laser, options)
+    item.redraw()
+    image = item.image
+
+    # Image is kept until render is finished
+    options.color_ranges["A"] = (0.0, 0.5)
+    with qtbot.waitSignal(item.imageChanged):
+        item.requestRedraw()
+        assert item.image is image
+    assert item.image is not image
+    assert item.vmax == 0.5
+
+    # Only the latest request is applied
+    changes = []
+    item.imageChanged.connect(lambda: changes.append(item.vmax))
+    for vmax in [0.1, 0.2, 0.3]:
+        options.color_ranges["A"] = (0.0, vmax)
+        item.requestRedraw()
+    qtbot.waitUntil(lambda: not item.render_queue.isActive())
+    assert changes == [0.3]
+
+    # Cached images are applied immediately
+    options.color_ranges["A"] = (0.0, 0.5)
+    item.requestRedraw()
+    assert item.vmax == 0.5
+    assert not item.render_queue.isActive()
+
+    # Modification cancels pending renders
+    options.color_ranges["A"] = (0.0, 0.6)
+    item.requestRedraw()
+    item.modified.emit()
+    qtbot.wait(50)
+    assert item.vmax == 0.5
+
+
+def test_laser_image_item_colortable(qtbot: QtBot):
+    laser = Laser(data=rand_data(["A", "B", "C"]), info={"Name": "test"})
+    options = GraphicsOptions()
+    options.colortable = "viridis"
+    item = LaserImageItem(laser, options)
+    item.redraw()
+
+    image = item.image
+    table = image.colorTable()
+    assert table[0] == options.nan_color.rgba()
+
+    options.setColortable("magma")
+    item.updateColorTable()
+    assert item.image is image
+    assert item.image.colorTable() != table
+    assert np.array_equal(
+        item.image.colorTable()[1:], colortable.get_table("magma")[1:]
+    )
+
+    options.setNanColor(QtGui.QColor(255, 0, 0))
+    item.updateColorTable()
+    assert item.image.colorTable()[0] == QtGui.QColor(255, 0, 0).rgba()
+    # Shared table not modified
+    assert colortable.get_table("magma")[0] != QtGui.QColor(255, 0, 0).rgba()
+
+    # Cached images get the current table
+    item.setElement("B")
+    item.setElement("A")
+    assert item.image is image
+    assert item.image.colorTable()[0] == QtGui.QColor(255, 0, 0).rgba()
+
+
+def test_laser_image_item_apply_data(qtbot: QtBot):
+    laser = Laser(data=rand_data(["A", "B"]), info={"Name": "test"})
+    item = LaserImageItem(laser, GraphicsOptions())
+    item.setElement("B")
+    item.select(laser.data["A"] > 2.0, [])  # empty
+    mask = np.zeros((10, 10), dtype=bool)
+    mask[2:4, 3:5] = True
+    item.select(mask, [])
+
+    # More lines and a new element
+    data = np.empty((15, 10), dtype=[("B", float), ("C", float)])
+    data["B"] = np.random.random((15, 10))
+    data["C"] = np.random.random((15, 10))
+
+    with qtbot.waitSignal(item.elementsChanged):
+        item.applyData(data)
+
+    assert item.laser.shape == (15, 10)
+    assert item.element() == "B"
+    assert "C" in item.laser.calibration
+    assert item.image.height() == 15
+    assert item.selection_mask.shape == (15, 10)
+    assert np.array_equal(item.mask[:10], mask)
+    assert not np.any(item.mask[10:])
+
+
 def test_laser_rgb_image_item(qtbot: QtBot):
     laser = Laser(data=rand_data(["A", "B", "C"]), info={"Name": "test"})
     item = RGBLaserImageItem(laser, GraphicsOptions())
@@ -147,7 +306,8 @@ def test_laser_rgb_image_item(qtbot: QtBot):
         RGBLaserImageItem.RGBElement("A", QtGui.QColor(255, 0, 0), (0.0, 99.0)),
         RGBLaserImageItem.RGBElement("B", QtGui.QColor(0, 255, 0), (0.0, 99.0)),
     ]
-    item.setCurrentElements(elements)
+    with qtbot.waitSignal(item.imageChanged):
+        item.setCurrentElements(elements)
 
     assert np.all(item.raw_data[:, :, 0] == laser.data["A"])
     assert np.all(item.raw_data[:, :, 1] == laser.data["B"])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from PySide6 import QtCore, QtGui
+
+from pewpew.graphics.mask import SelectionMask
+
+
+def test_selection_mask():
+    mask = SelectionMask((20, 30))
+    assert mask.isEmpty()
+    assert mask.image() is None
+    assert not np.any(mask.toArray())
+
+    x = np.zeros((20, 30), dtype=bool)
+    x[2:5, 3:10] = True
+
+    mask.combine(x)
+    assert mask.bounds() == (2, 5, 3, 10)
+    assert mask.region.shape == (3, 7)
+    assert mask.contains(2, 3)
+    assert not mask.contains(1, 3)
+    assert np.all(mask.toArray() == x)
+    assert not mask.toArray().flags.writeable
+
+    # Input is copied
+    x[:] = False
+    assert mask.contains(2, 3)
+
+    # Offset regions are clipped to the image
+    mask.combine(np.ones((5, 5), dtype=bool), "add", offset=(18, 28))
+    assert mask.bounds() == (2, 20, 3, 30)
+    assert mask.contains(19, 29)
+    assert np.count_nonzero(mask.toArray()) == 21 + 4
+
+    mask.combine(np.ones((3, 3), dtype=bool), "subtract", offset=(17, 27))
+    assert mask.bounds() == (2, 5, 3, 10)
+
+    mask.combine(np.ones((10, 10), dtype=bool), "intersect", offset=(0, 0))
+    assert mask.bounds() == (2, 5, 3, 10)
+    mask.combine(np.ones((10, 10), dtype=bool), "intersect", offset=(3, 5))
+    assert mask.bounds() == (3, 5, 5, 10)
+
+    mask.combine(np.ones((2, 2), dtype=bool), "difference", offset=(3, 5))
+    assert mask.bounds() == (3, 5, 7, 10)
+    mask.combine(np.ones((2, 2), dtype=bool), "difference", offset=(3, 5))
+    assert mask.bounds() == (3, 5, 5, 10)
+
+    with pytest.raises(ValueError):
+        mask.combine(x, "invalid")
+
+    mask.fill()
+    assert mask.bounds() == (0, 20, 0, 30)
+    mask.clear()
+    assert mask.isEmpty()
+
+
+def test_selection_mask_image():
+    mask = SelectionMask((20, 30), color=QtGui.QColor(255, 0, 0))
+    mask.combine(np.ones((2, 3), dtype=bool), offset=(4, 5))
+
+    image = mask.image()
+    assert image.size() == QtCore.QSize(3, 2)
+    assert image.pixel(0, 0) == QtGui.QColor(255, 0, 0).rgba()
+    assert mask.imageRect() == QtCore.QRect(5, 4, 3, 2)
+
+    # Cached until changed
+    assert mask.image() is image
+    mask.combine(np.ones((1, 1), dtype=bool), "add")
+    assert mask.image() is not image
+    assert mask.imageRect() == QtCore.QRect(0, 0, 8, 6)
@@ -0,0 +1,88 @@
+import numpy as np
+from PySide6 import QtCore, QtGui
+from pytestqt.qtbot import QtBot
+
+from pewpew.graphics.tiles import ImageTilePyramid
+from pewpew.lib.numpyqt import array_to_image
+
+
+def test_image_tile_pyramid(qtbot: QtBot):
+    image = array_to_image(np.random.random((100, 60)))
+    image.setColorTable(np.arange(256))
+
+    tiles = ImageTilePyramid(image, tile_size=16, max_tiles=4)
+    assert tiles.maxLevel() == 3
+    assert len(tiles.levels) == 1
+
+    assert tiles.level(2).size() == QtCore.QSize(15, 25)
+    assert tiles.level(2).format() == QtGui.QImage.Format_Indexed8
+    assert len(tiles.levels) == 3
+
+    assert tiles.levelForScale(2.0) == 0
+    assert tiles.levelForScale(1.0) == 0
+    assert tiles.levelForScale(0.5) == 1
+    assert tiles.levelForScale(0.2) == 2
+    assert tiles.levelForScale(0.01) == 3
+    assert tiles.levelForScale(0.0) == 3
+
+    tile = tiles.tile(0, 6, 3)  # edge tile
+    assert tile.size() == QtCore.QSize(12, 4)
+    assert tile.format() == QtGui.QImage.Format_ARGB32_Premultiplied
+
+    for i in range(6):
+        tiles.tile(0, i, 0)
+    assert len(tiles.tiles) == 4
+    assert (0, 6, 3) not in tiles.tiles
+
+    tiles.clearTiles()
+    assert len(tiles.tiles) == 0
+
+
+def test_image_tile_pyramid_paint(qtbot: QtBot):
+    image = array_to_image(np.random.random((100, 60)))
+    image.setColorTable([(255 << 24) + (i << 8) for i in range(256)])
+    tiles = ImageTilePyramid(image, tile_size=16)
+
+    expected = QtGui.QImage(60, 100, QtGui.QImage.Format_ARGB32_Premultiplied)
+    expected.fill(0)
+    painter = QtGui.QPainter(expected)
+    painter.drawImage(QtCore.QRectF(0, 0, 60, 100), image)
+    painter.end()
+
+    result = QtGui.QImage(60, 100, QtGui.QImage.Format_ARGB32_Premultiplied)
+    result.fill(0)
+    painter = QtGui.QPainter(result)
+    tiles.paint(painter, QtCore.QRectF(0, 0, 60, 100))
+    painter.end()
+
+    assert result == expected
+    assert len(tiles.tiles) == 4 * 7
+
+    # Only exposed tiles
+    tiles.clearTiles()
+    painter = QtGui.QPainter(result)
+    tiles.paint(painter, QtCore.QRectF(0, 0, 60, 100), QtCore.QRectF(0, 0, 20, 10))
+    painter.end()
+    assert set(tiles.tiles.keys()) == {(0, 0, 0), (0, 0, 1)}
+
+    # Zoomed out
+    tiles.clearTiles()
+    painter = QtGui.QPainter(result)
+    tiles.paint(painter, QtCore.QRectF(0, 0, 60, 100), level_of_detail=0.25)
+    painter.end()
+    assert set(tiles.tiles.keys()) == {(2, 0, 0), (2, 1, 0)}
+
+
+def test_image_tile_pyramid_colortable(qtbot: QtBot):
+    image = array_to_image(np.random.random((100, 60)))
+    image.setColorTable(np.arange(256))
+    tiles = ImageTilePyramid(image, tile_size=16)
+
+    tiles.level(2)
+    tiles.tile(1, 0, 0)
+    tiles.setColorTable(np.arange(256))  # no change
+    assert len(tiles.tiles) == 1
+
+    tiles.setColorTable(np.arange(256) + 1)
+    assert len(tiles.tiles) == 0
+    assert all(level.colorTable()[0] == 1 for level in tiles.levels)
@@ -7,6 +7,7 @@ from pewpew.graphics.util import (
     nice_values,
     path_for_colorbar_labels,
     polygonf_contains_points,
+    polygonf_to_mask,
     shortest_label,
 )
 
@@ -25,6 +26,35 @@ def test_polygonf_contains_points():
     assert np.all(r == [0, 0, 0, 0, 1, 1, 0, 0, 1])
 
 
+def test_polygonf_to_mask():
+    X, Y = np.mgrid[:20, :30]
+    points = np.stack((Y.flat, X.flat), axis=1).astype(np.float64) + 0.5
+
+    np.random.seed(9723)
+    for scale in [1.0, 2.0]:  # vertices on pixel corners and centers
+        p = QtGui.QPolygonF()
+        for x, y in np.round(np.random.uniform(-5.0, 35.0, (20, 2)) * scale):
+            p.append(QtCore.QPointF(x / scale, y / scale))
+
+        expected = polygonf_contains_points(p, points).reshape(20, 30)
+        mask, (y0, x0) = polygonf_to_mask(p, (20, 30))
+        result = np.zeros((20, 30), dtype=bool)
+        result[y0 : y0 + mask.shape[0], x0 : x0 + mask.shape[1]] = mask
+        assert np.all(result == expected)
+
+    # Pixel size and offset
+    p = QtGui.QPolygonF()
+    for x, y in [(10.0, 20.0), (30.0, 20.0), (30.0, 50.0), (10.0, 50.0)]:
+        p.append(QtCore.QPointF(x, y))
+    mask, offset = polygonf_to_mask(p, (20, 30), QtCore.QSizeF(10.0, 10.0))
+    assert offset == (2, 1)
+    assert mask.shape == (3, 2)
+    assert np.all(mask)
+
+    mask, offset = polygonf_to_mask(QtGui.QPolygonF(), (20, 30))
+    assert mask.size == 0
+
+
 def test_closest_nice_value():
     assert closest_nice_value(4.9, mode="upper") == 5.0
     assert closest_nice_value(4.9, mode="lower") == 4.5
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pewlib import io
+
+from pewpew.lib import agilent
+
+path = Path(__file__).parent.joinpath("data", "io", "agilent", "test_ms.b")
+
+
+def test_agilent_load_binary():
+    progress = []
+    data, params = agilent.load(
+        path, max_workers=3, progress=lambda i, n: progress.append((i, n))
+    )
+    expected, expected_params = io.agilent.load_binary(path)
+
+    assert data.dtype.names == expected.dtype.names
+    assert data.shape == expected.shape
+    for name in data.dtype.names:
+        assert np.all(data[name] == expected[name])
+    assert params["scantime"] == expected_params["scantime"]
+    assert np.all(params["acq_starts"] == expected_params["acq_starts"])
+    assert progress == [(i, 5) for i in range(1, 6)]
+
+
+def test_agilent_load_csv():
+    datafiles = io.agilent.collect_datafiles(path, ["batch_csv"])
+    lines = agilent.read_datafiles(datafiles, agilent.read_datafile_csv)
+    expected = list(io.agilent.read_datafile_csvs(datafiles))
+    assert len(lines) == 5
+    for line, expected_line in zip(lines, expected):
+        assert np.all(line == expected_line)
+
+    # Missing lines are skipped
+    lines = agilent.read_datafiles(
+        [path.joinpath("missing.d"), *datafiles], agilent.read_datafile_csv
+    )
+    assert len(lines) == 5
+
+
+def test_agilent_load_cancelled():
+    with pytest.raises(InterruptedError):
+        agilent.load(path, cancelled=lambda: True)
@@ -0,0 +1,160 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pewlib.io import npz
+from pewlib.laser import Laser
+from pytestqt.qtbot import QtBot
+from testing import rand_data
+
+from pewpew.autosave import AutosaveService, write_snapshot
+from pewpew.lib import lazynpz
+from pewpew.widgets.laser import LaserTabView
+
+
+def snapshot_files(service: AutosaveService) -> list[str]:
+    return sorted(p.name for p in service.session.glob("*.npz"))
+
+
+def test_autosave_service(qtbot: QtBot, tmp_path: Path):
+    view = LaserTabView()
+    qtbot.addWidget(view)
+    widget = view.newLaserTab()
+    a = widget.addLaser(
+        Laser(rand_data(["A1", "B2"]), info={"Name": "a", "File Path": "/a.npz"})
+    )
+    b = widget.addLaser(Laser(rand_data("C3"), info={"Name": "b", "File Path": ""}))
+
+    service = AutosaveService(view, tmp_path, interval=100000)
+    service.start()
+    assert service.isActive()
+
+    with qtbot.waitSignal(service.snapshotFinished, timeout=5000):
+        service.snapshot()
+    files = snapshot_files(service)
+    assert len(files) == 2
+
+    manifest = json.loads(service.session.joinpath("session.json").read_text())
+    assert len(manifest["lasers"]) == 2
+    assert manifest["lasers"][0]["tab_name"] == "Tab 1"
+    assert {r["file_path"] for r in manifest["lasers"]} == {"/a.npz", ""}
+
+    # Unmodified lasers are skipped
+    with qtbot.waitSignal(service.snapshotFinished, timeout=5000):
+        service.snapshot()
+    assert service.thread is None
+    assert snapshot_files(service) == files
+
+    # Modified lasers replace their snapshot
+    a.setName("a2")
+    with qtbot.waitSignal(service.snapshotFinished, timeout=5000):
+        service.snapshot()
+    new_files = snapshot_files(service)
+    assert len(new_files) == 2
+    assert service.saved[service.keys[b]][1] in files
+    assert service.saved[service.keys[a]][1] not in files
+
+    # Snapshots of lasers modified while writing are discarded
+    a_file = service.saved[service.keys[a]][1]
+    with qtbot.waitSignal(service.snapshotFinished, timeout=5000):
+        service.snapshot()
+        a.setName("a3")
+    assert service.saved[service.keys[a]][1] == a_file
+    assert snapshot_files(service) == new_files
+
+    service.stop(remove=True)
+    assert not service.session.exists()
+    assert not service.isActive()
+
+
+def test_autosave_service_recovery(qtbot: QtBot, tmp_path: Path):
+    view = LaserTabView()
+    qtbot.addWidget(view)
+    widget = view.newLaserTab()
+    data = rand_data(["A1", "B2"])
+    widget.addLaser(Laser(data, info={"Name": "a", "File Path": "/a.npz"}))
+
+    service = AutosaveService(view, tmp_path, interval=100000)
+    service.start()
+    with qtbot.waitSignal(service.snapshotFinished, timeout=5000):
+        service.snapshot()
+
+    new_view = LaserTabView()
+    qtbot.addWidget(new_view)
+    new_service = AutosaveService(new_view, tmp_path, interval=100000)
+    new_service.start()
+    # Locked by a running service
+    assert new_service.recoverableSessions() == []
+
+    # As if the process had exited
+    service.stop(remove=False)
+    sessions = new_service.recoverableSessions()
+    assert sessions == [service.session]
+
+    widgets = new_service.restoreSession(sessions[0])
+    assert len(widgets) == 1
+    assert widgets[0].isWindowModified()
+    items = widgets[0].laserItems()
+    assert len(items) == 1
+    assert items[0].laser.info["File Path"] == "/a.npz"
+    assert items[0].laser.info["Name"] == "a"
+    assert np.all(items[0].laser.get("A1") == data["A1"])
+
+    # Recovered session is removed once snapshotted
+    with qtbot.waitSignal(new_service.snapshotFinished, timeout=5000):
+        new_service.snapshot()
+    assert not service.session.exists()
+    assert len(snapshot_files(new_service)) == 1
+
+    new_service.stop()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_autosave_service_lazy(qtbot: QtBot, tmp_path: Path):
+    path = tmp_path.joinpath("a.npz")
+    npz.save(path, Laser(rand_data(["A1", "B2"]), info={"Name": "a"}))
+
+    view = LaserTabView()
+    qtbot.addWidget(view)
+    widget = view.newLaserTab()
+    item = widget.addLaser(lazynpz.load(path))
+
+    service = AutosaveService(view, tmp_path.joinpath("autosave"), interval=100000)
+    service.start()
+
+    # Unmodified lazy lasers record their source
+    with qtbot.waitSignal(service.snapshotFinished, timeout=5000):
+        service.snapshot()
+    assert service.thread is None
+    assert snapshot_files(service) == []
+    manifest = json.loads(service.session.joinpath("session.json").read_text())
+    assert manifest["lasers"][0]["source"] == str(path.resolve())
+
+    new_view = LaserTabView()
+    qtbot.addWidget(new_view)
+    widgets = AutosaveService(new_view, tmp_path).restoreSession(service.session)
+    assert widgets[0].laserItems()[0].laser.elements == ("A1", "B2")
+
+    # Modified lasers are snapshotted
+    item.setName("a2")
+    with qtbot.waitSignal(service.snapshotFinished, timeout=5000):
+        service.snapshot()
+    assert len(snapshot_files(service)) == 1
+
+    service.stop()
+
+
+def test_write_snapshot_cancelled(tmp_path: Path):
+    laser = Laser(rand_data(["A1", "B2"]))
+    path = tmp_path.joinpath("snapshot.npz")
+    with pytest.raises(InterruptedError):
+        write_snapshot(
+            path,
+            laser.data,
+            laser.calibration,
+            laser.config,
+            laser.info,
+            cancelled=lambda: True,
+        )
+    assert list(tmp_path.iterdir()) == []
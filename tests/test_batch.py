@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pewlib.io import npz
+from pewlib.laser import Laser
+from testing import rand_data
+
+from pewpew import batch
+
+path = Path(__file__).parent.joinpath("data", "io")
+
+
+def test_apply_processing():
+    laser = Laser(rand_data(["A1", "B2"]), info={"Name": "laser"})
+
+    batch.apply_processing(
+        laser, "Filter(*,Local Median,size=3,k=3.0); Calculator(C3,+ A1 B2);"
+    )
+    assert laser.elements == ("A1", "B2", "C3")
+    assert np.allclose(laser.get("C3"), laser.get("A1") + laser.get("B2"))
+    assert laser.info["Processing"] == (
+        "Filter(*,Local Median,size=3.0,k=3.0);Calculator(C3,+ A1 B2);"
+    )
+
+    # Existing elements are replaced
+    batch.apply_processing(laser, "Calculator(C3,* A1 0.0);")
+    assert np.all(laser.get("C3") == 0.0)
+
+    with pytest.raises(ValueError):
+        batch.apply_processing(laser, "Filter(*,Unknown Filter,size=3);")
+    with pytest.raises(ValueError):
+        batch.apply_processing(laser, "Transform(A1);")
+
+
+def test_export_laser(tmp_path: Path):
+    laser = Laser(rand_data(["A1", "B<2"]), info={"Name": "laser"})
+
+    paths = batch.export_laser(
+        laser, tmp_path, ["npz", "csv", "vti"], elements=["B<2", "C3"]
+    )
+    assert paths == [
+        tmp_path.joinpath("laser.npz"),
+        tmp_path.joinpath("laser_B_2.csv"),
+        tmp_path.joinpath("laser.vti"),
+    ]
+    assert all(p.exists() for p in paths)
+    assert npz.load(paths[0]).elements == ("A1", "B<2")
+
+    with pytest.raises(ValueError):
+        batch.export_laser(laser, tmp_path, ["xyz"])
+
+
+def test_batch_main(tmp_path: Path, capsys: pytest.CaptureFixture):
+    data = tmp_path.joinpath("data")
+    data.mkdir()
+    data.joinpath("a.csv").write_bytes(
+        path.joinpath("textimage", "csv.csv").read_bytes()
+    )
+    data.joinpath("b.text").write_bytes(
+        path.joinpath("textimage", "text.text").read_bytes()
+    )
+    data.joinpath("c.txt").write_text("not,a\nlaser")
+    data.joinpath("notes.md").write_text("ignored")
+    out = tmp_path.joinpath("out")
+
+    failed = batch.main(
+        [
+            str(data),
+            "-o",
+            str(out),
+            "-f",
+            "npz",
+            "csv",
+            "-p",
+            "Filter(*,Local Mean,size=3,σ=3.0);",
+            "-j",
+            "2",
+        ]
+    )
+    assert failed == 1
+    assert sorted(p.name for p in out.iterdir()) == [
+        "a.npz",
+        "a__element_.csv",
+        "b.npz",
+        "b__element_.csv",
+    ]
+    laser = npz.load(out.joinpath("a.npz"))
+    assert laser.info["Processing"].startswith("Filter(*,Local Mean,")
+    assert "c.txt" in capsys.readouterr().err
@@ -0,0 +1,48 @@
+import numpy as np
+
+from pewpew.lib.cache import LRUCache
+
+
+def test_lru_cache():
+    cache = LRUCache(100)
+
+    cache.put("a", np.zeros(4, dtype=np.uint64))  # 32 bytes
+    cache.put("b", np.zeros(4, dtype=np.uint64))
+    cache.put("c", np.zeros(4, dtype=np.uint64))
+    assert len(cache) == 3
+    assert cache.nbytes == 96
+
+    # Access moves to end
+    assert cache.get("a") is not None
+    cache.put("d", np.zeros(4, dtype=np.uint64))
+    assert cache.keys() == ["c", "a", "d"]
+    assert cache.nbytes == 96
+
+    assert cache.get("b") is None
+    assert cache.get("b", 1) == 1
+
+    # Replace
+    cache.put("a", np.zeros(1, dtype=np.uint64))
+    assert cache.nbytes == 72
+    assert cache.keys() == ["c", "d", "a"]
+
+    # Too large
+    cache.put("e", np.zeros(16, dtype=np.uint64))
+    assert "e" not in cache
+    assert cache.nbytes == 72
+
+    assert cache.pop("c") is not None
+    assert cache.nbytes == 40
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_lru_cache_sizeof():
+    cache = LRUCache(10, sizeof=len)
+    cache.put(0, "abcde")
+    cache.put(1, "abcde")
+    cache.put(2, "a")
+    assert cache.keys() == [1, 2]
+    assert cache.nbytes == 6
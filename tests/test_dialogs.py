@@ -8,7 +8,6 @@ from pytestqt.qtbot import QtBot
 
 from pewpew.graphics.imageitems import LaserImageItem
 from pewpew.graphics.options import GraphicsOptions
-from pewpew.lib.numpyqt import array_to_image
 from pewpew.widgets import dialogs
 
 
@@ -388,7 +387,7 @@ def test_selection_dialog(qtbot: QtBot):
     # Test limit threshold
     dialog.combo_method.setCurrentText("Mean")
     dialog.check_limit_threshold.setChecked(True)
-    item.mask_image = array_to_image((x["x"] > 0.9).astype(np.uint8))
+    item.select(x["x"] > 0.9, [])
     dialog.refresh()
 
     with qtbot.wait_signal(dialog.maskSelected) as emitted:
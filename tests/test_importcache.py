@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import numpy as np
+from pewlib.config import Config
+
+from pewpew.lib.importcache import ImportCache
+from pewpew.threads import import_path
+
+
+def test_import_cache(tmp_path: Path):
+    cache = ImportCache(tmp_path.joinpath("cache"), max_bytes=10000)
+
+    path = tmp_path.joinpath("data.txt")
+    path.write_text("1 2\n3 4\n")
+
+    key = cache.key(path)
+    assert cache.get(key) is None
+
+    data = np.zeros((2, 2), dtype=[("A", float), ("B", float)])
+    data["A"] = [[1.0, 2.0], [3.0, 4.0]]
+    cache.put(key, data, {"spotsize": np.float64(10.0)}, {"Vendor": "test"})
+
+    cached, params, info = cache.get(key)
+    assert np.array_equal(cached, data)
+    assert params == {"spotsize": 10.0}
+    assert info == {"Vendor": "test"}
+
+    # Options and modification change the key
+    assert cache.key(path, {"option": 1}) != key
+    os.utime(path, ns=(0, 0))
+    assert cache.key(path) != key
+    assert cache.get(cache.key(path)) is None
+
+    # Directories are keyed by their contents
+    dir = tmp_path.joinpath("dir")
+    dir.mkdir()
+    dir.joinpath("a.csv").write_text("1")
+    key = cache.key(dir)
+    dir.joinpath("b.csv").write_text("2")
+    assert cache.key(dir) != key
+
+    # Corrupt entries are removed
+    cache.entryPath("corrupt").write_bytes(b"0000")
+    assert cache.get("corrupt") is None
+    assert not cache.entryPath("corrupt").exists()
+
+
+def test_import_cache_eviction(tmp_path: Path):
+    cache = ImportCache(tmp_path)
+    data = np.zeros(100, dtype=[("A", float)])
+
+    cache.put("a", data, {}, {})
+    size = cache.entryPath("a").stat().st_size
+    cache.max_bytes = 3 * size
+
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, data, {}, {})
+        os.utime(cache.entryPath(key), ns=(i, i))
+    assert cache.get("a") is not None  # marked as recently used
+    cache.put("d", data, {}, {})
+
+    assert cache.nbytes <= 3 * size
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("d") is not None
+
+
+def test_import_path_cached(tmp_path: Path):
+    path = Path(__file__).parent.joinpath("data", "io", "textimage", "text.text")
+    cache = ImportCache(tmp_path)
+
+    laser = import_path(path, Config(), cache=cache)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    cached = import_path(path, Config(), cache=cache)
+    assert cached.elements == laser.elements
+    assert np.array_equal(cached.get(laser.elements[0]), laser.get(laser.elements[0]))
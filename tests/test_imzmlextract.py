@@ -0,0 +1,291 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pewlib.io.imzml import ImzML, fast_parse_imzml
+from PySide6 import QtCore
+from pytestqt.qtbot import QtBot
+from testing import rand_imzml
+
+from pewpew.lib import imzmlextract
+from pewpew.graphics.options import GraphicsOptions
+from pewpew.lib.imzmlindex import ImzMLIndex
+from pewpew.widgets.wizards.imzml import ImzMLImportWizard
+
+
+def test_imzml_extract_masses(tmp_path: Path):
+    ibd = rand_imzml(tmp_path.joinpath("test.imzML"), (6, 8))
+    imzml = fast_parse_imzml(tmp_path.joinpath("test.imzML"), ibd)
+    del imzml.spectra[(1, 1)]
+
+    assert np.allclose(imzmlextract.mass_range(imzml), imzml.mass_range())
+
+    index = ImzMLIndex(tmp_path.joinpath("test.imzML"))
+    index.save(imzml)
+    index.buildMassIndex()
+    expected = index.massIndex().extract_masses(
+        np.array([110.0, 150.0, 190.0]), mass_width_ppm=1e4
+    )
+
+    progress = []
+    data = imzmlextract.extract_masses(
+        imzml,
+        np.array([110.0, 150.0, 190.0]),
+        mass_width_ppm=1e4,
+        chunk_size=10,
+        progress=lambda i, n: progress.append((i, n)),
+        max_workers=1,
+    )
+    assert data.shape == (6, 8, 3)
+    assert data.dtype == np.float32
+    assert np.isnan(data[0, 0]).all()
+    assert np.allclose(data, expected, equal_nan=True)
+    assert progress == [(i, 47) for i in [10, 20, 30, 40, 47]]
+
+    data = imzmlextract.extract_masses(
+        imzml, 150.0, mass_width_mz=1.5, chunk_size=10, max_workers=2
+    )
+    assert np.allclose(
+        data,
+        index.massIndex().extract_masses(150.0, mass_width_mz=1.5),
+        equal_nan=True,
+    )
+
+    with pytest.raises(InterruptedError):
+        imzmlextract.extract_masses(
+            imzml, 150.0, mass_width_mz=1.0, chunk_size=10, cancelled=lambda: True
+        )
+    with pytest.raises(ValueError):
+        imzmlextract.extract_masses(imzml, 150.0)
+
+
+def brute_force_extract(imzml: ImzML, windows: np.ndarray) -> np.ndarray:
+    sx, sy = imzml.image_size
+    data = np.full((sy, sx, len(windows)), np.nan)
+    with imzml.external_binary.open("rb") as fp:
+        for (x, y), spectrum in imzml.spectra.items():
+            mz = spectrum.get_binary_data("mzArray", np.float64, fp)
+            intensity = spectrum.get_binary_data("intensities", np.float32, fp)
+            for i, (lower, upper) in enumerate(windows):
+                data[y - 1, x - 1, i] = intensity[(mz >= lower) & (mz <= upper)].sum()
+    return data
+
+
+def test_imzml_extract_masses_windows(tmp_path: Path):
+    ibd = rand_imzml(tmp_path.joinpath("test.imzML"), (6, 8))
+    imzml = fast_parse_imzml(tmp_path.joinpath("test.imzML"), ibd)
+    del imzml.spectra[(2, 3)]
+
+    index = ImzMLIndex(tmp_path.joinpath("test.imzML"))
+    index.save(imzml)
+    index.buildMassIndex()
+    mass_index = index.massIndex()
+
+    # Windows with edges on an m/z, empty windows and outside the mass range
+    with ibd.open("rb") as fp:
+        mz = imzml.spectra[(1, 1)].get_binary_data("mzArray", np.float64, fp)
+    width = 0.5
+    targets = np.array([mz[3] + width / 2.0, mz[5] - width / 2.0, 110.0, 150.0])
+    targets = np.concatenate([targets, [190.0, 99.0, 201.0, 150.0001]])
+
+    lower, upper = targets - width / 2.0, targets + width / 2.0
+    expected = brute_force_extract(imzml, np.stack((lower, upper), axis=1))
+    assert np.any(expected == 0.0)
+
+    for data in [
+        mass_index.extract_masses(targets, mass_width_mz=width),
+        imzmlextract.extract_masses(imzml, targets, mass_width_mz=width, max_workers=1),
+        imzmlextract.extract_masses(  # pool
+            imzml, targets, mass_width_mz=width, chunk_size=8, max_workers=2
+        ),
+    ]:
+        assert np.allclose(data, expected, equal_nan=True)
+
+    # Widths in ppm
+    ppm = 1e4
+    widths = targets * ppm / 1e6 / 2.0
+    expected = brute_force_extract(
+        imzml, np.stack((targets - widths, targets + widths), axis=1)
+    )
+    for data in [
+        mass_index.extract_masses(targets, mass_width_ppm=ppm),
+        imzmlextract.extract_masses(imzml, targets, mass_width_ppm=ppm, max_workers=1),
+        imzmlextract.extract_masses(
+            imzml, targets, mass_width_ppm=ppm, chunk_size=8, max_workers=2
+        ),
+    ]:
+        assert np.allclose(data, expected, equal_nan=True)
+
+
+def test_imzml_import_wizard_accept(qtbot: QtBot, tmp_path: Path):
+    path = tmp_path.joinpath("test.imzML")
+    ibd = rand_imzml(path)
+
+    for use_mass_index in [True, False]:
+        wiz = ImzMLImportWizard(path, ibd)
+        qtbot.addWidget(wiz)
+        wiz.show()
+        wiz.page(wiz.page_imzml).check_mass_index.setChecked(use_mass_index)
+        wiz.next()
+        assert wiz.currentId() == wiz.page_masses
+        wiz.page(wiz.page_masses).mass_table.addMass(150.0)
+        wiz.page(wiz.page_masses).mass_table.addMass(1000.0)  # out of range
+        wiz.setField("mass_width", 1000)
+
+        with qtbot.wait_signal(wiz.laserImported) as emitted:
+            wiz.accept()
+
+        laser = emitted.args[1]
+        assert laser.elements == ("150.0000",)
+        assert laser.data.shape == (4, 5)
+
+
+def test_imzml_target_mass_page_prefetch(qtbot: QtBot, tmp_path: Path):
+    path = tmp_path.joinpath("test.imzML")
+    ibd = rand_imzml(path)
+
+    options = GraphicsOptions()
+    options.image_cache_size = 4 * 5 * 4 * 4  # 4 images
+    wiz = ImzMLImportWizard(path, ibd, options=options)
+    qtbot.addWidget(wiz)
+    wiz.show()
+    wiz.page(wiz.page_imzml).check_mass_index.setChecked(False)
+    wiz.next()
+
+    page = wiz.page(wiz.page_masses)
+    masses = [110.0, 120.0, 130.0, 140.0, 150.0, 160.0]
+    for mz in masses:
+        page.mass_table.addMass(mz)
+
+    with qtbot.wait_signal(page.prefetch_queue.resultReady):
+        page.mass_table.setCurrentIndex(page.mass_table.model().index(0, 0))
+    assert page.image_cache.keys() == [(mz, 10.0) for mz in masses[:3]]
+
+    # Stepping to the next row draws from the cache
+    expected = page.image_cache.get((120.0, 10.0))
+    with qtbot.wait_signal(page.prefetch_queue.resultReady):
+        page.mass_table.setCurrentIndex(page.mass_table.model().index(1, 0))
+    assert page.image_cache.get((120.0, 10.0)) is expected
+    assert (140.0, 10.0) in page.image_cache
+
+    # The budget is kept
+    with qtbot.wait_signal(page.prefetch_queue.resultReady):
+        page.mass_table.setCurrentIndex(page.mass_table.model().index(4, 0))
+    assert len(page.image_cache) == 4
+    assert page.image_cache.nbytes <= options.image_cache_size
+    assert (110.0, 10.0) not in page.image_cache
+
+    # Keyed by width, images of other widths are extracted
+    page.mass_width.setValue(20)
+    page.drawMass(150.0)
+    assert (150.0, 20.0) in page.image_cache
+    assert (150.0, 10.0) in page.image_cache
+    assert np.all(
+        page.image_cache.get((150.0, 20.0)) >= page.image_cache.get((150.0, 10.0))
+    )
+
+    # Clicking a row prefetches once, and not again while in progress
+    submitted = []
+    submit = page.prefetch_queue.submit
+    page.prefetch_queue.submit = lambda *args, **kwargs: (
+        submitted.append(page.prefetch_targets),
+        submit(*args, **kwargs),
+    )
+    rect = page.mass_table.visualRect(page.mass_table.model().index(1, 0))
+    with qtbot.wait_signal(page.prefetch_queue.resultReady):
+        qtbot.mouseClick(
+            page.mass_table.viewport(), QtCore.Qt.LeftButton, pos=rect.center()
+        )
+        page.prefetchNeighbours(1)
+    # The clicked row is drawn, only its neighbours are prefetched
+    assert submitted == [({110.0, 130.0, 140.0}, 20.0)]
+
+
+def test_imzml_tic_and_mean_spectrum(tmp_path: Path):
+    ibd = rand_imzml(tmp_path.joinpath("test.imzML"), (6, 8))
+    imzml = fast_parse_imzml(tmp_path.joinpath("test.imzML"), ibd)
+    expected_tic = imzml.extract_tic()
+
+    partials = []
+    tic, mz, mean = imzmlextract.tic_and_mean_spectrum(
+        imzml,
+        bin_width=1.0,
+        chunk_size=10,
+        partial=lambda tic, mz, mean, i, n: partials.append((np.isnan(tic).sum(), i)),
+    )
+    assert np.allclose(tic, expected_tic)
+    assert partials == [(38, 10), (28, 20), (18, 30), (8, 40), (0, 48)]
+
+    # Mean of each 1 m/z bin
+    mzs, intensities = [], []
+    with ibd.open("rb") as fp:
+        for spectrum in imzml.spectra.values():
+            mzs.append(spectrum.get_binary_data("mzArray", np.float64, fp))
+            intensities.append(spectrum.get_binary_data("intensities", np.float32, fp))
+    mzs, intensities = np.concatenate(mzs), np.concatenate(intensities)
+    low = mzs.min()
+    bins = ((mzs - low) // 1.0).astype(int)
+    sums = np.bincount(bins, weights=intensities)
+    assert np.allclose(mz, low + np.flatnonzero(sums) + 0.5)
+    assert np.allclose(mean, sums[sums > 0] / 48)
+    assert np.isclose(mean.sum() * 48, intensities.sum())
+
+    # TIC summed if not stored
+    for spectrum in imzml.spectra.values():
+        spectrum.tic = None
+    tic, _, _ = imzmlextract.tic_and_mean_spectrum(imzml, chunk_size=7)
+    assert np.allclose(tic, expected_tic, rtol=1e-4)
+
+    with pytest.raises(InterruptedError):
+        imzmlextract.tic_and_mean_spectrum(imzml, cancelled=lambda: True)
+
+
+def test_imzml_target_mass_page_summary(qtbot: QtBot, tmp_path: Path):
+    path = tmp_path.joinpath("test.imzML")
+    ibd = rand_imzml(path)
+
+    wiz = ImzMLImportWizard(path, ibd)
+    qtbot.addWidget(wiz)
+    wiz.show()
+    page = wiz.page(wiz.page_masses)
+    wiz.next()
+    assert page.summary_thread is not None
+    qtbot.wait_until(lambda: page.index.summary() is not None, timeout=5000)
+    assert page.tic is not None and not np.any(np.isnan(page.tic))
+    assert page.image is not None
+    assert page.spectra.spectra is not None
+
+    summary = ImzMLIndex(path, ibd).summary()
+    assert summary is not None
+    assert np.allclose(summary[0], page.tic)
+    assert np.allclose(summary[2], page.mean_spectrum[1])
+
+    # Clicking the spectrum adds masses, pixel spectra replace the mean
+    page.spectra.spectra.mzClicked.emit(150.0)
+    assert np.all(page.mass_table.targetMasses() == [150.0])
+    page.drawSpectraAtPos(QtCore.QPoint(0, 0))
+    assert not page.mean_spectrum_shown
+    page.mass_width.setValue(1000)
+    page.drawMass(float(page.mean_spectrum[0][0]))
+    assert not page.tic_shown
+    page.action_tic.trigger()
+    page.action_mean_spectrum.trigger()
+    assert page.tic_shown and page.mean_spectrum_shown
+    wiz.close()
+
+    # The summary is read from the index
+    wiz = ImzMLImportWizard(path, ibd)
+    qtbot.addWidget(wiz)
+    wiz.show()
+    wiz.next()
+    page = wiz.page(wiz.page_masses)
+    assert page.summary_thread is None
+    assert np.allclose(page.tic, summary[0])
+
+    # Stopped when going back
+    ImzMLIndex(path, ibd).path.joinpath("tic.npy").unlink()
+    wiz.back()
+    wiz.next()
+    assert page.summary_thread is not None
+    wiz.back()
+    assert page.summary_thread is None
@@ -0,0 +1,149 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pewlib.io.imzml import fast_parse_imzml
+from pytestqt.qtbot import QtBot
+from testing import rand_imzml
+
+from pewpew.lib.imzmlindex import ImzMLIndex
+from pewpew.widgets.wizards import imzml as wizard
+
+
+def test_imzml_index(tmp_path: Path):
+    ibd = rand_imzml(tmp_path.joinpath("test.imzML"))
+    imzml = fast_parse_imzml(tmp_path.joinpath("test.imzML"), ibd)
+
+    index = ImzMLIndex(tmp_path.joinpath("test.imzML"))
+    assert index.path == tmp_path.joinpath("test.pewidx")
+    assert not index.isValid()
+    with pytest.raises(ValueError):
+        index.load()
+
+    index.save(imzml)
+    assert index.isValid()
+
+    loaded = index.load()
+    assert loaded.image_size == imzml.image_size
+    assert loaded.scan_settings.pixel_size == imzml.scan_settings.pixel_size
+    assert loaded.mz_params.dtype == np.float64
+    assert loaded.intensity_params.dtype == np.float32
+    assert loaded.spectra.keys() == imzml.spectra.keys()
+    for pos, spectrum in imzml.spectra.items():
+        assert loaded.spectra[pos].tic == pytest.approx(spectrum.tic)
+        assert loaded.spectra[pos].offsets == spectrum.offsets
+        assert loaded.spectra[pos].lengths == spectrum.lengths
+
+    assert np.allclose(loaded.extract_tic(), imzml.extract_tic())
+    assert np.allclose(
+        loaded.extract_masses(np.array([120.0, 180.0]), 1e4),
+        imzml.extract_masses(np.array([120.0, 180.0]), 1e4),
+    )
+
+    # Invalidated by modification
+    stat = ibd.stat()
+    os.utime(ibd, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert not index.isValid()
+
+    # Rebuilt
+    index.path.joinpath("stale.npy").touch()
+    index.save(imzml)
+    assert index.isValid()
+    assert not index.path.joinpath("stale.npy").exists()
+
+
+def test_imzml_mass_index(tmp_path: Path):
+    ibd = rand_imzml(tmp_path.joinpath("test.imzML"), (10, 12))
+    imzml = fast_parse_imzml(tmp_path.joinpath("test.imzML"), ibd)
+    # Remove a spectrum
+    del imzml.spectra[(3, 2)]
+
+    index = ImzMLIndex(tmp_path.joinpath("test.imzML"))
+    with pytest.raises(ValueError):
+        index.buildMassIndex()
+    index.save(imzml)
+    assert not index.hasMassIndex()
+    with pytest.raises(ValueError):
+        index.massIndex()
+
+    steps = []
+    index.buildMassIndex(
+        chunk_size=100, bucket_size=200, progress=lambda i, n: steps.append((i, n))
+    )
+    assert steps[-1][0] == steps[-1][1]
+    assert index.hasMassIndex()
+    assert not any(index.path.glob("*.tmp"))
+
+    mass_index = index.massIndex()
+    assert np.all(np.diff(mass_index.mz) >= 0)
+
+    targets = np.array([100.0, 150.0, 175.5, 250.0])
+    data = mass_index.extract_masses(targets, mass_width_mz=2.0)
+    assert data.shape == (10, 12, 4)
+    assert np.all(np.isnan(data[1, 2]))
+    assert np.all(data[:, :, 3][~np.isnan(data[:, :, 3])] == 0.0)
+
+    with ibd.open("rb") as fp:
+        for (x, y), spectrum in imzml.spectra.items():
+            mz = spectrum.get_binary_data("mzArray", np.float64, fp)
+            intensity = spectrum.get_binary_data("intensities", np.float32, fp)
+            for i, target in enumerate(targets):
+                window = (mz >= target - 1.0) & (mz <= target + 1.0)
+                assert np.isclose(data[y - 1, x - 1, i], intensity[window].sum())
+
+    ppm = mass_index.extract_masses(targets, mass_width_ppm=1e4)
+    for i, target in enumerate(targets):
+        assert np.allclose(
+            ppm[:, :, i],
+            mass_index.extract_masses(target, mass_width_mz=target / 100.0)[:, :, 0],
+            equal_nan=True,
+        )
+    with pytest.raises(ValueError):
+        mass_index.extract_masses(targets)
+
+    # Cancelled builds leave no index
+    index.save(imzml)
+    with pytest.raises(InterruptedError):
+        index.buildMassIndex(cancelled=lambda: True)
+    assert not index.hasMassIndex()
+    assert not any(index.path.glob("*.tmp"))
+
+
+def test_imzml_import_page_index(qtbot: QtBot, tmp_path: Path, monkeypatch):
+    path = tmp_path.joinpath("test.imzML")
+    ibd = rand_imzml(path)
+
+    wiz = wizard.ImzMLImportWizard(path, ibd)
+    qtbot.addWidget(wiz)
+    page = wiz.page(wiz.page_imzml)
+    page.check_mass_index.setChecked(True)
+    assert page.validatePage()
+    assert wiz.field("imzml").image_size == (5, 4)
+    # Built in the background
+    qtbot.waitUntil(lambda: wiz.field("mass_index") is not None)
+    assert ImzMLIndex(path, ibd).hasMassIndex()
+
+    def fail(*args, **kwargs):  # pragma: no cover
+        raise AssertionError("imzML was parsed")
+
+    monkeypatch.setattr(wizard, "fast_parse_imzml", fail)
+    wiz = wizard.ImzMLImportWizard(path, ibd)
+    qtbot.addWidget(wiz)
+    page = wiz.page(wiz.page_imzml)
+    assert page.check_mass_index.isChecked()  # remembered
+    assert page.validatePage()
+    assert len(wiz.field("imzml").spectra) == 20
+    qtbot.waitUntil(lambda: wiz.field("mass_index") is not None)
+
+    page = wiz.page(wiz.page_masses)
+    mz = float(wiz.field("mass_index").mz[100])
+    page.drawMass(mz)
+    assert page.image_cache.get((mz, 10.0)).shape == (4, 5)
+
+    # Without the m/z index
+    wiz = wizard.ImzMLImportWizard(path, ibd)
+    qtbot.addWidget(wiz)
+    wiz.page(wiz.page_imzml).check_mass_index.setChecked(False)
+    assert wiz.page(wiz.page_imzml).validatePage()
+    assert wiz.field("mass_index") is None
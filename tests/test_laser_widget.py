@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from pathlib import Path
 
 import numpy as np
@@ -157,3 +159,108 @@ def test_laser_widget_cursor(qtbot: QtBot):
 
     widget.updateCursorStatus(QtCore.QPointF(1.0, 3.0), QtCore.QPoint(0, 0), np.nan)
     assert main.statusBar().currentMessage() == "1,3 [nan]"
+
+
+def test_laser_tab_view_lazy_imports():
+    # Dialogs, tools and vendor io should only be imported when first used
+    code = (
+        "import sys\n"
+        "import pewpew.widgets.laser\n"
+        "print('\\n'.join(sys.modules.keys()))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    modules = proc.stdout.splitlines()
+    for lazy in [
+        "pyqtgraph",
+        "pewlib.io",
+        "pewpew.charts.calibration",
+        "pewpew.widgets.dialogs",
+        "pewpew.widgets.exportdialogs",
+        "pewpew.widgets.tools.calculator",
+        "pewpew.widgets.wizards.imzml",
+    ]:
+        assert lazy not in modules
+
+
+def test_laser_tab_view_update_or_import(qtbot: QtBot):
+    view = LaserTabView()
+    qtbot.addWidget(view)
+
+    path = Path("/fake/path.csv")
+    info = {"Name": "test", "Import Path": str(path.resolve())}
+    laser = Laser(rand_data(["A"]), info=info)
+    view.updateOrImportFile(path, laser)
+    assert len(view.laserItems()) == 1
+
+    data = rand_data(["A", "B"])
+    view.updateOrImportFile(path, Laser(data))
+    assert len(view.laserItems()) == 1
+    assert view.laserItems()[0].laser.elements == ("A", "B")
+
+
+def test_laser_tab_widget_project(qtbot: QtBot, tmp_path: Path):
+    view = LaserTabView()
+    qtbot.addWidget(view)
+    widget = view.newLaserTab()
+
+    a = widget.addLaser(Laser(rand_data(["A1", "B2"]), info={"Name": "a"}))
+    b = widget.addLaser(
+        Laser(rand_data(["C3", "D4", "E5"]), info={"Name": "b"}),
+        pos=QtCore.QPointF(100.0, 50.0),
+    )
+    b.setZValue(2.0)
+    widget.convertImage("RGBLaserImageItem", b)
+    image = QtGui.QImage(10, 10, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor(255, 0, 0))
+    overlay = widget.addImage(image)
+    overlay.setTransform(QtGui.QTransform.fromScale(2.0, 3.0))
+    overlay.lock()
+    view.options.color_ranges["A1"] = (1.0, "95%")
+
+    path = tmp_path.joinpath("test.pewz")
+    widget.saveProject(path)
+    assert not widget.isWindowModified()
+    assert len(widget.project_keys) == 3
+
+    # Unmodified items are not rewritten
+    mtime = path.stat().st_mtime_ns
+    keys = dict(widget.project_keys)
+    a.setName("a2")
+    assert a not in widget.project_keys
+    widget.saveProject(path)
+    assert path.stat().st_mtime_ns >= mtime
+    assert widget.project_keys[a] != keys[a]
+    assert all(
+        widget.project_keys[item] == keys[item]
+        for item in widget.project_keys
+        if item is not a
+    )
+
+    view.options.color_ranges.clear()
+    view.openDocument(path)
+    loaded = view.activeWidget()
+    assert loaded is not widget
+    assert loaded.project.path == path
+    assert view.options.color_ranges["A1"] == (1.0, "95%")
+
+    items = sorted(loaded.laserItems(), key=lambda item: item.name())
+    assert [item.name() for item in items] == ["a2", "b"]
+    assert not items[0].laser.isLoaded() or items[0].laser.isMapped()
+    assert np.all(items[0].laser.get("A1") == a.laser.get("A1"))
+    assert type(items[1]).__name__ == "RGBLaserImageItem"
+    assert [rgb.element for rgb in items[1].current_elements] == ["C3", "D4", "E5"]
+    rgb = [item for item in widget.laserItems() if item.name() == "b"][0]
+    assert items[1].pos() == rgb.pos()
+    assert items[1].zValue() == rgb.zValue()
+
+    overlays = [
+        item
+        for item in loaded.graphics.scene().items()
+        if type(item).__name__ == "ImageOverlayItem"
+    ]
+    assert len(overlays) == 1
+    assert overlays[0].isLocked()
+    assert overlays[0].transform().m22() == 3.0
+    assert overlays[0].image.pixelColor(0, 0) == QtGui.QColor(255, 0, 0)
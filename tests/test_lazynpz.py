@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pewlib.io import npz
+
+from pewpew.lib import lazynpz
+
+
+def test_lazy_npz_compressed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    laser = npz.load(Path(__file__).parent.joinpath("data", "io", "npz", "test.npz"))
+    path = tmp_path.joinpath("compressed.npz")
+    npz.save(path, laser)
+
+    # The archive is closed once loaded
+    archives = []
+    np_load = np.load
+
+    def load(*args, **kwargs):
+        archives.append(np_load(*args, **kwargs))
+        return archives[-1]
+
+    monkeypatch.setattr(np, "load", load)
+    lazy = lazynpz.load(path)
+    monkeypatch.undo()
+    assert len(archives) == 1
+    assert archives[0].fid is None
+
+    assert isinstance(lazy, lazynpz.LazyNpzLaser)
+    assert lazy.elements == laser.elements
+    assert lazy.shape == laser.shape
+    assert list(lazy.calibration.keys()) == list(laser.calibration.keys())
+    assert lazy.info["File Path"] == str(path.resolve())
+    assert not lazy.isLoaded()
+
+    assert np.array_equal(lazy.get("A1"), laser.get("A1"), equal_nan=True)
+    assert lazy.isLoaded()
+    assert not lazy.isMapped()
+
+
+def test_lazy_npz_elements(tmp_path: Path):
+    laser = npz.load(Path(__file__).parent.joinpath("data", "io", "npz", "test.npz"))
+    path = tmp_path.joinpath("elements.npz")
+    with path.open("wb") as fp:
+        lazynpz.save_elements(
+            fp,
+            laser.data,
+            header=npz.pack_info({"version": "0.10.0", "class": "Laser"}),
+            calibration=npz.pack_calibration(laser.calibration),
+            info=npz.pack_info(laser.info),
+            config=laser.config.to_array(),
+        )
+
+    lazy = lazynpz.load(path)
+    assert lazy.elements == laser.elements
+    assert lazy.shape == laser.shape
+
+    # Single elements are mapped without loading the data
+    assert np.array_equal(lazy.get("B2"), laser.get("B2"), equal_nan=True)
+    assert not lazy.isLoaded()
+    assert lazy.isMapped()
+    assert np.array_equal(
+        lazy.get("A1", calibrate=True), laser.get("A1", calibrate=True), equal_nan=True
+    )
+
+    lazy.data["A1"][0, 0] = -1.0
+    assert not lazy.isMapped()
+    assert np.array_equal(lazy.get("B2"), laser.get("B2"), equal_nan=True)
+
+    # Saving over the archive
+    lazynpz.save(path, lazy)
+    assert npz.load(path).get("A1")[0, 0] == -1.0
+
+
+def test_lazy_npz_fallback():
+    # Versions < 0.8.0 are fully loaded
+    laser = lazynpz.load(
+        Path(__file__).parent.joinpath("data", "io", "npz", "test.npz")
+    )
+    assert not isinstance(laser, lazynpz.LazyNpzLaser)
+    assert laser.elements == ("A1", "B2")
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from pathlib import Path
 
 from pewlib.laser import Laser
@@ -54,3 +56,25 @@ def test_main_window_actions_widget(qtbot: QtBot):
     dlg.close()
 
     assert window.tabview.options.font.pointSize() == 5
+
+
+def test_main_window_lazy_imports():
+    code = (
+        "import sys\n"
+        "import pewpew.mainwindow\n"
+        "print('\\n'.join(sys.modules.keys()))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    modules = proc.stdout.splitlines()
+    for lazy in [
+        "pyqtgraph",
+        "pewlib.io",
+        "pewpew.widgets.dialogs",
+        "pewpew.widgets.wizards.import_",
+        "pewpew.widgets.wizards.imzml",
+        "pewpew.widgets.wizards.laser",
+        "pewpew.widgets.wizards.spot",
+    ]:
+        assert lazy not in modules
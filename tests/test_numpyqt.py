@@ -7,6 +7,7 @@ from pewpew.lib.numpyqt import (
     array_to_image,
     array_to_polygonf,
     polygonf_to_array,
+    quantise_array,
 )
 
 
@@ -47,6 +48,45 @@ def test_array_to_image():
     assert i.pixel(0, 0) == (255 << 24)
     assert i.pixel(9, 9) == (255 << 24) + (99 << 16) + (99 << 8) + 99
 
+    # Float image with range
+    x = np.linspace(0.0, 10.0, 100, endpoint=True).reshape(10, 10)
+    i = array_to_image(x, vrange=(5.0, 10.0))
+    i.setColorTable(np.arange(256))
+    assert i.pixel(0, 0) == 1
+    assert i.pixel(9, 4) == 1
+    assert i.pixel(9, 9) == 255
+
+
+def test_quantise_array():
+    def quantise_numpy(x: np.ndarray, vmin: float, vmax: float) -> np.ndarray:
+        nans = np.isnan(x)
+        x = np.clip(x, vmin, vmax)
+        if vmin != vmax:
+            x = (x - vmin) / (vmax - vmin)
+        x = np.clip(x, 0.0, 1.0)
+        with np.errstate(invalid="ignore"):
+            x = (x * 254.0).astype(np.uint8) + 1
+        x[nans] = 0
+        return x
+
+    x = np.random.normal(size=(100, 120))
+    x[::7, ::3] = np.nan
+    x[0, :2] = np.inf, -np.inf
+
+    for dtype in [np.float32, np.float64]:
+        for vmin, vmax in [(0.0, 1.0), (-1.3, 0.7), (0.5, 0.5)]:
+            expected = quantise_numpy(x.astype(dtype), vmin, vmax)
+            result = quantise_array(x.astype(dtype), vmin, vmax)
+            assert result.dtype == np.uint8
+            assert np.all(result == expected)
+            # Multithreaded
+            result = quantise_array(x.astype(dtype), vmin, vmax, threads=3)
+            assert np.all(result == expected)
+
+    # Non-float types
+    result = quantise_array(np.array([[0, 2, 4]]), 0, 4)
+    assert np.all(result == [[1, 128, 255]])
+
 
 def test_array_to_polygonf():
     x = np.stack((np.arange(10), np.arange(10)), axis=1)
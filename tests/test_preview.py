@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from pewpew.lib.preview import PathPreview, PreviewCache
+
+
+def test_path_preview_file(tmp_path: Path):
+    path = tmp_path.joinpath("test.csv")
+    path.write_text("header\n" + "a;b;c\n" * 100)
+
+    preview = PathPreview(path, max_bytes=50)
+    assert preview.truncated
+    assert len(preview.head) == 50
+    lines = preview.lines()
+    assert lines[0] == "header\n"
+    assert all(line == "a;b;c\n" for line in lines[1:])  # partial line dropped
+    assert preview.line(1) == "a;b;c\n"
+    assert preview.line(100) == ""
+    assert preview.contains("a;b")
+    assert preview.sniffDelimiter() == ";"
+
+    preview = PathPreview(path)
+    assert not preview.truncated
+    assert len(preview.lines()) == 101
+
+
+def test_path_preview_directory(tmp_path: Path):
+    for i in range(5):
+        tmp_path.joinpath(f"{i}.csv").touch()
+    tmp_path.joinpath("a.txt").touch()
+    tmp_path.joinpath("dir.csv").mkdir()
+
+    preview = PathPreview(tmp_path)
+    assert not preview.truncated
+    assert preview.names == ["0.csv", "1.csv", "2.csv", "3.csv", "4.csv", "a.txt"]
+    assert preview.match(r".*\.csv") == ["0.csv", "1.csv", "2.csv", "3.csv", "4.csv"]
+
+    preview = PathPreview(tmp_path, max_entries=3)
+    assert preview.truncated
+    assert len(preview.names) == 3
+
+
+def test_preview_cache(tmp_path: Path):
+    path = tmp_path.joinpath("test.csv")
+    path.write_text("a,b\n")
+
+    cache = PreviewCache()
+    preview = cache.get(path)
+    assert cache.get(path) is preview
+
+    path.write_text("a,b,c\n")
+    assert cache.get(path) is not preview
+    assert cache.get(path).line(0) == "a,b,c\n"
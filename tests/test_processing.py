@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from pewlib.laser import Laser
+from testing import rand_data
+
+from pewpew.lib.processing import apply_processes, parse_processing
+
+
+def test_parse_processing():
+    assert parse_processing(
+        "Filter(*,Local Mean,size=5,σ=3.0);Filter(A1,Gaussian,σ=0.5);"
+        "Calculator(C3,/ A1 (+ B2 1.0))"
+    ) == [
+        ("Filter", None, "Local Mean", [5.0, 3.0]),
+        ("Filter", "A1", "Gaussian", [0.5]),
+        ("Calculator", "C3", "/ A1 (+ B2 1.0)"),
+    ]
+    assert parse_processing("") == []
+
+    with pytest.raises(ValueError):
+        parse_processing("Filter(*,Unknown Filter,size=3);")
+    with pytest.raises(ValueError):
+        parse_processing("Transform(A1);")
+
+
+def test_apply_processes_sequential():
+    laser = Laser(rand_data(["A1", "B2"]), info={"Name": "laser"})
+    a1 = laser.get("A1").copy()
+
+    # Each process uses the results of those before it
+    assert apply_processes(
+        laser,
+        [
+            ("Calculator", "C3", "+ A1 1.0"),
+            ("Calculator", "A1", "* A1 0.0"),
+            ("Calculator", "D4", "+ A1 C3"),
+        ],
+    )
+    assert laser.elements == ("A1", "B2", "C3", "D4")
+    assert np.allclose(laser.get("C3"), a1 + 1.0)
+    assert np.allclose(laser.get("D4"), a1 + 1.0)
+
+    # The recorded processing reproduces the result
+    replay = Laser(rand_data(["A1", "B2"]), info={"Name": "replay"})
+    replay.data["A1"] = a1
+    assert apply_processes(replay, parse_processing(laser.info["Processing"]))
+    assert replay.info["Processing"] == laser.info["Processing"]
+    assert np.allclose(replay.get("D4"), laser.get("D4"))
+
+    assert not apply_processes(laser, [("Filter", None, "Local Median", [3, 3.0])])
@@ -0,0 +1,101 @@
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pewlib.config import SpotConfig
+from pewlib.laser import Laser
+from testing import rand_data
+
+from pewpew.lib.lazynpz import LazyNpzLaser
+from pewpew.lib.project import ProjectFile
+
+
+def test_project_file(tmp_path: Path):
+    a = Laser(rand_data(["A1", "B2"]), info={"Name": "a"})
+    b = Laser(rand_data("C3"), config=SpotConfig(10.0, 20.0), info={"Name": "b"})
+
+    project = ProjectFile(tmp_path.joinpath("test.pewz"))
+    assert not project.exists()
+
+    state = {"lasers": [{"key": "a"}, {"key": "b"}], "images": [{"key": "i"}]}
+    project.write(state, {"a": a, "b": b}, {"i": b"png"})
+    assert project.exists()
+
+    manifest = project.readManifest()
+    assert manifest["lasers"] == state["lasers"]
+
+    laser = project.readLaser("b")
+    assert isinstance(laser, LazyNpzLaser)
+    assert not laser.isLoaded()
+    assert laser.elements == ("C3",)
+    assert laser.info["Name"] == "b"
+    assert isinstance(laser.config, SpotConfig)
+    assert laser.config.spotsize_y == 20.0
+    assert np.all(laser.get("C3") == b.get("C3"))
+    assert laser.isMapped()
+    assert not laser.isLoaded()
+
+    assert project.readImage("i") == b"png"
+
+    # Only modified lasers are appended
+    size = project.path.stat().st_size
+    a.add("D4", np.ones(a.shape))
+    project.write({"lasers": [{"key": "a2"}, {"key": "b"}]}, {"a2": a})
+    assert project.readManifest()["lasers"] == [{"key": "a2"}, {"key": "b"}]
+    assert project.path.stat().st_size > size
+    with zipfile.ZipFile(project.path) as zf:
+        names = zf.namelist()
+    assert "lasers/a/data/0.npy" in names  # not yet compacted
+    assert "manifest-1.json" in names
+    assert project.readLaser("a2").elements == ("A1", "B2", "D4")
+    # Existing maps are still valid
+    assert np.all(laser.get("C3") == b.get("C3"))
+
+    with pytest.raises(KeyError):
+        project.write({"lasers": [{"key": "x"}]})
+
+    # Removing a laser compacts the archive
+    project.write({"lasers": [{"key": "b"}]})
+    with zipfile.ZipFile(project.path) as zf:
+        names = zf.namelist()
+    assert not any(name.startswith("lasers/a") for name in names)
+    assert not any(name.startswith("images/") for name in names)
+    assert names[-1] == "manifest-2.json"
+    assert np.all(project.readLaser("b").get("C3") == b.get("C3"))
+    assert np.all(laser.get("C3") == b.get("C3"))
+
+
+def test_project_file_invalid(tmp_path: Path):
+    path = tmp_path.joinpath("test.pewz")
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("manifest.txt", "")
+    with pytest.raises(ValueError):
+        ProjectFile(path).readManifest()
+
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("manifest-0.json", '{"format": 999}')
+    with pytest.raises(ValueError):
+        ProjectFile(path).readManifest()
+
+
+def test_project_file_compact_in_use(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    a = Laser(rand_data(["A1", "B2"]), info={"Name": "a"})
+    b = Laser(rand_data("C3"), info={"Name": "b"})
+
+    project = ProjectFile(tmp_path.joinpath("test.pewz"))
+    project.write({"lasers": [{"key": "a"}, {"key": "b"}]}, {"a": a, "b": b})
+
+    # Mapped archives cannot be replaced on Windows
+    def replace(src, dst):
+        raise PermissionError("in use")
+
+    monkeypatch.setattr("pewpew.lib.project.os.replace", replace)
+    project.write({"lasers": [{"key": "b"}]})
+
+    with zipfile.ZipFile(project.path) as zf:
+        names = zf.namelist()
+    assert "lasers/a/header.npy" in names  # appended, not compacted
+    assert names[-1] == "manifest-1.json"
+    assert list(tmp_path.iterdir()) == [project.path]
+    assert np.all(project.readLaser("b").get("C3") == b.get("C3"))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from pewpew.lib.quantile import QuantileSketch
+
+
+def test_quantile_sketch_exact():
+    data = np.random.random((50, 50))
+    data[0, 0] = np.nan
+
+    sketch = QuantileSketch(data)
+    assert sketch.size == 2499
+    assert np.isclose(sketch.percentile(50.0), np.nanpercentile(data, 50.0))
+    assert np.allclose(
+        sketch.percentile([0.0, 1.0, 99.0, 100.0]),
+        np.nanpercentile(data, [0.0, 1.0, 99.0, 100.0]),
+    )
+
+
+def test_quantile_sketch_approximate():
+    np.random.seed(8732)
+    data = np.random.lognormal(0.0, 2.0, size=(500, 500))
+    data[:100] *= -1.0
+    data[0, :10] = np.inf
+
+    sketch = QuantileSketch(data, bins=1024, exact_size=1000)
+    assert sketch.nbytes < data.nbytes // 10
+
+    q = np.array([0.0, 1.0, 5.0, 50.0, 95.0, 99.0, 100.0])
+    expected = np.nanpercentile(np.where(np.isfinite(data), data, np.nan), q)
+    result = sketch.percentile(q)
+    assert result[0] == expected[0]
+    assert result[-1] == expected[-1]
+    assert np.allclose(result, expected, rtol=0.01)
+
+
+def test_quantile_sketch_empty():
+    sketch = QuantileSketch(np.full(10, np.nan))
+    assert np.isnan(sketch.percentile(50.0))
+
+    with pytest.raises(ValueError):
+        sketch.percentile(101.0)
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pewlib.io import thermo as pewlib_thermo
+
+from pewpew.lib import thermo
+
+path = Path(__file__).parent.joinpath("data", "io", "thermo", "icap_columns.csv")
+
+
+def write_icap_rows(path: Path, data: np.ndarray, times: np.ndarray) -> None:
+    names = data.dtype.names
+    nscans = data.shape[1]
+    columns = [(name, kind) for name in names for kind in ["Time", "Counter"]]
+    with path.open("w", encoding="utf-8-sig") as fp:
+        for header in [
+            ["MainRuns" for _ in columns for _ in range(nscans)],
+            [str(i) for _ in columns for i in range(nscans)],
+            [name for name, _ in columns for _ in range(nscans)],
+            [kind for _, kind in columns for _ in range(nscans)],
+        ]:
+            fp.write("," + ",".join(header) + ",\n")
+        for i in range(data.shape[0]):
+            values = []
+            for name, kind in columns:
+                values.extend(times[i] if kind == "Time" else data[name][i])
+            fp.write(f"Sample {i}," + ",".join(f"{v:.6f}" for v in values) + ",\n")
+
+
+def write_icap_columns(path: Path, data: np.ndarray, times: np.ndarray) -> None:
+    nsamples = data.shape[0]
+    with path.open("w", encoding="utf-8-sig") as fp:
+        fp.write(",,,," + ",".join(f"Sample {i}" for i in range(nsamples)) + ",\n")
+        fp.write(",,,," + ",".join("<Identifier>" for _ in range(nsamples)) + ",\n")
+        for name in data.dtype.names:
+            for kind, values in [("Time", times), ("Counter", data[name])]:
+                for scan in range(data.shape[1]):
+                    line = ",".join(f"{v:.6f}" for v in values[:, scan])
+                    fp.write(f"MainRuns,{scan},{name},{kind},{line},\n")
+
+
+@pytest.mark.parametrize("block_size", [100, 1 << 20])
+def test_thermo_load_columns(block_size: int):
+    progress = []
+    data, params = thermo.load(
+        path, block_size=block_size, progress=lambda i, n: progress.append((i, n))
+    )
+    expected = pewlib_thermo.icap_csv_columns_read_data(path)
+    expected_params = pewlib_thermo.icap_csv_columns_read_params(path)
+
+    assert data.dtype.names == expected.dtype.names
+    for name in data.dtype.names:
+        assert np.allclose(data[name], expected[name])
+    assert params["scantime"] == expected_params["scantime"]
+    assert np.allclose(params["times"], expected_params["times"])
+
+    assert progress[-1] == (path.stat().st_size, path.stat().st_size)
+    assert all(a[0] < b[0] for a, b in zip(progress[:-1], progress[1:]))
+
+    data, _ = thermo.load(path, use_analog=True, block_size=block_size)
+    expected = pewlib_thermo.icap_csv_columns_read_data(path, use_analog=True)
+    for name in data.dtype.names:
+        assert np.allclose(data[name], expected[name])
+
+
+@pytest.mark.parametrize("format", ["columns", "rows"])
+def test_thermo_load_estimates(tmp_path: Path, format: str):
+    rng = np.random.default_rng(1234)
+    names = [f"{i}X" for i in range(1, 31)]
+    data = np.empty((20, 15), dtype=[(name, np.float64) for name in names])
+    for name in names:
+        data[name] = np.round(rng.random(data.shape) * 1000.0, 6)
+    # The count of elements is underestimated from the longer first element
+    data[names[0]] += 1e6
+    times = np.round(np.tile(np.arange(15) * 0.25, (20, 1)), 6)
+
+    csv = tmp_path.joinpath("icap.csv")
+    if format == "rows":
+        write_icap_rows(csv, data, times)
+        expected = pewlib_thermo.icap_csv_rows_read_data(csv)
+    else:
+        write_icap_columns(csv, data, times)
+        expected = pewlib_thermo.icap_csv_columns_read_data(csv)
+    for name in names:
+        assert np.allclose(expected[name], data[name])
+
+    for block_size in [64, 1000, 1 << 20]:
+        loaded, params = thermo.load(csv, block_size=block_size)
+        assert loaded.dtype.names == tuple(names)
+        assert loaded.shape == data.shape
+        for name in names:
+            assert np.allclose(loaded[name], data[name])
+        assert params["scantime"] == 0.25
+        assert loaded.base is not None  # no copy
+
+
+def test_thermo_load_cancelled():
+    with pytest.raises(InterruptedError):
+        thermo.load(path, block_size=100, cancelled=lambda: True)
+
+
+def test_thermo_load_invalid(tmp_path: Path):
+    csv = tmp_path.joinpath("invalid.csv")
+    csv.write_text("a,b,c\n1,2,3\n4,5,6\n")
+    with pytest.raises(ValueError):
+        thermo.load(csv)
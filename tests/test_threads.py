@@ -1,9 +1,12 @@
+import time
+
+from PySide6 import QtCore
 from pytestqt.qtbot import QtBot
 from pathlib import Path
 
 from pewlib.config import Config
 
-from pewpew.threads import ImportThread
+from pewpew.threads import ImportThread, CoalescingQueue
 
 
 def test_import_thread(qtbot: QtBot):
@@ -30,3 +33,126 @@ def test_import_thread(qtbot: QtBot):
 
     with qtbot.waitSignal(thread.importFailed):
         thread.run()
+
+
+def test_import_thread_line_progress(qtbot: QtBot):
+    path = Path(__file__).parent.joinpath("data", "io", "agilent", "test_ms.b")
+    thread = ImportThread([path], Config(), lazy=False)
+
+    progress = []
+    thread.lineProgressChanged.connect(lambda *args: progress.append(args))
+    with qtbot.waitSignal(thread.importFinished):
+        thread.run()
+    assert progress == [("test_ms.b", i, 5) for i in range(1, 6)]
+
+
+def test_coalescing_queue(qtbot: QtBot):
+    pool = QtCore.QThreadPool()
+    pool.setMaxThreadCount(1)
+    queue = CoalescingQueue(pool)
+
+    results = []
+    queue.resultReady.connect(results.append)
+
+    with qtbot.waitSignal(queue.resultReady):
+        queue.submit(lambda: 1)
+    assert results == [1]
+
+    # Superseded jobs are not emitted
+    for i in range(2, 6):
+        queue.submit(lambda i=i: (time.sleep(0.01), i)[1])
+    assert queue.isActive()
+    qtbot.waitUntil(lambda: len(queue.jobs) == 0)
+    assert results == [1, 5]
+
+    # Failed jobs are not emitted
+    queue.submit(lambda: 1 / 0)
+    qtbot.waitUntil(lambda: len(queue.jobs) == 0)
+    assert results == [1, 5]
+
+    queue.submit(lambda: 6)
+    queue.cancel()
+    qtbot.waitUntil(lambda: len(queue.jobs) == 0)
+    assert results == [1, 5]
+
+    # Running cancellable jobs stop once superseded
+    started, stopped = [], []
+
+    def wait_for_cancel(cancelled) -> int:
+        started.append(True)
+        while not cancelled():
+            time.sleep(0.001)
+        stopped.append(True)
+        raise InterruptedError
+
+    queue.submit(wait_for_cancel, cancellable=True)
+    qtbot.waitUntil(lambda: len(started) == 1)
+    queue.submit(lambda cancelled: 7, cancellable=True)
+    qtbot.waitUntil(lambda: len(queue.jobs) == 0)
+    assert stopped == [True]
+    assert results == [1, 5, 7]
+
+
+def test_import_thread_concurrent(qtbot: QtBot):
+    path = Path(__file__).parent.joinpath("data", "io")
+    paths = [
+        path.joinpath("npz", "test.npz"),
+        path.joinpath("fake", "data.npz"),
+        path.joinpath("textimage", "csv.csv"),
+        path.joinpath("textimage", "text.text"),
+    ]
+    # Small files are not worth a pool
+    thread = ImportThread(paths, Config(), processes=2)
+    assert all(thread.isLocal(path) for path in paths)
+
+    thread = ImportThread(paths, Config(), processes=2, ordered=True)
+    thread.concurrent_min_bytes = 0
+    assert [thread.isLocal(path) for path in paths] == [True, True, False, False]
+
+    # Lasers parsed in the pool are still created by importPath
+    created = []
+    import_path = thread.importPath
+
+    def importPath(path: Path, index: int = 0, parsed=None):
+        created.append((path, parsed is not None))
+        return import_path(path, index, parsed=parsed)
+
+    thread.importPath = importPath
+
+    imported = []
+    thread.importFinished.connect(lambda path, laser: imported.append(path))
+    with qtbot.waitSignal(thread.importFailed):
+        thread.run()
+    assert imported == [paths[0], paths[2], paths[3]]
+    assert set(created) == {
+        (paths[0], False),
+        (paths[1], False),
+        (paths[2], True),
+        (paths[3], True),
+    }
+
+    thread = ImportThread(paths[2:], Config(), processes=2, ordered=False)
+    thread.concurrent_min_bytes = 0
+    progress = []
+    thread.progressChanged.connect(progress.append)
+    with qtbot.waitSignals([thread.importFinished, thread.importFinished]):
+        thread.run()
+    assert progress[-1] == 2 * ImportThread.progress_steps
+
+    # Unordered, local paths are emitted without waiting for the pool
+    thread = ImportThread(paths[2:] + paths[:1], Config(), processes=2, ordered=False)
+    thread.concurrent_min_bytes = 0
+    imported = []
+    thread.importFinished.connect(lambda path, laser: imported.append(path))
+    with qtbot.waitSignals([thread.importFinished] * 3):
+        thread.run()
+    assert imported[0] == paths[0]
+
+    # Interruption stops reading local paths
+    thread = ImportThread(paths[:1] * 4 + paths[2:], Config(), processes=2)
+    thread.concurrent_min_bytes = 0
+    imported = []
+    thread.importFinished.connect(lambda path, laser: imported.append(path))
+    thread.isInterruptionRequested = lambda: len(imported) > 0
+    thread.run()
+    assert imported == paths[:1]
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from pytestqt.qtbot import QtBot
+
+from pewpew.watch import DirectoryWatcher, is_importable, path_signature
+
+
+def test_is_importable(tmp_path: Path):
+    tmp_path.joinpath("data.csv").write_text("1,2")
+    tmp_path.joinpath("image.png").write_bytes(b"")
+    tmp_path.joinpath(".hidden.csv").write_text("1,2")
+    tmp_path.joinpath("batch.b").mkdir()
+
+    assert is_importable(tmp_path.joinpath("data.csv"))
+    assert not is_importable(tmp_path.joinpath("image.png"))
+    assert not is_importable(tmp_path.joinpath(".hidden.csv"))
+    assert is_importable(tmp_path.joinpath("batch.b"))
+
+
+def test_path_signature(tmp_path: Path):
+    dir = tmp_path.joinpath("batch.b")
+    dir.mkdir()
+    dir.joinpath("001.d").mkdir()
+    dir.joinpath("001.d", "data.csv").write_text("1")
+    signature = path_signature(dir)
+    assert len(signature) == 1
+
+    dir.joinpath("001.d", "data.csv").write_text("12")
+    assert path_signature(dir) != signature
+
+
+def test_directory_watcher(qtbot: QtBot, tmp_path: Path):
+    tmp_path.joinpath("existing.csv").write_text("1,2")
+
+    watcher = DirectoryWatcher(tmp_path, interval=10, debounce=50)
+    paths = []
+    watcher.pathChanged.connect(paths.append)
+
+    with qtbot.waitSignal(watcher.pathChanged, timeout=1000):
+        watcher.start()
+    assert paths == [tmp_path.joinpath("existing.csv")]
+
+    # Reported once settled
+    path = tmp_path.joinpath("new.csv")
+    path.write_text("1,2")
+    watcher.scan()
+    qtbot.waitUntil(lambda: path in watcher.pending, timeout=1000)
+    with qtbot.waitSignal(watcher.pathChanged, timeout=1000):
+        pass
+    assert paths[-1] == path
+
+    # Updates are reported again
+    path.write_text("1,2\n3,4")
+    with qtbot.waitSignal(watcher.pathChanged, timeout=1000):
+        pass
+    assert paths[-1] == path
+    assert len(paths) == 3
+
+    watcher.stop()
+    assert not watcher.isActive()
+
+    # Existing paths ignored
+    watcher = DirectoryWatcher(tmp_path, interval=10, debounce=0, existing=False)
+    watcher.pathChanged.connect(paths.append)
+    watcher.start()
+    qtbot.wait(50)
+    assert len(paths) == 3
+    watcher.stop()
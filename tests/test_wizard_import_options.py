@@ -8,7 +8,7 @@ from pewpew.widgets.wizards import options
 path = Path(__file__).parent.joinpath("data", "io")
 
 
-def test_wizard_import_options(qtbot: QtBot):
+def test_wizard_import_options(qtbot: QtBot, tmp_path: Path):
     # Agilent
     agilent = options.AgilentOptions()
     agilent.fieldArgs()
@@ -35,6 +35,20 @@ def test_wizard_import_options(qtbot: QtBot):
     agilent.setEnabled(False)
     assert not agilent.combo_dfile_method.isEnabled()
 
+    # CSV lines
+    csv = options.CsvLinesOptions()
+    csv.fieldArgs()
+    csv.combo_delimiter.setCurrentText(";")
+    csv.updateForPath(path.joinpath("csv", "generic"))
+    assert csv.combo_delimiter.currentText() == ","
+    assert csv.lineedit_nlines.text() == "3"
+    assert csv.lineedit_header_preview.text().startswith("A,B")
+    assert csv.isComplete()
+
+    csv.lineedit_regex.setText("1\\.csv")
+    csv.regexChanged()
+    assert csv.lines == 1
+
     # Numpy
     numpy = options.NumpyOptions()
     numpy.fieldArgs()
@@ -71,6 +85,20 @@ def test_wizard_import_options(qtbot: QtBot):
     assert not thermo.check_use_analog.isEnabled()
     assert not thermo.isComplete()
 
+    # Analog readings not in a truncated preview are unverified
+    lines = (
+        path.joinpath("thermo", "icap_columns.csv")
+        .read_text(encoding="utf-8-sig")
+        .splitlines(keepends=True)
+    )
+    lines = [line for line in lines if "Analog" not in line]
+    tmp_path.joinpath("large.csv").write_text("".join(lines * 20))
+    assert thermo.preprocessFile(tmp_path.joinpath("large.csv"))[2] is None
+    thermo.updateForPath(tmp_path.joinpath("large.csv"))
+    assert thermo.check_use_analog.isEnabled()
+    assert not thermo.check_use_analog.isChecked()
+    assert thermo.check_use_analog.toolTip() != ""
+
     thermo.setEnabled(False)
     assert not thermo.radio_columns.isEnabled()
     assert not thermo.radio_rows.isEnabled()
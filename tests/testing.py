@@ -1,3 +1,4 @@
+from pathlib import Path
 
 import numpy as np
 import pytest
@@ -27,3 +28,76 @@ def rand_data(names: str | list[str]) -> np.ndarray:
     for name in names:
         data[name] = np.random.random((10, 10))
     return data
+
+
+def write_imzml(
+    path: Path, mzs: list[np.ndarray], intensities: list[np.ndarray], shape: tuple
+) -> Path:
+    """Writes a processed imzML and binary, spectra are in row-major order.
+
+    Returns:
+        path to the binary
+    """
+    ibd = path.with_suffix(".ibd")
+    spectra = []
+    with ibd.open("wb") as fp:
+        fp.write(bytes(16))  # uuid
+        for i, (mz, intensity) in enumerate(zip(mzs, intensities)):
+            mz, intensity = mz.astype(np.float64), intensity.astype(np.float32)
+            y, x = np.unravel_index(i, shape)
+            arrays = []
+            for ref, array in [("mzArray", mz), ("intensities", intensity)]:
+                arrays.append((ref, array.size, fp.tell(), array.nbytes))
+                fp.write(array.tobytes())
+            spectra.append((x + 1, y + 1, float(intensity.sum()), arrays))
+
+    def cv(accession: str, value: str = "") -> str:
+        return f'<cvParam cvRef="MS" accession="{accession}" value="{value}"/>\n'
+
+    with path.open("w") as fp:
+        fp.write('<?xml version="1.0" encoding="ISO-8859-1"?>\n')
+        fp.write('<mzML xmlns="http://psi.hupo.org/ms/mzml" version="1.1">\n')
+        fp.write('<referenceableParamGroupList count="2">\n')
+        fp.write('<referenceableParamGroup id="mzArray">\n')
+        fp.write(cv("MS:1000514") + cv("MS:1000523") + cv("IMS:1000101", "true"))
+        fp.write("</referenceableParamGroup>\n")
+        fp.write('<referenceableParamGroup id="intensities">\n')
+        fp.write(cv("MS:1000515") + cv("MS:1000521") + cv("IMS:1000101", "true"))
+        fp.write("</referenceableParamGroup>\n")
+        fp.write("</referenceableParamGroupList>\n")
+        fp.write('<scanSettingsList count="1">\n<scanSettings id="scan1">\n')
+        fp.write(cv("IMS:1000042", str(shape[1])) + cv("IMS:1000043", str(shape[0])))
+        fp.write(cv("IMS:1000046", "10.0") + cv("IMS:1000047", "20.0"))
+        fp.write("</scanSettings>\n</scanSettingsList>\n")
+        fp.write(f'<run id="run">\n<spectrumList count="{len(spectra)}">\n')
+        for i, (x, y, tic, arrays) in enumerate(spectra):
+            fp.write(f'<spectrum id="{i}" index="{i}">\n')
+            fp.write(cv("MS:1000285", f"{tic:.6f}"))
+            fp.write('<scanList count="1">\n<scan>\n')
+            fp.write(cv("IMS:1000050", str(x)) + cv("IMS:1000051", str(y)))
+            fp.write("</scan>\n</scanList>\n")
+            fp.write('<binaryDataArrayList count="2">\n')
+            for ref, size, offset, nbytes in arrays:
+                fp.write('<binaryDataArray encodedLength="0">\n')
+                fp.write(f'<referenceableParamGroupRef ref="{ref}"/>\n')
+                fp.write(cv("IMS:1000103", str(size)) + cv("IMS:1000102", str(offset)))
+                fp.write(cv("IMS:1000104", str(nbytes)))
+                fp.write("<binary/>\n</binaryDataArray>\n")
+            fp.write("</binaryDataArrayList>\n</spectrum>\n")
+        fp.write("</spectrumList>\n</run>\n</mzML>\n")
+    return ibd
+
+
+def rand_imzml(path: Path, shape: tuple = (4, 5)) -> Path:
+    """Writes a random imzML with spectra of varying lengths.
+
+    Returns:
+        path to the binary
+    """
+    rng = np.random.default_rng(8724)
+    mzs, intensities = [], []
+    for _ in range(shape[0] * shape[1]):
+        n = rng.integers(20, 40)
+        mzs.append(np.sort(rng.uniform(100.0, 200.0, n)))
+        intensities.append(rng.uniform(0.0, 100.0, n))
+    return write_imzml(path, mzs, intensities, shape)